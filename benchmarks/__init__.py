@@ -0,0 +1,43 @@
+"""Benchmarks for z80py
+
+Run them from the top of the repository, e.g.
+
+    python -m benchmarks.zexall
+
+or all of them at once, with the results as JSON:
+
+    python -m benchmarks --output results.json
+"""
+from z80 import Z80
+from z80coarse import Z80Coarse
+from z80fuse import Z80Fuse
+from z80jit import Z80JIT
+from z80predecode import Z80Predecode
+
+
+def add_cpu_arguments(parser, verb='use'):
+    """Options to pick the CPU class
+    """
+    cpu = parser.add_mutually_exclusive_group()
+    cpu.add_argument('--jit', action='store_true',
+                     help=verb + ' the basic-block translating Z80JIT')
+    cpu.add_argument('--coarse', action='store_true',
+                     help=verb + ' Z80Coarse, which charges cycles per instruction')
+    cpu.add_argument('--fuse', action='store_true',
+                     help=verb + ' Z80Fuse, which runs common instruction pairs in one dispatch')
+    cpu.add_argument('--predecode', action='store_true',
+                     help=verb + ' Z80Predecode, which caches decoded instructions')
+
+
+def cpu_class(args):
+    """The CPU class picked by the arguments of add_cpu_arguments()
+    """
+    if args.jit:
+        return Z80JIT
+    if args.coarse:
+        return Z80Coarse
+    if args.fuse:
+        return Z80Fuse
+    if args.predecode:
+        return Z80Predecode
+    return Z80
@@ -0,0 +1,98 @@
+"""Run all benchmarks and write the results as JSON
+
+    python -m benchmarks --output results.json
+
+Speeds are emulated T-states per host second. The zexall workload is
+left out when zexall.bin is not in the current directory. Results of
+two runs, e.g. of two commits, are compared with benchmarks.compare.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+
+from benchmarks import add_cpu_arguments, cpu_class, construct, opcodes, workloads, zexall
+
+
+def commit():
+    """The git commit of the working tree, None outside of git
+    """
+    try:
+        res = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return res.stdout.strip() if res.returncode == 0 else None
+
+
+def speed(executed, elapsed):
+    return {'cycles': executed, 'seconds': elapsed, 'tstates_per_second': executed / elapsed}
+
+
+def run(args):
+    klass = cpu_class(args)
+    res = {
+        'commit': commit(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_implementation() + ' ' + platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_class': klass.__name__,
+    }
+
+    groups = {}
+    for group, times in opcodes.run(args.iterations, klass).items():
+        cycles = sum(cycles for cycles, _ in times.values())
+        elapsed = sum(elapsed for _, elapsed in times.values())
+        groups[group] = {
+            'tstates_per_second': cycles / elapsed,
+            'opcodes': {'{:02x}'.format(opcode): {'cycles': cycles, 'ns': elapsed * 1e9,
+                                                  'tstates_per_second': cycles / elapsed}
+                        for opcode, (cycles, elapsed) in times.items()},
+        }
+    res['opcodes'] = groups
+
+    mixed = {}
+    for name, program in workloads.PROGRAMS.items():
+        mixed[name] = speed(*workloads.run(program, args.cycles, args.slice, klass))
+    if os.path.exists('zexall.bin'):
+        # zexall reports its progress on stdout, which is for the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            mixed['zexall'] = speed(*zexall.run(args.cycles, args.slice, klass))
+    else:
+        print('zexall.bin not found, zexall left out', file=sys.stderr)
+    res['workloads'] = mixed
+
+    first, elapsed, size = construct.run(args.count, klass)
+    res['construct'] = {'first_seconds': first, 'seconds_each': elapsed / args.count, 'bytes_each': size}
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--output', help='file to write the results to (default: stdout)')
+    parser.add_argument('--iterations', type=int, default=1000,
+                        help='runs of each opcode (default: %(default)s)')
+    parser.add_argument('--cycles', type=int, default=10_000_000,
+                        help='T-states to emulate per workload (default: %(default)s)')
+    parser.add_argument('--slice', type=int, default=1_000_000,
+                        help='T-states per execute_run call (default: %(default)s)')
+    parser.add_argument('--count', type=int, default=1000,
+                        help='CPUs to construct (default: %(default)s)')
+    add_cpu_arguments(parser)
+    args = parser.parse_args()
+
+    text = json.dumps(run(args), indent=1)
+    if args.output is None:
+        print(text)
+    else:
+        with open(args.output, 'w') as fh:
+            fh.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
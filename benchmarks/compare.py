@@ -0,0 +1,64 @@
+"""Compare two results of python -m benchmarks
+
+    python -m benchmarks.compare old.json new.json
+
+Lists the speed of each workload and opcode group, and the construction
+time, in both results and the speedup from the first to the second.
+Opcodes whose speed changed by more than --threshold are listed, too.
+"""
+import argparse
+import json
+
+
+def line(name, old, new):
+    if old is None or new is None:
+        return '{:<24} {:>14} {:>14}'.format(name, '-' if old is None else '{:.0f}'.format(old),
+                                             '-' if new is None else '{:.0f}'.format(new))
+    return '{:<24} {:14.0f} {:14.0f} {:7.2f}x'.format(name, old, new, new / old)
+
+
+def compare(old, new, threshold=0.1):
+    """Text table of the speeds in two results
+    """
+    lines = ['{:<24} {:>14} {:>14} {:>8}'.format('T-states/s', 'old', 'new', 'speedup')]
+    for name in sorted(set(old['workloads']) | set(new['workloads'])):
+        lines.append(line(name, old['workloads'].get(name, {}).get('tstates_per_second'),
+                          new['workloads'].get(name, {}).get('tstates_per_second')))
+    for group in new['opcodes']:
+        if group not in old['opcodes']:
+            continue
+        lines.append(line(group, old['opcodes'][group]['tstates_per_second'],
+                          new['opcodes'][group]['tstates_per_second']))
+        old_opcodes = old['opcodes'][group]['opcodes']
+        for opcode, times in new['opcodes'][group]['opcodes'].items():
+            before = old_opcodes[opcode]['tstates_per_second']
+            if abs(times['tstates_per_second'] / before - 1) > threshold:
+                lines.append(line('  ' + opcode, before, times['tstates_per_second']))
+
+    lines.append('')
+    lines.append('{:<24} {:>14} {:>14}'.format('construction', 'old', 'new'))
+    lines.append('{:<24} {:12.1f}us {:12.1f}us'.format(
+        'each', old['construct']['seconds_each'] * 1e6, new['construct']['seconds_each'] * 1e6))
+    lines.append('{:<24} {:14.0f} {:14.0f}'.format(
+        'bytes each', old['construct']['bytes_each'], new['construct']['bytes_each']))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('old', help='results to compare against')
+    parser.add_argument('new', help='results to compare')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='list opcodes whose speed changed by more than this (default: %(default)s)')
+    args = parser.parse_args()
+
+    with open(args.old) as fh:
+        old = json.load(fh)
+    with open(args.new) as fh:
+        new = json.load(fh)
+    print('{} -> {}'.format(old.get('commit'), new.get('commit')))
+    print(compare(old, new, args.threshold))
+
+
+if __name__ == '__main__':
+    main()
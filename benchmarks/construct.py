@@ -0,0 +1,51 @@
+"""CPU construction cost
+
+Constructs a number of CPUs, each with its own 64K of memory, and
+reports the time taken and the memory allocated per CPU. The first
+construction, which also builds the class-wide tables, is timed
+separately. Memory is traced in a second, smaller round, as tracing
+slows construction down a lot.
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks import add_cpu_arguments, cpu_class
+from z80 import Z80, Bus
+
+
+def run(count, cpu_class=Z80):
+    io = Bus(lambda port: 0xff, lambda port, value: None)
+
+    start = time.perf_counter()
+    cpu_class(bytearray(0x10000), io)
+    first = time.perf_counter() - start
+
+    memories = [bytearray(0x10000) for _ in range(count)]
+    start = time.perf_counter()
+    cpus = [cpu_class(memory, io) for memory in memories]
+    elapsed = time.perf_counter() - start
+    del cpus
+
+    traced = memories[:100]
+    tracemalloc.start()
+    cpus = [cpu_class(memory, io) for memory in traced]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, elapsed, size / len(cpus)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--count', type=int, default=10_000,
+                        help='CPUs to construct (default: %(default)s)')
+    add_cpu_arguments(parser, 'construct')
+    args = parser.parse_args()
+
+    first, elapsed, size = run(args.count, cpu_class(args))
+    print("first: {:.1f}ms".format(first * 1e3))
+    print("{:d} CPUs in {:.3f}s: {:.1f}us and {:.0f} bytes each".format(
+        args.count, elapsed, elapsed / args.count * 1e6, size))
+
+
+if __name__ == '__main__':
+    main()
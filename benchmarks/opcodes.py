@@ -0,0 +1,74 @@
+"""Per-opcode speed
+
+Runs every opcode of the op, cb, ed, dd, fd and xycb dispatch tables on
+its own, one execute_run() call at a time, and reports the T-states it
+takes and the host time it took. Operands are all zero, and PC, SP, HL,
+IX and IY are set before each run, so jumps, calls and block
+instructions run once over and over. A prefix that is followed by
+another table runs with opcode 00 of that table.
+"""
+import argparse
+import time
+
+from benchmarks import add_cpu_arguments, cpu_class
+from z80 import Z80, Bus
+
+GROUPS = ('op', 'cb', 'ed', 'dd', 'fd', 'xycb')
+# bytes before the opcode in each group
+PREFIXES = {'op': b'', 'cb': b'\xcb', 'ed': b'\xed', 'dd': b'\xdd', 'fd': b'\xfd', 'xycb': b'\xdd\xcb\x00'}
+
+CODE = 0x8000
+DATA = 0x9000
+STACK = 0xf000
+
+
+def run(iterations, cpu_class=Z80, groups=GROUPS):
+    """{group: {opcode: (T-states, seconds)}} per instruction
+    """
+    memory = bytearray(0x10000)
+    cpu = cpu_class(memory, Bus(lambda port: 0xff, lambda port, value: None))
+    res = {}
+    for group in groups:
+        times = {}
+        for opcode in range(0x100):
+            code = PREFIXES[group] + bytes([opcode]) + bytes(4)
+            memory[CODE:CODE + len(code)] = code
+            if hasattr(cpu, 'flush'):
+                cpu.flush()
+
+            cycles = 0
+            start = time.perf_counter()
+            for _ in range(iterations):
+                cpu.m_pc = CODE
+                cpu.m_sp = STACK
+                cpu.m_hl = cpu.m_ix = cpu.m_iy = DATA
+                cpu.m_halt = 0
+                cpu.m_icount = 0
+                cpu.execute_run()
+                cycles -= cpu.m_icount
+            elapsed = time.perf_counter() - start
+            times[opcode] = (cycles / iterations, elapsed / iterations)
+        res[group] = times
+    return res
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--iterations', type=int, default=1000,
+                        help='runs of each opcode (default: %(default)s)')
+    parser.add_argument('--group', choices=GROUPS, action='append',
+                        help='dispatch table to run, may be repeated (default: all)')
+    add_cpu_arguments(parser)
+    args = parser.parse_args()
+
+    res = run(args.iterations, cpu_class(args), args.group or GROUPS)
+    for group, times in res.items():
+        cycles = sum(cycles for cycles, _ in times.values())
+        elapsed = sum(elapsed for _, elapsed in times.values())
+        print("{:<5} {:.0f} T-states/s ({:.2f} MHz)".format(group, cycles / elapsed, cycles / elapsed / 1e6))
+        for opcode, (cycles, elapsed) in times.items():
+            print("      {:02x} {:5.1f} T-states {:8.0f}ns".format(opcode, cycles, elapsed * 1e9))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Mixed workload throughput
+
+Runs small programs for a fixed number of T-states and reports the
+emulated speed of each: a block move, which copies 16K with LDIR over
+and over, a copy loop doing the same with LDI and JP PE, and an
+arithmetic loop of 8-bit ALU operations, rotates and 16-bit adds
+around a DJNZ. benchmarks.zexall runs the instruction exerciser as
+another one.
+"""
+import argparse
+import time
+
+from benchmarks import add_cpu_arguments, cpu_class
+from z80 import Z80, Bus
+
+PROGRAMS = {
+    'block_move': bytes((
+        0x21, 0x00, 0x40,       # LD    HL,4000H
+        0x11, 0x00, 0x80,       # LD    DE,8000H
+        0x01, 0x00, 0x40,       # LD    BC,4000H
+        0xed, 0xb0,             # LDIR
+        0x18, 0xf3,             # JR    0000H
+    )),
+    'copy_loop': bytes((
+        0x21, 0x00, 0x40,       # LD    HL,4000H
+        0x11, 0x00, 0x80,       # LD    DE,8000H
+        0x01, 0x00, 0x40,       # LD    BC,4000H
+        0xed, 0xa0,             # LDI
+        0xea, 0x09, 0x00,       # JP    PE,0009H
+        0x18, 0xf0,             # JR    0000H
+    )),
+    'arithmetic': bytes((
+        0x06, 0x00,             # LD    B,0
+        0x80,                   # ADD   A,B
+        0x89,                   # ADC   A,C
+        0x92,                   # SUB   D
+        0xab,                   # XOR   E
+        0x07,                   # RLCA
+        0x0c,                   # INC   C
+        0x15,                   # DEC   D
+        0x19,                   # ADD   HL,DE
+        0x10, 0xf6,             # DJNZ  0002H
+        0x18, 0xf2,             # JR    0000H
+    )),
+}
+
+
+def run(program, cycles, slice_cycles, cpu_class=Z80):
+    memory = bytearray(0x10000)
+    memory[:len(program)] = program
+    cpu = cpu_class(memory, Bus(lambda port: 0xff, lambda port, value: None))
+    cpu.PC = 0x0000
+
+    executed = 0
+    start = time.perf_counter()
+    while executed < cycles:
+        before = cpu.m_icount
+        cpu.m_icount += slice_cycles
+        cpu.execute_run()
+        executed += before + slice_cycles - cpu.m_icount
+    elapsed = time.perf_counter() - start
+    return executed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--cycles', type=int, default=10_000_000,
+                        help='T-states to emulate per workload (default: %(default)s)')
+    parser.add_argument('--slice', type=int, default=1_000_000,
+                        help='T-states per execute_run call (default: %(default)s)')
+    parser.add_argument('--workload', choices=sorted(PROGRAMS), action='append',
+                        help='workload to run, may be repeated (default: all)')
+    add_cpu_arguments(parser)
+    args = parser.parse_args()
+
+    for name in args.workload or PROGRAMS:
+        executed, elapsed = run(PROGRAMS[name], args.cycles, args.slice, cpu_class(args))
+        print("{}: {:d} T-states in {:.3f}s: {:.0f} T-states/s ({:.2f} MHz)".format(
+            name, executed, elapsed, executed / elapsed, executed / elapsed / 1e6))
+
+
+if __name__ == '__main__':
+    main()
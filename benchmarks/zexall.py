@@ -0,0 +1,47 @@
+"""zexall throughput
+
+Runs the zexall instruction exerciser through emu.VM for a fixed number
+of T-states and reports the emulated speed. zexall.bin has to be in the
+current directory, just like for emu.py itself.
+"""
+import argparse
+import time
+
+from benchmarks import add_cpu_arguments, cpu_class
+from emu import VM
+from z80 import Z80
+
+
+def run(cycles, slice_cycles, cpu_class=Z80, direct=False):
+    vm = VM(cpu_class, direct)
+    vm.cpu.PC = 0x0100
+
+    executed = 0
+    start = time.perf_counter()
+    while not vm.finished and executed < cycles:
+        before = vm.cpu.m_icount
+        vm.run(slice_cycles)
+        executed += before + slice_cycles - vm.cpu.m_icount
+    elapsed = time.perf_counter() - start
+    return executed, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--cycles', type=int, default=20_000_000,
+                        help='T-states to emulate (default: %(default)s)')
+    parser.add_argument('--slice', type=int, default=4_000_000,
+                        help='T-states per execute_run call (default: %(default)s)')
+    add_cpu_arguments(parser)
+    parser.add_argument('--direct', action='store_true',
+                        help='let the CPU index memory directly instead of through Bus callbacks')
+    args = parser.parse_args()
+
+    executed, elapsed = run(args.cycles, args.slice, cpu_class(args), args.direct)
+    print("")
+    print("{:d} T-states in {:.3f}s: {:.0f} T-states/s ({:.2f} MHz)".format(
+        executed, elapsed, executed / elapsed, executed / elapsed / 1e6))
+
+
+if __name__ == '__main__':
+    main()
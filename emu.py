@@ -3,14 +3,18 @@ from z80 import Z80, Bus
 import time
 
 class VM:
-    def __init__(self):
+    def __init__(self, cpu_class=Z80, direct=False):
+        self.memory = bytearray([0] * 0x10000)
+
         self.mem_bus = Bus(self.mem_read, self.mem_write)
         self.io_bus = Bus(self.io_read, self.io_write)
-        self.cpu = Z80(self.mem_bus, self.io_bus)
-        self.cpu.m_opcodes = Bus(self.mem_read_op, self.mem_write)
-        self.cpu.m_args = Bus(self.mem_read_arg, self.mem_write)
-
-        self.memory = bytearray([0] * 0x10000)
+        if direct:
+            # the CPU indexes memory itself, no RD/WR debug output
+            self.cpu = cpu_class(self.memory, self.io_bus)
+        else:
+            self.cpu = cpu_class(self.mem_bus, self.io_bus)
+            self.cpu.m_opcodes = Bus(self.mem_read_op, self.mem_write)
+            self.cpu.m_args = Bus(self.mem_read_arg, self.mem_write)
 
         fh = open('zexall.bin', 'rb')
         zex = [ int(b) for b in fh.read() ]
@@ -58,44 +62,45 @@ class VM:
         self.cpu.m_icount += cycles
         self.cpu.execute_run()
 
-    def debug(self, msg):
+    def debug(self, msg, *args):
+        # formatted only when enabled, this is called on every access
         if self.enable_debug:
-            print(msg, flush=True)
+            print(msg.format(*args), flush=True)
 
     def mem_read(self, addr):
-        self.debug("RD: {:04x} {:02x}".format(addr, self.memory[addr]))
+        self.debug("RD: {:04x} {:02x}", addr, self.memory[addr])
         return self.memory[addr]
 
     def mem_read_op(self, addr):
-        self.debug("RD: {:04x} {:02x} OP".format(addr, self.memory[addr]))
+        self.debug("RD: {:04x} {:02x} OP", addr, self.memory[addr])
         return self.memory[addr]
 
     def mem_read_arg(self, addr):
-        self.debug("RD: {:04x} {:02x}   ARG".format(addr, self.memory[addr]))
+        self.debug("RD: {:04x} {:02x}   ARG", addr, self.memory[addr])
         return self.memory[addr]
 
     def mem_write(self, addr, value):
-        self.debug("                        WR: {:04x} {:02x}".format(addr, value))
+        self.debug("                        WR: {:04x} {:02x}", addr, value)
         self.memory[addr] = value
 
     def io_read(self, addr):
-        self.debug("                        IN {:04x}".format(addr))
+        self.debug("                        IN {:04x}", addr)
         self.syscall(self.cpu.C)
         return 0
 
     def io_write(self, addr, value):
-        self.debug("                        OUT {:04x} {:02x}".format(addr, value))
+        self.debug("                        OUT {:04x} {:02x}", addr, value)
         print("")
         self.finished = True
 
     def syscall(self, no):
         if no == 0x02:
             c = self.cpu.E
-            self.debug("02 {:02x}".format(c))
+            self.debug("02 {:02x}", c)
             print("{:c}".format(c), end='', flush=True)
         if no == 0x09:
             addr = self.cpu.DE
-            self.debug("09 {:04x}".format(addr))
+            self.debug("09 {:04x}", addr)
             while True:
                 c = self.memory[addr]
                 addr += 1
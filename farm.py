@@ -0,0 +1,265 @@
+"""Run many Z80 programs on a pool of worker processes
+
+Each job loads an image into a fresh 64K address space, starts it at
+its entry point and runs it until its I/O stub ends it or its cycle
+budget runs out. Every worker process builds one CPU and reuses it for
+all the jobs it is given.
+
+    python farm.py manifest.json [--workers N] [--coarse]
+
+The manifest is a JSON list of jobs, e.g.
+
+    [{"image": "zexall.bin", "load": 256, "cycles": 40000000, "io": "cpm"}]
+
+and one JSON line is printed per job as soon as it finishes.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from z80 import Z80, Bus
+from z80coarse import Z80Coarse
+
+
+class NullIO:
+    """I/O stub: reads return FF, writes are dropped
+
+    A stub is created per job and attached to the CPU and memory it
+    runs on. Subclasses append console output to self.output and call
+    exit() to end the job.
+    """
+
+    def __init__(self):
+        self.cpu = None
+        self.memory = None
+        self.output = []
+        self.finished = False
+        # T-states of the slice dropped by exit()
+        self.skipped = 0
+
+    def attach(self, cpu, memory):
+        self.cpu = cpu
+        self.memory = memory
+
+    def read(self, port):
+        return 0xff
+
+    def write(self, port, value):
+        pass
+
+    def exit(self):
+        """End the job after the current instruction
+        """
+        cpu = self.cpu
+        self.finished = True
+        if cpu.m_icount >= 0:
+            self.skipped = cpu.m_icount + 1
+            cpu.m_icount = -1
+
+
+class CPMIO(NullIO):
+    """I/O stub for CP/M programs, set up like emu.py does for zexall
+
+    CALL 5 reaches the BDOS through RST 38H and an IN, which handles
+    function 2 (print E) and 9 (print the string at DE). Jumping to 0
+    runs an OUT, which ends the job.
+    """
+
+    def attach(self, cpu, memory):
+        super().attach(cpu, memory)
+        memory[0x00:0x08] = bytes((
+            0xd3, 0x00,     # OUT   (0),A
+            0x00,
+            0x18, 0xfe,     # JR    *
+            0xff,           # RST   38H
+            0x00, 0xf0,     # initial SP
+        ))
+        memory[0x38:0x3c] = bytes((
+            0xf1,           # POP   AF
+            0xdb, 0x00,     # IN    A,(0)
+            0xc9,           # RET
+        ))
+
+    def read(self, port):
+        cpu = self.cpu
+        if cpu.C == 0x02:
+            self.output.append(chr(cpu.E))
+        elif cpu.C == 0x09:
+            memory = self.memory
+            addr = cpu.DE
+            end = memory.find(b'$', addr)
+            if end < 0:
+                end = len(memory)
+            self.output.append(memory[addr:end].decode('latin-1').replace('\r', ''))
+        return 0
+
+    def write(self, port, value):
+        self.exit()
+
+
+IO_STUBS = {
+    'null': NullIO,
+    'cpm': CPMIO,
+}
+
+
+def check_fits(image, load):
+    """Raise ValueError unless image fits in 64K when loaded at load
+    """
+    if load + len(image) > 0x10000:
+        raise ValueError('{} bytes at {:04x} run past ffff'.format(len(image), load))
+
+
+class Job:
+    """A program to run
+
+    image is the program itself, or the path of a file holding it. It
+    is loaded at load and started at pc (load by default) for at most
+    cycles T-states, with I/O going to a new instance of io. An image
+    running past FFFF is rejected with ValueError, here or, for a file,
+    when the job runs.
+    """
+
+    def __init__(self, image, load=0x0100, pc=None, cycles=10_000_000, io=NullIO, name=None):
+        if not 0 <= load <= 0xffff:
+            raise ValueError('load address {:#x} outside of 0000-ffff'.format(load))
+        if not isinstance(image, str):
+            check_fits(image, load)
+        self.image = image
+        self.load = load
+        self.pc = load if pc is None else pc
+        self.cycles = cycles
+        self.io = IO_STUBS[io] if isinstance(io, str) else io
+        self.name = name if name is not None else (image if isinstance(image, str) else None)
+
+
+class Result:
+    """What a job left behind
+
+    finished tells whether the I/O stub ended the job before its cycle
+    budget ran out; state holds the registers at that point. A job that
+    could not run has the exception in error, and no state.
+    """
+
+    def __init__(self, name, finished, cycles, state, output, error=None):
+        self.name = name
+        self.finished = finished
+        self.cycles = cycles
+        self.state = state
+        self.output = output
+        self.error = error
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'finished': self.finished,
+            'cycles': self.cycles,
+            'state': self.state,
+            'output': self.output,
+            'error': self.error,
+        }
+
+
+# T-states per execute_run() call, between checks for the end of a job
+SLICE = 1_000_000
+
+# the CPU and memory of this worker process
+_cpu = None
+_memory = None
+
+
+def _init_worker(cpu_class):
+    global _cpu, _memory
+    _memory = bytearray(0x10000)
+    _cpu = cpu_class(_memory, None)
+
+
+def cpu_state(cpu):
+    """The registers of cpu as a dict
+    """
+    return {
+        'pc': cpu.m_pc, 'sp': cpu.m_sp, 'af': cpu.AF, 'bc': cpu.m_bc, 'de': cpu.m_de,
+        'hl': cpu.m_hl, 'ix': cpu.m_ix, 'iy': cpu.m_iy, 'wz': cpu.m_wz,
+        'af2': cpu.m_af2, 'bc2': cpu.m_bc2, 'de2': cpu.m_de2, 'hl2': cpu.m_hl2,
+        'i': cpu.m_i, 'r': (cpu.m_r & 0x7f) | (cpu.m_r2 & 0x80),
+        'iff1': cpu.m_iff1, 'iff2': cpu.m_iff2, 'im': cpu.m_im, 'halt': cpu.m_halt,
+    }
+
+
+def run_job(job):
+    """Run job on the CPU of this worker process
+    """
+    cpu = _cpu
+    memory = _memory
+    image = job.image
+    if isinstance(image, str):
+        with open(image, 'rb') as fh:
+            image = fh.read()
+        check_fits(image, job.load)
+    memory[:] = bytes(0x10000)
+    memory[job.load:job.load + len(image)] = image
+
+    cpu.reset()
+    io = job.io()
+    io.attach(cpu, memory)
+    if hasattr(cpu, 'flush'):
+        cpu.flush()
+    cpu.m_io = Bus(io.read, io.write)
+    cpu.m_pc = job.pc
+
+    executed = 0
+    while not io.finished and executed < job.cycles:
+        cycles = min(SLICE, job.cycles - executed)
+        before = cpu.m_icount
+        cpu.m_icount += cycles
+        cpu.execute_run()
+        executed += before + cycles - cpu.m_icount
+    executed -= io.skipped
+    return Result(job.name, io.finished, executed, cpu_state(cpu), ''.join(io.output))
+
+
+def run(jobs, workers=None, cpu_class=Z80):
+    """Run jobs on a pool of worker processes
+
+    Yields (index, result) pairs in the order the jobs finish. A job
+    that raises gets a Result with the error, the others run on.
+    """
+    with ProcessPoolExecutor(workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(cpu_class,)) as executor:
+        futures = {executor.submit(run_job, job): (index, job) for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index, job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = Result(job.name, False, 0, None, '', '{}: {}'.format(type(e).__name__, e))
+            yield index, result
+
+
+def load_manifest(path):
+    """Jobs of a JSON manifest; image paths are relative to it
+    """
+    with open(path) as fh:
+        entries = json.load(fh)
+    base = os.path.dirname(path)
+    return [Job(os.path.join(base, entry.pop('image')), **entry) for entry in entries]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('manifest', help='JSON list of jobs')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per CPU)')
+    parser.add_argument('--coarse', action='store_true',
+                        help='use Z80Coarse, which charges cycles per instruction')
+    args = parser.parse_args()
+
+    jobs = load_manifest(args.manifest)
+    cpu_class = Z80Coarse if args.coarse else Z80
+    for index, result in run(jobs, args.workers, cpu_class):
+        print(json.dumps(dict(result.as_dict(), job=index)), flush=True)
+
+
+if __name__ == '__main__':
+    main()
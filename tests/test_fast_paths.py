@@ -0,0 +1,363 @@
+"""Differential tests of the fast paths of Z80 against single iterations
+
+Z80 runs block instructions and idle loops many iterations at a time.
+Slow turns all of these fast paths off, so that every iteration goes
+through the interpreter, and Fast counts the calls that did run some.
+Both must end every time slice in the same state, with the same memory
+and the same memory handler and I/O accesses.
+
+    python -m unittest discover tests
+"""
+import collections
+import itertools
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from z80 import Z80, Bus
+
+
+class Slow(Z80):
+    """Z80 running every iteration through the interpreter
+    """
+
+    def block_copy(self, opcode, step):
+        pass
+
+    def block_search(self, opcode, step):
+        pass
+
+    def block_io(self, opcode, step):
+        pass
+
+    def skip_idle(self):
+        pass
+
+    def skip_halt(self):
+        pass
+
+
+def counted(name):
+    method = getattr(Z80, name)
+
+    def run(self, *args):
+        icount = self.m_icount
+        method(self, *args)
+        if self.m_icount != icount:
+            self.hits[name] += 1
+    return run
+
+
+class Fast(Z80):
+    """Z80 counting, in hits, the calls of each fast path that ran
+    some iterations
+    """
+
+    def __init__(self, mem_bus, io_bus):
+        super().__init__(mem_bus, io_bus)
+        self.hits = collections.Counter()
+
+    block_copy = counted('block_copy')
+    block_search = counted('block_search')
+    block_io = counted('block_io')
+    skip_idle = counted('skip_idle')
+    skip_halt = counted('skip_halt')
+
+
+class Machine:
+    """A CPU on its own copy of memory, logging the accesses to memory
+    handler pages and I/O ports
+
+    Port reads return the values of inputs, the same random sequence
+    on every machine unless replaced. The block callbacks log and
+    return the same as the single byte ones would, a byte at a time,
+    with B counting down.
+    """
+
+    def __init__(self, cpu_class, memory):
+        self.memory = bytearray(memory)
+        self.log = []
+        rng = random.Random(0)
+        self.inputs = (rng.randrange(256) for _ in itertools.count())
+        self.cpu = cpu_class(self.memory, Bus(self.io_read, self.io_write,
+                                              self.read_block, self.write_block))
+        self.cpu.m_irq_vector = lambda: 0xff
+
+    def read(self, addr):
+        self.log.append(('r', addr, self.cpu.m_icount))
+        return self.memory[addr]
+
+    def write(self, addr, value):
+        self.log.append(('w', addr, value, self.cpu.m_icount))
+        self.memory[addr] = value
+
+    def io_read(self, port):
+        value = next(self.inputs)
+        self.log.append(('i', port, value))
+        return value
+
+    def io_write(self, port, value):
+        self.log.append(('o', port, value))
+
+    def read_block(self, port, count):
+        return bytes(self.io_read((port - (n << 8)) & 0xffff) for n in range(count))
+
+    def write_block(self, port, data):
+        for n, value in enumerate(data):
+            self.io_write((port - (n << 8)) & 0xffff, value)
+
+
+def image(seed, code):
+    """64K of random bytes with code, a dict of address: bytes, on top
+    """
+    rng = random.Random(seed)
+    memory = bytearray(rng.randrange(256) for _ in range(0x10000))
+    for addr, data in code.items():
+        memory[addr:addr + len(data)] = data
+    return memory
+
+
+class FastPathTest(unittest.TestCase):
+
+    def compare(self, memory, regs, slices, setup=None, events=None):
+        """Run memory on Slow and Fast from regs, a time slice of each
+        of the given T-states at a time
+
+        setup(machine) is called once, and events(cpu, step) before
+        each slice. Returns the hits of Fast.
+        """
+        machines = [Machine(cpu_class, memory) for cpu_class in (Slow, Fast)]
+        for machine in machines:
+            if setup is not None:
+                setup(machine)
+            for name, value in regs.items():
+                setattr(machine.cpu, 'm_' + name, value)
+        slow, fast = machines
+        for step, cycles in enumerate(slices):
+            for machine in machines:
+                if events is not None:
+                    events(machine.cpu, step)
+                machine.cpu.m_icount += cycles
+                machine.cpu.execute_run()
+
+            where = 'step {} pc {:04x}'.format(step, slow.cpu.m_pc)
+            # the T-states Fast skipped are counted in m_idle_cycles only
+            idle = fast.cpu.m_idle_cycles
+            fast.cpu.m_idle_cycles = 0
+            self.assertEqual(slow.cpu.save_state(), fast.cpu.save_state(), where)
+            fast.cpu.m_idle_cycles = idle
+            self.assertEqual(slow.log, fast.log, where)
+            self.assertEqual(slow.memory, fast.memory, where)
+        return fast.cpu.hits
+
+    @staticmethod
+    def slices(seed, count):
+        rng = random.Random(seed)
+        return [rng.choice((1, 17, 21, 50, 333, 1000, 5000)) for _ in range(count)]
+
+    def test_block_copy_overlapping(self):
+        # copies onto their own source, a few bytes ahead or behind,
+        # across page boundaries and past FFFF
+        hits = collections.Counter()
+        for opcode in (0xb0, 0xb8):
+            for dist in (-3, -2, -1, 1, 2, 3, 255, 256, 257):
+                for src in (0x3ff0, 0xff80, 0x0040):
+                    seed = opcode * 1000 + dist * 10 + (src >> 12)
+                    memory = image(seed, {0x1000: bytes((0xed, opcode, 0x76))})
+                    regs = {'pc': 0x1000, 'hl': src, 'de': (src + dist) & 0xffff, 'bc': 700}
+                    hits += self.compare(memory, regs, self.slices(seed, 30))
+        self.assertGreater(hits['block_copy'], 0)
+
+    def test_block_copy_over_itself(self):
+        # the copy reaches the LDIR/LDDR and goes on with whatever it
+        # turned into
+        hits = collections.Counter()
+        for opcode, de in ((0xb0, 0x0f00), (0xb0, 0x0fff), (0xb0, 0x1001),
+                           (0xb8, 0x1100), (0xb8, 0x1001), (0xb8, 0x1000)):
+            for seed in range(4):
+                memory = image(seed, {0x1000: bytes((0xed, opcode))})
+                regs = {'pc': 0x1000, 'hl': 0x6000, 'de': de, 'bc': 0x300}
+                hits += self.compare(memory, regs, self.slices(seed, 30))
+        self.assertGreater(hits['block_copy'], 0)
+
+    def test_block_copy_mapped(self):
+        # through a page mapped twice onto the same buffer, onto a
+        # handler page, and with interrupts coming in
+        def setup(machine):
+            machine.cpu.map_ram(0x8000, 0x8fff, machine.memory, 0x2008)
+            machine.cpu.map_handler(0x4000, 0x40ff, machine.read, machine.write)
+
+        def events(cpu, step):
+            if step % 5 == 2:
+                cpu.execute_set_input(Z80.INPUT_LINE_IRQ0, step % 2)
+            if step == 11:
+                cpu.execute_set_input(Z80.INPUT_LINE_NMI, Z80.ASSERT_LINE)
+                cpu.execute_set_input(Z80.INPUT_LINE_NMI, Z80.CLEAR_LINE)
+
+        hits = collections.Counter()
+        for opcode in (0xb0, 0xb8):
+            for hl, de in ((0x2000, 0x8000), (0x8000, 0x2000), (0x3f00, 0x3fa0), (0x4080, 0x5000)):
+                seed = opcode + hl + de
+                memory = image(seed, {0x1000: bytes((0xed, opcode, 0x76)),
+                                      0x0038: bytes((0xfb, 0xc9)),      # EI, RET
+                                      0x0066: bytes((0xed, 0x45))})     # RETN
+                regs = {'pc': 0x1000, 'sp': 0xf000, 'hl': hl, 'de': de, 'bc': 0x280,
+                        'iff1': 1, 'iff2': 1, 'im': 1}
+                hits += self.compare(memory, regs, self.slices(seed, 30), setup, events)
+        self.assertGreater(hits['block_copy'], 0)
+
+    def test_block_search_wrapping(self):
+        # CPIR/CPDR over FFFF/0000, finding A on the other side, past
+        # the end of BC, or not at all, with BC = 0 searching 64K
+        hits = collections.Counter()
+        for opcode, hl in ((0xb1, 0xff80), (0xb1, 0xffff), (0xb9, 0x0080), (0xb9, 0x0000)):
+            for bc, found in ((0x200, 0x30), (0x200, 0x1f0), (0x100, 0x100), (0x0000, None)):
+                seed = opcode + hl + bc + (found or 0)
+                memory = image(seed, {0x1000: bytes((0xed, opcode, 0x76))})
+                step = 1 if opcode == 0xb1 else -1
+                for n in range(0x400):
+                    addr = (hl + step * n) & 0xffff
+                    memory[addr] = 0x55 if n == found else (addr * 7) % 0x55
+                memory[0x1000:0x1003] = bytes((0xed, opcode, 0x76))
+                regs = {'pc': 0x1000, 'hl': hl, 'bc': bc, 'a': 0x55, 'f': seed & 0xff}
+                hits += self.compare(memory, regs, self.slices(seed, 40))
+        self.assertGreater(hits['block_search'], 0)
+
+    def test_block_search_handlers(self):
+        # searches stop at handler pages, and leave them to single
+        # iterations
+        def setup(machine):
+            machine.cpu.map_handler(0x4000, 0x40ff, machine.read, machine.write)
+
+        hits = collections.Counter()
+        for opcode, hl in ((0xb1, 0x3f80), (0xb9, 0x4180)):
+            for seed in range(3):
+                memory = image(seed, {0x1000: bytes((0xed, opcode, 0x76))})
+                regs = {'pc': 0x1000, 'hl': hl, 'bc': 0x300, 'a': memory[0x4120]}
+                hits += self.compare(memory, regs, self.slices(seed, 30), setup)
+        self.assertGreater(hits['block_search'], 0)
+
+    def test_block_io_over_itself(self):
+        # the first INIR iteration turns ED B2 76 into ED 00 76, which
+        # runs on as ED 00 (a NOP) and HALT
+        def setup(machine):
+            machine.inputs = itertools.repeat(0)
+
+        memory = image(0, {0x0100: bytes((0xed, 0xb2, 0x76))})
+        regs = {'pc': 0x0100, 'hl': 0x0101, 'bc': 0x0510}
+        self.compare(memory, regs, [100], setup)
+        machine = Machine(Z80, memory)
+        setup(machine)
+        for name, value in regs.items():
+            setattr(machine.cpu, 'm_' + name, value)
+        machine.cpu.m_icount += 100
+        machine.cpu.execute_run()
+        self.assertEqual((machine.cpu.m_pc, machine.cpu.m_hl, machine.cpu.m_bc >> 8), (0x0103, 0x0102, 4))
+        self.assertEqual([entry[0] for entry in machine.log], ['i'])
+
+    def test_block_io(self):
+        # INIR/INDR/OTIR/OTDR across pages and FFFF, writing over the
+        # instruction at any point, or into a handler page
+        def setup(machine):
+            machine.cpu.map_handler(0x4000, 0x40ff, machine.read, machine.write)
+
+        hits = collections.Counter()
+        for opcode in (0xb2, 0xba, 0xb3, 0xbb):
+            step = -1 if opcode & 0x08 else 1
+            for hl in (0x2080, 0xffc0, 0x0fe0, 0x0ff0 + 0x18 * step, 0x1000, 0x1001, 0x1002, 0x3fc0):
+                for b in (0, 1, 0x30, 0x90):
+                    seed = opcode + hl + b
+                    memory = image(seed, {0x1000: bytes((0xed, opcode, 0x76))})
+                    regs = {'pc': 0x1000, 'hl': hl, 'bc': (b << 8) | 0x10}
+                    hits += self.compare(memory, regs, self.slices(seed, 20), setup)
+        self.assertGreater(hits['block_io'], 0)
+
+    def test_halt(self):
+        # HALT in RAM, in a handler page, where each NOP it runs is a
+        # fetch the device sees, and with the opcodes fetched through
+        # m_opcodes, until interrupts come in
+        def events(cpu, step):
+            if step == 7:
+                cpu.execute_set_input(Z80.INPUT_LINE_IRQ0, Z80.ASSERT_LINE)
+            if step == 9:
+                cpu.execute_set_input(Z80.INPUT_LINE_IRQ0, Z80.CLEAR_LINE)
+            if step == 14:
+                cpu.execute_set_input(Z80.INPUT_LINE_NMI, Z80.ASSERT_LINE)
+                cpu.execute_set_input(Z80.INPUT_LINE_NMI, Z80.CLEAR_LINE)
+
+        def handlers(machine):
+            machine.cpu.map_handler(0x4000, 0x40ff, machine.read, machine.write)
+
+        def opcodes(machine):
+            machine.cpu.m_opcodes = Bus(machine.read, machine.write)
+
+        hits = collections.Counter()
+        for pc, setup in ((0x1000, None), (0x4000, handlers), (0x1000, opcodes)):
+            for seed in range(3):
+                memory = image(seed, {pc: bytes((0x00, 0x76, 0x18, 0xfc)),    # NOP, HALT, JR -4
+                                      0x0038: bytes((0xfb, 0xc9)),            # EI, RET
+                                      0x0066: bytes((0xed, 0x45))})           # RETN
+                regs = {'pc': pc, 'sp': 0xf000, 'iff1': 1, 'iff2': 1, 'im': 1}
+                hits += self.compare(memory, regs, self.slices(seed, 20), setup, events)
+        self.assertGreater(hits['skip_halt'], 0)
+
+    def test_idle_loops(self):
+        # JR $, JR cc,$, JP $, JP cc,$ and DJNZ $ (on to a HALT), after
+        # an EI or not, with an IRQ held that can or cannot be taken,
+        # IRQs and NMIs coming in, and IM 2
+        loops = (
+            bytes((0x18, 0xfe)),
+            bytes((0x20, 0xfe)),
+            bytes((0x38, 0xfe)),
+            bytes((0xc3, 0x00, 0x10)),
+            bytes((0xca, 0x00, 0x10)),
+            bytes((0x10, 0xfe, 0x76, 0x18, 0xfd)),
+        )
+
+        def events(cpu, step):
+            if step % 6 == 4:
+                cpu.execute_set_input(Z80.INPUT_LINE_IRQ0, (step // 6) % 2)
+            if step == 17:
+                cpu.execute_set_input(Z80.INPUT_LINE_NMI, Z80.ASSERT_LINE)
+                cpu.execute_set_input(Z80.INPUT_LINE_NMI, Z80.CLEAR_LINE)
+
+        hits = collections.Counter()
+        for n, loop in enumerate(loops):
+            for iff, irq, im, ei in ((0, 1, 1, False), (1, 0, 1, False), (1, 1, 2, False),
+                                     (0, 0, 1, True), (0, 1, 2, True)):
+                for b in (0, 1, 2, 0x40):
+                    seed = n * 100 + iff * 8 + irq * 4 + im + ei * 16 + b
+                    memory = image(seed, {0x0fff: bytes((0xfb if ei else 0x00,)) + loop,
+                                          0x0038: bytes((0xfb, 0xc9)),          # EI, RET
+                                          0x0066: bytes((0xed, 0x45)),          # RETN
+                                          0x20ff: bytes((0x38, 0x00))})         # IM 2 vector
+                    regs = {'pc': 0x0fff, 'sp': 0xf000, 'bc': (b << 8) | 0x34, 'f': seed & 0xff,
+                            'iff1': iff, 'iff2': iff, 'im': im, 'i': 0x20, 'irq_state': irq}
+                    hits += self.compare(memory, regs, self.slices(seed, 30), events=events)
+        self.assertGreater(hits['skip_idle'], 0)
+
+    def test_idle_loops_fetched(self):
+        # loops in a handler page, with their operand in one, or fetched
+        # through m_opcodes and m_args, must run every iteration
+        def handlers(machine):
+            machine.cpu.map_handler(0x1100, 0x11ff, machine.read, machine.write)
+
+        def buses(machine):
+            machine.cpu.m_opcodes = Bus(machine.read, machine.write)
+            machine.cpu.m_args = Bus(machine.read, machine.write)
+
+        hits = collections.Counter()
+        for pc, setup in ((0x1100, handlers), (0x10ff, handlers), (0x10fe, handlers), (0x1000, buses)):
+            for loop in (bytes((0x18, 0xfe)), bytes((0x10, 0xfe, 0x18, 0xfe)),
+                         bytes((0xc3, pc & 0xff, pc >> 8))):
+                memory = image(pc, {pc: loop})
+                regs = {'pc': pc, 'bc': 0x2000}
+                hits += self.compare(memory, regs, self.slices(pc, 10), setup)
+        self.assertEqual(hits['skip_idle'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
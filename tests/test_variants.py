@@ -0,0 +1,268 @@
+"""Differential tests of the Z80 variants against Z80
+
+Random programs run on Z80 and on a variant side by side, a time slice
+at a time, with some memory mapped to handlers and interrupts coming
+in. After every slice the complete state from save_state(), the memory
+and the log of memory handler and I/O accesses must be the same.
+Z80Batch runs its instances next to a Z80 each, an instruction at a
+time, when NumPy is installed.
+
+    python -m unittest discover tests
+"""
+import inspect
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from z80 import Z80, Bus
+from z80jit import Z80JIT
+from z80predecode import Z80Predecode
+
+try:
+    import numpy as np
+    from z80batch import Z80Batch
+except ImportError:
+    np = Z80Batch = None
+
+
+class Machine:
+    """A CPU on its own copy of memory, logging the accesses to memory
+    handler pages and I/O ports with the cycle count they happen at
+    """
+
+    def __init__(self, cpu_class, memory, seed, handlers):
+        self.memory = bytearray(memory)
+        self.log = []
+        self.io_rng = random.Random(seed)
+        self.cpu = cpu_class(self.memory, Bus(self.io_read, self.io_write))
+        if handlers:
+            self.cpu.map_handler(0x8000, 0xbfff, self.read, self.write)
+        self.cpu.m_irq_vector = lambda: 0xff
+
+    def read(self, addr):
+        self.log.append(('r', addr, self.cpu.m_icount))
+        return self.memory[addr]
+
+    def write(self, addr, value):
+        self.log.append(('w', addr, value, self.cpu.m_icount))
+        self.memory[addr] = value
+
+    def io_read(self, port):
+        value = self.io_rng.randrange(256)
+        self.log.append(('i', port, value, self.cpu.m_icount))
+        return value
+
+    def io_write(self, port, value):
+        self.log.append(('o', port, value, self.cpu.m_icount))
+
+
+def program(rng):
+    """64K of random code with short loops, so that code runs repeatedly
+    """
+    memory = bytearray(rng.randrange(256) for _ in range(0x10000))
+    for _ in range(3000):
+        addr = rng.randrange(0x10000 - 2)
+        memory[addr:addr + 2] = bytes((rng.choice((0x10, 0x18, 0x20, 0x28)), rng.randrange(0xe0, 0x100)))
+    return memory
+
+
+def randomize(cpu, rng):
+    """Random registers, the same for the same rng
+    """
+    for name in ('m_pc', 'm_sp', 'm_bc', 'm_de', 'm_hl', 'm_ix', 'm_iy', 'm_wz',
+                 'm_af2', 'm_bc2', 'm_de2', 'm_hl2'):
+        setattr(cpu, name, rng.randrange(0x10000))
+    cpu.m_a = rng.randrange(256)
+    cpu.m_f = rng.randrange(256)
+    cpu.m_i = rng.randrange(256)
+    cpu.m_r = rng.randrange(128)
+    cpu.m_r2 = rng.randrange(2) * 0x80
+    cpu.m_im = rng.choice((0, 1, 2))
+
+
+class VariantTest:
+    """Runs random programs on Z80 and cpu_class
+
+    timing tells whether memory handlers and I/O see the accesses at
+    the same m_icount with both; otherwise they are compared without
+    the cycle count. m_icount is the same at the end of every time
+    slice either way.
+    """
+    cpu_class = None
+    timing = True
+
+    def compare(self, seeds, steps, budget, handlers=False, irq=False, writes=False, pc=None):
+        for seed in seeds:
+            rng = random.Random(seed)
+            memory = program(rng)
+            machines = [Machine(cpu_class, memory, seed, handlers) for cpu_class in (Z80, self.cpu_class)]
+            for machine in machines:
+                randomize(machine.cpu, random.Random(seed + 1))
+                if pc is not None:
+                    machine.cpu.m_pc = pc
+                if irq:
+                    machine.cpu.m_iff1 = machine.cpu.m_iff2 = 1
+            for step in range(steps):
+                for machine in machines:
+                    cpu = machine.cpu
+                    if irq and step % 7 == 3:
+                        cpu.execute_set_input(Z80.INPUT_LINE_IRQ0, step % 2)
+                    if irq and step % 97 == 50:
+                        cpu.execute_set_input(Z80.INPUT_LINE_NMI, Z80.ASSERT_LINE)
+                        cpu.execute_set_input(Z80.INPUT_LINE_NMI, Z80.CLEAR_LINE)
+                    if writes and step % 13 == 5:
+                        # the host writing behind the CPU's back
+                        addr = (seed * 7919 + step * 104729) & 0xffff
+                        cpu.write_mem(addr, step & 0xff)
+                        if hasattr(cpu, 'invalidate'):
+                            cpu.invalidate(addr)
+                    cpu.m_icount += budget
+                    cpu.execute_run()
+
+                ref, new = machines
+                if not self.timing:
+                    for machine in machines:
+                        machine.log = [entry[:-1] for entry in machine.log]
+                where = 'seed {} step {} pc {:04x}'.format(seed, step, ref.cpu.m_pc)
+                self.assertEqual(ref.cpu.save_state(), new.cpu.save_state(), where)
+                self.assertEqual(ref.log, new.log, where)
+                self.assertEqual(ref.memory, new.memory, where)
+                ref.log.clear()
+                new.log.clear()
+
+    def test_single_instructions(self):
+        self.compare(range(4), 1000, 1)
+
+    def test_slices(self):
+        self.compare(range(100, 104), 200, 300)
+
+    def test_handlers(self):
+        self.compare(range(200, 204), 200, 200, handlers=True)
+
+    def test_interrupts(self):
+        self.compare(range(300, 304), 200, 97, handlers=True, irq=True)
+
+    def test_host_writes(self):
+        self.compare(range(400, 404), 200, 151, handlers=True, irq=True, writes=True)
+
+
+class TestZ80JIT(VariantTest, unittest.TestCase):
+    cpu_class = Z80JIT
+    # translated blocks charge their cycles once, at the end
+    timing = False
+
+    def test_code_in_handlers(self):
+        # code in handler pages is fetched through the handlers every
+        # time it runs, and never translated
+        self.compare(range(500, 504), 200, 200, handlers=True, pc=0x8000)
+
+
+class TestZ80Predecode(VariantTest, unittest.TestCase):
+    cpu_class = Z80Predecode
+
+    def test_handlers_predecoded(self):
+        Z80Predecode.initialize_dispatch()
+        # prefixes and prefix chains are left to the interpreter
+        self.assertEqual([opcode for opcode, entry in enumerate(Z80Predecode.pre_op) if entry is None],
+                         [0xcb, 0xdd, 0xed, 0xfd])
+        self.assertNotIn(None, Z80Predecode.pre_cb)
+        self.assertNotIn(None, Z80Predecode.pre_ed)
+        # DD CB d op and FD CB d op are decoded through pre_xycb_ix/iy
+        for group in ('dd', 'fd'):
+            for opcode, entry in enumerate(getattr(Z80Predecode, 'pre_' + group)):
+                chain = opcode == 0xcb or \
+                    'op_illegal_1' in inspect.getsource(getattr(Z80, 'op_{}_{:02x}'.format(group, opcode)))
+                self.assertEqual(entry is None, chain, '{} {:02x}'.format(group, opcode))
+
+
+@unittest.skipIf(Z80Batch is None, 'needs NumPy')
+class TestZ80Batch(unittest.TestCase):
+    """Runs random programs on Z80Batch and on a Z80 per instance
+
+    Registers, memory, m_cycles and I/O must be the same after every
+    few steps.
+    """
+
+    REGISTERS = ('m_pc', 'm_sp', 'm_a', 'm_f', 'm_bc', 'm_de', 'm_hl', 'm_ix', 'm_iy', 'm_wz',
+                 'm_af2', 'm_bc2', 'm_de2', 'm_hl2', 'm_r', 'm_r2', 'm_iff1', 'm_iff2',
+                 'm_halt', 'm_im', 'm_i')
+
+    @staticmethod
+    def io_read(n, port):
+        return (n * 31 + port * 7) & 0xff
+
+    def compare(self, seed, count, steps, code, pc=None):
+        rng = random.Random(seed)
+        written = ([], [])
+        batch = Z80Batch(count, self.io_read, lambda n, port, value: written[0].append((n, port, value)))
+        cpus = []
+        for n in range(count):
+            memory = code(rng)
+            cpu = Z80(memory, Bus(lambda port, n=n: self.io_read(n, port),
+                                  lambda port, value, n=n: written[1].append((n, port, value))))
+            randomize(cpu, rng)
+            if pc is not None:
+                cpu.m_pc = pc
+            batch.m_mem[n] = np.frombuffer(memory, np.uint8)
+            batch.load(n, cpu)
+            cpus.append(cpu)
+
+        cycles = [0] * count
+        state = Z80(bytearray(0x10000), None)
+        for step in range(steps):
+            batch.step()
+            for n, cpu in enumerate(cpus):
+                # one instruction, too short for any fast path
+                cpu.m_icount = 0
+                cpu.execute_run()
+                cycles[n] -= cpu.m_icount
+            if step % 25 == 24 or step == steps - 1:
+                for n, cpu in enumerate(cpus):
+                    where = 'seed {} step {} instance {}'.format(seed, step, n)
+                    batch.store(n, state)
+                    self.assertEqual([getattr(cpu, name) for name in self.REGISTERS],
+                                     [getattr(state, name) for name in self.REGISTERS], where)
+                    self.assertEqual(cycles[n], batch.m_cycles[n], where)
+                    self.assertEqual(bytes(batch.m_mem[n]), bytes(cpu.m_page_origins[0][0]), where)
+                self.assertEqual(written[0], written[1], 'seed {} step {}'.format(seed, step))
+
+    def test_random_code(self):
+        # every opcode, mostly run by the fallback Z80
+        for seed in range(3):
+            self.compare(seed, 64, 300, lambda rng: bytearray(rng.randbytes(0x10000)))
+
+    def test_prefixed_code(self):
+        # CB, DD and FD instructions, vectorized or not, between
+        # unprefixed ones
+        common = [op for op in range(0x100) if Z80Batch.FAMILY[op] > Z80Batch.HALTED and op != 0x76]
+        xy = [op for op in range(0x100) if Z80Batch.XY_FAMILY[op]]
+
+        def code(rng):
+            memory = bytearray(rng.randbytes(0x10000))
+            pc = 0x1000
+            for _ in range(600):
+                kind = rng.random()
+                if kind < 0.35:
+                    data = [rng.choice(common)]
+                elif kind < 0.7:
+                    data = [rng.choice((0xdd, 0xfd)), rng.choice(xy), rng.randrange(256), rng.randrange(256)]
+                elif kind < 0.8:
+                    data = [rng.choice((0xdd, 0xfd)), rng.randrange(256), rng.randrange(256), rng.randrange(256)]
+                elif kind < 0.95:
+                    data = [0xcb, rng.randrange(256)]
+                else:
+                    data = [0xed, rng.randrange(256)]
+                for value in data:
+                    memory[pc] = value
+                    pc = (pc + 1) & 0xffff
+            return memory
+
+        for seed in range(10, 13):
+            self.compare(seed, 64, 300, code, 0x1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,26 @@
-class Pair:
-    def __init__(self, value = 0):
-        self.w = value
-    @property
-    def w(self):
-        return self.h << 8 | self.l
-    @w.setter
-    def w(self, value):
-        self.h = (value >> 8) & 0xff
-        self.l = value & 0xff
+import struct
+
 
 class Bus:
-    def __init__(self, read, write):
+    def __init__(self, read, write, read_block=None, write_block=None):
         self.read = read
         self.write = write
+        self.read_block = read_block
+        self.write_block = write_block
+
+
+class Snapshot:
+    """A checkpoint taken by Z80.snapshot()
+
+    state is the save_state() of the CPU; pages maps the number of each
+    page written since the parent snapshot to its contents. The first
+    snapshot of a CPU has no parent and holds every page.
+    """
+
+    def __init__(self, parent, state, pages):
+        self.parent = parent
+        self.state = state
+        self.pages = pages
 
 
 class Z80:
@@ -29,6 +37,21 @@ class Z80:
     copyright-holders:Juergen Buchmueller
     """
 
+    # Register file: the 16-bit pairs are kept as plain ints and the 8-bit
+    # halves are derived with shifts only when an instruction needs them.
+    # A and F are kept apart since nearly every ALU operation touches them.
+    __slots__ = (
+        'm_pc', 'm_sp', 'm_a', 'm_f', 'm_bc', 'm_de', 'm_hl', 'm_ix', 'm_iy', 'm_wz',
+        'm_af2', 'm_bc2', 'm_de2', 'm_hl2',
+        'm_r', 'm_r2', 'm_iff1', 'm_iff2', 'm_halt', 'm_im', 'm_i',
+        'm_nmi_state', 'm_nmi_pending', 'm_irq_state', 'm_wait_state', 'm_busrq_state',
+        'm_after_ei', 'm_after_ldair', 'm_ea',
+        'm_icount', 'm_icount_executing', 'm_idle_cycles', 'MTM',
+        'm_read_map', 'm_write_map', 'm_read_handlers', 'm_write_handlers', 'm_page_origins',
+        'm_opcodes', 'm_args', 'm_io', 'm_irq_vector', 'm_enable_debug',
+        'm_dirty', 'm_tracked_pages', 'm_snapshot',
+    )
+
     # The Z80 registers. halt is set to 1 when the CPU is halted, the refresh
     # register is calculated as follows: refresh=(r&127)|(r2&128)
     CF = 0x01
@@ -41,6 +64,12 @@ class Z80:
     ZF = 0x40
     SF = 0x80
 
+    # save_state(): magic, version, 16-bit registers, 8-bit registers,
+    # interrupt and line state, EA and the cycle counters
+    STATE_MAGIC = b'Z80S'
+    STATE_VERSION = 1
+    STATE = struct.Struct('<4sB' 'HHBBHHHHHHHHHH' 'BBBBBBB' 'BBBBBBBH' 'qqq')
+
     tables_initialized = False
     SZ = bytearray([0] * 256)       # zero and sign flags
     SZ_BIT = bytearray([0] *256)    # zero, sign and parity/overflow (=zero) flags for BIT opcode
@@ -183,176 +212,206 @@ class Z80:
 
     @property
     def PC(self):
-        return self.m_pc.w
+        return self.m_pc
     @PC.setter
     def PC(self, value):
-        self.m_pc.w = value
+        self.m_pc = value & 0xffff
     @property
     def SP(self):
-        return self.m_sp.w
+        return self.m_sp
     @SP.setter
     def SP(self, value):
-        self.m_sp.w = value
+        self.m_sp = value & 0xffff
 
     @property
     def AF(self):
-        return self.m_af.w
+        return (self.m_a << 8) | self.m_f
     @AF.setter
     def AF(self, value):
-        self.m_af.w = value
+        self.m_a = (value >> 8) & 0xff
+        self.m_f = value & 0xff
     @property
     def A(self):
-        return self.m_af.h
+        return self.m_a
     @A.setter
     def A(self, value):
-        self.m_af.h = value
+        self.m_a = value & 0xff
     @property
     def F(self):
-        return self.m_af.l
+        return self.m_f
     @F.setter
     def F(self, value):
-        self.m_af.l = value
+        self.m_f = value & 0xff
 
     @property
     def BC(self):
-        return self.m_bc.w
+        return self.m_bc
     @BC.setter
     def BC(self, value):
-        self.m_bc.w = value
+        self.m_bc = value & 0xffff
     @property
     def B(self):
-        return self.m_bc.h
+        return self.m_bc >> 8
     @B.setter
     def B(self, value):
-        self.m_bc.h = value
+        self.m_bc = ((value & 0xff) << 8) | (self.m_bc & 0xff)
     @property
     def C(self):
-        return self.m_bc.l
+        return self.m_bc & 0xff
     @C.setter
     def C(self, value):
-        self.m_bc.l = value
+        self.m_bc = (self.m_bc & 0xff00) | (value & 0xff)
 
     @property
     def DE(self):
-        return self.m_de.w
+        return self.m_de
     @DE.setter
     def DE(self, value):
-        self.m_de.w = value
+        self.m_de = value & 0xffff
     @property
     def D(self):
-        return self.m_de.h
+        return self.m_de >> 8
     @D.setter
     def D(self, value):
-        self.m_de.h = value
+        self.m_de = ((value & 0xff) << 8) | (self.m_de & 0xff)
     @property
     def E(self):
-        return self.m_de.l
+        return self.m_de & 0xff
     @E.setter
     def E(self, value):
-        self.m_de.l = value
+        self.m_de = (self.m_de & 0xff00) | (value & 0xff)
 
     @property
     def HL(self):
-        return self.m_hl.w
+        return self.m_hl
     @HL.setter
     def HL(self, value):
-        self.m_hl.w = value
+        self.m_hl = value & 0xffff
     @property
     def H(self):
-        return self.m_hl.h
+        return self.m_hl >> 8
     @H.setter
     def H(self, value):
-        self.m_hl.h = value
+        self.m_hl = ((value & 0xff) << 8) | (self.m_hl & 0xff)
     @property
     def L(self):
-        return self.m_hl.l
+        return self.m_hl & 0xff
     @L.setter
     def L(self, value):
-        self.m_hl.l = value
+        self.m_hl = (self.m_hl & 0xff00) | (value & 0xff)
 
     @property
     def IX(self):
-        return self.m_ix.w
+        return self.m_ix
     @IX.setter
     def IX(self, value):
-        self.m_ix.w = value
+        self.m_ix = value & 0xffff
     @property
     def HX(self):
-        return self.m_ix.h
+        return self.m_ix >> 8
     @HX.setter
     def HX(self, value):
-        self.m_ix.h = value
+        self.m_ix = ((value & 0xff) << 8) | (self.m_ix & 0xff)
     @property
     def LX(self):
-        return self.m_ix.l
+        return self.m_ix & 0xff
     @LX.setter
     def LX(self, value):
-        self.m_ix.l = value
+        self.m_ix = (self.m_ix & 0xff00) | (value & 0xff)
 
     @property
     def IY(self):
-        return self.m_iy.w
+        return self.m_iy
     @IY.setter
     def IY(self, value):
-        self.m_iy.w = value
+        self.m_iy = value & 0xffff
     @property
     def HY(self):
-        return self.m_iy.h
+        return self.m_iy >> 8
     @HY.setter
     def HY(self, value):
-        self.m_iy.h = value
+        self.m_iy = ((value & 0xff) << 8) | (self.m_iy & 0xff)
     @property
     def LY(self):
-        return self.m_iy.l
+        return self.m_iy & 0xff
     @LY.setter
     def LY(self, value):
-        self.m_iy.l = value
+        self.m_iy = (self.m_iy & 0xff00) | (value & 0xff)
 
     @property
     def WZ(self):
-        return self.m_wz.w
+        return self.m_wz
     @WZ.setter
     def WZ(self, value):
-        self.m_wz.w = value
+        self.m_wz = value & 0xffff
     @property
     def WZ_H(self):
-        return self.m_wz.h
+        return self.m_wz >> 8
     @WZ_H.setter
     def WZ_H(self, value):
-        self.m_wz.h = value
+        self.m_wz = ((value & 0xff) << 8) | (self.m_wz & 0xff)
     @property
     def WZ_L(self):
-        return self.m_wz.l
+        return self.m_wz & 0xff
     @WZ_L.setter
     def WZ_L(self, value):
-        self.m_wz.l = value
+        self.m_wz = (self.m_wz & 0xff00) | (value & 0xff)
 
     def __init__(self, mem_bus, io_bus):
         self.initialize_tables()
 
-        self.m_data = mem_bus
-        self.m_opcodes = mem_bus
-        self.m_args = mem_bus
+        # Pages written since the latest snapshot(), None until the first
+        # one is taken, and the write pages of those not written yet
+        self.m_dirty = None
+        self.m_tracked_pages = [None] * 0x100
+        self.m_snapshot = None
+
+        # Memory is mapped in pages of 256 bytes. A page of the read
+        # and write maps is a memoryview into a buffer, or None when the
+        # access goes through the handler of the page instead
+        self.m_read_map = [None] * 0x100
+        self.m_write_map = [None] * 0x100
+        self.m_read_handlers = [None] * 0x100
+        self.m_write_handlers = [None] * 0x100
+        # (buffer, offset) a RAM or ROM page is read from
+        self.m_page_origins = [None] * 0x100
+        # mem_bus is either a Bus, or a bytearray/memoryview holding the
+        # whole 64K that is indexed directly
+        if isinstance(mem_bus, Bus):
+            self.map_handler(0x0000, 0xffff, mem_bus.read, mem_bus.write)
+        else:
+            self.map_ram(0x0000, 0xffff, mem_bus)
+        # Buses overriding the memory map for opcode and argument fetches
+        self.m_opcodes = None
+        self.m_args = None
         self.m_io = io_bus
 
-        # Reset registers to their initial values
-        self.m_pc = Pair()
-        self.m_sp = Pair()
-        self.m_af = Pair()
-        self.m_bc = Pair()
-        self.m_de = Pair()
-        self.m_hl = Pair()
-        self.m_ix = Pair()
-        self.m_iy = Pair()
-        self.m_wz = Pair()
-
-        self.m_af2 = Pair()
-        self.m_bc2 = Pair()
-        self.m_de2 = Pair()
-        self.m_hl2 = Pair()
-
-        self.IX = self.IY = 0xffff  # IX and IY are FFFF after a reset!
-        self.F = Z80.ZF             # Zero flag is set
+        self.reset()
+
+        self.MTM = Z80.cc_op[0] - 1
+
+        self.m_irq_vector = None
+
+        self.m_enable_debug = False
+
+    def reset(self):
+        """Reset registers to their initial values
+        """
+        self.m_pc = 0
+        self.m_sp = 0
+        self.m_a = 0
+        self.m_f = Z80.ZF           # Zero flag is set
+        self.m_bc = 0
+        self.m_de = 0
+        self.m_hl = 0
+        self.m_ix = 0xffff          # IX and IY are FFFF after a reset!
+        self.m_iy = 0xffff
+        self.m_wz = 0
+
+        self.m_af2 = 0
+        self.m_bc2 = 0
+        self.m_de2 = 0
+        self.m_hl2 = 0
 
         self.m_r = 0
         self.m_r2 = 0
@@ -372,12 +431,202 @@ class Z80:
 
         self.m_icount = 0
         self.m_icount_executing = 0
+        # T-states run at once by skip_halt() and skip_idle()
+        self.m_idle_cycles = 0
 
-        self.MTM = Z80.cc_op[0] - 1
+    def save_state(self, memory=False):
+        """Pack the CPU state into bytes
 
-        self.m_irq_vector = None
+        The registers, interrupt and input line state and the cycle
+        counters go into one struct; with memory, the 64K as read
+        through the memory map follow.
+        """
+        state = Z80.STATE.pack(
+            Z80.STATE_MAGIC, Z80.STATE_VERSION,
+            self.m_pc, self.m_sp, self.m_a, self.m_f, self.m_bc, self.m_de, self.m_hl,
+            self.m_ix, self.m_iy, self.m_wz, self.m_af2, self.m_bc2, self.m_de2, self.m_hl2,
+            self.m_r & 0xff, self.m_r2, self.m_iff1, self.m_iff2, self.m_halt, self.m_im, self.m_i,
+            self.m_nmi_state, self.m_nmi_pending, self.m_irq_state, self.m_wait_state,
+            self.m_busrq_state, self.m_after_ei, self.m_after_ldair, self.m_ea,
+            self.m_icount, self.m_icount_executing, self.m_idle_cycles)
+        if memory:
+            pages = []
+            for page in range(0x100):
+                read_page = self.m_read_map[page]
+                if read_page is None:
+                    read = self.m_read_handlers[page]
+                    addr = page << 8
+                    pages.append(bytes(read(addr | offset) for offset in range(0x100)))
+                else:
+                    pages.append(read_page)
+            state += b''.join(pages)
+        return state
+
+    def load_state(self, state):
+        """Restore a state packed by save_state()
+
+        Memory, if saved along, is written back through the memory map.
+        """
+        values = Z80.STATE.unpack_from(state)
+        if values[0] != Z80.STATE_MAGIC or values[1] != Z80.STATE_VERSION:
+            raise ValueError('not a Z80 state of version {}'.format(Z80.STATE_VERSION))
+        (self.m_pc, self.m_sp, self.m_a, self.m_f, self.m_bc, self.m_de, self.m_hl,
+         self.m_ix, self.m_iy, self.m_wz, self.m_af2, self.m_bc2, self.m_de2, self.m_hl2,
+         self.m_r, self.m_r2, self.m_iff1, self.m_iff2, self.m_halt, self.m_im, self.m_i,
+         self.m_nmi_state, nmi_pending, self.m_irq_state, self.m_wait_state,
+         self.m_busrq_state, after_ei, after_ldair, self.m_ea,
+         self.m_icount, self.m_icount_executing, self.m_idle_cycles) = values[2:]
+        self.m_nmi_pending = bool(nmi_pending)
+        self.m_after_ei = bool(after_ei)
+        self.m_after_ldair = bool(after_ldair)
+        if len(state) > Z80.STATE.size:
+            data = memoryview(state)[Z80.STATE.size:Z80.STATE.size + 0x10000]
+            for page in range(0x100):
+                chunk = data[page << 8:(page + 1) << 8]
+                write_page = self.m_write_map[page]
+                if write_page is None:
+                    write = self.m_write_handlers[page]
+                    addr = page << 8
+                    for offset, value in enumerate(chunk):
+                        write(addr | offset, value)
+                else:
+                    write_page[:] = chunk
+
+    def set_page(self, page, read_page, write_page, read=None, write=None, origin=None):
+        """Set one page of the memory map
+
+        origin is the (buffer, offset) read_page starts at; write_page
+        is either read_page itself or memory that is never read.
+        """
+        self.m_read_map[page] = read_page
+        self.m_write_map[page] = write_page
+        self.m_read_handlers[page] = read
+        self.m_write_handlers[page] = write
+        self.m_page_origins[page] = origin
+        if self.m_dirty is not None:
+            # the contents seen at the page change
+            self.m_dirty[page] = 1
+            self.m_tracked_pages[page] = None
+
+    def map_ram(self, start, end, buffer, offset=0):
+        """Map start-end to buffer[offset:]
+
+        start and end are rounded to whole pages. Remapping only
+        swaps memoryviews, so it is cheap enough for bank switching.
+        Different buffers mapped into one CPU must not share memory.
+        """
+        view = memoryview(buffer)
+        for page in range(start >> 8, (end >> 8) + 1):
+            ram = view[offset:offset + 0x100]
+            self.set_page(page, ram, ram, origin=(buffer, offset))
+            offset += 0x100
+
+    def map_rom(self, start, end, buffer, offset=0):
+        """Map start-end to buffer[offset:] for reading; writes are dropped
+        """
+        view = memoryview(buffer)
+        sink = bytearray(0x100)
+        for page in range(start >> 8, (end >> 8) + 1):
+            self.set_page(page, view[offset:offset + 0x100], sink, origin=(buffer, offset))
+            offset += 0x100
+
+    def map_handler(self, start, end, read, write):
+        """Map start-end to the handler pair read(addr), write(addr, data)
+        """
+        for page in range(start >> 8, (end >> 8) + 1):
+            self.set_page(page, None, None, read, write)
 
-        self.m_enable_debug = False
+    def snapshot(self):
+        """Take a checkpoint of the CPU state and memory
+
+        Only the pages written since the previous snapshot are copied.
+        Pages are write-protected to find out: their first write goes
+        through write_tracked(), which marks the page in m_dirty and
+        maps it back for writing, so later writes cost nothing extra.
+        Handler pages are not part of snapshots.
+        """
+        read_map = self.m_read_map
+        if self.m_dirty is None:
+            self.m_dirty = bytearray(0x100)
+            changed = range(0x100)
+        else:
+            changed = [page for page in range(0x100) if self.m_dirty[page]]
+        pages = {}
+        for page in changed:
+            if read_map[page] is not None:
+                pages[page] = bytes(read_map[page])
+            self.protect_page(page)
+        self.m_dirty[:] = bytes(0x100)
+        self.m_snapshot = Snapshot(self.m_snapshot, self.save_state(), pages)
+        return self.m_snapshot
+
+    def restore(self, snapshot):
+        """Go back to a checkpoint taken by snapshot()
+
+        Only the pages written since, according to m_dirty and the
+        snapshots taken in between, are copied back.
+        """
+        if self.m_dirty is None:
+            raise ValueError('no snapshot taken')
+        pages = {page for page in range(0x100) if self.m_dirty[page]}
+        later = self.m_snapshot
+        while later is not None and later is not snapshot:
+            pages.update(later.pages)
+            later = later.parent
+        if later is None:
+            # not an ancestor of the current state
+            pages = set(range(0x100))
+        # the latest contents up to snapshot
+        earlier = snapshot
+        while pages and earlier is not None:
+            for page in pages.intersection(earlier.pages):
+                write_page = self.m_write_map[page]
+                if write_page is None:
+                    write_page = self.m_tracked_pages[page]
+                if write_page is not None:
+                    write_page[:] = earlier.pages[page]
+                self.protect_page(page)
+                pages.discard(page)
+            earlier = earlier.parent
+        self.m_dirty[:] = bytes(0x100)
+        self.load_state(snapshot.state)
+        self.m_snapshot = snapshot
+
+    def protect_page(self, page):
+        """Send writes to page through write_tracked()
+        """
+        write_page = self.m_write_map[page]
+        if write_page is not None:
+            self.m_tracked_pages[page] = write_page
+            self.m_write_map[page] = None
+            self.m_write_handlers[page] = self.write_tracked
+
+    def write_tracked(self, addr, data):
+        """First write to a page since the latest snapshot
+        """
+        page = addr >> 8
+        write_page = self.m_tracked_pages[page]
+        self.m_dirty[page] = 1
+        self.m_write_map[page] = write_page
+        self.m_write_handlers[page] = None
+        write_page[addr & 0xff] = data
+
+    def read_mem(self, addr):
+        """Read a byte through the memory map without taking any cycles
+        """
+        page = self.m_read_map[addr >> 8]
+        if page is None:
+            return self.m_read_handlers[addr >> 8](addr)
+        return page[addr & 0xff]
+
+    def write_mem(self, addr, data):
+        """Write a byte through the memory map without taking any cycles
+        """
+        page = self.m_write_map[addr >> 8]
+        if page is None:
+            self.m_write_handlers[addr >> 8](addr, data)
+        else:
+            page[addr & 0xff] = data
 
     def CC(self, table, opcode):
         self.m_icount_executing += table[opcode]
@@ -388,7 +637,7 @@ class Z80:
 
     def EXEC(self, cc_table, op_table, opcode):
         self.CC(cc_table, opcode)
-        op_table[opcode]()
+        op_table[opcode](self)
         if self.m_icount_executing > 0:
             self.T(self.m_icount_executing)
         else:
@@ -397,12 +646,81 @@ class Z80:
     def halt(self):
         """Enter halt state; write 1 to callback on first execution
         """
-        m_halt = 1
-    
+        self.m_halt = 1
+
     def leave_halt(self):
         """Leave halt state; write 0 to callback
         """
-        m_halt = 0
+        self.m_halt = 0
+
+    def skip_halt(self):
+        """Run the rest of the time slice in HALT state at once
+
+        Nothing but an interrupt ends the HALT state, and none can be
+        taken before the slice ends unless one is already pending. R
+        and m_icount advance as for the NOPs the CPU would execute;
+        the opcode fetches themselves are skipped. This is only done
+        when they would not go to a memory handler, nor to the
+        m_opcodes or m_args bus.
+        """
+        if self.m_icount < 0 or self.m_nmi_pending or \
+                (self.m_irq_state != Z80.CLEAR_LINE and self.m_iff1):
+            return
+        if self.m_opcodes is not None or self.m_args is not None:
+            return
+        if self.m_read_map[self.m_pc >> 8] is None:
+            return
+        count = self.m_icount // Z80.cc_op[0] + 1
+        self.m_r += count
+        self.m_icount -= count * Z80.cc_op[0]
+        self.m_idle_cycles += count * Z80.cc_op[0]
+
+    def skip_idle(self):
+        """Run the rest of the time slice in an idle loop at once
+
+        Called once a JR, JP or DJNZ jumped onto itself. Until an
+        interrupt is taken, such a loop changes nothing but R, and B
+        for DJNZ; none can be taken before the slice ends unless one is
+        already pending. R, B and m_icount advance as for the loop
+        iterations that fit, whose fetches are skipped; this is only
+        done when they would not go to a memory handler, nor to the
+        m_opcodes or m_args bus.
+        """
+        if self.m_nmi_pending or (self.m_irq_state != Z80.CLEAR_LINE and self.m_iff1):
+            return
+        # cycles left after this iteration
+        left = self.m_icount - max(self.m_icount_executing, 0)
+        if left < 0:
+            return
+        if self.m_opcodes is not None or self.m_args is not None:
+            return
+        pc = self.m_pc
+        page = self.m_read_map[pc >> 8]
+        if page is None:
+            return
+        op = page[pc & 0xff]
+        for addr in ((pc + 1) & 0xffff, (pc + 2) & 0xffff):
+            if self.m_read_map[addr >> 8] is None:
+                return
+
+        repeat = Z80.cc_op[op] + Z80.cc_ex[op]
+        count = left // repeat + 1
+        if op == 0x10:
+            # DJNZ: the last iteration falls through
+            b = self.m_bc >> 8
+            if count >= b:
+                count = b
+                cycles = repeat * (count - 1) + Z80.cc_op[op]
+                self.m_pc = (pc + 2) & 0xffff
+                self.m_wz = 0xfe
+            else:
+                cycles = repeat * count
+            self.m_bc = (((b - count) & 0xff) << 8) | (self.m_bc & 0xff)
+        else:
+            cycles = repeat * count
+        self.m_r += count
+        self.m_icount -= cycles
+        self.m_idle_cycles += cycles
 
     def inp(self, port):
         """Input a byte from given I/O port
@@ -420,7 +738,11 @@ class Z80:
     def rm(self, addr):
         """Read a byte from given memory location
         """
-        res = self.m_data.read(addr)
+        page = self.m_read_map[addr >> 8]
+        if page is None:
+            res = self.m_read_handlers[addr >> 8](addr)
+        else:
+            res = page[addr & 0xff]
         self.T(self.MTM)
         return res
 
@@ -431,37 +753,41 @@ class Z80:
         self.nomreq_addr(addr, 1)
         return res
 
-    def rm16(self, addr, r):
+    def rm16(self, addr):
         """Read a word from given memory location
         """
-        r.l = self.rm(addr)
-        r.h = self.rm(addr+1)
+        res = self.rm(addr)
+        return (self.rm((addr + 1) & 0xffff) << 8) | res
 
     def wm(self, addr, data):
         """Write a byte to given memory location
         """
         if self.m_icount_executing != self.MTM:
              self.T(self.m_icount_executing - self.MTM)
-        self.m_data.write(addr, data)
+        page = self.m_write_map[addr >> 8]
+        if page is None:
+            self.m_write_handlers[addr >> 8](addr, data)
+        else:
+            page[addr & 0xff] = data
         self.T(self.MTM)
 
-    def wm16(self, addr, r):
+    def wm16(self, addr, value):
         """Write a word to given memory location
         """
         self.m_icount_executing -= self.MTM
-        self.wm(addr, r.l)
+        self.wm(addr, value & 0xff)
         self.m_icount_executing += self.MTM
-        self.wm(addr+1, r.h)
+        self.wm((addr + 1) & 0xffff, value >> 8)
 
-    def wm16_sp(self, r):
+    def wm16_sp(self, value):
         """Write a word to (SP)
         """
-        self.SP -= 1
+        self.m_sp = (self.m_sp - 1) & 0xffff
         self.m_icount_executing -= self.MTM
-        self.wm(self.SP, r.h)
+        self.wm(self.m_sp, value >> 8)
         self.m_icount_executing += self.MTM
-        self.SP -= 1
-        self.wm(self.SP, r.l)
+        self.m_sp = (self.m_sp - 1) & 0xffff
+        self.wm(self.m_sp, value & 0xff)
 
     def rop(self):
         """Read an opcode from (PC)
@@ -472,11 +798,19 @@ class Z80:
         """
         if self.m_icount_executing:
             self.T(self.m_icount_executing)
-        res = self.m_opcodes.read(self.PC)
+        pc = self.m_pc
+        if self.m_opcodes is None:
+            page = self.m_read_map[pc >> 8]
+            if page is None:
+                res = self.m_read_handlers[pc >> 8](pc)
+            else:
+                res = page[pc & 0xff]
+        else:
+            res = self.m_opcodes.read(pc)
         self.T(self.execute_min_cycles())
         # refresh
         self.T(self.execute_min_cycles())
-        self.PC += 1
+        self.m_pc = (pc + 1) & 0xffff
         self.m_r += 1
         return res
 
@@ -488,11 +822,19 @@ class Z80:
         support systems that use different encoding mechanisms for
         opcodes and opcode arguments
         """
-        res = self.m_args.read(self.PC)
+        pc = self.m_pc
+        if self.m_args is None:
+            page = self.m_read_map[pc >> 8]
+            if page is None:
+                res = self.m_read_handlers[pc >> 8](pc)
+            else:
+                res = page[pc & 0xff]
+        else:
+            res = self.m_args.read(pc)
         self.T(self.MTM)
-        self.PC += 1
+        self.m_pc = (pc + 1) & 0xffff
         return res
-    
+
     def arg16(self):
         """Read a 16bits opcode argument from (PC)
 
@@ -507,48 +849,58 @@ class Z80:
     def eax(self):
         """ Calculate the effective address EA of an opcode using IX+offset
         """
-        self.m_ea = (self.IX + Z80.S8[self.arg()]) & 0xffff
-        self.WZ = self.m_ea
+        self.m_ea = (self.m_ix + Z80.S8[self.arg()]) & 0xffff
+        self.m_wz = self.m_ea
 
     def eay(self):
         """ Calculate the effective address EA of an opcode using IY+offset
         """
-        self.m_ea = (self.IY + Z80.S8[self.arg()]) & 0xffff
-        self.WZ = self.m_ea
+        self.m_ea = (self.m_iy + Z80.S8[self.arg()]) & 0xffff
+        self.m_wz = self.m_ea
 
-    def pop(self, r):
+    def pop(self):
         """POP
         """
-        self.rm16(self.SP, r)
-        self.SP += 2
+        res = self.rm16(self.m_sp)
+        self.m_sp = (self.m_sp + 2) & 0xffff
+        return res
 
-    def push(self, r):
+    def push(self, value):
         """PUSH
         """
         self.nomreq_ir(1)
-        self.wm16_sp(r)
+        self.wm16_sp(value)
 
     def jp(self):
         """JP
         """
-        self.PC = self.arg16()
-        self.WZ = self.PC
+        pc = self.m_pc
+        self.m_pc = self.arg16()
+        self.m_wz = self.m_pc
+        if self.m_pc == (pc - 1) & 0xffff:
+            self.skip_idle()
 
     def jp_cond(self, cond):
         """JP_COND
         """
         if cond:
-            self.PC = self.arg16()
-            self.WZ = self.PC
+            pc = self.m_pc
+            self.m_pc = self.arg16()
+            self.m_wz = self.m_pc
+            if self.m_pc == (pc - 1) & 0xffff:
+                self.skip_idle()
         else:
-            self.WZ = self.arg16()
-    
+            self.m_wz = self.arg16()
+
     def jr(self):
         """JR
         """
-        self.PC += Z80.S8[self.arg()]
-        self.nomreq_addr(self.PC - 1, 5)
-        self.WZ = self.PC
+        disp = Z80.S8[self.arg()]
+        self.m_pc = (self.m_pc + disp) & 0xffff
+        self.nomreq_addr(self.m_pc - 1, 5)
+        self.m_wz = self.m_pc
+        if disp == -2:
+            self.skip_idle()
 
     def jr_cond(self, cond, opcode):
         """JR_COND
@@ -557,16 +909,16 @@ class Z80:
             self.CC(Z80.cc_ex, opcode)
             self.jr()
         else:
-            self.WZ = self.arg()
-    
+            self.m_wz = self.arg()
+
     def call(self):
         """CALL
         """
         self.m_ea = self.arg16()
-        self.nomreq_addr(self.PC - 1, 1)
-        self.WZ = self.m_ea
+        self.nomreq_addr(self.m_pc - 1, 1)
+        self.m_wz = self.m_ea
         self.wm16_sp(self.m_pc)
-        self.PC = self.m_ea
+        self.m_pc = self.m_ea
 
     def call_cond(self, cond, opcode):
         """CALL_COND
@@ -574,12 +926,12 @@ class Z80:
         if cond:
             self.CC(Z80.cc_ex, opcode)
             self.m_ea = self.arg16()
-            self.nomreq_addr(self.PC - 1, 1)
-            self.WZ = self.m_ea
+            self.nomreq_addr(self.m_pc - 1, 1)
+            self.m_wz = self.m_ea
             self.wm16_sp(self.m_pc)
-            self.PC = self.m_ea
+            self.m_pc = self.m_ea
         else:
-            self.WZ = self.arg16()
+            self.m_wz = self.arg16()
 
     def ret_cond(self, cond, opcode):
         """RET_COND
@@ -587,284 +939,287 @@ class Z80:
         self.nomreq_ir(1)
         if cond:
             self.CC(Z80.cc_ex, opcode)
-            self.pop(self.m_pc)
-            self.WZ = self.PC
+            self.m_pc = self.pop()
+            self.m_wz = self.m_pc
 
     def retn(self):
         """RETN
         """
-        self.pop(self.m_pc)
-        self.WZ = self.PC
+        self.m_pc = self.pop()
+        self.m_wz = self.m_pc
         self.m_iff1 = self.m_iff2
 
     def reti(self):
         """RETI
         """
-        self.pop(self.m_pc)
-        self.WZ = self.PC
+        self.m_pc = self.pop()
+        self.m_wz = self.m_pc
         self.m_iff1 = self.m_iff2
 
     def ld_r_a(self):
         """LD   R,A
         """
         self.nomreq_ir(1)
-        self.m_r = self.A
-        self.m_r2 = self.A & 0x80
+        self.m_r = self.m_a
+        self.m_r2 = self.m_a & 0x80
 
     def ld_a_r(self):
         """LD   A,R
         """
         self.nomreq_ir(1)
-        self.A = (self.m_r & 0x7f) | self.m_r2
-        self.F = (self.F & Z80.CF) | Z80.SZ[self.A] | (self.m_iff2 << 2)
+        self.m_a = (self.m_r & 0x7f) | self.m_r2
+        self.m_f = (self.m_f & Z80.CF) | Z80.SZ[self.m_a] | (self.m_iff2 << 2)
         self.m_after_ldair = True
 
     def ld_i_a(self):
         """LD   I,A
         """
         self.nomreq_ir(1)
-        self.m_i = self.A
+        self.m_i = self.m_a
 
     def ld_a_i(self):
         """LD   A,I
         """
         self.nomreq_ir(1)
-        self.A = self.m_i
-        self.F = (self.F & Z80.CF) | Z80.SZ[self.A] | (self.m_iff2 << 2)
+        self.m_a = self.m_i
+        self.m_f = (self.m_f & Z80.CF) | Z80.SZ[self.m_a] | (self.m_iff2 << 2)
         self.m_after_ldair = True
 
     def rst(self, addr):
         """RST
         """
         self.push(self.m_pc)
-        self.PC = addr
-        self.WZ = self.PC
+        self.m_pc = addr
+        self.m_wz = addr
 
     def inc(self, value):
         """INC  r8
         """
         res = (value + 1) & 0xff
-        self.F = (self.F & Z80.CF) | Z80.SZHV_inc[res]
+        self.m_f = (self.m_f & Z80.CF) | Z80.SZHV_inc[res]
         return res
 
     def dec(self, value):
         """DEC  r8
         """
         res = (value - 1) & 0xff
-        self.F = (self.F & Z80.CF) | Z80.SZHV_dec[res]
+        self.m_f = (self.m_f & Z80.CF) | Z80.SZHV_dec[res]
         return res
 
     def rlca(self):
         """RLCA
         """
-        self.A = ((self.A << 1) | (self.A >> 7)) & 0xff
-        self.F = (self.F & (Z80.SF | Z80.ZF | Z80.PF)) | (self.A & (Z80.YF | Z80.XF | Z80.CF))
+        a = self.m_a
+        a = ((a << 1) | (a >> 7)) & 0xff
+        self.m_a = a
+        self.m_f = (self.m_f & (Z80.SF | Z80.ZF | Z80.PF)) | (a & (Z80.YF | Z80.XF | Z80.CF))
 
     def rrca(self):
         """RRCA
         """
-        self.F = (self.F & (Z80.SF | Z80.ZF | Z80.PF)) | (self.A & Z80.CF)
-        self.A = ((self.A >> 1) | (self.A << 7)) & 0xff
-        self.F |= (self.A & (Z80.YF | Z80.XF))
+        a = self.m_a
+        f = (self.m_f & (Z80.SF | Z80.ZF | Z80.PF)) | (a & Z80.CF)
+        a = ((a >> 1) | (a << 7)) & 0xff
+        self.m_a = a
+        self.m_f = f | (a & (Z80.YF | Z80.XF))
 
     def rla(self):
         """RLA
         """
-        res = ((self.A << 1) | (self.F & Z80.CF)) & 0xff
-        c = Z80.CF if (self.A & 0x80) else 0
-        self.F = (self.F & (Z80.SF | Z80.ZF | Z80.PF)) | c | (res & (Z80.YF | Z80.XF))
-        self.A = res
+        a = self.m_a
+        res = ((a << 1) | (self.m_f & Z80.CF)) & 0xff
+        c = Z80.CF if (a & 0x80) else 0
+        self.m_f = (self.m_f & (Z80.SF | Z80.ZF | Z80.PF)) | c | (res & (Z80.YF | Z80.XF))
+        self.m_a = res
 
     def rra(self):
         """RRA
         """
-        res = ((self.A >> 1) | (self.F << 7)) & 0xff
-        c = Z80.CF if (self.A & 0x01) else 0
-        self.F = (self.F & (Z80.SF | Z80.ZF | Z80.PF)) | c | (res & (Z80.YF | Z80.XF))
-        self.A = res
+        a = self.m_a
+        res = ((a >> 1) | (self.m_f << 7)) & 0xff
+        c = Z80.CF if (a & 0x01) else 0
+        self.m_f = (self.m_f & (Z80.SF | Z80.ZF | Z80.PF)) | c | (res & (Z80.YF | Z80.XF))
+        self.m_a = res
 
     def rrd(self):
         """RRD
         """
-        n = self.rm(self.HL)
-        self.WZ = self.HL + 1
-        self.nomreq_addr(self.HL, 4)
-        self.wm(self.HL, ((n >> 4) | (self.A << 4)) & 0xff)
-        self.A = (self.A & 0xf0) | (n & 0x0f)
-        self.F = (self.F & Z80.CF) | Z80.SZP[self.A]
+        hl = self.m_hl
+        n = self.rm(hl)
+        self.m_wz = (hl + 1) & 0xffff
+        self.nomreq_addr(hl, 4)
+        self.wm(hl, ((n >> 4) | (self.m_a << 4)) & 0xff)
+        self.m_a = (self.m_a & 0xf0) | (n & 0x0f)
+        self.m_f = (self.m_f & Z80.CF) | Z80.SZP[self.m_a]
 
     def rld(self):
         """RLD
         """
-        n = self.rm(self.HL)
-        self.WZ = self.HL + 1
-        self.nomreq_addr(self.HL, 4)
-        self.wm(self.HL, ((n << 4) | (self.A & 0x0f)) & 0xff)
-        self.A = (self.A & 0xf0) | (n >> 4)
-        self.F = (self.F & Z80.CF) | Z80.SZP[self.A]
+        hl = self.m_hl
+        n = self.rm(hl)
+        self.m_wz = (hl + 1) & 0xffff
+        self.nomreq_addr(hl, 4)
+        self.wm(hl, ((n << 4) | (self.m_a & 0x0f)) & 0xff)
+        self.m_a = (self.m_a & 0xf0) | (n >> 4)
+        self.m_f = (self.m_f & Z80.CF) | Z80.SZP[self.m_a]
 
     def add_a(self, value):
         """ADD  A,n
         """
-        ah = self.AF & 0xff00
-        res = ((ah >> 8) + value) & 0xff
-        self.F = Z80.SZHVC_add[ah | res]
-        self.A = res
+        a = self.m_a
+        res = (a + value) & 0xff
+        self.m_f = Z80.SZHVC_add[(a << 8) | res]
+        self.m_a = res
 
     def adc_a(self, value):
         """ADC  A,n
         """
-        ah = self.AF & 0xff00
-        c = self.F & 1
-        res = ((ah >> 8) + value + c) & 0xff
-        self.F = Z80.SZHVC_add[(c << 16) | ah | res]
-        self.A = res
+        a = self.m_a
+        c = self.m_f & 1
+        res = (a + value + c) & 0xff
+        self.m_f = Z80.SZHVC_add[(c << 16) | (a << 8) | res]
+        self.m_a = res
 
     def sub(self, value):
         """SUB  n
         """
-        ah = self.AF & 0xff00
-        res = ((ah >> 8) - value) & 0xff
-        self.F = Z80.SZHVC_sub[ah | res]
-        self.A = res
+        a = self.m_a
+        res = (a - value) & 0xff
+        self.m_f = Z80.SZHVC_sub[(a << 8) | res]
+        self.m_a = res
 
     def sbc_a(self, value):
         """SBC  A,n
         """
-        ah = self.AF & 0xff00
-        c = self.F & 1
-        res = ((ah >> 8) - value - c) & 0xff
-        self.F = Z80.SZHVC_sub[(c << 16) | ah | res]
-        self.A = res
+        a = self.m_a
+        c = self.m_f & 1
+        res = (a - value - c) & 0xff
+        self.m_f = Z80.SZHVC_sub[(c << 16) | (a << 8) | res]
+        self.m_a = res
 
     def neg(self):
         """NEG
         """
-        value = self.A
-        self.A = 0
+        value = self.m_a
+        self.m_a = 0
         self.sub(value)
-    
+
     def daa(self):
         """DAA
         """
-        a = self.A
-        if self.F & Z80.NF:
-            if (self.F & Z80.HF) | ((self.A & 0x0f) > 9):
+        a = self.m_a
+        f = self.m_f
+        if f & Z80.NF:
+            if (f & Z80.HF) | ((self.m_a & 0x0f) > 9):
                 a = (a - 6) & 0xff
-            if (self.F & Z80.CF) | (self.A > 0x99):
+            if (f & Z80.CF) | (self.m_a > 0x99):
                 a = (a - 0x60) & 0xff
         else:
-            if (self.F & Z80.HF) | ((self.A & 0x0f) > 9):
+            if (f & Z80.HF) | ((self.m_a & 0x0f) > 9):
                 a = (a + 6) & 0xff
-            if (self.F & Z80.CF) | (self.A > 0x99):
+            if (f & Z80.CF) | (self.m_a > 0x99):
                 a = (a + 0x60) & 0xff
-        self.F = (self.F & (Z80.CF | Z80.NF)) | (self.A > 0x99) | ((self.A ^ a) & Z80.HF) | Z80.SZP[a]
-        self.A = a
-    
+        self.m_f = (f & (Z80.CF | Z80.NF)) | (self.m_a > 0x99) | ((self.m_a ^ a) & Z80.HF) | Z80.SZP[a]
+        self.m_a = a
+
     def and_a(self, value):
         """AND  n
         """
-        self.A &= value
-        self.F = Z80.SZP[self.A] | Z80.HF
+        self.m_a &= value
+        self.m_f = Z80.SZP[self.m_a] | Z80.HF
 
     def or_a(self, value):
         """OR   n
         """
-        self.A |= value
-        self.F = Z80.SZP[self.A]
+        self.m_a |= value
+        self.m_f = Z80.SZP[self.m_a]
 
     def xor_a(self, value):
         """XOR  n
         """
-        self.A ^= value
-        self.F = Z80.SZP[self.A]
+        self.m_a ^= value
+        self.m_f = Z80.SZP[self.m_a]
 
     def cp(self, value):
         """CP   n
         """
-        ah = self.AF & 0xff00
-        res = ((ah >> 8) - value) & 0xff
-        self.F = Z80.SZHVC_sub[ah | res] & ~(Z80.YF | Z80.XF) \
+        a = self.m_a
+        res = (a - value) & 0xff
+        self.m_f = Z80.SZHVC_sub[(a << 8) | res] & ~(Z80.YF | Z80.XF) \
             | (value & (Z80.YF | Z80.XF))
 
     def ex_af(self):
         """EX   AF,AF'
         """
-        tmp = self.m_af.w
-        self.m_af.w = self.m_af2.w
-        self.m_af2.w = tmp
+        af2 = self.m_af2
+        self.m_af2 = (self.m_a << 8) | self.m_f
+        self.m_a = af2 >> 8
+        self.m_f = af2 & 0xff
 
     def ex_de_hl(self):
         """EX   DE,HL
         """
-        tmp = self.m_de.w
-        self.m_de.w = self.m_hl.w
-        self.m_hl.w = tmp
+        self.m_de, self.m_hl = self.m_hl, self.m_de
 
     def exx(self):
         """EXX
         """
-        tmp = self.m_bc.w
-        self.m_bc.w = self.m_bc2.w
-        self.m_bc2.w = tmp
-        tmp = self.m_de.w
-        self.m_de.w = self.m_de2.w
-        self.m_de2.w = tmp
-        tmp = self.m_hl.w
-        self.m_hl.w = self.m_hl2.w
-        self.m_hl2.w = tmp
-
-    def ex_sp(self, r):
+        self.m_bc, self.m_bc2 = self.m_bc2, self.m_bc
+        self.m_de, self.m_de2 = self.m_de2, self.m_de
+        self.m_hl, self.m_hl2 = self.m_hl2, self.m_hl
+
+    def ex_sp(self, value):
         """EX   (SP),r16
         """
-        tmp =  Pair()
-        self.pop(tmp)
-        self.nomreq_addr(self.SP - 1, 1)
+        res = self.pop()
+        self.nomreq_addr(self.m_sp - 1, 1)
         self.m_icount_executing -= 2
-        self.wm16_sp(r)
+        self.wm16_sp(value)
         self.m_icount_executing += 2
-        self.nomreq_addr(self.SP, 2)
-        r.w = tmp.w
-        self.WZ = r.w
+        self.nomreq_addr(self.m_sp, 2)
+        self.m_wz = res
+        return res
 
     def add16(self, dr, sr):
         """ADD16
         """
         self.nomreq_ir(7)
-        res = dr.w + sr.w
-        self.WZ = dr.w + 1
-        self.F = (self.F & (Z80.SF | Z80.ZF | self.VF)) \
-            | (((dr.w ^ res ^ sr.w) >> 8) & Z80.HF) \
+        res = dr + sr
+        self.m_wz = (dr + 1) & 0xffff
+        self.m_f = (self.m_f & (Z80.SF | Z80.ZF | Z80.VF)) \
+            | (((dr ^ res ^ sr) >> 8) & Z80.HF) \
             | ((res >> 16) & Z80.CF) \
             | ((res >> 8) & (Z80.YF | Z80.XF))
-        dr.w = res
+        return res & 0xffff
 
-    def adc_hl(self, r):
+    def adc_hl(self, value):
         """ADC  HL,r16
         """
         self.nomreq_ir(7)
-        res = self.HL + r.w + (self.F & Z80.CF)
-        self.WZ = self.HL + 1
-        self.F = (((self.HL ^ res ^ r.w) >> 8) & Z80.HF) \
+        hl = self.m_hl
+        res = hl + value + (self.m_f & Z80.CF)
+        self.m_wz = (hl + 1) & 0xffff
+        self.m_f = (((hl ^ res ^ value) >> 8) & Z80.HF) \
             | ((res >> 16) & Z80.CF) \
             | ((res >> 8) & (Z80.SF | Z80.YF | Z80.XF)) \
             | (0 if (res & 0xffff) else Z80.ZF) \
-            | (((r.w ^ self.HL ^ 0x8000) & (r.w ^ res) & 0x8000) >> 13)
-        self.HL = res
+            | (((value ^ hl ^ 0x8000) & (value ^ res) & 0x8000) >> 13)
+        self.m_hl = res & 0xffff
 
-    def sbc_hl(self, r):
+    def sbc_hl(self, value):
         """SBC  HL,r16
         """
         self.nomreq_ir(7)
-        res = self.HL - r.w - (self.F & Z80.CF)
-        self.WZ = self.HL + 1
-        self.F = (((self.HL ^ res ^ r.w) >> 8) & Z80.HF) \
+        hl = self.m_hl
+        res = hl - value - (self.m_f & Z80.CF)
+        self.m_wz = (hl + 1) & 0xffff
+        self.m_f = (((hl ^ res ^ value) >> 8) & Z80.HF) \
             | Z80.NF \
             | ((res >> 16) & Z80.CF) \
             | ((res >> 8) & (Z80.SF | Z80.YF | Z80.XF)) \
             | (0 if (res & 0xffff) else Z80.ZF) \
-            | (((r.w ^ self.HL) & (self.HL ^ res) & 0x8000) >> 13)
-        self.HL = res
+            | (((value ^ hl) & (hl ^ res) & 0x8000) >> 13)
+        self.m_hl = res & 0xffff
 
     def rlc(self, value):
         """RLC  r8
@@ -872,7 +1227,7 @@ class Z80:
         res = value
         c = Z80.CF if (res & 0x80) else 0
         res = ((res << 1) | (res >> 7)) & 0xff
-        self.F = Z80.SZP[res] | c
+        self.m_f = Z80.SZP[res] | c
         return res
 
     def rrc(self, value):
@@ -881,7 +1236,7 @@ class Z80:
         res = value
         c = Z80.CF if (res & 0x01) else 0
         res = ((res >> 1) | (res << 7)) & 0xff
-        self.F = Z80.SZP[res] | c
+        self.m_f = Z80.SZP[res] | c
         return res
 
     def rl(self, value):
@@ -889,8 +1244,8 @@ class Z80:
         """
         res = value
         c = Z80.CF if (res & 0x80) else 0
-        res = ((res << 1) | (self.F & Z80.CF)) & 0xff
-        self.F = Z80.SZP[res] | c
+        res = ((res << 1) | (self.m_f & Z80.CF)) & 0xff
+        self.m_f = Z80.SZP[res] | c
         return res
 
     def rr(self, value):
@@ -898,8 +1253,8 @@ class Z80:
         """
         res = value
         c = Z80.CF if (res & 0x01) else 0
-        res = ((res >> 1) | (self.F << 7)) & 0xff
-        self.F = Z80.SZP[res] | c
+        res = ((res >> 1) | (self.m_f << 7)) & 0xff
+        self.m_f = Z80.SZP[res] | c
         return res
 
     def sla(self, value):
@@ -908,7 +1263,7 @@ class Z80:
         res = value
         c = Z80.CF if (res & 0x80) else 0
         res = (res << 1)  & 0xff
-        self.F = Z80.SZP[res] | c
+        self.m_f = Z80.SZP[res] | c
         return res
 
     def sra(self, value):
@@ -917,7 +1272,7 @@ class Z80:
         res = value
         c = Z80.CF if (res & 0x01) else 0
         res = ((res >> 1) | (res & 0x80)) & 0xff
-        self.F = Z80.SZP[res] | c
+        self.m_f = Z80.SZP[res] | c
         return res
 
     def sll(self, value):
@@ -926,7 +1281,7 @@ class Z80:
         res = value
         c = Z80.CF if (res & 0x80) else 0
         res = ((res << 1) | 0x01) & 0xff
-        self.F = Z80.SZP[res] | c
+        self.m_f = Z80.SZP[res] | c
         return res
 
     def srl(self, value):
@@ -935,13 +1290,13 @@ class Z80:
         res = value
         c = Z80.CF if (res & 0x01) else 0
         res = (res >> 1) & 0xff
-        self.F = Z80.SZP[res] | c
+        self.m_f = Z80.SZP[res] | c
         return res
 
     def bit(self, bit, value):
         """BIT  bit,r8
         """
-        self.F = (self.F & Z80.CF) \
+        self.m_f = (self.m_f & Z80.CF) \
             | Z80.HF \
             | (Z80.SZ_BIT[value & (1 << bit)] & ~(Z80.YF | Z80.XF)) \
             | (value & (Z80.YF | Z80.XF))
@@ -949,15 +1304,15 @@ class Z80:
     def bit_hl(self, bit, value):
         """BIT  bit,(HL)
         """
-        self.F = (self.F & Z80.CF) \
+        self.m_f = (self.m_f & Z80.CF) \
             | Z80.HF \
             | (Z80.SZ_BIT[value & (1 << bit)] & ~(Z80.YF | Z80.XF)) \
-            | (self.WZ_H & (Z80.YF | Z80.XF))
+            | ((self.m_wz >> 8) & (Z80.YF | Z80.XF))
 
     def bit_xy(self, bit, value):
         """BIT  bit,(IX/Y+o)
         """
-        self.F = (self.F & Z80.CF) \
+        self.m_f = (self.m_f & Z80.CF) \
             | Z80.HF \
             | (Z80.SZ_BIT[value & (1 << bit)] & ~(Z80.YF | Z80.XF)) \
             | ((self.m_ea >> 8) & (Z80.YF | Z80.XF))
@@ -975,228 +1330,521 @@ class Z80:
     def ldi(self):
         """LDI
         """
-        io = self.rm(self.HL)
+        io = self.rm(self.m_hl)
         self.m_icount_executing -= 2
-        self.wm(self.DE, io)
+        self.wm(self.m_de, io)
         self.m_icount_executing += 2
-        self.nomreq_addr(self.DE, 2)
-        self.F &= Z80.SF | Z80.ZF | Z80.CF
-        if (self.A + io) & 0x02:
-            self.F |= Z80.YF
-        if (self.A + io) & 0x08:
-            self.F |= Z80.XF
-        self.HL += 1
-        self.DE += 1
-        self.BC -= 1
-        if self.BC:
-            self.F |= Z80.VF
+        self.nomreq_addr(self.m_de, 2)
+        self.m_f &= Z80.SF | Z80.ZF | Z80.CF
+        if (self.m_a + io) & 0x02:
+            self.m_f |= Z80.YF
+        if (self.m_a + io) & 0x08:
+            self.m_f |= Z80.XF
+        self.m_hl = (self.m_hl + 1) & 0xffff
+        self.m_de = (self.m_de + 1) & 0xffff
+        self.m_bc = (self.m_bc - 1) & 0xffff
+        if self.m_bc:
+            self.m_f |= Z80.VF
 
     def cpi(self):
         """CPI
         """
-        val = self.rm(self.HL)
-        self.nomreq_addr(self.DE, 5)
-        res = (self.A - val) & 0xff
-        self.WZ += 1
-        self.HL += 1
-        self.BC -= 1
-        self.F = (self.F & Z80.CF) \
+        val = self.rm(self.m_hl)
+        self.nomreq_addr(self.m_de, 5)
+        res = (self.m_a - val) & 0xff
+        self.m_wz = (self.m_wz + 1) & 0xffff
+        self.m_hl = (self.m_hl + 1) & 0xffff
+        self.m_bc = (self.m_bc - 1) & 0xffff
+        self.m_f = (self.m_f & Z80.CF) \
             | (Z80.SZ[res] & ~(Z80.YF | Z80.XF)) \
-            | ((self.A ^ val ^ res) & Z80.HF) \
+            | ((self.m_a ^ val ^ res) & Z80.HF) \
             | Z80.NF
-        if self.F & Z80.HF:
+        if self.m_f & Z80.HF:
             res -= 1
         if res & 0x02:
-            self.F |= Z80.YF
+            self.m_f |= Z80.YF
         if res & 0x08:
-            self.F |= Z80.XF
-        if self.BC:
-            self.F |= Z80.VF
+            self.m_f |= Z80.XF
+        if self.m_bc:
+            self.m_f |= Z80.VF
 
     def ini(self):
         """INI
         """
         self.nomreq_ir(1)
-        io = self.inp(self.BC)
-        self.WZ = self.BC + 1
-        self.B = (self.B - 1) & 0xff
-        self.wm(self.HL, io)
-        self.HL += 1
-        self.F = Z80.SZ[self.B]
-        t = ((self.C + 1) & 0xff) + io
+        io = self.inp(self.m_bc)
+        self.m_wz = (self.m_bc + 1) & 0xffff
+        self.m_bc = (self.m_bc - 0x100) & 0xffff
+        self.wm(self.m_hl, io)
+        self.m_hl = (self.m_hl + 1) & 0xffff
+        b = self.m_bc >> 8
+        self.m_f = Z80.SZ[b]
+        t = (((self.m_bc & 0xff) + 1) & 0xff) + io
         if io & Z80.SF:
-            self.F |= Z80.NF
+            self.m_f |= Z80.NF
         if t & 0x100:
-            self.F |= Z80.HF | Z80.CF
-        self.F |= Z80.SZP[(t & 0x07) ^ self.B] & Z80.PF
+            self.m_f |= Z80.HF | Z80.CF
+        self.m_f |= Z80.SZP[(t & 0x07) ^ b] & Z80.PF
 
     def outi(self):
         """OUTI
         """
         self.nomreq_ir(1)
-        io = self.rm(self.HL)
-        self.B = (self.B - 1) & 0xff
-        self.WZ = self.BC + 1
-        self.out(self.BC, io)
-        self.HL += 1
-        self.F = Z80.SZ[self.B]
-        t = self.L + io
+        io = self.rm(self.m_hl)
+        self.m_bc = (self.m_bc - 0x100) & 0xffff
+        self.m_wz = (self.m_bc + 1) & 0xffff
+        self.out(self.m_bc, io)
+        self.m_hl = (self.m_hl + 1) & 0xffff
+        b = self.m_bc >> 8
+        self.m_f = Z80.SZ[b]
+        t = (self.m_hl & 0xff) + io
         if io & Z80.SF:
-            self.F |= Z80.NF
+            self.m_f |= Z80.NF
         if t & 0x100:
-            self.F |= Z80.HF | Z80.CF
-        self.F |= Z80.SZP[(t & 0x07) ^ self.B] & Z80.PF
+            self.m_f |= Z80.HF | Z80.CF
+        self.m_f |= Z80.SZP[(t & 0x07) ^ b] & Z80.PF
 
     def ldd(self):
         """LDD
         """
-        io = self.rm(self.HL)
+        io = self.rm(self.m_hl)
         self.m_icount_executing -= 2
-        self.wm(self.DE, io)
+        self.wm(self.m_de, io)
         self.m_icount_executing += 2
-        self.nomreq_addr(self.DE, 2)
-        self.F &= Z80.SF | Z80.ZF | Z80.CF
-        if (self.A + io) & 0x02:
-            self.F |= Z80.YF
-        if (self.A + io) & 0x08:
-            self.F |= Z80.XF
-        self.HL -= 1
-        self.DE -= 1
-        self.BC -= 1
-        if self.BC:
-            self.F |= Z80.VF
+        self.nomreq_addr(self.m_de, 2)
+        self.m_f &= Z80.SF | Z80.ZF | Z80.CF
+        if (self.m_a + io) & 0x02:
+            self.m_f |= Z80.YF
+        if (self.m_a + io) & 0x08:
+            self.m_f |= Z80.XF
+        self.m_hl = (self.m_hl - 1) & 0xffff
+        self.m_de = (self.m_de - 1) & 0xffff
+        self.m_bc = (self.m_bc - 1) & 0xffff
+        if self.m_bc:
+            self.m_f |= Z80.VF
 
     def cpd(self):
         """CPD
         """
-        val = self.rm(self.HL)
-        self.nomreq_addr(self.DE, 5)
-        res = (self.A - val) & 0xff
-        self.WZ -= 1
-        self.HL -= 1
-        self.BC -= 1
-        self.F = (self.F & Z80.CF) \
+        val = self.rm(self.m_hl)
+        self.nomreq_addr(self.m_de, 5)
+        res = (self.m_a - val) & 0xff
+        self.m_wz = (self.m_wz - 1) & 0xffff
+        self.m_hl = (self.m_hl - 1) & 0xffff
+        self.m_bc = (self.m_bc - 1) & 0xffff
+        self.m_f = (self.m_f & Z80.CF) \
             | (Z80.SZ[res] & ~(Z80.YF | Z80.XF)) \
-            | ((self.A ^ val ^ res) & Z80.HF) \
+            | ((self.m_a ^ val ^ res) & Z80.HF) \
             | Z80.NF
-        if self.F & Z80.HF:
+        if self.m_f & Z80.HF:
             res -= 1
         if res & 0x02:
-            self.F |= Z80.YF
+            self.m_f |= Z80.YF
         if res & 0x08:
-            self.F |= Z80.XF
-        if self.BC:
-            self.F |= Z80.VF
+            self.m_f |= Z80.XF
+        if self.m_bc:
+            self.m_f |= Z80.VF
 
     def ind(self):
         """IND
         """
         self.nomreq_ir(1)
-        io = self.inp(self.BC)
-        self.WZ = self.BC - 1
-        self.B = (self.B - 1) & 0xff
-        self.wm(self.HL, io)
-        self.HL -= 1
-        self.F = Z80.SZ[self.B]
-        t = ((self.C - 1) & 0xff) + io
+        io = self.inp(self.m_bc)
+        self.m_wz = (self.m_bc - 1) & 0xffff
+        self.m_bc = (self.m_bc - 0x100) & 0xffff
+        self.wm(self.m_hl, io)
+        self.m_hl = (self.m_hl - 1) & 0xffff
+        b = self.m_bc >> 8
+        self.m_f = Z80.SZ[b]
+        t = (((self.m_bc & 0xff) - 1) & 0xff) + io
         if io & Z80.SF:
-            self.F |= Z80.NF
+            self.m_f |= Z80.NF
         if t & 0x100:
-            self.F |= Z80.HF | Z80.CF
-        self.F |= Z80.SZP[(t & 0x07) ^ self.B] & Z80.PF
+            self.m_f |= Z80.HF | Z80.CF
+        self.m_f |= Z80.SZP[(t & 0x07) ^ b] & Z80.PF
 
     def outd(self):
         """OUTD
         """
         self.nomreq_ir(1)
-        io = self.rm(self.HL)
-        self.B = (self.B - 1) & 0xff
-        self.WZ = self.BC - 1
-        self.out(self.BC, io)
-        self.HL -= 1
-        self.F = Z80.SZ[self.B]
-        t = self.L + io
+        io = self.rm(self.m_hl)
+        self.m_bc = (self.m_bc - 0x100) & 0xffff
+        self.m_wz = (self.m_bc - 1) & 0xffff
+        self.out(self.m_bc, io)
+        self.m_hl = (self.m_hl - 1) & 0xffff
+        b = self.m_bc >> 8
+        self.m_f = Z80.SZ[b]
+        t = (self.m_hl & 0xff) + io
         if io & Z80.SF:
-            self.F |= Z80.NF
+            self.m_f |= Z80.NF
         if t & 0x100:
-            self.F |= Z80.HF | Z80.CF
-        self.F |= Z80.SZP[(t & 0x07) ^ self.B] & Z80.PF
+            self.m_f |= Z80.HF | Z80.CF
+        self.m_f |= Z80.SZP[(t & 0x07) ^ b] & Z80.PF
 
     def ldir(self):
         """LDIR
         """
         self.ldi()
-        if self.BC != 0:
+        if self.m_bc != 0:
             self.CC(Z80.cc_ex, 0xb0)
-            self.nomreq_addr(self.DE, 5)
-            self.PC -= 2
-            self.WZ = self.PC + 1
+            self.nomreq_addr(self.m_de, 5)
+            self.m_pc = (self.m_pc - 2) & 0xffff
+            self.m_wz = (self.m_pc + 1) & 0xffff
+            self.block_copy(0xb0, 1)
 
     def cpir(self):
         """CPIR
         """
         self.cpi()
-        if (self.BC != 0) and (not (self.F & Z80.ZF)):
+        if (self.m_bc != 0) and (not (self.m_f & Z80.ZF)):
             self.CC(Z80.cc_ex, 0xb1)
-            self.nomreq_addr(self.HL, 5)
-            self.PC -= 2
-            self.WZ = self.PC + 1
+            self.nomreq_addr(self.m_hl, 5)
+            self.m_pc = (self.m_pc - 2) & 0xffff
+            self.m_wz = (self.m_pc + 1) & 0xffff
+            self.block_search(0xb1, 1)
 
     def inir(self):
         """INIR
         """
         self.ini()
-        if self.B != 0:
+        if self.m_bc & 0xff00:
             self.CC(Z80.cc_ex, 0xb2)
-            self.nomreq_addr(self.HL, 5)
-            self.PC -= 2
+            self.nomreq_addr(self.m_hl, 5)
+            self.m_pc = (self.m_pc - 2) & 0xffff
+            self.block_io(0xb2, 1)
 
     def otir(self):
         """OTIR
         """
         self.outi()
-        if self.B != 0:
+        if self.m_bc & 0xff00:
             self.CC(Z80.cc_ex, 0xb3)
-            self.nomreq_addr(self.BC, 5)
-            self.PC -= 2
-    
+            self.nomreq_addr(self.m_bc, 5)
+            self.m_pc = (self.m_pc - 2) & 0xffff
+            self.block_io(0xb3, 1)
+
     def lddr(self):
         """LDDR
         """
         self.ldd()
-        if self.BC != 0:
+        if self.m_bc != 0:
             self.CC(Z80.cc_ex, 0xb8)
-            self.nomreq_addr(self.DE, 5)
-            self.PC -= 2
-            self.WZ = self.PC + 1
+            self.nomreq_addr(self.m_de, 5)
+            self.m_pc = (self.m_pc - 2) & 0xffff
+            self.m_wz = (self.m_pc + 1) & 0xffff
+            self.block_copy(0xb8, -1)
 
     def cpdr(self):
         """CPDR
         """
         self.cpd()
-        if (self.BC != 0) and (not (self.F & Z80.ZF)):
+        if (self.m_bc != 0) and (not (self.m_f & Z80.ZF)):
             self.CC(Z80.cc_ex, 0xb9)
-            self.nomreq_addr(self.HL, 5)
-            self.PC -= 2
-            self.WZ = self.PC + 1
+            self.nomreq_addr(self.m_hl, 5)
+            self.m_pc = (self.m_pc - 2) & 0xffff
+            self.m_wz = (self.m_pc + 1) & 0xffff
+            self.block_search(0xb9, -1)
 
     def indr(self):
         """INDR
         """
         self.ind()
-        if self.B != 0:
+        if self.m_bc & 0xff00:
             self.CC(Z80.cc_ex, 0xba)
-            self.nomreq_addr(self.HL, 5)
-            self.PC -= 2
+            self.nomreq_addr(self.m_hl, 5)
+            self.m_pc = (self.m_pc - 2) & 0xffff
+            self.block_io(0xba, -1)
 
     def otdr(self):
         """OTDR
         """
         self.outd()
-        if self.B != 0:
+        if self.m_bc & 0xff00:
             self.CC(Z80.cc_ex, 0xbb)
-            self.nomreq_addr(self.BC, 5)
-            self.PC -= 2
+            self.nomreq_addr(self.m_bc, 5)
+            self.m_pc = (self.m_pc - 2) & 0xffff
+            self.block_io(0xbb, -1)
+
+    def block_copy(self, opcode, step):
+        """Run further iterations of LDIR/LDDR in one go
+
+        Called once an iteration has repeated. Copies as many of the
+        remaining bytes as the interpreter would within the cycles
+        left, by slice assignment between RAM/ROM pages. Stops short
+        at handler pages and after overwriting the instruction itself,
+        and does nothing when an interrupt could be taken in between.
+        """
+        if self.m_nmi_pending or self.m_wait_state or \
+                (self.m_irq_state != Z80.CLEAR_LINE and self.m_iff1):
+            return
+        repeat = Z80.cc_op[0xed] + Z80.cc_ed[opcode] + Z80.cc_ex[opcode]
+        last = repeat - Z80.cc_ex[opcode]
+        # cycles left after this iteration
+        left = self.m_icount - max(self.m_icount_executing, 0)
+        if left < 0:
+            return
+        count = min(self.m_bc, left // repeat + 1)
+
+        read_map = self.m_read_map
+        write_map = self.m_write_map
+        origins = self.m_page_origins
+        # where the opcode bytes live, to notice the copy overwriting them
+        code = []
+        for addr in (self.m_pc, (self.m_pc + 1) & 0xffff):
+            origin = origins[addr >> 8]
+            if origin is not None:
+                code.append((origin[0], origin[1] + (addr & 0xff)))
+
+        src = self.m_hl
+        dst = self.m_de
+        # the iteration just run may have hit them already
+        addr = (dst - step) & 0xffff
+        origin = origins[addr >> 8]
+        if origin is not None and write_map[addr >> 8] is read_map[addr >> 8]:
+            for buffer, offset in code:
+                if buffer is origin[0] and offset == origin[1] + (addr & 0xff):
+                    return
+        done = 0
+        value = 0
+        while done < count:
+            src_page = read_map[src >> 8]
+            dst_page = write_map[dst >> 8]
+            if src_page is None or dst_page is None:
+                break
+            # the segment up to the next page boundary on either side;
+            # s and d are the lowest offsets in the pages it covers
+            if step > 0:
+                length = min(count - done, 0x100 - (src & 0xff), 0x100 - (dst & 0xff))
+                s = src & 0xff
+                d = dst & 0xff
+            else:
+                length = min(count - done, (src & 0xff) + 1, (dst & 0xff) + 1)
+                s = (src & 0xff) - length + 1
+                d = (dst & 0xff) - length + 1
+            src_origin = origins[src >> 8]
+            dst_origin = origins[dst >> 8] if dst_page is read_map[dst >> 8] else None
+            stop = False
+            if dst_origin is not None:
+                # writes go to memory that is read: stop after the opcode
+                start = dst_origin[1] + (dst & 0xff)
+                for buffer, offset in code:
+                    if buffer is dst_origin[0]:
+                        k = (offset - start) * step
+                        if 0 <= k < length:
+                            length = k + 1
+                            stop = True
+                if step < 0:
+                    s = (src & 0xff) - length + 1
+                    d = (dst & 0xff) - length + 1
+                dst_base = dst_origin[1] + d
+            data = bytes(src_page[s:s + length])
+            if dst_origin is not None and src_origin is not None and dst_origin[0] is src_origin[0]:
+                # a copy onto its own source repeats the bytes
+                # that were read before they got overwritten
+                dist = (dst_base - (src_origin[1] + s)) * step
+                if 0 < dist < length:
+                    if step > 0:
+                        data = (data[:dist] * (length // dist + 1))[:length]
+                    else:
+                        data = (data[-dist:] * (length // dist + 1))[-length:]
+            dst_page[d:d + length] = data
+            value = data[-1] if step > 0 else data[0]
+            done += length
+            src = (src + step * length) & 0xffff
+            dst = (dst + step * length) & 0xffff
+            if stop:
+                break
+        if not done:
+            return
+
+        self.m_hl = src
+        self.m_de = dst
+        self.m_bc = (self.m_bc - done) & 0xffff
+        self.m_r += 2 * done
+        self.m_f &= Z80.SF | Z80.ZF | Z80.CF
+        if (self.m_a + value) & 0x02:
+            self.m_f |= Z80.YF
+        if (self.m_a + value) & 0x08:
+            self.m_f |= Z80.XF
+        if self.m_bc:
+            self.m_f |= Z80.VF
+            self.m_icount -= repeat * done
+        else:
+            self.m_pc = (self.m_pc + 2) & 0xffff
+            self.m_icount -= repeat * (done - 1) + last
+
+    def block_search(self, opcode, step):
+        """Run further iterations of CPIR/CPDR in one go
+
+        Called once an iteration has repeated. Looks for A in as many
+        of the remaining bytes as the interpreter would compare within
+        the cycles left, by bytes.find/rfind over RAM/ROM pages. Stops
+        short at handler pages and does nothing when an interrupt
+        could be taken in between.
+        """
+        if self.m_nmi_pending or self.m_wait_state or \
+                (self.m_irq_state != Z80.CLEAR_LINE and self.m_iff1):
+            return
+        repeat = Z80.cc_op[0xed] + Z80.cc_ed[opcode] + Z80.cc_ex[opcode]
+        last = repeat - Z80.cc_ex[opcode]
+        # cycles left after this iteration
+        left = self.m_icount - max(self.m_icount_executing, 0)
+        if left < 0:
+            return
+        count = min(self.m_bc, left // repeat + 1)
+
+        read_map = self.m_read_map
+        a = self.m_a
+        src = self.m_hl
+        done = 0
+        found = False
+        while done < count:
+            page = read_map[src >> 8]
+            if page is None:
+                break
+            # the segment up to the next page boundary
+            if step > 0:
+                length = min(count - done, 0x100 - (src & 0xff))
+                s = src & 0xff
+                k = bytes(page[s:s + length]).find(a)
+            else:
+                length = min(count - done, (src & 0xff) + 1)
+                s = (src & 0xff) - length + 1
+                k = bytes(page[s:s + length]).rfind(a)
+                if k >= 0:
+                    k = length - 1 - k
+            if k >= 0:
+                length = k + 1
+                found = True
+            done += length
+            src = (src + step * length) & 0xffff
+            if found:
+                break
+        if not done:
+            return
+
+        addr = (src - step) & 0xffff
+        val = read_map[addr >> 8][addr & 0xff]
+        self.m_hl = src
+        self.m_bc = (self.m_bc - done) & 0xffff
+        self.m_r += 2 * done
+        res = (a - val) & 0xff
+        self.m_f = (self.m_f & Z80.CF) \
+            | (Z80.SZ[res] & ~(Z80.YF | Z80.XF)) \
+            | ((a ^ val ^ res) & Z80.HF) \
+            | Z80.NF
+        if self.m_f & Z80.HF:
+            res -= 1
+        if res & 0x02:
+            self.m_f |= Z80.YF
+        if res & 0x08:
+            self.m_f |= Z80.XF
+        if self.m_bc:
+            self.m_f |= Z80.VF
+        if self.m_bc and not found:
+            self.m_icount -= repeat * done
+        else:
+            self.m_pc = (self.m_pc + 2) & 0xffff
+            self.m_wz = (self.m_wz + step) & 0xffff
+            self.m_icount -= repeat * (done - 1) + last
+
+    def block_io(self, opcode, step):
+        """Run the remaining iterations of INIR/OTIR/INDR/OTDR in one go
+
+        Called once an iteration has repeated. When the I/O bus has a
+        read_block/write_block callback, and all the remaining bytes
+        go to or come from RAM/ROM pages within the cycles left, they
+        are transferred with one call. Otherwise, when an interrupt
+        could be taken in between, or when INIR/INDR writes over its own
+        opcode, does nothing. read_block must return
+        as many bytes as asked for, or ValueError is raised before any
+        state changes.
+        """
+        inp = not opcode & 1
+        block = getattr(self.m_io, 'read_block' if inp else 'write_block', None)
+        if block is None:
+            return
+        if self.m_nmi_pending or self.m_wait_state or \
+                (self.m_irq_state != Z80.CLEAR_LINE and self.m_iff1):
+            return
+        repeat = Z80.cc_op[0xed] + Z80.cc_ed[opcode] + Z80.cc_ex[opcode]
+        last = repeat - Z80.cc_ex[opcode]
+        count = self.m_bc >> 8
+        # cycles left after this iteration
+        left = self.m_icount - max(self.m_icount_executing, 0)
+        if left < repeat * (count - 1):
+            return
+
+        # the page segments holding the bytes, lowest offset first
+        memory_map = self.m_write_map if inp else self.m_read_map
+        origins = self.m_page_origins
+        code = []
+        if inp:
+            # where the opcode bytes live, to leave an INIR/INDR
+            # overwriting them to the interpreter
+            for addr in (self.m_pc, (self.m_pc + 1) & 0xffff):
+                origin = origins[addr >> 8]
+                if origin is not None:
+                    code.append((origin[0], origin[1] + (addr & 0xff)))
+            # the iteration just run may have hit them already
+            addr = (self.m_hl - step) & 0xffff
+            origin = origins[addr >> 8]
+            if origin is not None and memory_map[addr >> 8] is self.m_read_map[addr >> 8]:
+                for buffer, offset in code:
+                    if buffer is origin[0] and offset == origin[1] + (addr & 0xff):
+                        return
+        segments = []
+        addr = self.m_hl
+        done = 0
+        while done < count:
+            page = memory_map[addr >> 8]
+            if page is None:
+                return
+            if step > 0:
+                length = min(count - done, 0x100 - (addr & 0xff))
+                s = addr & 0xff
+            else:
+                length = min(count - done, (addr & 0xff) + 1)
+                s = (addr & 0xff) - length + 1
+            origin = origins[addr >> 8]
+            if code and origin is not None and page is self.m_read_map[addr >> 8]:
+                for buffer, offset in code:
+                    if buffer is origin[0] and 0 <= offset - origin[1] - s < length:
+                        return
+            segments.append((page, s, length))
+            done += length
+            addr = (addr + step * length) & 0xffff
+
+        c = self.m_bc & 0xff
+        if inp:
+            data = bytes(block(self.m_bc, count))
+            if len(data) != count:
+                raise ValueError('read_block returned {} bytes for {}'.format(len(data), count))
+            n = 0
+            for page, s, length in segments:
+                chunk = data[n:n + length]
+                page[s:s + length] = chunk if step > 0 else chunk[::-1]
+                n += length
+            self.m_wz = (0x100 | c) + step
+            t = ((c + step) & 0xff) + data[-1]
+        else:
+            data = b''.join(bytes(page[s:s + length]) if step > 0 else
+                            bytes(page[s:s + length])[::-1]
+                            for page, s, length in segments)
+            block(((count - 1) << 8) | c, data)
+            self.m_wz = (c + step) & 0xffff
+            t = (addr & 0xff) + data[-1]
+        self.m_hl = addr
+        self.m_bc = c
+        self.m_r += 2 * count
+        self.m_f = Z80.SZ[0]
+        if data[-1] & Z80.SF:
+            self.m_f |= Z80.NF
+        if t & 0x100:
+            self.m_f |= Z80.HF | Z80.CF
+        self.m_f |= Z80.SZP[t & 0x07] & Z80.PF
+        self.m_pc = (self.m_pc + 2) & 0xffff
+        self.m_icount -= repeat * (count - 1) + last
 
     def ei(self):
         """EI
@@ -1206,367 +1854,367 @@ class Z80:
 
     # opcodes with CB prefix
     # rotate, shift and bit operations
-    def op_cb_00(self): self.B = self.rlc(self.B)
-    def op_cb_01(self): self.C = self.rlc(self.C)
-    def op_cb_02(self): self.D = self.rlc(self.D)
-    def op_cb_03(self): self.E = self.rlc(self.E)
-    def op_cb_04(self): self.H = self.rlc(self.H)
-    def op_cb_05(self): self.L = self.rlc(self.L)
-    def op_cb_06(self): self.wm(self.HL, self.rlc(self.rm_reg(self.HL)))
-    def op_cb_07(self): self.A = self.rlc(self.A)
-
-    def op_cb_08(self): self.B = self.rrc(self.B)
-    def op_cb_09(self): self.C = self.rrc(self.C)
-    def op_cb_0a(self): self.D = self.rrc(self.D)
-    def op_cb_0b(self): self.E = self.rrc(self.E)
-    def op_cb_0c(self): self.H = self.rrc(self.H)
-    def op_cb_0d(self): self.L = self.rrc(self.L)
-    def op_cb_0e(self): self.wm(self.HL, self.rrc(self.rm_reg(self.HL)))
-    def op_cb_0f(self): self.A = self.rrc(self.A)
-
-    def op_cb_10(self): self.B = self.rl(self.B)
-    def op_cb_11(self): self.C = self.rl(self.C)
-    def op_cb_12(self): self.D = self.rl(self.D)
-    def op_cb_13(self): self.E = self.rl(self.E)
-    def op_cb_14(self): self.H = self.rl(self.H)
-    def op_cb_15(self): self.L = self.rl(self.L)
-    def op_cb_16(self): self.wm(self.HL, self.rl(self.rm_reg(self.HL)))
-    def op_cb_17(self): self.A = self.rl(self.A)
-
-    def op_cb_18(self): self.B = self.rr(self.B)
-    def op_cb_19(self): self.C = self.rr(self.C)
-    def op_cb_1a(self): self.D = self.rr(self.D)
-    def op_cb_1b(self): self.E = self.rr(self.E)
-    def op_cb_1c(self): self.H = self.rr(self.H)
-    def op_cb_1d(self): self.L = self.rr(self.L)
-    def op_cb_1e(self): self.wm(self.HL, self.rr(self.rm_reg(self.HL)))
-    def op_cb_1f(self): self.A = self.rr(self.A)
-
-    def op_cb_20(self): self.B = self.sla(self.B)
-    def op_cb_21(self): self.C = self.sla(self.C)
-    def op_cb_22(self): self.D = self.sla(self.D)
-    def op_cb_23(self): self.E = self.sla(self.E)
-    def op_cb_24(self): self.H = self.sla(self.H)
-    def op_cb_25(self): self.L = self.sla(self.L)
-    def op_cb_26(self): self.wm(self.HL, self.sla(self.rm_reg(self.HL)))
-    def op_cb_27(self): self.A = self.sla(self.A)
-
-    def op_cb_28(self): self.B = self.sra(self.B)
-    def op_cb_29(self): self.C = self.sra(self.C)
-    def op_cb_2a(self): self.D = self.sra(self.D)
-    def op_cb_2b(self): self.E = self.sra(self.E)
-    def op_cb_2c(self): self.H = self.sra(self.H)
-    def op_cb_2d(self): self.L = self.sra(self.L)
-    def op_cb_2e(self): self.wm(self.HL, self.sra(self.rm_reg(self.HL)))
-    def op_cb_2f(self): self.A = self.sra(self.A)
-
-    def op_cb_30(self): self.B = self.sll(self.B)
-    def op_cb_31(self): self.C = self.sll(self.C)
-    def op_cb_32(self): self.D = self.sll(self.D)
-    def op_cb_33(self): self.E = self.sll(self.E)
-    def op_cb_34(self): self.H = self.sll(self.H)
-    def op_cb_35(self): self.L = self.sll(self.L)
-    def op_cb_36(self): self.wm(self.HL, self.sll(self.rm_reg(self.HL)))
-    def op_cb_37(self): self.A = self.sll(self.A)
-
-    def op_cb_38(self): self.B = self.srl(self.B)
-    def op_cb_39(self): self.C = self.srl(self.C)
-    def op_cb_3a(self): self.D = self.srl(self.D)
-    def op_cb_3b(self): self.E = self.srl(self.E)
-    def op_cb_3c(self): self.H = self.srl(self.H)
-    def op_cb_3d(self): self.L = self.srl(self.L)
-    def op_cb_3e(self): self.wm(self.HL, self.srl(self.rm_reg(self.HL)))
-    def op_cb_3f(self): self.A = self.srl(self.A)
-
-    def op_cb_40(self): self.bit(0, self.B)
-    def op_cb_41(self): self.bit(0, self.C)
-    def op_cb_42(self): self.bit(0, self.D)
-    def op_cb_43(self): self.bit(0, self.E)
-    def op_cb_44(self): self.bit(0, self.H)
-    def op_cb_45(self): self.bit(0, self.L)
-    def op_cb_46(self): self.bit_hl(0, self.rm_reg(self.HL))
-    def op_cb_47(self): self.bit(0, self.A)
-
-    def op_cb_48(self): self.bit(1, self.B)
-    def op_cb_49(self): self.bit(1, self.C)
-    def op_cb_4a(self): self.bit(1, self.D)
-    def op_cb_4b(self): self.bit(1, self.E)
-    def op_cb_4c(self): self.bit(1, self.H)
-    def op_cb_4d(self): self.bit(1, self.L)
-    def op_cb_4e(self): self.bit_hl(1, self.rm_reg(self.HL))
-    def op_cb_4f(self): self.bit(1, self.A)
-
-    def op_cb_50(self): self.bit(2, self.B)
-    def op_cb_51(self): self.bit(2, self.C)
-    def op_cb_52(self): self.bit(2, self.D)
-    def op_cb_53(self): self.bit(2, self.E)
-    def op_cb_54(self): self.bit(2, self.H)
-    def op_cb_55(self): self.bit(2, self.L)
-    def op_cb_56(self): self.bit_hl(2, self.rm_reg(self.HL))
-    def op_cb_57(self): self.bit(2, self.A)
-
-    def op_cb_58(self): self.bit(3, self.B)
-    def op_cb_59(self): self.bit(3, self.C)
-    def op_cb_5a(self): self.bit(3, self.D)
-    def op_cb_5b(self): self.bit(3, self.E)
-    def op_cb_5c(self): self.bit(3, self.H)
-    def op_cb_5d(self): self.bit(3, self.L)
-    def op_cb_5e(self): self.bit_hl(3, self.rm_reg(self.HL))
-    def op_cb_5f(self): self.bit(3, self.A)
-
-    def op_cb_60(self): self.bit(4, self.B)
-    def op_cb_61(self): self.bit(4, self.C)
-    def op_cb_62(self): self.bit(4, self.D)
-    def op_cb_63(self): self.bit(4, self.E)
-    def op_cb_64(self): self.bit(4, self.H)
-    def op_cb_65(self): self.bit(4, self.L)
-    def op_cb_66(self): self.bit_hl(4, self.rm_reg(self.HL))
-    def op_cb_67(self): self.bit(4, self.A)
-
-    def op_cb_68(self): self.bit(5, self.B)
-    def op_cb_69(self): self.bit(5, self.C)
-    def op_cb_6a(self): self.bit(5, self.D)
-    def op_cb_6b(self): self.bit(5, self.E)
-    def op_cb_6c(self): self.bit(5, self.H)
-    def op_cb_6d(self): self.bit(5, self.L)
-    def op_cb_6e(self): self.bit_hl(5, self.rm_reg(self.HL))
-    def op_cb_6f(self): self.bit(5, self.A)
-
-    def op_cb_70(self): self.bit(6, self.B)
-    def op_cb_71(self): self.bit(6, self.C)
-    def op_cb_72(self): self.bit(6, self.D)
-    def op_cb_73(self): self.bit(6, self.E)
-    def op_cb_74(self): self.bit(6, self.H)
-    def op_cb_75(self): self.bit(6, self.L)
-    def op_cb_76(self): self.bit_hl(6, self.rm_reg(self.HL))
-    def op_cb_77(self): self.bit(6, self.A)
-
-    def op_cb_78(self): self.bit(7, self.B)
-    def op_cb_79(self): self.bit(7, self.C)
-    def op_cb_7a(self): self.bit(7, self.D)
-    def op_cb_7b(self): self.bit(7, self.E)
-    def op_cb_7c(self): self.bit(7, self.H)
-    def op_cb_7d(self): self.bit(7, self.L)
-    def op_cb_7e(self): self.bit_hl(7, self.rm_reg(self.HL))
-    def op_cb_7f(self): self.bit(7, self.A)
-
-    def op_cb_80(self): self.B = self.res(0, self.B)
-    def op_cb_81(self): self.C = self.res(0, self.C)
-    def op_cb_82(self): self.D = self.res(0, self.D)
-    def op_cb_83(self): self.E = self.res(0, self.E)
-    def op_cb_84(self): self.H = self.res(0, self.H)
-    def op_cb_85(self): self.L = self.res(0, self.L)
-    def op_cb_86(self): self.wm(self.HL, self.res(0, self.rm_reg(self.HL)))
-    def op_cb_87(self): self.A = self.res(0, self.A)
-
-    def op_cb_88(self): self.B = self.res(1, self.B)
-    def op_cb_89(self): self.C = self.res(1, self.C)
-    def op_cb_8a(self): self.D = self.res(1, self.D)
-    def op_cb_8b(self): self.E = self.res(1, self.E)
-    def op_cb_8c(self): self.H = self.res(1, self.H)
-    def op_cb_8d(self): self.L = self.res(1, self.L)
-    def op_cb_8e(self): self.wm(self.HL, self.res(1, self.rm_reg(self.HL)))
-    def op_cb_8f(self): self.A = self.res(1, self.A)
-
-    def op_cb_90(self): self.B = self.res(2, self.B)
-    def op_cb_91(self): self.C = self.res(2, self.C)
-    def op_cb_92(self): self.D = self.res(2, self.D)
-    def op_cb_93(self): self.E = self.res(2, self.E)
-    def op_cb_94(self): self.H = self.res(2, self.H)
-    def op_cb_95(self): self.L = self.res(2, self.L)
-    def op_cb_96(self): self.wm(self.HL, self.res(2, self.rm_reg(self.HL)))
-    def op_cb_97(self): self.A = self.res(2, self.A)
-
-    def op_cb_98(self): self.B = self.res(3, self.B)
-    def op_cb_99(self): self.C = self.res(3, self.C)
-    def op_cb_9a(self): self.D = self.res(3, self.D)
-    def op_cb_9b(self): self.E = self.res(3, self.E)
-    def op_cb_9c(self): self.H = self.res(3, self.H)
-    def op_cb_9d(self): self.L = self.res(3, self.L)
-    def op_cb_9e(self): self.wm(self.HL, self.res(3, self.rm_reg(self.HL)))
-    def op_cb_9f(self): self.A = self.res(3, self.A)
-
-    def op_cb_a0(self): self.B = self.res(4, self.B)
-    def op_cb_a1(self): self.C = self.res(4, self.C)
-    def op_cb_a2(self): self.D = self.res(4, self.D)
-    def op_cb_a3(self): self.E = self.res(4, self.E)
-    def op_cb_a4(self): self.H = self.res(4, self.H)
-    def op_cb_a5(self): self.L = self.res(4, self.L)
-    def op_cb_a6(self): self.wm(self.HL, self.res(4, self.rm_reg(self.HL)))
-    def op_cb_a7(self): self.A = self.res(4, self.A)
-
-    def op_cb_a8(self): self.B = self.res(5, self.B)
-    def op_cb_a9(self): self.C = self.res(5, self.C)
-    def op_cb_aa(self): self.D = self.res(5, self.D)
-    def op_cb_ab(self): self.E = self.res(5, self.E)
-    def op_cb_ac(self): self.H = self.res(5, self.H)
-    def op_cb_ad(self): self.L = self.res(5, self.L)
-    def op_cb_ae(self): self.wm(self.HL, self.res(5, self.rm_reg(self.HL)))
-    def op_cb_af(self): self.A = self.res(5, self.A)
-
-    def op_cb_b0(self): self.B = self.res(6, self.B)
-    def op_cb_b1(self): self.C = self.res(6, self.C)
-    def op_cb_b2(self): self.D = self.res(6, self.D)
-    def op_cb_b3(self): self.E = self.res(6, self.E)
-    def op_cb_b4(self): self.H = self.res(6, self.H)
-    def op_cb_b5(self): self.L = self.res(6, self.L)
-    def op_cb_b6(self): self.wm(self.HL, self.res(6, self.rm_reg(self.HL)))
-    def op_cb_b7(self): self.A = self.res(6, self.A)
-
-    def op_cb_b8(self): self.B = self.res(7, self.B)
-    def op_cb_b9(self): self.C = self.res(7, self.C)
-    def op_cb_ba(self): self.D = self.res(7, self.D)
-    def op_cb_bb(self): self.E = self.res(7, self.E)
-    def op_cb_bc(self): self.H = self.res(7, self.H)
-    def op_cb_bd(self): self.L = self.res(7, self.L)
-    def op_cb_be(self): self.wm(self.HL, self.res(7, self.rm_reg(self.HL)))
-    def op_cb_bf(self): self.A = self.res(7, self.A)
-
-    def op_cb_c0(self): self.B = self.set(0, self.B)
-    def op_cb_c1(self): self.C = self.set(0, self.C)
-    def op_cb_c2(self): self.D = self.set(0, self.D)
-    def op_cb_c3(self): self.E = self.set(0, self.E)
-    def op_cb_c4(self): self.H = self.set(0, self.H)
-    def op_cb_c5(self): self.L = self.set(0, self.L)
-    def op_cb_c6(self): self.wm(self.HL, self.set(0, self.rm_reg(self.HL)))
-    def op_cb_c7(self): self.A = self.set(0, self.A)
-
-    def op_cb_c8(self): self.B = self.set(1, self.B)
-    def op_cb_c9(self): self.C = self.set(1, self.C)
-    def op_cb_ca(self): self.D = self.set(1, self.D)
-    def op_cb_cb(self): self.E = self.set(1, self.E)
-    def op_cb_cc(self): self.H = self.set(1, self.H)
-    def op_cb_cd(self): self.L = self.set(1, self.L)
-    def op_cb_ce(self): self.wm(self.HL, self.set(1, self.rm_reg(self.HL)))
-    def op_cb_cf(self): self.A = self.set(1, self.A)
-
-    def op_cb_d0(self): self.B = self.set(2, self.B)
-    def op_cb_d1(self): self.C = self.set(2, self.C)
-    def op_cb_d2(self): self.D = self.set(2, self.D)
-    def op_cb_d3(self): self.E = self.set(2, self.E)
-    def op_cb_d4(self): self.H = self.set(2, self.H)
-    def op_cb_d5(self): self.L = self.set(2, self.L)
-    def op_cb_d6(self): self.wm(self.HL, self.set(2, self.rm_reg(self.HL)))
-    def op_cb_d7(self): self.A = self.set(2, self.A)
-
-    def op_cb_d8(self): self.B = self.set(3, self.B)
-    def op_cb_d9(self): self.C = self.set(3, self.C)
-    def op_cb_da(self): self.D = self.set(3, self.D)
-    def op_cb_db(self): self.E = self.set(3, self.E)
-    def op_cb_dc(self): self.H = self.set(3, self.H)
-    def op_cb_dd(self): self.L = self.set(3, self.L)
-    def op_cb_de(self): self.wm(self.HL, self.set(3, self.rm_reg(self.HL)))
-    def op_cb_df(self): self.A = self.set(3, self.A)
-
-    def op_cb_e0(self): self.B = self.set(4, self.B)
-    def op_cb_e1(self): self.C = self.set(4, self.C)
-    def op_cb_e2(self): self.D = self.set(4, self.D)
-    def op_cb_e3(self): self.E = self.set(4, self.E)
-    def op_cb_e4(self): self.H = self.set(4, self.H)
-    def op_cb_e5(self): self.L = self.set(4, self.L)
-    def op_cb_e6(self): self.wm(self.HL, self.set(4, self.rm_reg(self.HL)))
-    def op_cb_e7(self): self.A = self.set(4, self.A)
-
-    def op_cb_e8(self): self.B = self.set(5, self.B)
-    def op_cb_e9(self): self.C = self.set(5, self.C)
-    def op_cb_ea(self): self.D = self.set(5, self.D)
-    def op_cb_eb(self): self.E = self.set(5, self.E)
-    def op_cb_ec(self): self.H = self.set(5, self.H)
-    def op_cb_ed(self): self.L = self.set(5, self.L)
-    def op_cb_ee(self): self.wm(self.HL, self.set(5, self.rm_reg(self.HL)))
-    def op_cb_ef(self): self.A = self.set(5, self.A)
-
-    def op_cb_f0(self): self.B = self.set(6, self.B)
-    def op_cb_f1(self): self.C = self.set(6, self.C)
-    def op_cb_f2(self): self.D = self.set(6, self.D)
-    def op_cb_f3(self): self.E = self.set(6, self.E)
-    def op_cb_f4(self): self.H = self.set(6, self.H)
-    def op_cb_f5(self): self.L = self.set(6, self.L)
-    def op_cb_f6(self): self.wm(self.HL, self.set(6, self.rm_reg(self.HL)))
-    def op_cb_f7(self): self.A = self.set(6, self.A)
-
-    def op_cb_f8(self): self.B = self.set(7, self.B)
-    def op_cb_f9(self): self.C = self.set(7, self.C)
-    def op_cb_fa(self): self.D = self.set(7, self.D)
-    def op_cb_fb(self): self.E = self.set(7, self.E)
-    def op_cb_fc(self): self.H = self.set(7, self.H)
-    def op_cb_fd(self): self.L = self.set(7, self.L)
-    def op_cb_fe(self): self.wm(self.HL, self.set(7, self.rm_reg(self.HL)))
-    def op_cb_ff(self): self.A = self.set(7, self.A)
+    def op_cb_00(self): self.m_bc = (self.rlc((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_01(self): self.m_bc = (self.m_bc & 0xff00) | self.rlc((self.m_bc & 0xff))
+    def op_cb_02(self): self.m_de = (self.rlc((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_03(self): self.m_de = (self.m_de & 0xff00) | self.rlc((self.m_de & 0xff))
+    def op_cb_04(self): self.m_hl = (self.rlc((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_05(self): self.m_hl = (self.m_hl & 0xff00) | self.rlc((self.m_hl & 0xff))
+    def op_cb_06(self): self.wm(self.m_hl, self.rlc(self.rm_reg(self.m_hl)))
+    def op_cb_07(self): self.m_a = self.rlc(self.m_a)
+
+    def op_cb_08(self): self.m_bc = (self.rrc((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_09(self): self.m_bc = (self.m_bc & 0xff00) | self.rrc((self.m_bc & 0xff))
+    def op_cb_0a(self): self.m_de = (self.rrc((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_0b(self): self.m_de = (self.m_de & 0xff00) | self.rrc((self.m_de & 0xff))
+    def op_cb_0c(self): self.m_hl = (self.rrc((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_0d(self): self.m_hl = (self.m_hl & 0xff00) | self.rrc((self.m_hl & 0xff))
+    def op_cb_0e(self): self.wm(self.m_hl, self.rrc(self.rm_reg(self.m_hl)))
+    def op_cb_0f(self): self.m_a = self.rrc(self.m_a)
+
+    def op_cb_10(self): self.m_bc = (self.rl((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_11(self): self.m_bc = (self.m_bc & 0xff00) | self.rl((self.m_bc & 0xff))
+    def op_cb_12(self): self.m_de = (self.rl((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_13(self): self.m_de = (self.m_de & 0xff00) | self.rl((self.m_de & 0xff))
+    def op_cb_14(self): self.m_hl = (self.rl((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_15(self): self.m_hl = (self.m_hl & 0xff00) | self.rl((self.m_hl & 0xff))
+    def op_cb_16(self): self.wm(self.m_hl, self.rl(self.rm_reg(self.m_hl)))
+    def op_cb_17(self): self.m_a = self.rl(self.m_a)
+
+    def op_cb_18(self): self.m_bc = (self.rr((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_19(self): self.m_bc = (self.m_bc & 0xff00) | self.rr((self.m_bc & 0xff))
+    def op_cb_1a(self): self.m_de = (self.rr((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_1b(self): self.m_de = (self.m_de & 0xff00) | self.rr((self.m_de & 0xff))
+    def op_cb_1c(self): self.m_hl = (self.rr((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_1d(self): self.m_hl = (self.m_hl & 0xff00) | self.rr((self.m_hl & 0xff))
+    def op_cb_1e(self): self.wm(self.m_hl, self.rr(self.rm_reg(self.m_hl)))
+    def op_cb_1f(self): self.m_a = self.rr(self.m_a)
+
+    def op_cb_20(self): self.m_bc = (self.sla((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_21(self): self.m_bc = (self.m_bc & 0xff00) | self.sla((self.m_bc & 0xff))
+    def op_cb_22(self): self.m_de = (self.sla((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_23(self): self.m_de = (self.m_de & 0xff00) | self.sla((self.m_de & 0xff))
+    def op_cb_24(self): self.m_hl = (self.sla((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_25(self): self.m_hl = (self.m_hl & 0xff00) | self.sla((self.m_hl & 0xff))
+    def op_cb_26(self): self.wm(self.m_hl, self.sla(self.rm_reg(self.m_hl)))
+    def op_cb_27(self): self.m_a = self.sla(self.m_a)
+
+    def op_cb_28(self): self.m_bc = (self.sra((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_29(self): self.m_bc = (self.m_bc & 0xff00) | self.sra((self.m_bc & 0xff))
+    def op_cb_2a(self): self.m_de = (self.sra((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_2b(self): self.m_de = (self.m_de & 0xff00) | self.sra((self.m_de & 0xff))
+    def op_cb_2c(self): self.m_hl = (self.sra((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_2d(self): self.m_hl = (self.m_hl & 0xff00) | self.sra((self.m_hl & 0xff))
+    def op_cb_2e(self): self.wm(self.m_hl, self.sra(self.rm_reg(self.m_hl)))
+    def op_cb_2f(self): self.m_a = self.sra(self.m_a)
+
+    def op_cb_30(self): self.m_bc = (self.sll((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_31(self): self.m_bc = (self.m_bc & 0xff00) | self.sll((self.m_bc & 0xff))
+    def op_cb_32(self): self.m_de = (self.sll((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_33(self): self.m_de = (self.m_de & 0xff00) | self.sll((self.m_de & 0xff))
+    def op_cb_34(self): self.m_hl = (self.sll((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_35(self): self.m_hl = (self.m_hl & 0xff00) | self.sll((self.m_hl & 0xff))
+    def op_cb_36(self): self.wm(self.m_hl, self.sll(self.rm_reg(self.m_hl)))
+    def op_cb_37(self): self.m_a = self.sll(self.m_a)
+
+    def op_cb_38(self): self.m_bc = (self.srl((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_39(self): self.m_bc = (self.m_bc & 0xff00) | self.srl((self.m_bc & 0xff))
+    def op_cb_3a(self): self.m_de = (self.srl((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_3b(self): self.m_de = (self.m_de & 0xff00) | self.srl((self.m_de & 0xff))
+    def op_cb_3c(self): self.m_hl = (self.srl((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_3d(self): self.m_hl = (self.m_hl & 0xff00) | self.srl((self.m_hl & 0xff))
+    def op_cb_3e(self): self.wm(self.m_hl, self.srl(self.rm_reg(self.m_hl)))
+    def op_cb_3f(self): self.m_a = self.srl(self.m_a)
+
+    def op_cb_40(self): self.bit(0, (self.m_bc >> 8))
+    def op_cb_41(self): self.bit(0, (self.m_bc & 0xff))
+    def op_cb_42(self): self.bit(0, (self.m_de >> 8))
+    def op_cb_43(self): self.bit(0, (self.m_de & 0xff))
+    def op_cb_44(self): self.bit(0, (self.m_hl >> 8))
+    def op_cb_45(self): self.bit(0, (self.m_hl & 0xff))
+    def op_cb_46(self): self.bit_hl(0, self.rm_reg(self.m_hl))
+    def op_cb_47(self): self.bit(0, self.m_a)
+
+    def op_cb_48(self): self.bit(1, (self.m_bc >> 8))
+    def op_cb_49(self): self.bit(1, (self.m_bc & 0xff))
+    def op_cb_4a(self): self.bit(1, (self.m_de >> 8))
+    def op_cb_4b(self): self.bit(1, (self.m_de & 0xff))
+    def op_cb_4c(self): self.bit(1, (self.m_hl >> 8))
+    def op_cb_4d(self): self.bit(1, (self.m_hl & 0xff))
+    def op_cb_4e(self): self.bit_hl(1, self.rm_reg(self.m_hl))
+    def op_cb_4f(self): self.bit(1, self.m_a)
+
+    def op_cb_50(self): self.bit(2, (self.m_bc >> 8))
+    def op_cb_51(self): self.bit(2, (self.m_bc & 0xff))
+    def op_cb_52(self): self.bit(2, (self.m_de >> 8))
+    def op_cb_53(self): self.bit(2, (self.m_de & 0xff))
+    def op_cb_54(self): self.bit(2, (self.m_hl >> 8))
+    def op_cb_55(self): self.bit(2, (self.m_hl & 0xff))
+    def op_cb_56(self): self.bit_hl(2, self.rm_reg(self.m_hl))
+    def op_cb_57(self): self.bit(2, self.m_a)
+
+    def op_cb_58(self): self.bit(3, (self.m_bc >> 8))
+    def op_cb_59(self): self.bit(3, (self.m_bc & 0xff))
+    def op_cb_5a(self): self.bit(3, (self.m_de >> 8))
+    def op_cb_5b(self): self.bit(3, (self.m_de & 0xff))
+    def op_cb_5c(self): self.bit(3, (self.m_hl >> 8))
+    def op_cb_5d(self): self.bit(3, (self.m_hl & 0xff))
+    def op_cb_5e(self): self.bit_hl(3, self.rm_reg(self.m_hl))
+    def op_cb_5f(self): self.bit(3, self.m_a)
+
+    def op_cb_60(self): self.bit(4, (self.m_bc >> 8))
+    def op_cb_61(self): self.bit(4, (self.m_bc & 0xff))
+    def op_cb_62(self): self.bit(4, (self.m_de >> 8))
+    def op_cb_63(self): self.bit(4, (self.m_de & 0xff))
+    def op_cb_64(self): self.bit(4, (self.m_hl >> 8))
+    def op_cb_65(self): self.bit(4, (self.m_hl & 0xff))
+    def op_cb_66(self): self.bit_hl(4, self.rm_reg(self.m_hl))
+    def op_cb_67(self): self.bit(4, self.m_a)
+
+    def op_cb_68(self): self.bit(5, (self.m_bc >> 8))
+    def op_cb_69(self): self.bit(5, (self.m_bc & 0xff))
+    def op_cb_6a(self): self.bit(5, (self.m_de >> 8))
+    def op_cb_6b(self): self.bit(5, (self.m_de & 0xff))
+    def op_cb_6c(self): self.bit(5, (self.m_hl >> 8))
+    def op_cb_6d(self): self.bit(5, (self.m_hl & 0xff))
+    def op_cb_6e(self): self.bit_hl(5, self.rm_reg(self.m_hl))
+    def op_cb_6f(self): self.bit(5, self.m_a)
+
+    def op_cb_70(self): self.bit(6, (self.m_bc >> 8))
+    def op_cb_71(self): self.bit(6, (self.m_bc & 0xff))
+    def op_cb_72(self): self.bit(6, (self.m_de >> 8))
+    def op_cb_73(self): self.bit(6, (self.m_de & 0xff))
+    def op_cb_74(self): self.bit(6, (self.m_hl >> 8))
+    def op_cb_75(self): self.bit(6, (self.m_hl & 0xff))
+    def op_cb_76(self): self.bit_hl(6, self.rm_reg(self.m_hl))
+    def op_cb_77(self): self.bit(6, self.m_a)
+
+    def op_cb_78(self): self.bit(7, (self.m_bc >> 8))
+    def op_cb_79(self): self.bit(7, (self.m_bc & 0xff))
+    def op_cb_7a(self): self.bit(7, (self.m_de >> 8))
+    def op_cb_7b(self): self.bit(7, (self.m_de & 0xff))
+    def op_cb_7c(self): self.bit(7, (self.m_hl >> 8))
+    def op_cb_7d(self): self.bit(7, (self.m_hl & 0xff))
+    def op_cb_7e(self): self.bit_hl(7, self.rm_reg(self.m_hl))
+    def op_cb_7f(self): self.bit(7, self.m_a)
+
+    def op_cb_80(self): self.m_bc = (self.res(0, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_81(self): self.m_bc = (self.m_bc & 0xff00) | self.res(0, (self.m_bc & 0xff))
+    def op_cb_82(self): self.m_de = (self.res(0, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_83(self): self.m_de = (self.m_de & 0xff00) | self.res(0, (self.m_de & 0xff))
+    def op_cb_84(self): self.m_hl = (self.res(0, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_85(self): self.m_hl = (self.m_hl & 0xff00) | self.res(0, (self.m_hl & 0xff))
+    def op_cb_86(self): self.wm(self.m_hl, self.res(0, self.rm_reg(self.m_hl)))
+    def op_cb_87(self): self.m_a = self.res(0, self.m_a)
+
+    def op_cb_88(self): self.m_bc = (self.res(1, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_89(self): self.m_bc = (self.m_bc & 0xff00) | self.res(1, (self.m_bc & 0xff))
+    def op_cb_8a(self): self.m_de = (self.res(1, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_8b(self): self.m_de = (self.m_de & 0xff00) | self.res(1, (self.m_de & 0xff))
+    def op_cb_8c(self): self.m_hl = (self.res(1, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_8d(self): self.m_hl = (self.m_hl & 0xff00) | self.res(1, (self.m_hl & 0xff))
+    def op_cb_8e(self): self.wm(self.m_hl, self.res(1, self.rm_reg(self.m_hl)))
+    def op_cb_8f(self): self.m_a = self.res(1, self.m_a)
+
+    def op_cb_90(self): self.m_bc = (self.res(2, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_91(self): self.m_bc = (self.m_bc & 0xff00) | self.res(2, (self.m_bc & 0xff))
+    def op_cb_92(self): self.m_de = (self.res(2, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_93(self): self.m_de = (self.m_de & 0xff00) | self.res(2, (self.m_de & 0xff))
+    def op_cb_94(self): self.m_hl = (self.res(2, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_95(self): self.m_hl = (self.m_hl & 0xff00) | self.res(2, (self.m_hl & 0xff))
+    def op_cb_96(self): self.wm(self.m_hl, self.res(2, self.rm_reg(self.m_hl)))
+    def op_cb_97(self): self.m_a = self.res(2, self.m_a)
+
+    def op_cb_98(self): self.m_bc = (self.res(3, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_99(self): self.m_bc = (self.m_bc & 0xff00) | self.res(3, (self.m_bc & 0xff))
+    def op_cb_9a(self): self.m_de = (self.res(3, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_9b(self): self.m_de = (self.m_de & 0xff00) | self.res(3, (self.m_de & 0xff))
+    def op_cb_9c(self): self.m_hl = (self.res(3, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_9d(self): self.m_hl = (self.m_hl & 0xff00) | self.res(3, (self.m_hl & 0xff))
+    def op_cb_9e(self): self.wm(self.m_hl, self.res(3, self.rm_reg(self.m_hl)))
+    def op_cb_9f(self): self.m_a = self.res(3, self.m_a)
+
+    def op_cb_a0(self): self.m_bc = (self.res(4, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_a1(self): self.m_bc = (self.m_bc & 0xff00) | self.res(4, (self.m_bc & 0xff))
+    def op_cb_a2(self): self.m_de = (self.res(4, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_a3(self): self.m_de = (self.m_de & 0xff00) | self.res(4, (self.m_de & 0xff))
+    def op_cb_a4(self): self.m_hl = (self.res(4, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_a5(self): self.m_hl = (self.m_hl & 0xff00) | self.res(4, (self.m_hl & 0xff))
+    def op_cb_a6(self): self.wm(self.m_hl, self.res(4, self.rm_reg(self.m_hl)))
+    def op_cb_a7(self): self.m_a = self.res(4, self.m_a)
+
+    def op_cb_a8(self): self.m_bc = (self.res(5, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_a9(self): self.m_bc = (self.m_bc & 0xff00) | self.res(5, (self.m_bc & 0xff))
+    def op_cb_aa(self): self.m_de = (self.res(5, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_ab(self): self.m_de = (self.m_de & 0xff00) | self.res(5, (self.m_de & 0xff))
+    def op_cb_ac(self): self.m_hl = (self.res(5, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_ad(self): self.m_hl = (self.m_hl & 0xff00) | self.res(5, (self.m_hl & 0xff))
+    def op_cb_ae(self): self.wm(self.m_hl, self.res(5, self.rm_reg(self.m_hl)))
+    def op_cb_af(self): self.m_a = self.res(5, self.m_a)
+
+    def op_cb_b0(self): self.m_bc = (self.res(6, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_b1(self): self.m_bc = (self.m_bc & 0xff00) | self.res(6, (self.m_bc & 0xff))
+    def op_cb_b2(self): self.m_de = (self.res(6, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_b3(self): self.m_de = (self.m_de & 0xff00) | self.res(6, (self.m_de & 0xff))
+    def op_cb_b4(self): self.m_hl = (self.res(6, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_b5(self): self.m_hl = (self.m_hl & 0xff00) | self.res(6, (self.m_hl & 0xff))
+    def op_cb_b6(self): self.wm(self.m_hl, self.res(6, self.rm_reg(self.m_hl)))
+    def op_cb_b7(self): self.m_a = self.res(6, self.m_a)
+
+    def op_cb_b8(self): self.m_bc = (self.res(7, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_b9(self): self.m_bc = (self.m_bc & 0xff00) | self.res(7, (self.m_bc & 0xff))
+    def op_cb_ba(self): self.m_de = (self.res(7, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_bb(self): self.m_de = (self.m_de & 0xff00) | self.res(7, (self.m_de & 0xff))
+    def op_cb_bc(self): self.m_hl = (self.res(7, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_bd(self): self.m_hl = (self.m_hl & 0xff00) | self.res(7, (self.m_hl & 0xff))
+    def op_cb_be(self): self.wm(self.m_hl, self.res(7, self.rm_reg(self.m_hl)))
+    def op_cb_bf(self): self.m_a = self.res(7, self.m_a)
+
+    def op_cb_c0(self): self.m_bc = (self.set(0, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_c1(self): self.m_bc = (self.m_bc & 0xff00) | self.set(0, (self.m_bc & 0xff))
+    def op_cb_c2(self): self.m_de = (self.set(0, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_c3(self): self.m_de = (self.m_de & 0xff00) | self.set(0, (self.m_de & 0xff))
+    def op_cb_c4(self): self.m_hl = (self.set(0, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_c5(self): self.m_hl = (self.m_hl & 0xff00) | self.set(0, (self.m_hl & 0xff))
+    def op_cb_c6(self): self.wm(self.m_hl, self.set(0, self.rm_reg(self.m_hl)))
+    def op_cb_c7(self): self.m_a = self.set(0, self.m_a)
+
+    def op_cb_c8(self): self.m_bc = (self.set(1, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_c9(self): self.m_bc = (self.m_bc & 0xff00) | self.set(1, (self.m_bc & 0xff))
+    def op_cb_ca(self): self.m_de = (self.set(1, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_cb(self): self.m_de = (self.m_de & 0xff00) | self.set(1, (self.m_de & 0xff))
+    def op_cb_cc(self): self.m_hl = (self.set(1, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_cd(self): self.m_hl = (self.m_hl & 0xff00) | self.set(1, (self.m_hl & 0xff))
+    def op_cb_ce(self): self.wm(self.m_hl, self.set(1, self.rm_reg(self.m_hl)))
+    def op_cb_cf(self): self.m_a = self.set(1, self.m_a)
+
+    def op_cb_d0(self): self.m_bc = (self.set(2, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_d1(self): self.m_bc = (self.m_bc & 0xff00) | self.set(2, (self.m_bc & 0xff))
+    def op_cb_d2(self): self.m_de = (self.set(2, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_d3(self): self.m_de = (self.m_de & 0xff00) | self.set(2, (self.m_de & 0xff))
+    def op_cb_d4(self): self.m_hl = (self.set(2, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_d5(self): self.m_hl = (self.m_hl & 0xff00) | self.set(2, (self.m_hl & 0xff))
+    def op_cb_d6(self): self.wm(self.m_hl, self.set(2, self.rm_reg(self.m_hl)))
+    def op_cb_d7(self): self.m_a = self.set(2, self.m_a)
+
+    def op_cb_d8(self): self.m_bc = (self.set(3, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_d9(self): self.m_bc = (self.m_bc & 0xff00) | self.set(3, (self.m_bc & 0xff))
+    def op_cb_da(self): self.m_de = (self.set(3, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_db(self): self.m_de = (self.m_de & 0xff00) | self.set(3, (self.m_de & 0xff))
+    def op_cb_dc(self): self.m_hl = (self.set(3, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_dd(self): self.m_hl = (self.m_hl & 0xff00) | self.set(3, (self.m_hl & 0xff))
+    def op_cb_de(self): self.wm(self.m_hl, self.set(3, self.rm_reg(self.m_hl)))
+    def op_cb_df(self): self.m_a = self.set(3, self.m_a)
+
+    def op_cb_e0(self): self.m_bc = (self.set(4, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_e1(self): self.m_bc = (self.m_bc & 0xff00) | self.set(4, (self.m_bc & 0xff))
+    def op_cb_e2(self): self.m_de = (self.set(4, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_e3(self): self.m_de = (self.m_de & 0xff00) | self.set(4, (self.m_de & 0xff))
+    def op_cb_e4(self): self.m_hl = (self.set(4, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_e5(self): self.m_hl = (self.m_hl & 0xff00) | self.set(4, (self.m_hl & 0xff))
+    def op_cb_e6(self): self.wm(self.m_hl, self.set(4, self.rm_reg(self.m_hl)))
+    def op_cb_e7(self): self.m_a = self.set(4, self.m_a)
+
+    def op_cb_e8(self): self.m_bc = (self.set(5, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_e9(self): self.m_bc = (self.m_bc & 0xff00) | self.set(5, (self.m_bc & 0xff))
+    def op_cb_ea(self): self.m_de = (self.set(5, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_eb(self): self.m_de = (self.m_de & 0xff00) | self.set(5, (self.m_de & 0xff))
+    def op_cb_ec(self): self.m_hl = (self.set(5, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_ed(self): self.m_hl = (self.m_hl & 0xff00) | self.set(5, (self.m_hl & 0xff))
+    def op_cb_ee(self): self.wm(self.m_hl, self.set(5, self.rm_reg(self.m_hl)))
+    def op_cb_ef(self): self.m_a = self.set(5, self.m_a)
+
+    def op_cb_f0(self): self.m_bc = (self.set(6, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_f1(self): self.m_bc = (self.m_bc & 0xff00) | self.set(6, (self.m_bc & 0xff))
+    def op_cb_f2(self): self.m_de = (self.set(6, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_f3(self): self.m_de = (self.m_de & 0xff00) | self.set(6, (self.m_de & 0xff))
+    def op_cb_f4(self): self.m_hl = (self.set(6, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_f5(self): self.m_hl = (self.m_hl & 0xff00) | self.set(6, (self.m_hl & 0xff))
+    def op_cb_f6(self): self.wm(self.m_hl, self.set(6, self.rm_reg(self.m_hl)))
+    def op_cb_f7(self): self.m_a = self.set(6, self.m_a)
+
+    def op_cb_f8(self): self.m_bc = (self.set(7, (self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_cb_f9(self): self.m_bc = (self.m_bc & 0xff00) | self.set(7, (self.m_bc & 0xff))
+    def op_cb_fa(self): self.m_de = (self.set(7, (self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_cb_fb(self): self.m_de = (self.m_de & 0xff00) | self.set(7, (self.m_de & 0xff))
+    def op_cb_fc(self): self.m_hl = (self.set(7, (self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_cb_fd(self): self.m_hl = (self.m_hl & 0xff00) | self.set(7, (self.m_hl & 0xff))
+    def op_cb_fe(self): self.wm(self.m_hl, self.set(7, self.rm_reg(self.m_hl)))
+    def op_cb_ff(self): self.m_a = self.set(7, self.m_a)
 
     # opcodes with DD/FD CB prefix
     # rotate, shift and bit operations with (IX+o)
-    def op_xycb_00(self): self.B = self.rlc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_01(self): self.C = self.rlc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_02(self): self.D = self.rlc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_03(self): self.E = self.rlc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_04(self): self.H = self.rlc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_05(self): self.L = self.rlc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_00(self): self.m_bc = (self.rlc(self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_01(self): self.m_bc = (self.m_bc & 0xff00) | self.rlc(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_02(self): self.m_de = (self.rlc(self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_03(self): self.m_de = (self.m_de & 0xff00) | self.rlc(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_04(self): self.m_hl = (self.rlc(self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_05(self): self.m_hl = (self.m_hl & 0xff00) | self.rlc(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_06(self): self.wm(self.m_ea, self.rlc(self.rm_reg(self.m_ea)))
-    def op_xycb_07(self): self.A = self.rlc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_08(self): self.B = self.rrc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_09(self): self.C = self.rrc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_0a(self): self.D = self.rrc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_0b(self): self.E = self.rrc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_0c(self): self.H = self.rrc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_0d(self): self.L = self.rrc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_07(self): self.m_a = self.rlc(self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_08(self): self.m_bc = (self.rrc(self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_09(self): self.m_bc = (self.m_bc & 0xff00) | self.rrc(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_0a(self): self.m_de = (self.rrc(self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_0b(self): self.m_de = (self.m_de & 0xff00) | self.rrc(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_0c(self): self.m_hl = (self.rrc(self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_0d(self): self.m_hl = (self.m_hl & 0xff00) | self.rrc(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_0e(self): self.wm(self.m_ea, self.rrc(self.rm_reg(self.m_ea)))
-    def op_xycb_0f(self): self.A = self.rrc(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_10(self): self.B = self.rl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_11(self): self.C = self.rl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_12(self): self.D = self.rl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_13(self): self.E = self.rl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_14(self): self.H = self.rl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_15(self): self.L = self.rl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_0f(self): self.m_a = self.rrc(self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_10(self): self.m_bc = (self.rl(self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_11(self): self.m_bc = (self.m_bc & 0xff00) | self.rl(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_12(self): self.m_de = (self.rl(self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_13(self): self.m_de = (self.m_de & 0xff00) | self.rl(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_14(self): self.m_hl = (self.rl(self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_15(self): self.m_hl = (self.m_hl & 0xff00) | self.rl(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_16(self): self.wm(self.m_ea, self.rl(self.rm_reg(self.m_ea)))
-    def op_xycb_17(self): self.A = self.rl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_18(self): self.B = self.rr(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_19(self): self.C = self.rr(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_1a(self): self.D = self.rr(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_1b(self): self.E = self.rr(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_1c(self): self.H = self.rr(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_1d(self): self.L = self.rr(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_17(self): self.m_a = self.rl(self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_18(self): self.m_bc = (self.rr(self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_19(self): self.m_bc = (self.m_bc & 0xff00) | self.rr(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_1a(self): self.m_de = (self.rr(self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_1b(self): self.m_de = (self.m_de & 0xff00) | self.rr(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_1c(self): self.m_hl = (self.rr(self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_1d(self): self.m_hl = (self.m_hl & 0xff00) | self.rr(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_1e(self): self.wm(self.m_ea, self.rr(self.rm_reg(self.m_ea)))
-    def op_xycb_1f(self): self.A = self.rr(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_20(self): self.B = self.sla(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_21(self): self.C = self.sla(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_22(self): self.D = self.sla(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_23(self): self.E = self.sla(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_24(self): self.H = self.sla(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_25(self): self.L = self.sla(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_1f(self): self.m_a = self.rr(self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_20(self): self.m_bc = (self.sla(self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_21(self): self.m_bc = (self.m_bc & 0xff00) | self.sla(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_22(self): self.m_de = (self.sla(self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_23(self): self.m_de = (self.m_de & 0xff00) | self.sla(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_24(self): self.m_hl = (self.sla(self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_25(self): self.m_hl = (self.m_hl & 0xff00) | self.sla(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_26(self): self.wm(self.m_ea, self.sla(self.rm_reg(self.m_ea)))
-    def op_xycb_27(self): self.A = self.sla(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_28(self): self.B = self.sra(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_29(self): self.C = self.sra(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_2a(self): self.D = self.sra(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_2b(self): self.E = self.sra(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_2c(self): self.H = self.sra(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_2d(self): self.L = self.sra(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_27(self): self.m_a = self.sla(self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_28(self): self.m_bc = (self.sra(self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_29(self): self.m_bc = (self.m_bc & 0xff00) | self.sra(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_2a(self): self.m_de = (self.sra(self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_2b(self): self.m_de = (self.m_de & 0xff00) | self.sra(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_2c(self): self.m_hl = (self.sra(self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_2d(self): self.m_hl = (self.m_hl & 0xff00) | self.sra(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_2e(self): self.wm(self.m_ea, self.sra(self.rm_reg(self.m_ea)))
-    def op_xycb_2f(self): self.A = self.sra(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_30(self): self.B = self.sll(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_31(self): self.C = self.sll(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_32(self): self.D = self.sll(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_33(self): self.E = self.sll(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_34(self): self.H = self.sll(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_35(self): self.L = self.sll(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_2f(self): self.m_a = self.sra(self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_30(self): self.m_bc = (self.sll(self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_31(self): self.m_bc = (self.m_bc & 0xff00) | self.sll(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_32(self): self.m_de = (self.sll(self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_33(self): self.m_de = (self.m_de & 0xff00) | self.sll(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_34(self): self.m_hl = (self.sll(self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_35(self): self.m_hl = (self.m_hl & 0xff00) | self.sll(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_36(self): self.wm(self.m_ea, self.sll(self.rm_reg(self.m_ea)))
-    def op_xycb_37(self): self.A = self.sll(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_38(self): self.B = self.srl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_39(self): self.C = self.srl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_3a(self): self.D = self.srl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_3b(self): self.E = self.srl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_3c(self): self.H = self.srl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_3d(self): self.L = self.srl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_37(self): self.m_a = self.sll(self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_38(self): self.m_bc = (self.srl(self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_39(self): self.m_bc = (self.m_bc & 0xff00) | self.srl(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_3a(self): self.m_de = (self.srl(self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_3b(self): self.m_de = (self.m_de & 0xff00) | self.srl(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_3c(self): self.m_hl = (self.srl(self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_3d(self): self.m_hl = (self.m_hl & 0xff00) | self.srl(self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_3e(self): self.wm(self.m_ea, self.srl(self.rm_reg(self.m_ea)))
-    def op_xycb_3f(self): self.A = self.srl(self.rmreg(self.m_ea)); self.wm(self.m_ea, self.A)
+    def op_xycb_3f(self): self.m_a = self.srl(self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
 
     def op_xycb_40(self): self.op_xycb_46()
     def op_xycb_41(self): self.op_xycb_46()
@@ -1640,155 +2288,155 @@ class Z80:
     def op_xycb_7e(self): self.bit_xy(7, self.rm_reg(self.m_ea))
     def op_xycb_7f(self): self.op_xycb_7e()
 
-    def op_xycb_80(self): self.B = self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_81(self): self.C = self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_82(self): self.D = self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_83(self): self.E = self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_84(self): self.H = self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_85(self): self.L = self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_80(self): self.m_bc = (self.res(0, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_81(self): self.m_bc = (self.m_bc & 0xff00) | self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_82(self): self.m_de = (self.res(0, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_83(self): self.m_de = (self.m_de & 0xff00) | self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_84(self): self.m_hl = (self.res(0, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_85(self): self.m_hl = (self.m_hl & 0xff00) | self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_86(self): self.wm(self.m_ea, self.res(0, self.rm_reg(self.m_ea)))
-    def op_xycb_87(self): self.A = self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_88(self): self.B = self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_89(self): self.C = self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_8a(self): self.D = self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_8b(self): self.E = self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_8c(self): self.H = self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_8d(self): self.L = self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_87(self): self.m_a = self.res(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_88(self): self.m_bc = (self.res(1, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_89(self): self.m_bc = (self.m_bc & 0xff00) | self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_8a(self): self.m_de = (self.res(1, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_8b(self): self.m_de = (self.m_de & 0xff00) | self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_8c(self): self.m_hl = (self.res(1, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_8d(self): self.m_hl = (self.m_hl & 0xff00) | self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_8e(self): self.wm(self.m_ea, self.res(1, self.rm_reg(self.m_ea)))
-    def op_xycb_8f(self): self.A = self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_90(self): self.B = self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_91(self): self.C = self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_92(self): self.D = self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_93(self): self.E = self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_94(self): self.H = self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_95(self): self.L = self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_8f(self): self.m_a = self.res(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_90(self): self.m_bc = (self.res(2, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_91(self): self.m_bc = (self.m_bc & 0xff00) | self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_92(self): self.m_de = (self.res(2, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_93(self): self.m_de = (self.m_de & 0xff00) | self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_94(self): self.m_hl = (self.res(2, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_95(self): self.m_hl = (self.m_hl & 0xff00) | self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_96(self): self.wm(self.m_ea, self.res(2, self.rm_reg(self.m_ea)))
-    def op_xycb_97(self): self.A = self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_98(self): self.B = self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_99(self): self.C = self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_9a(self): self.D = self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_9b(self): self.E = self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_9c(self): self.H = self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_9d(self): self.L = self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_97(self): self.m_a = self.res(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_98(self): self.m_bc = (self.res(3, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_99(self): self.m_bc = (self.m_bc & 0xff00) | self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_9a(self): self.m_de = (self.res(3, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_9b(self): self.m_de = (self.m_de & 0xff00) | self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_9c(self): self.m_hl = (self.res(3, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_9d(self): self.m_hl = (self.m_hl & 0xff00) | self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_9e(self): self.wm(self.m_ea, self.res(3, self.rm_reg(self.m_ea)))
-    def op_xycb_9f(self): self.A = self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_a0(self): self.B = self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_a1(self): self.C = self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_a2(self): self.D = self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_a3(self): self.E = self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_a4(self): self.H = self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_a5(self): self.L = self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_9f(self): self.m_a = self.res(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_a0(self): self.m_bc = (self.res(4, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_a1(self): self.m_bc = (self.m_bc & 0xff00) | self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_a2(self): self.m_de = (self.res(4, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_a3(self): self.m_de = (self.m_de & 0xff00) | self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_a4(self): self.m_hl = (self.res(4, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_a5(self): self.m_hl = (self.m_hl & 0xff00) | self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_a6(self): self.wm(self.m_ea, self.res(4, self.rm_reg(self.m_ea)))
-    def op_xycb_a7(self): self.A = self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_a8(self): self.B = self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_a9(self): self.C = self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_aa(self): self.D = self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_ab(self): self.E = self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_ac(self): self.H = self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_ad(self): self.L = self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_a7(self): self.m_a = self.res(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_a8(self): self.m_bc = (self.res(5, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_a9(self): self.m_bc = (self.m_bc & 0xff00) | self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_aa(self): self.m_de = (self.res(5, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_ab(self): self.m_de = (self.m_de & 0xff00) | self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_ac(self): self.m_hl = (self.res(5, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_ad(self): self.m_hl = (self.m_hl & 0xff00) | self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_ae(self): self.wm(self.m_ea, self.res(5, self.rm_reg(self.m_ea)))
-    def op_xycb_af(self): self.A = self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_b0(self): self.B = self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_b1(self): self.C = self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_b2(self): self.D = self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_b3(self): self.E = self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_b4(self): self.H = self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_b5(self): self.L = self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_af(self): self.m_a = self.res(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_b0(self): self.m_bc = (self.res(6, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_b1(self): self.m_bc = (self.m_bc & 0xff00) | self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_b2(self): self.m_de = (self.res(6, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_b3(self): self.m_de = (self.m_de & 0xff00) | self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_b4(self): self.m_hl = (self.res(6, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_b5(self): self.m_hl = (self.m_hl & 0xff00) | self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_b6(self): self.wm(self.m_ea, self.res(6, self.rm_reg(self.m_ea)))
-    def op_xycb_b7(self): self.A = self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_b8(self): self.B = self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_b9(self): self.C = self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_ba(self): self.D = self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_bb(self): self.E = self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_bc(self): self.H = self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_bd(self): self.L = self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_b7(self): self.m_a = self.res(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_b8(self): self.m_bc = (self.res(7, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_b9(self): self.m_bc = (self.m_bc & 0xff00) | self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_ba(self): self.m_de = (self.res(7, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_bb(self): self.m_de = (self.m_de & 0xff00) | self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_bc(self): self.m_hl = (self.res(7, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_bd(self): self.m_hl = (self.m_hl & 0xff00) | self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_be(self): self.wm(self.m_ea, self.res(7, self.rm_reg(self.m_ea)))
-    def op_xycb_bf(self): self.A = self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_c0(self): self.B = self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_c1(self): self.C = self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_c2(self): self.D = self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_c3(self): self.E = self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_c4(self): self.H = self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_c5(self): self.L = self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_bf(self): self.m_a = self.res(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_c0(self): self.m_bc = (self.set(0, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_c1(self): self.m_bc = (self.m_bc & 0xff00) | self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_c2(self): self.m_de = (self.set(0, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_c3(self): self.m_de = (self.m_de & 0xff00) | self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_c4(self): self.m_hl = (self.set(0, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_c5(self): self.m_hl = (self.m_hl & 0xff00) | self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_c6(self): self.wm(self.m_ea, self.set(0, self.rm_reg(self.m_ea)))
-    def op_xycb_c7(self): self.A = self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_c8(self): self.B = self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_c9(self): self.C = self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_ca(self): self.D = self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_cb(self): self.E = self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_cc(self): self.H = self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_cd(self): self.L = self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_c7(self): self.m_a = self.set(0, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_c8(self): self.m_bc = (self.set(1, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_c9(self): self.m_bc = (self.m_bc & 0xff00) | self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_ca(self): self.m_de = (self.set(1, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_cb(self): self.m_de = (self.m_de & 0xff00) | self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_cc(self): self.m_hl = (self.set(1, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_cd(self): self.m_hl = (self.m_hl & 0xff00) | self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_ce(self): self.wm(self.m_ea, self.set(1, self.rm_reg(self.m_ea)))
-    def op_xycb_cf(self): self.A = self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_d0(self): self.B = self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_d1(self): self.C = self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_d2(self): self.D = self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_d3(self): self.E = self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_d4(self): self.H = self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_d5(self): self.L = self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_cf(self): self.m_a = self.set(1, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_d0(self): self.m_bc = (self.set(2, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_d1(self): self.m_bc = (self.m_bc & 0xff00) | self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_d2(self): self.m_de = (self.set(2, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_d3(self): self.m_de = (self.m_de & 0xff00) | self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_d4(self): self.m_hl = (self.set(2, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_d5(self): self.m_hl = (self.m_hl & 0xff00) | self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_d6(self): self.wm(self.m_ea, self.set(2, self.rm_reg(self.m_ea)))
-    def op_xycb_d7(self): self.A = self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_d8(self): self.B = self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_d9(self): self.C = self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_da(self): self.D = self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_db(self): self.E = self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_dc(self): self.H = self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_dd(self): self.L = self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_d7(self): self.m_a = self.set(2, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_d8(self): self.m_bc = (self.set(3, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_d9(self): self.m_bc = (self.m_bc & 0xff00) | self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_da(self): self.m_de = (self.set(3, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_db(self): self.m_de = (self.m_de & 0xff00) | self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_dc(self): self.m_hl = (self.set(3, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_dd(self): self.m_hl = (self.m_hl & 0xff00) | self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_de(self): self.wm(self.m_ea, self.set(3, self.rm_reg(self.m_ea)))
-    def op_xycb_df(self): self.A = self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_e0(self): self.B = self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_e1(self): self.C = self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_e2(self): self.D = self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_e3(self): self.E = self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_e4(self): self.H = self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_e5(self): self.L = self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_df(self): self.m_a = self.set(3, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_e0(self): self.m_bc = (self.set(4, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_e1(self): self.m_bc = (self.m_bc & 0xff00) | self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_e2(self): self.m_de = (self.set(4, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_e3(self): self.m_de = (self.m_de & 0xff00) | self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_e4(self): self.m_hl = (self.set(4, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_e5(self): self.m_hl = (self.m_hl & 0xff00) | self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_e6(self): self.wm(self.m_ea, self.set(4, self.rm_reg(self.m_ea)))
-    def op_xycb_e7(self): self.A = self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_e8(self): self.B = self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_e9(self): self.C = self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_ea(self): self.D = self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_eb(self): self.E = self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_ec(self): self.H = self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_ed(self): self.L = self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_e7(self): self.m_a = self.set(4, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_e8(self): self.m_bc = (self.set(5, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_e9(self): self.m_bc = (self.m_bc & 0xff00) | self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_ea(self): self.m_de = (self.set(5, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_eb(self): self.m_de = (self.m_de & 0xff00) | self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_ec(self): self.m_hl = (self.set(5, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_ed(self): self.m_hl = (self.m_hl & 0xff00) | self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_ee(self): self.wm(self.m_ea, self.set(5, self.rm_reg(self.m_ea)))
-    def op_xycb_ef(self): self.A = self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_f0(self): self.B = self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_f1(self): self.C = self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_f2(self): self.D = self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_f3(self): self.E = self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_f4(self): self.H = self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_f5(self): self.L = self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_ef(self): self.m_a = self.set(5, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_f0(self): self.m_bc = (self.set(6, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_f1(self): self.m_bc = (self.m_bc & 0xff00) | self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_f2(self): self.m_de = (self.set(6, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_f3(self): self.m_de = (self.m_de & 0xff00) | self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_f4(self): self.m_hl = (self.set(6, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_f5(self): self.m_hl = (self.m_hl & 0xff00) | self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_f6(self): self.wm(self.m_ea, self.set(6, self.rm_reg(self.m_ea)))
-    def op_xycb_f7(self): self.A = self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
-
-    def op_xycb_f8(self): self.B = self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.B)
-    def op_xycb_f9(self): self.C = self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.C)
-    def op_xycb_fa(self): self.D = self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.D)
-    def op_xycb_fb(self): self.E = self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.E)
-    def op_xycb_fc(self): self.H = self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.H)
-    def op_xycb_fd(self): self.L = self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.L)
+    def op_xycb_f7(self): self.m_a = self.set(6, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
+
+    def op_xycb_f8(self): self.m_bc = (self.set(7, self.rm_reg(self.m_ea)) << 8) | (self.m_bc & 0xff); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_xycb_f9(self): self.m_bc = (self.m_bc & 0xff00) | self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_xycb_fa(self): self.m_de = (self.set(7, self.rm_reg(self.m_ea)) << 8) | (self.m_de & 0xff); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_xycb_fb(self): self.m_de = (self.m_de & 0xff00) | self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_xycb_fc(self): self.m_hl = (self.set(7, self.rm_reg(self.m_ea)) << 8) | (self.m_hl & 0xff); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_xycb_fd(self): self.m_hl = (self.m_hl & 0xff00) | self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_xycb_fe(self): self.wm(self.m_ea, self.set(7, self.rm_reg(self.m_ea)))
-    def op_xycb_ff(self): self.A = self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.A)
+    def op_xycb_ff(self): self.m_a = self.set(7, self.rm_reg(self.m_ea)); self.wm(self.m_ea, self.m_a)
 
     def op_illegal_1(self):
         self.log("Z80 ill. opcode ${:02x} ${:02x} (${:04x})".format(
-            self.m_opcodes.read(self.PC-2),
-            self.m_opcodes.read(self.PC-1),
-            self.PC-2))
+            self.read_mem((self.m_pc - 2) & 0xffff),
+            self.read_mem((self.m_pc - 1) & 0xffff),
+            (self.m_pc - 2) & 0xffff))
 
     # IX register related opcodes (DD prefix)
     def op_dd_00(self): self.op_illegal_1(); self.op_op_00()
@@ -1801,7 +2449,7 @@ class Z80:
     def op_dd_07(self): self.op_illegal_1(); self.op_op_07()
 
     def op_dd_08(self): self.op_illegal_1(); self.op_op_08()
-    def op_dd_09(self): self.add16(self.m_ix, self.m_bc)
+    def op_dd_09(self): self.m_ix = self.add16(self.m_ix, self.m_bc)
     def op_dd_0a(self): self.op_illegal_1(); self.op_op_0a()
     def op_dd_0b(self): self.op_illegal_1(); self.op_op_0b()
     def op_dd_0c(self): self.op_illegal_1(); self.op_op_0c()
@@ -1819,7 +2467,7 @@ class Z80:
     def op_dd_17(self): self.op_illegal_1(); self.op_op_17()
 
     def op_dd_18(self): self.op_illegal_1(); self.op_op_18()
-    def op_dd_19(self): self.add16(self.m_ix, self.m_de)
+    def op_dd_19(self): self.m_ix = self.add16(self.m_ix, self.m_de)
     def op_dd_1a(self): self.op_illegal_1(); self.op_op_1a()
     def op_dd_1b(self): self.op_illegal_1(); self.op_op_1b()
     def op_dd_1c(self): self.op_illegal_1(); self.op_op_1c()
@@ -1828,34 +2476,34 @@ class Z80:
     def op_dd_1f(self): self.op_illegal_1(); self.op_op_1f()
 
     def op_dd_20(self): self.op_illegal_1(); self.op_op_20()
-    def op_dd_21(self): self.IX = self.arg16()
-    def op_dd_22(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_ix); self.WZ = self.m_ea + 1
-    def op_dd_23(self): self.nomreq_ir(2); self.IX += 1
-    def op_dd_24(self): self.HX = self.inc(self.HX)
-    def op_dd_25(self): self.HX = self.dec(self.HX)
-    def op_dd_26(self): self.HX = self.arg()
+    def op_dd_21(self): self.m_ix = self.arg16()
+    def op_dd_22(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_ix); self.m_wz = (self.m_ea + 1) & 0xffff
+    def op_dd_23(self): self.nomreq_ir(2); self.m_ix = (self.m_ix + 1) & 0xffff
+    def op_dd_24(self): self.m_ix = (self.inc((self.m_ix >> 8)) << 8) | (self.m_ix & 0xff)
+    def op_dd_25(self): self.m_ix = (self.dec((self.m_ix >> 8)) << 8) | (self.m_ix & 0xff)
+    def op_dd_26(self): self.m_ix = (self.arg() << 8) | (self.m_ix & 0xff)
     def op_dd_27(self): self.op_illegal_1(); self.op_op_27()
 
     def op_dd_28(self): self.op_illegal_1(); self.op_op_28()
-    def op_dd_29(self): self.add16(self.m_ix, self.m_ix)
-    def op_dd_2a(self): self.m_ea = self.arg16(); self.rm16(self.m_ea, self.m_ix); self.WZ = self.m_ea + 1
-    def op_dd_2b(self): self.nomreq_ir(2); self.IX -= 1
-    def op_dd_2c(self): self.LX = self.inc(self.LX)
-    def op_dd_2d(self): self.LX = self.dec(self.LX)
-    def op_dd_2e(self): self.LX = self.arg()
+    def op_dd_29(self): self.m_ix = self.add16(self.m_ix, self.m_ix)
+    def op_dd_2a(self): self.m_ea = self.arg16(); self.m_ix = self.rm16(self.m_ea); self.m_wz = (self.m_ea + 1) & 0xffff
+    def op_dd_2b(self): self.nomreq_ir(2); self.m_ix = (self.m_ix - 1) & 0xffff
+    def op_dd_2c(self): self.m_ix = (self.m_ix & 0xff00) | self.inc((self.m_ix & 0xff))
+    def op_dd_2d(self): self.m_ix = (self.m_ix & 0xff00) | self.dec((self.m_ix & 0xff))
+    def op_dd_2e(self): self.m_ix = (self.m_ix & 0xff00) | self.arg()
     def op_dd_2f(self): self.op_illegal_1(); self.op_op_2f()
 
     def op_dd_30(self): self.op_illegal_1(); self.op_op_30()
     def op_dd_31(self): self.op_illegal_1(); self.op_op_31()
     def op_dd_32(self): self.op_illegal_1(); self.op_op_32()
     def op_dd_33(self): self.op_illegal_1(); self.op_op_33()
-    def op_dd_34(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.inc(self.rm_reg(self.m_ea)))
-    def op_dd_35(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.dec(self.rm_reg(self.m_ea)))
-    def op_dd_36(self): self.eax(); a = self.arg(); self.nomreq_addr(self.PC - 1, 2); self.wm(self.m_ea, a)
+    def op_dd_34(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, self.inc(self.rm_reg(self.m_ea)))
+    def op_dd_35(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, self.dec(self.rm_reg(self.m_ea)))
+    def op_dd_36(self): self.eax(); a = self.arg(); self.nomreq_addr(self.m_pc - 1, 2); self.wm(self.m_ea, a)
     def op_dd_37(self): self.op_illegal_1(); self.op_op_37()
 
     def op_dd_38(self): self.op_illegal_1(); self.op_op_38()
-    def op_dd_39(self): self.add16(self.m_ix, self.m_sp)
+    def op_dd_39(self): self.m_ix = self.add16(self.m_ix, self.m_sp)
     def op_dd_3a(self): self.op_illegal_1(); self.op_op_3a()
     def op_dd_3b(self): self.op_illegal_1(); self.op_op_3b()
     def op_dd_3c(self): self.op_illegal_1(); self.op_op_3c()
@@ -1867,144 +2515,144 @@ class Z80:
     def op_dd_41(self): self.op_illegal_1(); self.op_op_41()
     def op_dd_42(self): self.op_illegal_1(); self.op_op_42()
     def op_dd_43(self): self.op_illegal_1(); self.op_op_43()
-    def op_dd_44(self): self.B = self.HX
-    def op_dd_45(self): self.B = self.LX
-    def op_dd_46(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.B = self.rm(self.m_ea)
+    def op_dd_44(self): self.m_bc = ((self.m_ix >> 8) << 8) | (self.m_bc & 0xff)
+    def op_dd_45(self): self.m_bc = ((self.m_ix & 0xff) << 8) | (self.m_bc & 0xff)
+    def op_dd_46(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.m_bc = (self.rm(self.m_ea) << 8) | (self.m_bc & 0xff)
     def op_dd_47(self): self.op_illegal_1(); self.op_op_47()
 
     def op_dd_48(self): self.op_illegal_1(); self.op_op_48()
     def op_dd_49(self): self.op_illegal_1(); self.op_op_49()
     def op_dd_4a(self): self.op_illegal_1(); self.op_op_4a()
     def op_dd_4b(self): self.op_illegal_1(); self.op_op_4b()
-    def op_dd_4c(self): self.C = self.HX
-    def op_dd_4d(self): self.C = self.LX
-    def op_dd_4e(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.C = self.rm(self.m_ea)
+    def op_dd_4c(self): self.m_bc = (self.m_bc & 0xff00) | (self.m_ix >> 8)
+    def op_dd_4d(self): self.m_bc = (self.m_bc & 0xff00) | (self.m_ix & 0xff)
+    def op_dd_4e(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.m_bc = (self.m_bc & 0xff00) | self.rm(self.m_ea)
     def op_dd_4f(self): self.op_illegal_1(); self.op_op_4f()
 
     def op_dd_50(self): self.op_illegal_1(); self.op_op_50()
     def op_dd_51(self): self.op_illegal_1(); self.op_op_51()
     def op_dd_52(self): self.op_illegal_1(); self.op_op_52()
     def op_dd_53(self): self.op_illegal_1(); self.op_op_53()
-    def op_dd_54(self): self.D = self.HX
-    def op_dd_55(self): self.D = self.LX
-    def op_dd_56(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.D = self.rm(self.m_ea)
+    def op_dd_54(self): self.m_de = ((self.m_ix >> 8) << 8) | (self.m_de & 0xff)
+    def op_dd_55(self): self.m_de = ((self.m_ix & 0xff) << 8) | (self.m_de & 0xff)
+    def op_dd_56(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.m_de = (self.rm(self.m_ea) << 8) | (self.m_de & 0xff)
     def op_dd_57(self): self.op_illegal_1(); self.op_op_57()
 
     def op_dd_58(self): self.op_illegal_1(); self.op_op_58()
     def op_dd_59(self): self.op_illegal_1(); self.op_op_59()
     def op_dd_5a(self): self.op_illegal_1(); self.op_op_5a()
     def op_dd_5b(self): self.op_illegal_1(); self.op_op_5b()
-    def op_dd_5c(self): self.E = self.HX
-    def op_dd_5d(self): self.E = self.LX
-    def op_dd_5e(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.E = self.rm(self.m_ea)
+    def op_dd_5c(self): self.m_de = (self.m_de & 0xff00) | (self.m_ix >> 8)
+    def op_dd_5d(self): self.m_de = (self.m_de & 0xff00) | (self.m_ix & 0xff)
+    def op_dd_5e(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.m_de = (self.m_de & 0xff00) | self.rm(self.m_ea)
     def op_dd_5f(self): self.op_illegal_1(); self.op_op_5f()
 
-    def op_dd_60(self): self.HX = self.B
-    def op_dd_61(self): self.HX = self.C
-    def op_dd_62(self): self.HX = self.D
-    def op_dd_63(self): self.HX = self.E
+    def op_dd_60(self): self.m_ix = ((self.m_bc >> 8) << 8) | (self.m_ix & 0xff)
+    def op_dd_61(self): self.m_ix = ((self.m_bc & 0xff) << 8) | (self.m_ix & 0xff)
+    def op_dd_62(self): self.m_ix = ((self.m_de >> 8) << 8) | (self.m_ix & 0xff)
+    def op_dd_63(self): self.m_ix = ((self.m_de & 0xff) << 8) | (self.m_ix & 0xff)
     def op_dd_64(self): pass
-    def op_dd_65(self): self.HX = self.LX
-    def op_dd_66(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.H = self.rm(self.m_ea)
-    def op_dd_67(self): self.HX = self.A
-
-    def op_dd_68(self): self.LX = self.B
-    def op_dd_69(self): self.LX = self.C
-    def op_dd_6a(self): self.LX = self.D
-    def op_dd_6b(self): self.LX = self.E
-    def op_dd_6c(self): self.LX = self.HX
+    def op_dd_65(self): self.m_ix = ((self.m_ix & 0xff) << 8) | (self.m_ix & 0xff)
+    def op_dd_66(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.m_hl = (self.rm(self.m_ea) << 8) | (self.m_hl & 0xff)
+    def op_dd_67(self): self.m_ix = (self.m_a << 8) | (self.m_ix & 0xff)
+
+    def op_dd_68(self): self.m_ix = (self.m_ix & 0xff00) | (self.m_bc >> 8)
+    def op_dd_69(self): self.m_ix = (self.m_ix & 0xff00) | (self.m_bc & 0xff)
+    def op_dd_6a(self): self.m_ix = (self.m_ix & 0xff00) | (self.m_de >> 8)
+    def op_dd_6b(self): self.m_ix = (self.m_ix & 0xff00) | (self.m_de & 0xff)
+    def op_dd_6c(self): self.m_ix = (self.m_ix & 0xff00) | (self.m_ix >> 8)
     def op_dd_6d(self): pass
-    def op_dd_6e(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.L = self.rm(self.m_ea)
-    def op_dd_6f(self): self.LX = self.A
-
-    def op_dd_70(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.B)
-    def op_dd_71(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.C)
-    def op_dd_72(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.D)
-    def op_dd_73(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.E)
-    def op_dd_74(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.H)
-    def op_dd_75(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.L)
+    def op_dd_6e(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.m_hl = (self.m_hl & 0xff00) | self.rm(self.m_ea)
+    def op_dd_6f(self): self.m_ix = (self.m_ix & 0xff00) | self.m_a
+
+    def op_dd_70(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_dd_71(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_dd_72(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_dd_73(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_dd_74(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_dd_75(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_dd_76(self): self.op_illegal_1(); self.op_op_76()
-    def op_dd_77(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.A)
+    def op_dd_77(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, self.m_a)
 
     def op_dd_78(self): self.op_illegal_1(); self.op_op_78()
     def op_dd_79(self): self.op_illegal_1(); self.op_op_79()
     def op_dd_7a(self): self.op_illegal_1(); self.op_op_7a()
     def op_dd_7b(self): self.op_illegal_1(); self.op_op_7b()
-    def op_dd_7c(self): self.A = self.HX
-    def op_dd_7d(self): self.A = self.LX
-    def op_dd_7e(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.A = self.rm(self.m_ea)
+    def op_dd_7c(self): self.m_a = (self.m_ix >> 8)
+    def op_dd_7d(self): self.m_a = (self.m_ix & 0xff)
+    def op_dd_7e(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.m_a = self.rm(self.m_ea)
     def op_dd_7f(self): self.op_illegal_1(); self.op_op_7f()
 
     def op_dd_80(self): self.op_illegal_1(); self.op_op_80()
     def op_dd_81(self): self.op_illegal_1(); self.op_op_81()
     def op_dd_82(self): self.op_illegal_1(); self.op_op_82()
     def op_dd_83(self): self.op_illegal_1(); self.op_op_83()
-    def op_dd_84(self): self.add_a(self.HX)
-    def op_dd_85(self): self.add_a(self.LX)
-    def op_dd_86(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.add_a(self.rm(self.m_ea))
+    def op_dd_84(self): self.add_a((self.m_ix >> 8))
+    def op_dd_85(self): self.add_a((self.m_ix & 0xff))
+    def op_dd_86(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.add_a(self.rm(self.m_ea))
     def op_dd_87(self): self.op_illegal_1(); self.op_op_87()
 
     def op_dd_88(self): self.op_illegal_1(); self.op_op_88()
     def op_dd_89(self): self.op_illegal_1(); self.op_op_89()
     def op_dd_8a(self): self.op_illegal_1(); self.op_op_8a()
     def op_dd_8b(self): self.op_illegal_1(); self.op_op_8b()
-    def op_dd_8c(self): self.adc_a(self.HX)
-    def op_dd_8d(self): self.adc_a(self.LX)
-    def op_dd_8e(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.adc_a(self.rm(self.m_ea))
+    def op_dd_8c(self): self.adc_a((self.m_ix >> 8))
+    def op_dd_8d(self): self.adc_a((self.m_ix & 0xff))
+    def op_dd_8e(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.adc_a(self.rm(self.m_ea))
     def op_dd_8f(self): self.op_illegal_1(); self.op_op_8f()
 
     def op_dd_90(self): self.op_illegal_1(); self.op_op_90()
     def op_dd_91(self): self.op_illegal_1(); self.op_op_91()
     def op_dd_92(self): self.op_illegal_1(); self.op_op_92()
     def op_dd_93(self): self.op_illegal_1(); self.op_op_93()
-    def op_dd_94(self): self.sub(self.HX)
-    def op_dd_95(self): self.sub(self.LX)
-    def op_dd_96(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.sub(self.rm(self.m_ea))
+    def op_dd_94(self): self.sub((self.m_ix >> 8))
+    def op_dd_95(self): self.sub((self.m_ix & 0xff))
+    def op_dd_96(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.sub(self.rm(self.m_ea))
     def op_dd_97(self): self.op_illegal_1(); self.op_op_97()
 
     def op_dd_98(self): self.op_illegal_1(); self.op_op_98()
     def op_dd_99(self): self.op_illegal_1(); self.op_op_99()
     def op_dd_9a(self): self.op_illegal_1(); self.op_op_9a()
     def op_dd_9b(self): self.op_illegal_1(); self.op_op_9b()
-    def op_dd_9c(self): self.sbc_a(self.HX)
-    def op_dd_9d(self): self.sbc_a(self.LX)
-    def op_dd_9e(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.sbc_a(self.rm(self.m_ea))
+    def op_dd_9c(self): self.sbc_a((self.m_ix >> 8))
+    def op_dd_9d(self): self.sbc_a((self.m_ix & 0xff))
+    def op_dd_9e(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.sbc_a(self.rm(self.m_ea))
     def op_dd_9f(self): self.op_illegal_1(); self.op_op_9f()
 
     def op_dd_a0(self): self.op_illegal_1(); self.op_op_a0()
     def op_dd_a1(self): self.op_illegal_1(); self.op_op_a1()
     def op_dd_a2(self): self.op_illegal_1(); self.op_op_a2()
     def op_dd_a3(self): self.op_illegal_1(); self.op_op_a3()
-    def op_dd_a4(self): self.and_a(self.HX)
-    def op_dd_a5(self): self.and_a(self.LX)
-    def op_dd_a6(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.and_a(self.rm(self.m_ea))
+    def op_dd_a4(self): self.and_a((self.m_ix >> 8))
+    def op_dd_a5(self): self.and_a((self.m_ix & 0xff))
+    def op_dd_a6(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.and_a(self.rm(self.m_ea))
     def op_dd_a7(self): self.op_illegal_1(); self.op_op_a7()
 
     def op_dd_a8(self): self.op_illegal_1(); self.op_op_a8()
     def op_dd_a9(self): self.op_illegal_1(); self.op_op_a9()
     def op_dd_aa(self): self.op_illegal_1(); self.op_op_aa()
     def op_dd_ab(self): self.op_illegal_1(); self.op_op_ab()
-    def op_dd_ac(self): self.xor_a(self.HX)
-    def op_dd_ad(self): self.xor_a(self.LX)
-    def op_dd_ae(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.xor_a(self.rm(self.m_ea))
+    def op_dd_ac(self): self.xor_a((self.m_ix >> 8))
+    def op_dd_ad(self): self.xor_a((self.m_ix & 0xff))
+    def op_dd_ae(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.xor_a(self.rm(self.m_ea))
     def op_dd_af(self): self.op_illegal_1(); self.op_op_af()
 
     def op_dd_b0(self): self.op_illegal_1(); self.op_op_b0()
     def op_dd_b1(self): self.op_illegal_1(); self.op_op_b1()
     def op_dd_b2(self): self.op_illegal_1(); self.op_op_b2()
     def op_dd_b3(self): self.op_illegal_1(); self.op_op_b3()
-    def op_dd_b4(self): self.or_a(self.HX)
-    def op_dd_b5(self): self.or_a(self.LX)
-    def op_dd_b6(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.or_a(self.rm(self.m_ea))
+    def op_dd_b4(self): self.or_a((self.m_ix >> 8))
+    def op_dd_b5(self): self.or_a((self.m_ix & 0xff))
+    def op_dd_b6(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.or_a(self.rm(self.m_ea))
     def op_dd_b7(self): self.op_illegal_1(); self.op_op_b7()
 
     def op_dd_b8(self): self.op_illegal_1(); self.op_op_b8()
     def op_dd_b9(self): self.op_illegal_1(); self.op_op_b9()
     def op_dd_ba(self): self.op_illegal_1(); self.op_op_ba()
     def op_dd_bb(self): self.op_illegal_1(); self.op_op_bb()
-    def op_dd_bc(self): self.cp(self.HX)
-    def op_dd_bd(self): self.cp(self.LX)
-    def op_dd_be(self): self.eax(); self.nomreq_addr(self.PC - 1, 5); self.cp(self.rm(self.m_ea))
+    def op_dd_bc(self): self.cp((self.m_ix >> 8))
+    def op_dd_bd(self): self.cp((self.m_ix & 0xff))
+    def op_dd_be(self): self.eax(); self.nomreq_addr(self.m_pc - 1, 5); self.cp(self.rm(self.m_ea))
     def op_dd_bf(self): self.op_illegal_1(); self.op_op_bf()
 
     def op_dd_c0(self): self.op_illegal_1(); self.op_op_c0()
@@ -2019,7 +2667,7 @@ class Z80:
     def op_dd_c8(self): self.op_illegal_1(); self.op_op_c8()
     def op_dd_c9(self): self.op_illegal_1(); self.op_op_c9()
     def op_dd_ca(self): self.op_illegal_1(); self.op_op_ca()
-    def op_dd_cb(self): self.eax(); a = self.arg(); self.nomreq_addr(self.PC - 1, 2); self.EXEC(Z80.cc_xycb, self.op_xycb, a)
+    def op_dd_cb(self): self.eax(); a = self.arg(); self.nomreq_addr(self.m_pc - 1, 2); self.EXEC(Z80.cc_xycb, self.op_xycb, a)
     def op_dd_cc(self): self.op_illegal_1(); self.op_op_cc()
     def op_dd_cd(self): self.op_illegal_1(); self.op_op_cd()
     def op_dd_ce(self): self.op_illegal_1(); self.op_op_ce()
@@ -2044,16 +2692,16 @@ class Z80:
     def op_dd_df(self): self.op_illegal_1(); self.op_op_df()
 
     def op_dd_e0(self): self.op_illegal_1(); self.op_op_e0()
-    def op_dd_e1(self): self.pop(self.m_ix)
+    def op_dd_e1(self): self.m_ix = self.pop()
     def op_dd_e2(self): self.op_illegal_1(); self.op_op_e2()
-    def op_dd_e3(self): self.ex_sp(self.m_ix)
+    def op_dd_e3(self): self.m_ix = self.ex_sp(self.m_ix)
     def op_dd_e4(self): self.op_illegal_1(); self.op_op_e4()
     def op_dd_e5(self): self.push(self.m_ix)
     def op_dd_e6(self): self.op_illegal_1(); self.op_op_e6()
     def op_dd_e7(self): self.op_illegal_1(); self.op_op_e7()
 
     def op_dd_e8(self): self.op_illegal_1(); self.op_op_e8()
-    def op_dd_e9(self): self.PC = self.IX
+    def op_dd_e9(self): self.m_pc = self.m_ix
     def op_dd_ea(self): self.op_illegal_1(); self.op_op_ea()
     def op_dd_eb(self): self.op_illegal_1(); self.op_op_eb()
     def op_dd_ec(self): self.op_illegal_1(); self.op_op_ec()
@@ -2071,7 +2719,7 @@ class Z80:
     def op_dd_f7(self): self.op_illegal_1(); self.op_op_f7()
 
     def op_dd_f8(self): self.op_illegal_1(); self.op_op_f8()
-    def op_dd_f9(self): self.nomreq_ir(2); self.SP = self.IX
+    def op_dd_f9(self): self.nomreq_ir(2); self.m_sp = self.m_ix
     def op_dd_fa(self): self.op_illegal_1(); self.op_op_fa()
     def op_dd_fb(self): self.op_illegal_1(); self.op_op_fb()
     def op_dd_fc(self): self.op_illegal_1(); self.op_op_fc()
@@ -2090,7 +2738,7 @@ class Z80:
     def op_fd_07(self): self.op_illegal_1(); self.op_op_07()
 
     def op_fd_08(self): self.op_illegal_1(); self.op_op_08()
-    def op_fd_09(self): self.add16(self.m_iy, self.m_bc)
+    def op_fd_09(self): self.m_iy = self.add16(self.m_iy, self.m_bc)
     def op_fd_0a(self): self.op_illegal_1(); self.op_op_0a()
     def op_fd_0b(self): self.op_illegal_1(); self.op_op_0b()
     def op_fd_0c(self): self.op_illegal_1(); self.op_op_0c()
@@ -2108,7 +2756,7 @@ class Z80:
     def op_fd_17(self): self.op_illegal_1(); self.op_op_17()
 
     def op_fd_18(self): self.op_illegal_1(); self.op_op_18()
-    def op_fd_19(self): self.add16(self.m_iy, self.m_de)
+    def op_fd_19(self): self.m_iy = self.add16(self.m_iy, self.m_de)
     def op_fd_1a(self): self.op_illegal_1(); self.op_op_1a()
     def op_fd_1b(self): self.op_illegal_1(); self.op_op_1b()
     def op_fd_1c(self): self.op_illegal_1(); self.op_op_1c()
@@ -2117,34 +2765,34 @@ class Z80:
     def op_fd_1f(self): self.op_illegal_1(); self.op_op_1f()
 
     def op_fd_20(self): self.op_illegal_1(); self.op_op_20()
-    def op_fd_21(self): self.IY = self.arg16()
-    def op_fd_22(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_iy); self.WZ = self.m_ea + 1
-    def op_fd_23(self): self.nomreq_ir(2); self.IY += 1
-    def op_fd_24(self): self.HY = self.inc(self.HY)
-    def op_fd_25(self): self.HY = self.dec(self.HY)
-    def op_fd_26(self): self.HY = self.arg()
+    def op_fd_21(self): self.m_iy = self.arg16()
+    def op_fd_22(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_iy); self.m_wz = (self.m_ea + 1) & 0xffff
+    def op_fd_23(self): self.nomreq_ir(2); self.m_iy = (self.m_iy + 1) & 0xffff
+    def op_fd_24(self): self.m_iy = (self.inc((self.m_iy >> 8)) << 8) | (self.m_iy & 0xff)
+    def op_fd_25(self): self.m_iy = (self.dec((self.m_iy >> 8)) << 8) | (self.m_iy & 0xff)
+    def op_fd_26(self): self.m_iy = (self.arg() << 8) | (self.m_iy & 0xff)
     def op_fd_27(self): self.op_illegal_1(); self.op_op_27()
 
     def op_fd_28(self): self.op_illegal_1(); self.op_op_28()
-    def op_fd_29(self): self.add16(self.m_iy, self.m_iy)
-    def op_fd_2a(self): self.m_ea = self.arg16(); self.rm16(self.m_ea, self.m_iy); self.WZ = self.m_ea + 1
-    def op_fd_2b(self): self.nomreq_ir(2); self.IY -= 1
-    def op_fd_2c(self): self.LY = self.inc(self.LY)
-    def op_fd_2d(self): self.LY = self.dec(self.LY)
-    def op_fd_2e(self): self.LY = self.arg()
+    def op_fd_29(self): self.m_iy = self.add16(self.m_iy, self.m_iy)
+    def op_fd_2a(self): self.m_ea = self.arg16(); self.m_iy = self.rm16(self.m_ea); self.m_wz = (self.m_ea + 1) & 0xffff
+    def op_fd_2b(self): self.nomreq_ir(2); self.m_iy = (self.m_iy - 1) & 0xffff
+    def op_fd_2c(self): self.m_iy = (self.m_iy & 0xff00) | self.inc((self.m_iy & 0xff))
+    def op_fd_2d(self): self.m_iy = (self.m_iy & 0xff00) | self.dec((self.m_iy & 0xff))
+    def op_fd_2e(self): self.m_iy = (self.m_iy & 0xff00) | self.arg()
     def op_fd_2f(self): self.op_illegal_1(); self.op_op_2f()
 
     def op_fd_30(self): self.op_illegal_1(); self.op_op_30()
     def op_fd_31(self): self.op_illegal_1(); self.op_op_31()
     def op_fd_32(self): self.op_illegal_1(); self.op_op_32()
     def op_fd_33(self): self.op_illegal_1(); self.op_op_33()
-    def op_fd_34(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.inc(self.rm_reg(self.m_ea)))
-    def op_fd_35(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.dec(self.rm_reg(self.m_ea)))
-    def op_fd_36(self): self.eay(); a = self.arg(); self.nomreq_addr(self.PC - 1, 2); self.wm(self.m_ea, a)
+    def op_fd_34(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, self.inc(self.rm_reg(self.m_ea)))
+    def op_fd_35(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, self.dec(self.rm_reg(self.m_ea)))
+    def op_fd_36(self): self.eay(); a = self.arg(); self.nomreq_addr(self.m_pc - 1, 2); self.wm(self.m_ea, a)
     def op_fd_37(self): self.op_illegal_1(); self.op_op_37()
 
     def op_fd_38(self): self.op_illegal_1(); self.op_op_38()
-    def op_fd_39(self): self.add16(self.m_iy, self.m_sp)
+    def op_fd_39(self): self.m_iy = self.add16(self.m_iy, self.m_sp)
     def op_fd_3a(self): self.op_illegal_1(); self.op_op_3a()
     def op_fd_3b(self): self.op_illegal_1(); self.op_op_3b()
     def op_fd_3c(self): self.op_illegal_1(); self.op_op_3c()
@@ -2156,144 +2804,144 @@ class Z80:
     def op_fd_41(self): self.op_illegal_1(); self.op_op_41()
     def op_fd_42(self): self.op_illegal_1(); self.op_op_42()
     def op_fd_43(self): self.op_illegal_1(); self.op_op_43()
-    def op_fd_44(self): self.B = self.HY
-    def op_fd_45(self): self.B = self.LY
-    def op_fd_46(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.B = self.rm(self.m_ea)
+    def op_fd_44(self): self.m_bc = ((self.m_iy >> 8) << 8) | (self.m_bc & 0xff)
+    def op_fd_45(self): self.m_bc = ((self.m_iy & 0xff) << 8) | (self.m_bc & 0xff)
+    def op_fd_46(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.m_bc = (self.rm(self.m_ea) << 8) | (self.m_bc & 0xff)
     def op_fd_47(self): self.op_illegal_1(); self.op_op_47()
 
     def op_fd_48(self): self.op_illegal_1(); self.op_op_48()
     def op_fd_49(self): self.op_illegal_1(); self.op_op_49()
     def op_fd_4a(self): self.op_illegal_1(); self.op_op_4a()
     def op_fd_4b(self): self.op_illegal_1(); self.op_op_4b()
-    def op_fd_4c(self): self.C = self.HY
-    def op_fd_4d(self): self.C = self.LY
-    def op_fd_4e(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.C = self.rm(self.m_ea)
+    def op_fd_4c(self): self.m_bc = (self.m_bc & 0xff00) | (self.m_iy >> 8)
+    def op_fd_4d(self): self.m_bc = (self.m_bc & 0xff00) | (self.m_iy & 0xff)
+    def op_fd_4e(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.m_bc = (self.m_bc & 0xff00) | self.rm(self.m_ea)
     def op_fd_4f(self): self.op_illegal_1(); self.op_op_4f()
 
     def op_fd_50(self): self.op_illegal_1(); self.op_op_50()
     def op_fd_51(self): self.op_illegal_1(); self.op_op_51()
     def op_fd_52(self): self.op_illegal_1(); self.op_op_52()
     def op_fd_53(self): self.op_illegal_1(); self.op_op_53()
-    def op_fd_54(self): self.D = self.HY
-    def op_fd_55(self): self.D = self.LY
-    def op_fd_56(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.D = self.rm(self.m_ea)
+    def op_fd_54(self): self.m_de = ((self.m_iy >> 8) << 8) | (self.m_de & 0xff)
+    def op_fd_55(self): self.m_de = ((self.m_iy & 0xff) << 8) | (self.m_de & 0xff)
+    def op_fd_56(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.m_de = (self.rm(self.m_ea) << 8) | (self.m_de & 0xff)
     def op_fd_57(self): self.op_illegal_1(); self.op_op_57()
 
     def op_fd_58(self): self.op_illegal_1(); self.op_op_58()
     def op_fd_59(self): self.op_illegal_1(); self.op_op_59()
     def op_fd_5a(self): self.op_illegal_1(); self.op_op_5a()
     def op_fd_5b(self): self.op_illegal_1(); self.op_op_5b()
-    def op_fd_5c(self): self.E = self.HY
-    def op_fd_5d(self): self.E = self.LY
-    def op_fd_5e(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.E = self.rm(self.m_ea)
+    def op_fd_5c(self): self.m_de = (self.m_de & 0xff00) | (self.m_iy >> 8)
+    def op_fd_5d(self): self.m_de = (self.m_de & 0xff00) | (self.m_iy & 0xff)
+    def op_fd_5e(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.m_de = (self.m_de & 0xff00) | self.rm(self.m_ea)
     def op_fd_5f(self): self.op_illegal_1(); self.op_op_5f()
 
-    def op_fd_60(self): self.HY = self.B
-    def op_fd_61(self): self.HY = self.C
-    def op_fd_62(self): self.HY = self.D
-    def op_fd_63(self): self.HY = self.E
+    def op_fd_60(self): self.m_iy = ((self.m_bc >> 8) << 8) | (self.m_iy & 0xff)
+    def op_fd_61(self): self.m_iy = ((self.m_bc & 0xff) << 8) | (self.m_iy & 0xff)
+    def op_fd_62(self): self.m_iy = ((self.m_de >> 8) << 8) | (self.m_iy & 0xff)
+    def op_fd_63(self): self.m_iy = ((self.m_de & 0xff) << 8) | (self.m_iy & 0xff)
     def op_fd_64(self): pass
-    def op_fd_65(self): self.HY = self.LY
-    def op_fd_66(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.H = self.rm(self.m_ea)
-    def op_fd_67(self): self.HY = self.A
-
-    def op_fd_68(self): self.LY = self.B
-    def op_fd_69(self): self.LY = self.C
-    def op_fd_6a(self): self.LY = self.D
-    def op_fd_6b(self): self.LY = self.E
-    def op_fd_6c(self): self.LY = self.HY
+    def op_fd_65(self): self.m_iy = ((self.m_iy & 0xff) << 8) | (self.m_iy & 0xff)
+    def op_fd_66(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.m_hl = (self.rm(self.m_ea) << 8) | (self.m_hl & 0xff)
+    def op_fd_67(self): self.m_iy = (self.m_a << 8) | (self.m_iy & 0xff)
+
+    def op_fd_68(self): self.m_iy = (self.m_iy & 0xff00) | (self.m_bc >> 8)
+    def op_fd_69(self): self.m_iy = (self.m_iy & 0xff00) | (self.m_bc & 0xff)
+    def op_fd_6a(self): self.m_iy = (self.m_iy & 0xff00) | (self.m_de >> 8)
+    def op_fd_6b(self): self.m_iy = (self.m_iy & 0xff00) | (self.m_de & 0xff)
+    def op_fd_6c(self): self.m_iy = (self.m_iy & 0xff00) | (self.m_iy >> 8)
     def op_fd_6d(self): pass
-    def op_fd_6e(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.L = self.rm(self.m_ea)
-    def op_fd_6f(self): self.LY = self.A
-
-    def op_fd_70(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.B)
-    def op_fd_71(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.C)
-    def op_fd_72(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.D)
-    def op_fd_73(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.E)
-    def op_fd_74(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.H)
-    def op_fd_75(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.L)
+    def op_fd_6e(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.m_hl = (self.m_hl & 0xff00) | self.rm(self.m_ea)
+    def op_fd_6f(self): self.m_iy = (self.m_iy & 0xff00) | self.m_a
+
+    def op_fd_70(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_bc >> 8))
+    def op_fd_71(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_bc & 0xff))
+    def op_fd_72(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_de >> 8))
+    def op_fd_73(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_de & 0xff))
+    def op_fd_74(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_hl >> 8))
+    def op_fd_75(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, (self.m_hl & 0xff))
     def op_fd_76(self): self.op_illegal_1(); self.op_op_76()
-    def op_fd_77(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.wm(self.m_ea, self.A)
+    def op_fd_77(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.wm(self.m_ea, self.m_a)
 
     def op_fd_78(self): self.op_illegal_1(); self.op_op_78()
     def op_fd_79(self): self.op_illegal_1(); self.op_op_79()
     def op_fd_7a(self): self.op_illegal_1(); self.op_op_7a()
     def op_fd_7b(self): self.op_illegal_1(); self.op_op_7b()
-    def op_fd_7c(self): self.A = self.HY
-    def op_fd_7d(self): self.A = self.LY
-    def op_fd_7e(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.A = self.rm(self.m_ea)
+    def op_fd_7c(self): self.m_a = (self.m_iy >> 8)
+    def op_fd_7d(self): self.m_a = (self.m_iy & 0xff)
+    def op_fd_7e(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.m_a = self.rm(self.m_ea)
     def op_fd_7f(self): self.op_illegal_1(); self.op_op_7f()
 
     def op_fd_80(self): self.op_illegal_1(); self.op_op_80()
     def op_fd_81(self): self.op_illegal_1(); self.op_op_81()
     def op_fd_82(self): self.op_illegal_1(); self.op_op_82()
     def op_fd_83(self): self.op_illegal_1(); self.op_op_83()
-    def op_fd_84(self): self.add_a(self.HY)
-    def op_fd_85(self): self.add_a(self.LY)
-    def op_fd_86(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.add_a(self.rm(self.m_ea))
+    def op_fd_84(self): self.add_a((self.m_iy >> 8))
+    def op_fd_85(self): self.add_a((self.m_iy & 0xff))
+    def op_fd_86(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.add_a(self.rm(self.m_ea))
     def op_fd_87(self): self.op_illegal_1(); self.op_op_87()
 
     def op_fd_88(self): self.op_illegal_1(); self.op_op_88()
     def op_fd_89(self): self.op_illegal_1(); self.op_op_89()
     def op_fd_8a(self): self.op_illegal_1(); self.op_op_8a()
     def op_fd_8b(self): self.op_illegal_1(); self.op_op_8b()
-    def op_fd_8c(self): self.adc_a(self.HY)
-    def op_fd_8d(self): self.adc_a(self.LY)
-    def op_fd_8e(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.adc_a(self.rm(self.m_ea))
+    def op_fd_8c(self): self.adc_a((self.m_iy >> 8))
+    def op_fd_8d(self): self.adc_a((self.m_iy & 0xff))
+    def op_fd_8e(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.adc_a(self.rm(self.m_ea))
     def op_fd_8f(self): self.op_illegal_1(); self.op_op_8f()
 
     def op_fd_90(self): self.op_illegal_1(); self.op_op_90()
     def op_fd_91(self): self.op_illegal_1(); self.op_op_91()
     def op_fd_92(self): self.op_illegal_1(); self.op_op_92()
     def op_fd_93(self): self.op_illegal_1(); self.op_op_93()
-    def op_fd_94(self): self.sub(self.HY)
-    def op_fd_95(self): self.sub(self.LY)
-    def op_fd_96(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.sub(self.rm(self.m_ea))
+    def op_fd_94(self): self.sub((self.m_iy >> 8))
+    def op_fd_95(self): self.sub((self.m_iy & 0xff))
+    def op_fd_96(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.sub(self.rm(self.m_ea))
     def op_fd_97(self): self.op_illegal_1(); self.op_op_97()
 
     def op_fd_98(self): self.op_illegal_1(); self.op_op_98()
     def op_fd_99(self): self.op_illegal_1(); self.op_op_99()
     def op_fd_9a(self): self.op_illegal_1(); self.op_op_9a()
     def op_fd_9b(self): self.op_illegal_1(); self.op_op_9b()
-    def op_fd_9c(self): self.sbc_a(self.HY)
-    def op_fd_9d(self): self.sbc_a(self.LY)
-    def op_fd_9e(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.sbc_a(self.rm(self.m_ea))
+    def op_fd_9c(self): self.sbc_a((self.m_iy >> 8))
+    def op_fd_9d(self): self.sbc_a((self.m_iy & 0xff))
+    def op_fd_9e(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.sbc_a(self.rm(self.m_ea))
     def op_fd_9f(self): self.op_illegal_1(); self.op_op_9f()
 
     def op_fd_a0(self): self.op_illegal_1(); self.op_op_a0()
     def op_fd_a1(self): self.op_illegal_1(); self.op_op_a1()
     def op_fd_a2(self): self.op_illegal_1(); self.op_op_a2()
     def op_fd_a3(self): self.op_illegal_1(); self.op_op_a3()
-    def op_fd_a4(self): self.and_a(self.HY)
-    def op_fd_a5(self): self.and_a(self.LY)
-    def op_fd_a6(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.and_a(self.rm(self.m_ea))
+    def op_fd_a4(self): self.and_a((self.m_iy >> 8))
+    def op_fd_a5(self): self.and_a((self.m_iy & 0xff))
+    def op_fd_a6(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.and_a(self.rm(self.m_ea))
     def op_fd_a7(self): self.op_illegal_1(); self.op_op_a7()
 
     def op_fd_a8(self): self.op_illegal_1(); self.op_op_a8()
     def op_fd_a9(self): self.op_illegal_1(); self.op_op_a9()
     def op_fd_aa(self): self.op_illegal_1(); self.op_op_aa()
     def op_fd_ab(self): self.op_illegal_1(); self.op_op_ab()
-    def op_fd_ac(self): self.xor_a(self.HY)
-    def op_fd_ad(self): self.xor_a(self.LY)
-    def op_fd_ae(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.xor_a(self.rm(self.m_ea))
+    def op_fd_ac(self): self.xor_a((self.m_iy >> 8))
+    def op_fd_ad(self): self.xor_a((self.m_iy & 0xff))
+    def op_fd_ae(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.xor_a(self.rm(self.m_ea))
     def op_fd_af(self): self.op_illegal_1(); self.op_op_af()
 
     def op_fd_b0(self): self.op_illegal_1(); self.op_op_b0()
     def op_fd_b1(self): self.op_illegal_1(); self.op_op_b1()
     def op_fd_b2(self): self.op_illegal_1(); self.op_op_b2()
     def op_fd_b3(self): self.op_illegal_1(); self.op_op_b3()
-    def op_fd_b4(self): self.or_a(self.HY)
-    def op_fd_b5(self): self.or_a(self.LY)
-    def op_fd_b6(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.or_a(self.rm(self.m_ea))
+    def op_fd_b4(self): self.or_a((self.m_iy >> 8))
+    def op_fd_b5(self): self.or_a((self.m_iy & 0xff))
+    def op_fd_b6(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.or_a(self.rm(self.m_ea))
     def op_fd_b7(self): self.op_illegal_1(); self.op_op_b7()
 
     def op_fd_b8(self): self.op_illegal_1(); self.op_op_b8()
     def op_fd_b9(self): self.op_illegal_1(); self.op_op_b9()
     def op_fd_ba(self): self.op_illegal_1(); self.op_op_ba()
     def op_fd_bb(self): self.op_illegal_1(); self.op_op_bb()
-    def op_fd_bc(self): self.cp(self.HY)
-    def op_fd_bd(self): self.cp(self.LY)
-    def op_fd_be(self): self.eay(); self.nomreq_addr(self.PC - 1, 5); self.cp(self.rm(self.m_ea))
+    def op_fd_bc(self): self.cp((self.m_iy >> 8))
+    def op_fd_bd(self): self.cp((self.m_iy & 0xff))
+    def op_fd_be(self): self.eay(); self.nomreq_addr(self.m_pc - 1, 5); self.cp(self.rm(self.m_ea))
     def op_fd_bf(self): self.op_illegal_1(); self.op_op_bf()
 
     def op_fd_c0(self): self.op_illegal_1(); self.op_op_c0()
@@ -2308,7 +2956,7 @@ class Z80:
     def op_fd_c8(self): self.op_illegal_1(); self.op_op_c8()
     def op_fd_c9(self): self.op_illegal_1(); self.op_op_c9()
     def op_fd_ca(self): self.op_illegal_1(); self.op_op_ca()
-    def op_fd_cb(self): self.eay(); a = self.arg(); self.nomreq_addr(self.PC - 1, 2); self.EXEC(Z80.cc_xycb, self.op_xycb, a)
+    def op_fd_cb(self): self.eay(); a = self.arg(); self.nomreq_addr(self.m_pc - 1, 2); self.EXEC(Z80.cc_xycb, self.op_xycb, a)
     def op_fd_cc(self): self.op_illegal_1(); self.op_op_cc()
     def op_fd_cd(self): self.op_illegal_1(); self.op_op_cd()
     def op_fd_ce(self): self.op_illegal_1(); self.op_op_ce()
@@ -2333,16 +2981,16 @@ class Z80:
     def op_fd_df(self): self.op_illegal_1(); self.op_op_df()
 
     def op_fd_e0(self): self.op_illegal_1(); self.op_op_e0()
-    def op_fd_e1(self): self.pop(self.m_iy)
+    def op_fd_e1(self): self.m_iy = self.pop()
     def op_fd_e2(self): self.op_illegal_1(); self.op_op_e2()
-    def op_fd_e3(self): self.ex_sp(self.m_iy)
+    def op_fd_e3(self): self.m_iy = self.ex_sp(self.m_iy)
     def op_fd_e4(self): self.op_illegal_1(); self.op_op_e4()
     def op_fd_e5(self): self.push(self.m_iy)
     def op_fd_e6(self): self.op_illegal_1(); self.op_op_e6()
     def op_fd_e7(self): self.op_illegal_1(); self.op_op_e7()
 
     def op_fd_e8(self): self.op_illegal_1(); self.op_op_e8()
-    def op_fd_e9(self): self.PC = self.IY
+    def op_fd_e9(self): self.m_pc = self.m_iy
     def op_fd_ea(self): self.op_illegal_1(); self.op_op_ea()
     def op_fd_eb(self): self.op_illegal_1(); self.op_op_eb()
     def op_fd_ec(self): self.op_illegal_1(); self.op_op_ec()
@@ -2360,7 +3008,7 @@ class Z80:
     def op_fd_f7(self): self.op_illegal_1(); self.op_op_f7()
 
     def op_fd_f8(self): self.op_illegal_1(); self.op_op_f8()
-    def op_fd_f9(self): self.nomreq_ir(2); self.SP = self.IY
+    def op_fd_f9(self): self.nomreq_ir(2); self.m_sp = self.m_iy
     def op_fd_fa(self): self.op_illegal_1(); self.op_op_fa()
     def op_fd_fb(self): self.op_illegal_1(); self.op_op_fb()
     def op_fd_fc(self): self.op_illegal_1(); self.op_op_fc()
@@ -2370,8 +3018,8 @@ class Z80:
 
     def op_illegal_2(self):
         self.log("Z80 ill. opcode $ed ${:02x} (${:04x})".format(
-            self.m_opcodes.read(self.PC-1),
-            self.PC-2))
+            self.read_mem((self.m_pc - 1) & 0xffff),
+            (self.m_pc - 2) & 0xffff))
 
     # special opcodes (ED prefix)
     def op_ed_00(self): self.op_illegal_2()
@@ -2446,73 +3094,73 @@ class Z80:
     def op_ed_3e(self): self.op_illegal_2()
     def op_ed_3f(self): self.op_illegal_2()
 
-    def op_ed_40(self): self.B = self.inp(self.BC); self.F = (self.F & Z80.CF) | Z80.SZP[self.B]
-    def op_ed_41(self): self.out(self.BC, self.B)
+    def op_ed_40(self): self.m_bc = (self.inp(self.m_bc) << 8) | (self.m_bc & 0xff); self.m_f = (self.m_f & Z80.CF) | Z80.SZP[(self.m_bc >> 8)]
+    def op_ed_41(self): self.out(self.m_bc, (self.m_bc >> 8))
     def op_ed_42(self): self.sbc_hl(self.m_bc)
-    def op_ed_43(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_bc); self.WZ = self.m_ea + 1
+    def op_ed_43(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_bc); self.m_wz = (self.m_ea + 1) & 0xffff
     def op_ed_44(self): self.neg()
     def op_ed_45(self): self.retn()
     def op_ed_46(self): self.m_im = 0
     def op_ed_47(self): self.ld_i_a()
 
-    def op_ed_48(self): self.C = self.inp(self.BC); self.F = (self.F & Z80.CF) | Z80.SZP[self.C]
-    def op_ed_49(self): self.out(self.BC, self.C)
+    def op_ed_48(self): self.m_bc = (self.m_bc & 0xff00) | self.inp(self.m_bc); self.m_f = (self.m_f & Z80.CF) | Z80.SZP[(self.m_bc & 0xff)]
+    def op_ed_49(self): self.out(self.m_bc, (self.m_bc & 0xff))
     def op_ed_4a(self): self.adc_hl(self.m_bc)
-    def op_ed_4b(self): self.m_ea = self.arg16(); self.rm16(self.m_ea, self.m_bc); self.WZ = self.m_ea + 1
+    def op_ed_4b(self): self.m_ea = self.arg16(); self.m_bc = self.rm16(self.m_ea); self.m_wz = (self.m_ea + 1) & 0xffff
     def op_ed_4c(self): self.neg()
     def op_ed_4d(self): self.reti()
     def op_ed_4e(self): self.m_im = 0
     def op_ed_4f(self): self.ld_r_a()
 
-    def op_ed_50(self): self.D = self.inp(self.BC); self.F = (self.F & Z80.CF) | Z80.SZP[self.D]
-    def op_ed_51(self): self.out(self.BC, self.D)
+    def op_ed_50(self): self.m_de = (self.inp(self.m_bc) << 8) | (self.m_de & 0xff); self.m_f = (self.m_f & Z80.CF) | Z80.SZP[(self.m_de >> 8)]
+    def op_ed_51(self): self.out(self.m_bc, (self.m_de >> 8))
     def op_ed_52(self): self.sbc_hl(self.m_de)
-    def op_ed_53(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_de); self.WZ = self.m_ea + 1
+    def op_ed_53(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_de); self.m_wz = (self.m_ea + 1) & 0xffff
     def op_ed_54(self): self.neg()
     def op_ed_55(self): self.retn()
     def op_ed_56(self): self.m_im = 1
     def op_ed_57(self): self.ld_a_i()
 
-    def op_ed_58(self): self.E = self.inp(self.BC); self.F = (self.F & Z80.CF) | Z80.SZP[self.E]
-    def op_ed_59(self): self.out(self.BC, self.E)
+    def op_ed_58(self): self.m_de = (self.m_de & 0xff00) | self.inp(self.m_bc); self.m_f = (self.m_f & Z80.CF) | Z80.SZP[(self.m_de & 0xff)]
+    def op_ed_59(self): self.out(self.m_bc, (self.m_de & 0xff))
     def op_ed_5a(self): self.adc_hl(self.m_de)
-    def op_ed_5b(self): self.m_ea = self.arg16(); self.rm16(self.m_ea, self.m_de); self.WZ = self.m_ea + 1
+    def op_ed_5b(self): self.m_ea = self.arg16(); self.m_de = self.rm16(self.m_ea); self.m_wz = (self.m_ea + 1) & 0xffff
     def op_ed_5c(self): self.neg()
     def op_ed_5d(self): self.reti()
     def op_ed_5e(self): self.m_im = 2
     def op_ed_5f(self): self.ld_a_r()
 
-    def op_ed_60(self): self.H = self.inp(self.BC); self.F = (self.F & Z80.CF) | Z80.SZP[self.H]
-    def op_ed_61(self): self.out(self.BC, self.H)
+    def op_ed_60(self): self.m_hl = (self.inp(self.m_bc) << 8) | (self.m_hl & 0xff); self.m_f = (self.m_f & Z80.CF) | Z80.SZP[(self.m_hl >> 8)]
+    def op_ed_61(self): self.out(self.m_bc, (self.m_hl >> 8))
     def op_ed_62(self): self.sbc_hl(self.m_hl)
-    def op_ed_63(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_hl); self.WZ = self.m_ea + 1
+    def op_ed_63(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_hl); self.m_wz = (self.m_ea + 1) & 0xffff
     def op_ed_64(self): self.neg()
     def op_ed_65(self): self.retn()
     def op_ed_66(self): self.m_im = 0
     def op_ed_67(self): self.rrd()
 
-    def op_ed_68(self): self.L = self.inp(self.BC); self.F = (self.F & Z80.CF) | Z80.SZP[self.L]
-    def op_ed_69(self): self.out(self.BC, self.L)
+    def op_ed_68(self): self.m_hl = (self.m_hl & 0xff00) | self.inp(self.m_bc); self.m_f = (self.m_f & Z80.CF) | Z80.SZP[(self.m_hl & 0xff)]
+    def op_ed_69(self): self.out(self.m_bc, (self.m_hl & 0xff))
     def op_ed_6a(self): self.adc_hl(self.m_hl)
-    def op_ed_6b(self): self.m_ea = self.arg16(); self.rm16(self.m_ea, self.m_hl); self.WZ = self.m_ea + 1
+    def op_ed_6b(self): self.m_ea = self.arg16(); self.m_hl = self.rm16(self.m_ea); self.m_wz = (self.m_ea + 1) & 0xffff
     def op_ed_6c(self): self.neg()
     def op_ed_6d(self): self.reti()
     def op_ed_6e(self): self.m_im = 0
     def op_ed_6f(self): self.rld()
 
-    def op_ed_70(self): res = self.inp(self.BC); self.F = (self.F & Z80.CF) | Z80.SZP[res]
-    def op_ed_71(self): self.out(self.BC, 0)
+    def op_ed_70(self): res = self.inp(self.m_bc); self.m_f = (self.m_f & Z80.CF) | Z80.SZP[res]
+    def op_ed_71(self): self.out(self.m_bc, 0)
     def op_ed_72(self): self.sbc_hl(self.m_sp)
-    def op_ed_73(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_sp); self.WZ = self.m_ea + 1
+    def op_ed_73(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_sp); self.m_wz = (self.m_ea + 1) & 0xffff
     def op_ed_74(self): self.neg()
     def op_ed_75(self): self.retn()
     def op_ed_76(self): self.m_im = 1
     def op_ed_77(self): self.op_illegal_2()
 
-    def op_ed_78(self): self.A = self.inp(self.BC); self.F = (self.F & Z80.CF) | Z80.SZP[self.A]; self.WZ = self.BC + 1
-    def op_ed_79(self): self.out(self.BC, self.A); self.WZ = self.BC + 1
+    def op_ed_78(self): self.m_a = self.inp(self.m_bc); self.m_f = (self.m_f & Z80.CF) | Z80.SZP[self.m_a]; self.m_wz = (self.m_bc + 1) & 0xffff
+    def op_ed_79(self): self.out(self.m_bc, self.m_a); self.m_wz = (self.m_bc + 1) & 0xffff
     def op_ed_7a(self): self.adc_hl(self.m_sp)
-    def op_ed_7b(self): self.m_ea = self.arg16(); self.rm16(self.m_ea, self.m_sp); self.WZ = self.m_ea + 1
+    def op_ed_7b(self): self.m_ea = self.arg16(); self.m_sp = self.rm16(self.m_ea); self.m_wz = (self.m_ea + 1) & 0xffff
     def op_ed_7c(self): self.neg()
     def op_ed_7d(self): self.reti()
     def op_ed_7e(self): self.m_im = 2
@@ -2664,338 +3312,344 @@ class Z80:
 
     # main opcodes
     def op_op_00(self): pass
-    def op_op_01(self): self.BC = self.arg16()
-    def op_op_02(self): self.wm(self.BC, self.A); self.WZ_L = (self.BC + 1) & 0xff; self.WZ_H = self.A
-    def op_op_03(self): self.nomreq_ir(2); self.BC += 1
-    def op_op_04(self): self.B = self.inc(self.B)
-    def op_op_05(self): self.B = self.dec(self.B)
-    def op_op_06(self): self.B = self.arg()
+    def op_op_01(self): self.m_bc = self.arg16()
+    def op_op_02(self): self.wm(self.m_bc, self.m_a); self.m_wz = (self.m_a << 8) | ((self.m_bc + 1) & 0xff)
+    def op_op_03(self): self.nomreq_ir(2); self.m_bc = (self.m_bc + 1) & 0xffff
+    def op_op_04(self): self.m_bc = (self.inc((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_op_05(self): self.m_bc = (self.dec((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+    def op_op_06(self): self.m_bc = (self.arg() << 8) | (self.m_bc & 0xff)
     def op_op_07(self): self.rlca()
 
     def op_op_08(self): self.ex_af()
-    def op_op_09(self): self.add16(self.m_hl, self.m_bc)
-    def op_op_0a(self): self.A = self.rm(self.BC); self.WZ = self.BC + 1
-    def op_op_0b(self): self.nomreq_ir(2); self.BC -= 1
-    def op_op_0c(self): self.C = self.inc(self.C)
-    def op_op_0d(self): self.C = self.dec(self.C)
-    def op_op_0e(self): self.C = self.arg()
+    def op_op_09(self): self.m_hl = self.add16(self.m_hl, self.m_bc)
+    def op_op_0a(self): self.m_a = self.rm(self.m_bc); self.m_wz = (self.m_bc + 1) & 0xffff
+    def op_op_0b(self): self.nomreq_ir(2); self.m_bc = (self.m_bc - 1) & 0xffff
+    def op_op_0c(self): self.m_bc = (self.m_bc & 0xff00) | self.inc((self.m_bc & 0xff))
+    def op_op_0d(self): self.m_bc = (self.m_bc & 0xff00) | self.dec((self.m_bc & 0xff))
+    def op_op_0e(self): self.m_bc = (self.m_bc & 0xff00) | self.arg()
     def op_op_0f(self): self.rrca()
 
-    def op_op_10(self): self.nomreq_ir(1); self.B -= 1; self.jr_cond(self.B, 0x10)
-    def op_op_11(self): self.DE = self.arg16()
-    def op_op_12(self): self.wm(self.DE, self.A); self.WZ_L = (self.DE + 1) & 0xff; self.WZ_H = self.A
-    def op_op_13(self): self.nomreq_ir(2); self.DE += 1
-    def op_op_14(self): self.D = self.inc(self.D)
-    def op_op_15(self): self.D = self.dec(self.D)
-    def op_op_16(self): self.D = self.arg()
+    def op_op_10(self): self.nomreq_ir(1); self.m_bc = (self.m_bc - 0x100) & 0xffff; self.jr_cond((self.m_bc >> 8), 0x10)
+    def op_op_11(self): self.m_de = self.arg16()
+    def op_op_12(self): self.wm(self.m_de, self.m_a); self.m_wz = (self.m_a << 8) | ((self.m_de + 1) & 0xff)
+    def op_op_13(self): self.nomreq_ir(2); self.m_de = (self.m_de + 1) & 0xffff
+    def op_op_14(self): self.m_de = (self.inc((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_op_15(self): self.m_de = (self.dec((self.m_de >> 8)) << 8) | (self.m_de & 0xff)
+    def op_op_16(self): self.m_de = (self.arg() << 8) | (self.m_de & 0xff)
     def op_op_17(self): self.rla()
 
     def op_op_18(self): self.jr()
-    def op_op_19(self): self.add16(self.m_hl, self.m_de)
-    def op_op_1a(self): self.A = self.rm(self.DE); self.WZ = self.DE + 1
-    def op_op_1b(self): self.nomreq_ir(2); self.DE -= 1
-    def op_op_1c(self): self.E = self.inc(self.E)
-    def op_op_1d(self): self.E = self.dec(self.E)
-    def op_op_1e(self): self.E = self.arg()
+    def op_op_19(self): self.m_hl = self.add16(self.m_hl, self.m_de)
+    def op_op_1a(self): self.m_a = self.rm(self.m_de); self.m_wz = (self.m_de + 1) & 0xffff
+    def op_op_1b(self): self.nomreq_ir(2); self.m_de = (self.m_de - 1) & 0xffff
+    def op_op_1c(self): self.m_de = (self.m_de & 0xff00) | self.inc((self.m_de & 0xff))
+    def op_op_1d(self): self.m_de = (self.m_de & 0xff00) | self.dec((self.m_de & 0xff))
+    def op_op_1e(self): self.m_de = (self.m_de & 0xff00) | self.arg()
     def op_op_1f(self): self.rra()
 
-    def op_op_20(self): self.jr_cond(not self.F & Z80.ZF, 0x20)
-    def op_op_21(self): self.HL = self.arg16()
-    def op_op_22(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_hl); self.WZ = self.m_ea + 1
-    def op_op_23(self): self.nomreq_ir(2); self.HL += 1
-    def op_op_24(self): self.H = self.inc(self.H)
-    def op_op_25(self): self.H = self.dec(self.H)
-    def op_op_26(self): self.H = self.arg()
+    def op_op_20(self): self.jr_cond(not self.m_f & Z80.ZF, 0x20)
+    def op_op_21(self): self.m_hl = self.arg16()
+    def op_op_22(self): self.m_ea = self.arg16(); self.wm16(self.m_ea, self.m_hl); self.m_wz = (self.m_ea + 1) & 0xffff
+    def op_op_23(self): self.nomreq_ir(2); self.m_hl = (self.m_hl + 1) & 0xffff
+    def op_op_24(self): self.m_hl = (self.inc((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_op_25(self): self.m_hl = (self.dec((self.m_hl >> 8)) << 8) | (self.m_hl & 0xff)
+    def op_op_26(self): self.m_hl = (self.arg() << 8) | (self.m_hl & 0xff)
     def op_op_27(self): self.daa()
 
-    def op_op_28(self): self.jr_cond(self.F & Z80.ZF, 0x28)
-    def op_op_29(self): self.add16(self.m_hl, self.m_hl)
-    def op_op_2a(self): self.m_ea = self.arg16(); self.rm16(self.m_ea, self.m_hl); self.WZ = self.m_ea + 1
-    def op_op_2b(self): self.nomreq_ir(2); self.HL -= 1
-    def op_op_2c(self): self.L = self.inc(self.L)
-    def op_op_2d(self): self.L = self.dec(self.L)
-    def op_op_2e(self): self.L = self.arg()
-    def op_op_2f(self): self.A ^= 0xff; self.F = (self.F & (Z80.SF | Z80.ZF | Z80.PF | Z80.CF)) | Z80.HF | Z80.NF | (self.A & (Z80.YF | Z80.XF))
-
-    def op_op_30(self): self.jr_cond(not self.F & Z80.CF, 0x30)
-    def op_op_31(self): self.SP = self.arg16()
-    def op_op_32(self): self.m_ea = self.arg16(); self.wm(self.m_ea, self.A); self.WZ_L = (self.m_ea + 1) & 0xff; self.WZ_H = self.A
-    def op_op_33(self): self.nomreq_ir(2); self.SP += 1
-    def op_op_34(self): self.wm(self.HL, self.inc(self.rm_reg(self.HL)))
-    def op_op_35(self): self.wm(self.HL, self.dec(self.rm_reg(self.HL)))
-    def op_op_36(self): self.wm(self.HL, self.arg())
-    def op_op_37(self): self.F = (self.F & (Z80.SF | Z80.ZF | Z80.YF | Z80.XF | Z80.PF)) | Z80.CF | (self.A & (Z80.YF | Z80.XF))
-
-    def op_op_38(self): self.jr_cond(self.F & Z80.CF, 0x38)
-    def op_op_39(self): self.add16(self.m_hl, self.m_sp)
-    def op_op_3a(self): self.m_ea = self.arg16(); self.A = self.rm(self.m_ea); self.WZ = self.m_ea + 1
-    def op_op_3b(self): self.nomreq_ir(2); self.SP -= 1
-    def op_op_3c(self): self.A = self.inc(self.A)
-    def op_op_3d(self): self.A = self.dec(self.A)
-    def op_op_3e(self): self.A = self.arg()
-    def op_op_3f(self): self.F = ((self.F & (Z80.SF | Z80.ZF | Z80.YF | Z80.XF | Z80.PF | Z80.CF)) | ((self.F & Z80.CF) << 4) | (self.A & (Z80.YF | Z80.XF))) ^ Z80.CF
+    def op_op_28(self): self.jr_cond(self.m_f & Z80.ZF, 0x28)
+    def op_op_29(self): self.m_hl = self.add16(self.m_hl, self.m_hl)
+    def op_op_2a(self): self.m_ea = self.arg16(); self.m_hl = self.rm16(self.m_ea); self.m_wz = (self.m_ea + 1) & 0xffff
+    def op_op_2b(self): self.nomreq_ir(2); self.m_hl = (self.m_hl - 1) & 0xffff
+    def op_op_2c(self): self.m_hl = (self.m_hl & 0xff00) | self.inc((self.m_hl & 0xff))
+    def op_op_2d(self): self.m_hl = (self.m_hl & 0xff00) | self.dec((self.m_hl & 0xff))
+    def op_op_2e(self): self.m_hl = (self.m_hl & 0xff00) | self.arg()
+    def op_op_2f(self): self.m_a ^= 0xff; self.m_f = (self.m_f & (Z80.SF | Z80.ZF | Z80.PF | Z80.CF)) | Z80.HF | Z80.NF | (self.m_a & (Z80.YF | Z80.XF))
+
+    def op_op_30(self): self.jr_cond(not self.m_f & Z80.CF, 0x30)
+    def op_op_31(self): self.m_sp = self.arg16()
+    def op_op_32(self): self.m_ea = self.arg16(); self.wm(self.m_ea, self.m_a); self.m_wz = (self.m_a << 8) | ((self.m_ea + 1) & 0xff)
+    def op_op_33(self): self.nomreq_ir(2); self.m_sp = (self.m_sp + 1) & 0xffff
+    def op_op_34(self): self.wm(self.m_hl, self.inc(self.rm_reg(self.m_hl)))
+    def op_op_35(self): self.wm(self.m_hl, self.dec(self.rm_reg(self.m_hl)))
+    def op_op_36(self): self.wm(self.m_hl, self.arg())
+    def op_op_37(self): self.m_f = (self.m_f & (Z80.SF | Z80.ZF | Z80.YF | Z80.XF | Z80.PF)) | Z80.CF | (self.m_a & (Z80.YF | Z80.XF))
+
+    def op_op_38(self): self.jr_cond(self.m_f & Z80.CF, 0x38)
+    def op_op_39(self): self.m_hl = self.add16(self.m_hl, self.m_sp)
+    def op_op_3a(self): self.m_ea = self.arg16(); self.m_a = self.rm(self.m_ea); self.m_wz = (self.m_ea + 1) & 0xffff
+    def op_op_3b(self): self.nomreq_ir(2); self.m_sp = (self.m_sp - 1) & 0xffff
+    def op_op_3c(self): self.m_a = self.inc(self.m_a)
+    def op_op_3d(self): self.m_a = self.dec(self.m_a)
+    def op_op_3e(self): self.m_a = self.arg()
+    def op_op_3f(self): self.m_f = ((self.m_f & (Z80.SF | Z80.ZF | Z80.YF | Z80.XF | Z80.PF | Z80.CF)) | ((self.m_f & Z80.CF) << 4) | (self.m_a & (Z80.YF | Z80.XF))) ^ Z80.CF
 
     def op_op_40(self): pass
-    def op_op_41(self): self.B = self.C
-    def op_op_42(self): self.B = self.D
-    def op_op_43(self): self.B = self.E
-    def op_op_44(self): self.B = self.H
-    def op_op_45(self): self.B = self.L
-    def op_op_46(self): self.B = self.rm(self.HL)
-    def op_op_47(self): self.B = self.A
-
-    def op_op_48(self): self.C = self.B
+    def op_op_41(self): self.m_bc = ((self.m_bc & 0xff) << 8) | (self.m_bc & 0xff)
+    def op_op_42(self): self.m_bc = ((self.m_de >> 8) << 8) | (self.m_bc & 0xff)
+    def op_op_43(self): self.m_bc = ((self.m_de & 0xff) << 8) | (self.m_bc & 0xff)
+    def op_op_44(self): self.m_bc = ((self.m_hl >> 8) << 8) | (self.m_bc & 0xff)
+    def op_op_45(self): self.m_bc = ((self.m_hl & 0xff) << 8) | (self.m_bc & 0xff)
+    def op_op_46(self): self.m_bc = (self.rm(self.m_hl) << 8) | (self.m_bc & 0xff)
+    def op_op_47(self): self.m_bc = (self.m_a << 8) | (self.m_bc & 0xff)
+
+    def op_op_48(self): self.m_bc = (self.m_bc & 0xff00) | (self.m_bc >> 8)
     def op_op_49(self): pass
-    def op_op_4a(self): self.C = self.D
-    def op_op_4b(self): self.C = self.E
-    def op_op_4c(self): self.C = self.H
-    def op_op_4d(self): self.C = self.L
-    def op_op_4e(self): self.C = self.rm(self.HL)
-    def op_op_4f(self): self.C = self.A
-
-    def op_op_50(self): self.D = self.B
-    def op_op_51(self): self.D = self.C
+    def op_op_4a(self): self.m_bc = (self.m_bc & 0xff00) | (self.m_de >> 8)
+    def op_op_4b(self): self.m_bc = (self.m_bc & 0xff00) | (self.m_de & 0xff)
+    def op_op_4c(self): self.m_bc = (self.m_bc & 0xff00) | (self.m_hl >> 8)
+    def op_op_4d(self): self.m_bc = (self.m_bc & 0xff00) | (self.m_hl & 0xff)
+    def op_op_4e(self): self.m_bc = (self.m_bc & 0xff00) | self.rm(self.m_hl)
+    def op_op_4f(self): self.m_bc = (self.m_bc & 0xff00) | self.m_a
+
+    def op_op_50(self): self.m_de = ((self.m_bc >> 8) << 8) | (self.m_de & 0xff)
+    def op_op_51(self): self.m_de = ((self.m_bc & 0xff) << 8) | (self.m_de & 0xff)
     def op_op_52(self): pass
-    def op_op_53(self): self.D = self.E
-    def op_op_54(self): self.D = self.H
-    def op_op_55(self): self.D = self.L
-    def op_op_56(self): self.D = self.rm(self.HL)
-    def op_op_57(self): self.D = self.A
-
-    def op_op_58(self): self.E = self.B
-    def op_op_59(self): self.E = self.C
-    def op_op_5a(self): self.E = self.D
+    def op_op_53(self): self.m_de = ((self.m_de & 0xff) << 8) | (self.m_de & 0xff)
+    def op_op_54(self): self.m_de = ((self.m_hl >> 8) << 8) | (self.m_de & 0xff)
+    def op_op_55(self): self.m_de = ((self.m_hl & 0xff) << 8) | (self.m_de & 0xff)
+    def op_op_56(self): self.m_de = (self.rm(self.m_hl) << 8) | (self.m_de & 0xff)
+    def op_op_57(self): self.m_de = (self.m_a << 8) | (self.m_de & 0xff)
+
+    def op_op_58(self): self.m_de = (self.m_de & 0xff00) | (self.m_bc >> 8)
+    def op_op_59(self): self.m_de = (self.m_de & 0xff00) | (self.m_bc & 0xff)
+    def op_op_5a(self): self.m_de = (self.m_de & 0xff00) | (self.m_de >> 8)
     def op_op_5b(self): pass
-    def op_op_5c(self): self.E = self.H
-    def op_op_5d(self): self.E = self.L
-    def op_op_5e(self): self.E = self.rm(self.HL)
-    def op_op_5f(self): self.E = self.A
-
-    def op_op_60(self): self.H = self.B
-    def op_op_61(self): self.H = self.C
-    def op_op_62(self): self.H = self.D
-    def op_op_63(self): self.H = self.E
+    def op_op_5c(self): self.m_de = (self.m_de & 0xff00) | (self.m_hl >> 8)
+    def op_op_5d(self): self.m_de = (self.m_de & 0xff00) | (self.m_hl & 0xff)
+    def op_op_5e(self): self.m_de = (self.m_de & 0xff00) | self.rm(self.m_hl)
+    def op_op_5f(self): self.m_de = (self.m_de & 0xff00) | self.m_a
+
+    def op_op_60(self): self.m_hl = ((self.m_bc >> 8) << 8) | (self.m_hl & 0xff)
+    def op_op_61(self): self.m_hl = ((self.m_bc & 0xff) << 8) | (self.m_hl & 0xff)
+    def op_op_62(self): self.m_hl = ((self.m_de >> 8) << 8) | (self.m_hl & 0xff)
+    def op_op_63(self): self.m_hl = ((self.m_de & 0xff) << 8) | (self.m_hl & 0xff)
     def op_op_64(self): pass
-    def op_op_65(self): self.H = self.L
-    def op_op_66(self): self.H = self.rm(self.HL)
-    def op_op_67(self): self.H = self.A
-
-    def op_op_68(self): self.L = self.B
-    def op_op_69(self): self.L = self.C
-    def op_op_6a(self): self.L = self.D
-    def op_op_6b(self): self.L = self.E
-    def op_op_6c(self): self.L = self.H
+    def op_op_65(self): self.m_hl = ((self.m_hl & 0xff) << 8) | (self.m_hl & 0xff)
+    def op_op_66(self): self.m_hl = (self.rm(self.m_hl) << 8) | (self.m_hl & 0xff)
+    def op_op_67(self): self.m_hl = (self.m_a << 8) | (self.m_hl & 0xff)
+
+    def op_op_68(self): self.m_hl = (self.m_hl & 0xff00) | (self.m_bc >> 8)
+    def op_op_69(self): self.m_hl = (self.m_hl & 0xff00) | (self.m_bc & 0xff)
+    def op_op_6a(self): self.m_hl = (self.m_hl & 0xff00) | (self.m_de >> 8)
+    def op_op_6b(self): self.m_hl = (self.m_hl & 0xff00) | (self.m_de & 0xff)
+    def op_op_6c(self): self.m_hl = (self.m_hl & 0xff00) | (self.m_hl >> 8)
     def op_op_6d(self): pass
-    def op_op_6e(self): self.L = self.rm(self.HL)
-    def op_op_6f(self): self.L = self.A
-
-    def op_op_70(self): self.wm(self.HL, self.B)
-    def op_op_71(self): self.wm(self.HL, self.C)
-    def op_op_72(self): self.wm(self.HL, self.D)
-    def op_op_73(self): self.wm(self.HL, self.E)
-    def op_op_74(self): self.wm(self.HL, self.H)
-    def op_op_75(self): self.wm(self.HL, self.L)
+    def op_op_6e(self): self.m_hl = (self.m_hl & 0xff00) | self.rm(self.m_hl)
+    def op_op_6f(self): self.m_hl = (self.m_hl & 0xff00) | self.m_a
+
+    def op_op_70(self): self.wm(self.m_hl, (self.m_bc >> 8))
+    def op_op_71(self): self.wm(self.m_hl, (self.m_bc & 0xff))
+    def op_op_72(self): self.wm(self.m_hl, (self.m_de >> 8))
+    def op_op_73(self): self.wm(self.m_hl, (self.m_de & 0xff))
+    def op_op_74(self): self.wm(self.m_hl, (self.m_hl >> 8))
+    def op_op_75(self): self.wm(self.m_hl, (self.m_hl & 0xff))
     def op_op_76(self): self.halt()
-    def op_op_77(self): self.wm(self.HL, self.A)
-
-    def op_op_78(self): self.A = self.B
-    def op_op_79(self): self.A = self.C
-    def op_op_7a(self): self.A = self.D
-    def op_op_7b(self): self.A = self.E
-    def op_op_7c(self): self.A = self.H
-    def op_op_7d(self): self.A = self.L
-    def op_op_7e(self): self.A = self.rm(self.HL)
+    def op_op_77(self): self.wm(self.m_hl, self.m_a)
+
+    def op_op_78(self): self.m_a = (self.m_bc >> 8)
+    def op_op_79(self): self.m_a = (self.m_bc & 0xff)
+    def op_op_7a(self): self.m_a = (self.m_de >> 8)
+    def op_op_7b(self): self.m_a = (self.m_de & 0xff)
+    def op_op_7c(self): self.m_a = (self.m_hl >> 8)
+    def op_op_7d(self): self.m_a = (self.m_hl & 0xff)
+    def op_op_7e(self): self.m_a = self.rm(self.m_hl)
     def op_op_7f(self): pass
 
-    def op_op_80(self): self.add_a(self.B)
-    def op_op_81(self): self.add_a(self.C)
-    def op_op_82(self): self.add_a(self.D)
-    def op_op_83(self): self.add_a(self.E)
-    def op_op_84(self): self.add_a(self.H)
-    def op_op_85(self): self.add_a(self.L)
-    def op_op_86(self): self.add_a(self.rm(self.HL))
-    def op_op_87(self): self.add_a(self.A)
-
-    def op_op_88(self): self.adc_a(self.B)
-    def op_op_89(self): self.adc_a(self.C)
-    def op_op_8a(self): self.adc_a(self.D)
-    def op_op_8b(self): self.adc_a(self.E)
-    def op_op_8c(self): self.adc_a(self.H)
-    def op_op_8d(self): self.adc_a(self.L)
-    def op_op_8e(self): self.adc_a(self.rm(self.HL))
-    def op_op_8f(self): self.adc_a(self.A)
-
-    def op_op_90(self): self.sub(self.B)
-    def op_op_91(self): self.sub(self.C)
-    def op_op_92(self): self.sub(self.D)
-    def op_op_93(self): self.sub(self.E)
-    def op_op_94(self): self.sub(self.H)
-    def op_op_95(self): self.sub(self.L)
-    def op_op_96(self): self.sub(self.rm(self.HL))
-    def op_op_97(self): self.sub(self.A)
-
-    def op_op_98(self): self.sbc_a(self.B)
-    def op_op_99(self): self.sbc_a(self.C)
-    def op_op_9a(self): self.sbc_a(self.D)
-    def op_op_9b(self): self.sbc_a(self.E)
-    def op_op_9c(self): self.sbc_a(self.H)
-    def op_op_9d(self): self.sbc_a(self.L)
-    def op_op_9e(self): self.sbc_a(self.rm(self.HL))
-    def op_op_9f(self): self.sbc_a(self.A)
-
-    def op_op_a0(self): self.and_a(self.B)
-    def op_op_a1(self): self.and_a(self.C)
-    def op_op_a2(self): self.and_a(self.D)
-    def op_op_a3(self): self.and_a(self.E)
-    def op_op_a4(self): self.and_a(self.H)
-    def op_op_a5(self): self.and_a(self.L)
-    def op_op_a6(self): self.and_a(self.rm(self.HL))
-    def op_op_a7(self): self.and_a(self.A)
-
-    def op_op_a8(self): self.xor_a(self.B)
-    def op_op_a9(self): self.xor_a(self.C)
-    def op_op_aa(self): self.xor_a(self.D)
-    def op_op_ab(self): self.xor_a(self.E)
-    def op_op_ac(self): self.xor_a(self.H)
-    def op_op_ad(self): self.xor_a(self.L)
-    def op_op_ae(self): self.xor_a(self.rm(self.HL))
-    def op_op_af(self): self.xor_a(self.A)
-
-    def op_op_b0(self): self.or_a(self.B)
-    def op_op_b1(self): self.or_a(self.C)
-    def op_op_b2(self): self.or_a(self.D)
-    def op_op_b3(self): self.or_a(self.E)
-    def op_op_b4(self): self.or_a(self.H)
-    def op_op_b5(self): self.or_a(self.L)
-    def op_op_b6(self): self.or_a(self.rm(self.HL))
-    def op_op_b7(self): self.or_a(self.A)
-
-    def op_op_b8(self): self.cp(self.B)
-    def op_op_b9(self): self.cp(self.C)
-    def op_op_ba(self): self.cp(self.D)
-    def op_op_bb(self): self.cp(self.E)
-    def op_op_bc(self): self.cp(self.H)
-    def op_op_bd(self): self.cp(self.L)
-    def op_op_be(self): self.cp(self.rm(self.HL))
-    def op_op_bf(self): self.cp(self.A)
-
-    def op_op_c0(self): self.ret_cond(not (self.F & Z80.ZF), 0xc0)
-    def op_op_c1(self): self.pop(self.m_bc)
-    def op_op_c2(self): self.jp_cond(not (self.F & Z80.ZF))
+    def op_op_80(self): self.add_a((self.m_bc >> 8))
+    def op_op_81(self): self.add_a((self.m_bc & 0xff))
+    def op_op_82(self): self.add_a((self.m_de >> 8))
+    def op_op_83(self): self.add_a((self.m_de & 0xff))
+    def op_op_84(self): self.add_a((self.m_hl >> 8))
+    def op_op_85(self): self.add_a((self.m_hl & 0xff))
+    def op_op_86(self): self.add_a(self.rm(self.m_hl))
+    def op_op_87(self): self.add_a(self.m_a)
+
+    def op_op_88(self): self.adc_a((self.m_bc >> 8))
+    def op_op_89(self): self.adc_a((self.m_bc & 0xff))
+    def op_op_8a(self): self.adc_a((self.m_de >> 8))
+    def op_op_8b(self): self.adc_a((self.m_de & 0xff))
+    def op_op_8c(self): self.adc_a((self.m_hl >> 8))
+    def op_op_8d(self): self.adc_a((self.m_hl & 0xff))
+    def op_op_8e(self): self.adc_a(self.rm(self.m_hl))
+    def op_op_8f(self): self.adc_a(self.m_a)
+
+    def op_op_90(self): self.sub((self.m_bc >> 8))
+    def op_op_91(self): self.sub((self.m_bc & 0xff))
+    def op_op_92(self): self.sub((self.m_de >> 8))
+    def op_op_93(self): self.sub((self.m_de & 0xff))
+    def op_op_94(self): self.sub((self.m_hl >> 8))
+    def op_op_95(self): self.sub((self.m_hl & 0xff))
+    def op_op_96(self): self.sub(self.rm(self.m_hl))
+    def op_op_97(self): self.sub(self.m_a)
+
+    def op_op_98(self): self.sbc_a((self.m_bc >> 8))
+    def op_op_99(self): self.sbc_a((self.m_bc & 0xff))
+    def op_op_9a(self): self.sbc_a((self.m_de >> 8))
+    def op_op_9b(self): self.sbc_a((self.m_de & 0xff))
+    def op_op_9c(self): self.sbc_a((self.m_hl >> 8))
+    def op_op_9d(self): self.sbc_a((self.m_hl & 0xff))
+    def op_op_9e(self): self.sbc_a(self.rm(self.m_hl))
+    def op_op_9f(self): self.sbc_a(self.m_a)
+
+    def op_op_a0(self): self.and_a((self.m_bc >> 8))
+    def op_op_a1(self): self.and_a((self.m_bc & 0xff))
+    def op_op_a2(self): self.and_a((self.m_de >> 8))
+    def op_op_a3(self): self.and_a((self.m_de & 0xff))
+    def op_op_a4(self): self.and_a((self.m_hl >> 8))
+    def op_op_a5(self): self.and_a((self.m_hl & 0xff))
+    def op_op_a6(self): self.and_a(self.rm(self.m_hl))
+    def op_op_a7(self): self.and_a(self.m_a)
+
+    def op_op_a8(self): self.xor_a((self.m_bc >> 8))
+    def op_op_a9(self): self.xor_a((self.m_bc & 0xff))
+    def op_op_aa(self): self.xor_a((self.m_de >> 8))
+    def op_op_ab(self): self.xor_a((self.m_de & 0xff))
+    def op_op_ac(self): self.xor_a((self.m_hl >> 8))
+    def op_op_ad(self): self.xor_a((self.m_hl & 0xff))
+    def op_op_ae(self): self.xor_a(self.rm(self.m_hl))
+    def op_op_af(self): self.xor_a(self.m_a)
+
+    def op_op_b0(self): self.or_a((self.m_bc >> 8))
+    def op_op_b1(self): self.or_a((self.m_bc & 0xff))
+    def op_op_b2(self): self.or_a((self.m_de >> 8))
+    def op_op_b3(self): self.or_a((self.m_de & 0xff))
+    def op_op_b4(self): self.or_a((self.m_hl >> 8))
+    def op_op_b5(self): self.or_a((self.m_hl & 0xff))
+    def op_op_b6(self): self.or_a(self.rm(self.m_hl))
+    def op_op_b7(self): self.or_a(self.m_a)
+
+    def op_op_b8(self): self.cp((self.m_bc >> 8))
+    def op_op_b9(self): self.cp((self.m_bc & 0xff))
+    def op_op_ba(self): self.cp((self.m_de >> 8))
+    def op_op_bb(self): self.cp((self.m_de & 0xff))
+    def op_op_bc(self): self.cp((self.m_hl >> 8))
+    def op_op_bd(self): self.cp((self.m_hl & 0xff))
+    def op_op_be(self): self.cp(self.rm(self.m_hl))
+    def op_op_bf(self): self.cp(self.m_a)
+
+    def op_op_c0(self): self.ret_cond(not (self.m_f & Z80.ZF), 0xc0)
+    def op_op_c1(self): self.m_bc = self.pop()
+    def op_op_c2(self): self.jp_cond(not (self.m_f & Z80.ZF))
     def op_op_c3(self): self.jp()
-    def op_op_c4(self): self.call_cond(not (self.F & Z80.ZF), 0xc4)
+    def op_op_c4(self): self.call_cond(not (self.m_f & Z80.ZF), 0xc4)
     def op_op_c5(self): self.push(self.m_bc)
     def op_op_c6(self): self.add_a(self.arg())
     def op_op_c7(self): self.rst(0x00)
 
-    def op_op_c8(self): self.ret_cond(self.F & Z80.ZF, 0xc8)
-    def op_op_c9(self): self.pop(self.m_pc); self.WZ = self.PC
-    def op_op_ca(self): self.jp_cond(self.F & Z80.ZF)
+    def op_op_c8(self): self.ret_cond(self.m_f & Z80.ZF, 0xc8)
+    def op_op_c9(self): self.m_pc = self.pop(); self.m_wz = self.m_pc
+    def op_op_ca(self): self.jp_cond(self.m_f & Z80.ZF)
     def op_op_cb(self): self.EXEC(Z80.cc_cb, self.op_cb, self.rop())
-    def op_op_cc(self): self.call_cond(self.F & Z80.ZF, 0xcc)
+    def op_op_cc(self): self.call_cond(self.m_f & Z80.ZF, 0xcc)
     def op_op_cd(self): self.call()
     def op_op_ce(self): self.adc_a(self.arg())
     def op_op_cf(self): self.rst(0x08)
 
-    def op_op_d0(self): self.ret_cond(not (self.F & Z80.CF), 0xd0)
-    def op_op_d1(self): self.pop(self.m_de)
-    def op_op_d2(self): self.jp_cond(not (self.F & Z80.CF))
-    def op_op_d3(self): n = self.arg() | (self.A << 8); self.out(n, self.A); self.WZ_L = ((n & 0xff) + 1) & 0xff; self.WZ_H = self.A
-    def op_op_d4(self): self.call_cond(not (self.F & Z80.CF), 0xd4)
+    def op_op_d0(self): self.ret_cond(not (self.m_f & Z80.CF), 0xd0)
+    def op_op_d1(self): self.m_de = self.pop()
+    def op_op_d2(self): self.jp_cond(not (self.m_f & Z80.CF))
+    def op_op_d3(self): n = self.arg() | (self.m_a << 8); self.out(n, self.m_a); self.m_wz = (self.m_a << 8) | (((n & 0xff) + 1) & 0xff)
+    def op_op_d4(self): self.call_cond(not (self.m_f & Z80.CF), 0xd4)
     def op_op_d5(self): self.push(self.m_de)
     def op_op_d6(self): self.sub(self.arg())
     def op_op_d7(self): self.rst(0x10)
 
-    def op_op_d8(self): self.ret_cond(self.F & Z80.CF, 0xd8)
+    def op_op_d8(self): self.ret_cond(self.m_f & Z80.CF, 0xd8)
     def op_op_d9(self): self.exx()
-    def op_op_da(self): self.jp_cond(self.F & Z80.CF)
-    def op_op_db(self): n = self.arg() | (self.A << 8); self.A = self.inp(n); self.WZ = n + 1
-    def op_op_dc(self): self.call_cond(self.F & Z80.CF, 0xdc)
+    def op_op_da(self): self.jp_cond(self.m_f & Z80.CF)
+    def op_op_db(self): n = self.arg() | (self.m_a << 8); self.m_a = self.inp(n); self.m_wz = (n + 1) & 0xffff
+    def op_op_dc(self): self.call_cond(self.m_f & Z80.CF, 0xdc)
     def op_op_dd(self): self.EXEC(Z80.cc_dd, self.op_dd, self.rop())
     def op_op_de(self): self.sbc_a(self.arg())
     def op_op_df(self): self.rst(0x18)
 
-    def op_op_e0(self): self.ret_cond(not (self.F & Z80.PF), 0xe0)
-    def op_op_e1(self): self.pop(self.m_hl)
-    def op_op_e2(self): self.jp_cond(not (self.F & Z80.PF))
-    def op_op_e3(self): self.ex_sp(self.m_hl)
-    def op_op_e4(self): self.call_cond(not (self.F & Z80.PF), 0xe4)
+    def op_op_e0(self): self.ret_cond(not (self.m_f & Z80.PF), 0xe0)
+    def op_op_e1(self): self.m_hl = self.pop()
+    def op_op_e2(self): self.jp_cond(not (self.m_f & Z80.PF))
+    def op_op_e3(self): self.m_hl = self.ex_sp(self.m_hl)
+    def op_op_e4(self): self.call_cond(not (self.m_f & Z80.PF), 0xe4)
     def op_op_e5(self): self.push(self.m_hl)
     def op_op_e6(self): self.and_a(self.arg())
     def op_op_e7(self): self.rst(0x20)
 
-    def op_op_e8(self): self.ret_cond(self.F & Z80.PF, 0xe8)
-    def op_op_e9(self): self.PC = self.HL
-    def op_op_ea(self): self.jp_cond(self.F & Z80.PF)
+    def op_op_e8(self): self.ret_cond(self.m_f & Z80.PF, 0xe8)
+    def op_op_e9(self): self.m_pc = self.m_hl
+    def op_op_ea(self): self.jp_cond(self.m_f & Z80.PF)
     def op_op_eb(self): self.ex_de_hl()
-    def op_op_ec(self): self.call_cond(self.F & Z80.PF, 0xec)
+    def op_op_ec(self): self.call_cond(self.m_f & Z80.PF, 0xec)
     def op_op_ed(self): self.EXEC(Z80.cc_ed, self.op_ed, self.rop())
     def op_op_ee(self): self.xor_a(self.arg())
     def op_op_ef(self): self.rst(0x28)
 
-    def op_op_f0(self): self.ret_cond(not (self.F & Z80.SF), 0xf0)
-    def op_op_f1(self): self.pop(self.m_af)
-    def op_op_f2(self): self.jp_cond(not (self.F & Z80.SF))
+    def op_op_f0(self): self.ret_cond(not (self.m_f & Z80.SF), 0xf0)
+    def op_op_f1(self): af = self.pop(); self.m_a = af >> 8; self.m_f = af & 0xff
+    def op_op_f2(self): self.jp_cond(not (self.m_f & Z80.SF))
     def op_op_f3(self): self.m_iff1 = self.m_iff2 = 0
-    def op_op_f4(self): self.call_cond(not (self.F & Z80.SF), 0xf4)
-    def op_op_f5(self): self.push(self.m_af)
+    def op_op_f4(self): self.call_cond(not (self.m_f & Z80.SF), 0xf4)
+    def op_op_f5(self): self.push((self.m_a << 8) | self.m_f)
     def op_op_f6(self): self.or_a(self.arg())
     def op_op_f7(self): self.rst(0x30)
 
-    def op_op_f8(self): self.ret_cond(self.F & Z80.SF, 0xf8)
-    def op_op_f9(self): self.nomreq_ir(2); self.SP = self.HL
-    def op_op_fa(self): self.jp_cond(self.F & Z80.SF)
+    def op_op_f8(self): self.ret_cond(self.m_f & Z80.SF, 0xf8)
+    def op_op_f9(self): self.nomreq_ir(2); self.m_sp = self.m_hl
+    def op_op_fa(self): self.jp_cond(self.m_f & Z80.SF)
     def op_op_fb(self): self.ei()
-    def op_op_fc(self): self.call_cond(self.F & Z80.SF, 0xfc)
+    def op_op_fc(self): self.call_cond(self.m_f & Z80.SF, 0xfc)
     def op_op_fd(self): self.EXEC(Z80.cc_fd, self.op_fd, self.rop())
     def op_op_fe(self): self.cp(self.arg())
     def op_op_ff(self): self.rst(0x38)
 
     def initialize_tables(self):
         if not Z80.tables_initialized:
+            # the add/sub tables are built a row of 256 results at a time,
+            # with the flag bits of the whole row computed on big ints
             add = Z80.SZHVC_add
             sub = Z80.SZHVC_sub
+            values = bytes(range(256))
+            neg = bytes((-i) & 0xff for i in range(256))
+            bit7 = int.from_bytes(b'\x80' * 256, 'big')
+            new7 = int.from_bytes(values, 'big') & bit7
 
-            for oldval in range(256):
-                for newval in range(256):
-                    idx = oldval * 256 + newval
-                    idxc = 256 * 256 + oldval * 256 + newval
-
-                    # add or adc w/o carry set
-                    val = newval - oldval
-                    f = (Z80.SF if newval & 0x80 else 0) if newval else Z80.ZF
-                    f |= newval & (Z80.YF | Z80.XF) # undocumented flag bits 5+3
-                    if (newval & 0x0f) < (oldval & 0x0f): f |= Z80.HF
-                    if newval < oldval: f |= Z80.CF
-                    if (val^oldval^0x80) & (val^newval) & 0x80: f |= Z80.VF
-                    add[idx] = f
-
-                    # add or adc with carry set
-                    val = newval - oldval - 1
-                    f = (Z80.SF if newval & 0x80 else 0) if newval else Z80.ZF
-                    f |= newval & (Z80.YF | Z80.XF) # undocumented flag bits 5+3
-                    if (newval & 0x0f) <= (oldval & 0x0f): f |= Z80.HF
-                    if newval <= oldval: f |= Z80.CF
-                    if (val^oldval^0x80) & (val^newval) & 0x80: f |= Z80.VF
-                    add[idxc] = f
-
-                    # cp, sub or sbc w/o carry set
-                    val = oldval - newval;
-                    f = Z80.NF | ((Z80.SF if newval & 0x80 else 0) if newval else Z80.ZF)
-                    f |= newval & (Z80.YF | Z80.XF) # undocumented flag bits 5+3
-                    if (newval & 0x0f) > (oldval & 0x0f): f |= Z80.HF
-                    if newval > oldval: f |= Z80.CF
-                    if (val^oldval) & (oldval^newval) & 0x80: f |= Z80.VF
-                    sub[idx] = f
-
-                    # sbc with carry set
-                    val = oldval - newval - 1
-                    f = Z80.NF | ((Z80.SF if newval & 0x80 else 0) if newval else Z80.ZF)
-                    f |= newval & (Z80.YF | Z80.XF) # undocumented flag bits 5+3
-                    if (newval & 0x0f) >= (oldval & 0x0f): f |= Z80.HF
-                    if newval >= oldval: f |= Z80.CF
-                    if (val^oldval) & (oldval^newval) & 0x80: f |= Z80.VF
-                    sub[idxc] = f
+            sz = bytearray(256)
+            for i in range(256):
+                sz[i] = ((i & Z80.SF) if i else Z80.ZF) | (i & (Z80.YF | Z80.XF))
+            sz = int.from_bytes(sz, 'big')
+            nf = int.from_bytes(bytes([Z80.NF]) * 256, 'big')
+
+            def row(pattern):
+                return int.from_bytes(pattern, 'big')
+
+            for c in range(2):
+                for oldval in range(256):
+                    idx = (c << 16) | (oldval << 8)
+                    old7 = oldval & 0x80
+                    low = oldval & 0x0f
+
+                    # add or adc: newval = oldval + val + c
+                    k = (oldval + c) & 0xff
+                    val7 = row(values[-k:] + values[:-k] if k else values) & bit7
+                    if old7:
+                        v = val7 & ~new7
+                    else:
+                        v = (bit7 ^ val7) & new7
+                    f = sz \
+                        | row(bytes(Z80.HF if i < low + c else 0 for i in range(16)) * 16) \
+                        | row(bytes([Z80.CF]) * min(oldval + c, 256) + bytes(256 - min(oldval + c, 256))) \
+                        | (v >> 5)    # bit 7 to VF
+                    add[idx:idx + 256] = f.to_bytes(256, 'big')
+
+                    # cp, sub or sbc: newval = oldval - val - c
+                    k = (oldval - c) & 0xff
+                    val7 = row((values[-k:] + values[:-k] if k else values).translate(neg)) & bit7
+                    if old7:
+                        v = bit7 ^ (val7 | new7)
+                    else:
+                        v = val7 & new7
+                    f = nf | sz \
+                        | row(bytes(Z80.HF if i > low - c else 0 for i in range(16)) * 16) \
+                        | row(bytes(oldval + 1 - c) + bytes([Z80.CF]) * (255 - oldval + c)) \
+                        | (v >> 5)
+                    sub[idx:idx + 256] = f.to_bytes(256, 'big')
 
             for i in range(256):
                 p = 0
@@ -3023,407 +3677,416 @@ class Z80:
                 value = -(i & 0b10000000) | (i & 0b01111111)
                 Z80.S8[i] = value
 
-            for i in range(0x10000):
-                value = -(value & 0b1000000000000000) | (value & 0b0111111111111111)
-                Z80.S16[i] = value
+            Z80.S16[:] = list(range(0x8000)) + list(range(-0x8000, 0))
 
             Z80.tables_initialized = True
 
-        self.op_cb = [
-            self.op_cb_00, self.op_cb_01, self.op_cb_02, self.op_cb_03,
-            self.op_cb_04, self.op_cb_05, self.op_cb_06, self.op_cb_07,
-            self.op_cb_08, self.op_cb_09, self.op_cb_0a, self.op_cb_0b,
-            self.op_cb_0c, self.op_cb_0d, self.op_cb_0e, self.op_cb_0f,
-            self.op_cb_10, self.op_cb_11, self.op_cb_12, self.op_cb_13,
-            self.op_cb_14, self.op_cb_15, self.op_cb_16, self.op_cb_17,
-            self.op_cb_18, self.op_cb_19, self.op_cb_1a, self.op_cb_1b,
-            self.op_cb_1c, self.op_cb_1d, self.op_cb_1e, self.op_cb_1f,
-            self.op_cb_20, self.op_cb_21, self.op_cb_22, self.op_cb_23,
-            self.op_cb_24, self.op_cb_25, self.op_cb_26, self.op_cb_27,
-            self.op_cb_28, self.op_cb_29, self.op_cb_2a, self.op_cb_2b,
-            self.op_cb_2c, self.op_cb_2d, self.op_cb_2e, self.op_cb_2f,
-            self.op_cb_30, self.op_cb_31, self.op_cb_32, self.op_cb_33,
-            self.op_cb_34, self.op_cb_35, self.op_cb_36, self.op_cb_37,
-            self.op_cb_38, self.op_cb_39, self.op_cb_3a, self.op_cb_3b,
-            self.op_cb_3c, self.op_cb_3d, self.op_cb_3e, self.op_cb_3f,
-            self.op_cb_40, self.op_cb_41, self.op_cb_42, self.op_cb_43,
-            self.op_cb_44, self.op_cb_45, self.op_cb_46, self.op_cb_47,
-            self.op_cb_48, self.op_cb_49, self.op_cb_4a, self.op_cb_4b,
-            self.op_cb_4c, self.op_cb_4d, self.op_cb_4e, self.op_cb_4f,
-            self.op_cb_50, self.op_cb_51, self.op_cb_52, self.op_cb_53,
-            self.op_cb_54, self.op_cb_55, self.op_cb_56, self.op_cb_57,
-            self.op_cb_58, self.op_cb_59, self.op_cb_5a, self.op_cb_5b,
-            self.op_cb_5c, self.op_cb_5d, self.op_cb_5e, self.op_cb_5f,
-            self.op_cb_60, self.op_cb_61, self.op_cb_62, self.op_cb_63,
-            self.op_cb_64, self.op_cb_65, self.op_cb_66, self.op_cb_67,
-            self.op_cb_68, self.op_cb_69, self.op_cb_6a, self.op_cb_6b,
-            self.op_cb_6c, self.op_cb_6d, self.op_cb_6e, self.op_cb_6f,
-            self.op_cb_70, self.op_cb_71, self.op_cb_72, self.op_cb_73,
-            self.op_cb_74, self.op_cb_75, self.op_cb_76, self.op_cb_77,
-            self.op_cb_78, self.op_cb_79, self.op_cb_7a, self.op_cb_7b,
-            self.op_cb_7c, self.op_cb_7d, self.op_cb_7e, self.op_cb_7f,
-            self.op_cb_80, self.op_cb_81, self.op_cb_82, self.op_cb_83,
-            self.op_cb_84, self.op_cb_85, self.op_cb_86, self.op_cb_87,
-            self.op_cb_88, self.op_cb_89, self.op_cb_8a, self.op_cb_8b,
-            self.op_cb_8c, self.op_cb_8d, self.op_cb_8e, self.op_cb_8f,
-            self.op_cb_90, self.op_cb_91, self.op_cb_92, self.op_cb_93,
-            self.op_cb_94, self.op_cb_95, self.op_cb_96, self.op_cb_97,
-            self.op_cb_98, self.op_cb_99, self.op_cb_9a, self.op_cb_9b,
-            self.op_cb_9c, self.op_cb_9d, self.op_cb_9e, self.op_cb_9f,
-            self.op_cb_a0, self.op_cb_a1, self.op_cb_a2, self.op_cb_a3,
-            self.op_cb_a4, self.op_cb_a5, self.op_cb_a6, self.op_cb_a7,
-            self.op_cb_a8, self.op_cb_a9, self.op_cb_aa, self.op_cb_ab,
-            self.op_cb_ac, self.op_cb_ad, self.op_cb_ae, self.op_cb_af,
-            self.op_cb_b0, self.op_cb_b1, self.op_cb_b2, self.op_cb_b3,
-            self.op_cb_b4, self.op_cb_b5, self.op_cb_b6, self.op_cb_b7,
-            self.op_cb_b8, self.op_cb_b9, self.op_cb_ba, self.op_cb_bb,
-            self.op_cb_bc, self.op_cb_bd, self.op_cb_be, self.op_cb_bf,
-            self.op_cb_c0, self.op_cb_c1, self.op_cb_c2, self.op_cb_c3,
-            self.op_cb_c4, self.op_cb_c5, self.op_cb_c6, self.op_cb_c7,
-            self.op_cb_c8, self.op_cb_c9, self.op_cb_ca, self.op_cb_cb,
-            self.op_cb_cc, self.op_cb_cd, self.op_cb_ce, self.op_cb_cf,
-            self.op_cb_d0, self.op_cb_d1, self.op_cb_d2, self.op_cb_d3,
-            self.op_cb_d4, self.op_cb_d5, self.op_cb_d6, self.op_cb_d7,
-            self.op_cb_d8, self.op_cb_d9, self.op_cb_da, self.op_cb_db,
-            self.op_cb_dc, self.op_cb_dd, self.op_cb_de, self.op_cb_df,
-            self.op_cb_e0, self.op_cb_e1, self.op_cb_e2, self.op_cb_e3,
-            self.op_cb_e4, self.op_cb_e5, self.op_cb_e6, self.op_cb_e7,
-            self.op_cb_e8, self.op_cb_e9, self.op_cb_ea, self.op_cb_eb,
-            self.op_cb_ec, self.op_cb_ed, self.op_cb_ee, self.op_cb_ef,
-            self.op_cb_f0, self.op_cb_f1, self.op_cb_f2, self.op_cb_f3,
-            self.op_cb_f4, self.op_cb_f5, self.op_cb_f6, self.op_cb_f7,
-            self.op_cb_f8, self.op_cb_f9, self.op_cb_fa, self.op_cb_fb,
-            self.op_cb_fc, self.op_cb_fd, self.op_cb_fe, self.op_cb_ff,
+        if 'op_op' not in vars(type(self)):
+            type(self).initialize_dispatch()
+
+    @classmethod
+    def initialize_dispatch(cls):
+        """Build the opcode dispatch tables of the class
+
+        The tables hold plain functions, called with the CPU as their
+        argument; they are built once for each class, so that handlers
+        overridden by a subclass are picked up.
+        """
+        cls.op_cb = [
+            cls.op_cb_00, cls.op_cb_01, cls.op_cb_02, cls.op_cb_03,
+            cls.op_cb_04, cls.op_cb_05, cls.op_cb_06, cls.op_cb_07,
+            cls.op_cb_08, cls.op_cb_09, cls.op_cb_0a, cls.op_cb_0b,
+            cls.op_cb_0c, cls.op_cb_0d, cls.op_cb_0e, cls.op_cb_0f,
+            cls.op_cb_10, cls.op_cb_11, cls.op_cb_12, cls.op_cb_13,
+            cls.op_cb_14, cls.op_cb_15, cls.op_cb_16, cls.op_cb_17,
+            cls.op_cb_18, cls.op_cb_19, cls.op_cb_1a, cls.op_cb_1b,
+            cls.op_cb_1c, cls.op_cb_1d, cls.op_cb_1e, cls.op_cb_1f,
+            cls.op_cb_20, cls.op_cb_21, cls.op_cb_22, cls.op_cb_23,
+            cls.op_cb_24, cls.op_cb_25, cls.op_cb_26, cls.op_cb_27,
+            cls.op_cb_28, cls.op_cb_29, cls.op_cb_2a, cls.op_cb_2b,
+            cls.op_cb_2c, cls.op_cb_2d, cls.op_cb_2e, cls.op_cb_2f,
+            cls.op_cb_30, cls.op_cb_31, cls.op_cb_32, cls.op_cb_33,
+            cls.op_cb_34, cls.op_cb_35, cls.op_cb_36, cls.op_cb_37,
+            cls.op_cb_38, cls.op_cb_39, cls.op_cb_3a, cls.op_cb_3b,
+            cls.op_cb_3c, cls.op_cb_3d, cls.op_cb_3e, cls.op_cb_3f,
+            cls.op_cb_40, cls.op_cb_41, cls.op_cb_42, cls.op_cb_43,
+            cls.op_cb_44, cls.op_cb_45, cls.op_cb_46, cls.op_cb_47,
+            cls.op_cb_48, cls.op_cb_49, cls.op_cb_4a, cls.op_cb_4b,
+            cls.op_cb_4c, cls.op_cb_4d, cls.op_cb_4e, cls.op_cb_4f,
+            cls.op_cb_50, cls.op_cb_51, cls.op_cb_52, cls.op_cb_53,
+            cls.op_cb_54, cls.op_cb_55, cls.op_cb_56, cls.op_cb_57,
+            cls.op_cb_58, cls.op_cb_59, cls.op_cb_5a, cls.op_cb_5b,
+            cls.op_cb_5c, cls.op_cb_5d, cls.op_cb_5e, cls.op_cb_5f,
+            cls.op_cb_60, cls.op_cb_61, cls.op_cb_62, cls.op_cb_63,
+            cls.op_cb_64, cls.op_cb_65, cls.op_cb_66, cls.op_cb_67,
+            cls.op_cb_68, cls.op_cb_69, cls.op_cb_6a, cls.op_cb_6b,
+            cls.op_cb_6c, cls.op_cb_6d, cls.op_cb_6e, cls.op_cb_6f,
+            cls.op_cb_70, cls.op_cb_71, cls.op_cb_72, cls.op_cb_73,
+            cls.op_cb_74, cls.op_cb_75, cls.op_cb_76, cls.op_cb_77,
+            cls.op_cb_78, cls.op_cb_79, cls.op_cb_7a, cls.op_cb_7b,
+            cls.op_cb_7c, cls.op_cb_7d, cls.op_cb_7e, cls.op_cb_7f,
+            cls.op_cb_80, cls.op_cb_81, cls.op_cb_82, cls.op_cb_83,
+            cls.op_cb_84, cls.op_cb_85, cls.op_cb_86, cls.op_cb_87,
+            cls.op_cb_88, cls.op_cb_89, cls.op_cb_8a, cls.op_cb_8b,
+            cls.op_cb_8c, cls.op_cb_8d, cls.op_cb_8e, cls.op_cb_8f,
+            cls.op_cb_90, cls.op_cb_91, cls.op_cb_92, cls.op_cb_93,
+            cls.op_cb_94, cls.op_cb_95, cls.op_cb_96, cls.op_cb_97,
+            cls.op_cb_98, cls.op_cb_99, cls.op_cb_9a, cls.op_cb_9b,
+            cls.op_cb_9c, cls.op_cb_9d, cls.op_cb_9e, cls.op_cb_9f,
+            cls.op_cb_a0, cls.op_cb_a1, cls.op_cb_a2, cls.op_cb_a3,
+            cls.op_cb_a4, cls.op_cb_a5, cls.op_cb_a6, cls.op_cb_a7,
+            cls.op_cb_a8, cls.op_cb_a9, cls.op_cb_aa, cls.op_cb_ab,
+            cls.op_cb_ac, cls.op_cb_ad, cls.op_cb_ae, cls.op_cb_af,
+            cls.op_cb_b0, cls.op_cb_b1, cls.op_cb_b2, cls.op_cb_b3,
+            cls.op_cb_b4, cls.op_cb_b5, cls.op_cb_b6, cls.op_cb_b7,
+            cls.op_cb_b8, cls.op_cb_b9, cls.op_cb_ba, cls.op_cb_bb,
+            cls.op_cb_bc, cls.op_cb_bd, cls.op_cb_be, cls.op_cb_bf,
+            cls.op_cb_c0, cls.op_cb_c1, cls.op_cb_c2, cls.op_cb_c3,
+            cls.op_cb_c4, cls.op_cb_c5, cls.op_cb_c6, cls.op_cb_c7,
+            cls.op_cb_c8, cls.op_cb_c9, cls.op_cb_ca, cls.op_cb_cb,
+            cls.op_cb_cc, cls.op_cb_cd, cls.op_cb_ce, cls.op_cb_cf,
+            cls.op_cb_d0, cls.op_cb_d1, cls.op_cb_d2, cls.op_cb_d3,
+            cls.op_cb_d4, cls.op_cb_d5, cls.op_cb_d6, cls.op_cb_d7,
+            cls.op_cb_d8, cls.op_cb_d9, cls.op_cb_da, cls.op_cb_db,
+            cls.op_cb_dc, cls.op_cb_dd, cls.op_cb_de, cls.op_cb_df,
+            cls.op_cb_e0, cls.op_cb_e1, cls.op_cb_e2, cls.op_cb_e3,
+            cls.op_cb_e4, cls.op_cb_e5, cls.op_cb_e6, cls.op_cb_e7,
+            cls.op_cb_e8, cls.op_cb_e9, cls.op_cb_ea, cls.op_cb_eb,
+            cls.op_cb_ec, cls.op_cb_ed, cls.op_cb_ee, cls.op_cb_ef,
+            cls.op_cb_f0, cls.op_cb_f1, cls.op_cb_f2, cls.op_cb_f3,
+            cls.op_cb_f4, cls.op_cb_f5, cls.op_cb_f6, cls.op_cb_f7,
+            cls.op_cb_f8, cls.op_cb_f9, cls.op_cb_fa, cls.op_cb_fb,
+            cls.op_cb_fc, cls.op_cb_fd, cls.op_cb_fe, cls.op_cb_ff,
         ]
-        self.op_xycb = [
-            self.op_xycb_00, self.op_xycb_01, self.op_xycb_02, self.op_xycb_03,
-            self.op_xycb_04, self.op_xycb_05, self.op_xycb_06, self.op_xycb_07,
-            self.op_xycb_08, self.op_xycb_09, self.op_xycb_0a, self.op_xycb_0b,
-            self.op_xycb_0c, self.op_xycb_0d, self.op_xycb_0e, self.op_xycb_0f,
-            self.op_xycb_10, self.op_xycb_11, self.op_xycb_12, self.op_xycb_13,
-            self.op_xycb_14, self.op_xycb_15, self.op_xycb_16, self.op_xycb_17,
-            self.op_xycb_18, self.op_xycb_19, self.op_xycb_1a, self.op_xycb_1b,
-            self.op_xycb_1c, self.op_xycb_1d, self.op_xycb_1e, self.op_xycb_1f,
-            self.op_xycb_20, self.op_xycb_21, self.op_xycb_22, self.op_xycb_23,
-            self.op_xycb_24, self.op_xycb_25, self.op_xycb_26, self.op_xycb_27,
-            self.op_xycb_28, self.op_xycb_29, self.op_xycb_2a, self.op_xycb_2b,
-            self.op_xycb_2c, self.op_xycb_2d, self.op_xycb_2e, self.op_xycb_2f,
-            self.op_xycb_30, self.op_xycb_31, self.op_xycb_32, self.op_xycb_33,
-            self.op_xycb_34, self.op_xycb_35, self.op_xycb_36, self.op_xycb_37,
-            self.op_xycb_38, self.op_xycb_39, self.op_xycb_3a, self.op_xycb_3b,
-            self.op_xycb_3c, self.op_xycb_3d, self.op_xycb_3e, self.op_xycb_3f,
-            self.op_xycb_40, self.op_xycb_41, self.op_xycb_42, self.op_xycb_43,
-            self.op_xycb_44, self.op_xycb_45, self.op_xycb_46, self.op_xycb_47,
-            self.op_xycb_48, self.op_xycb_49, self.op_xycb_4a, self.op_xycb_4b,
-            self.op_xycb_4c, self.op_xycb_4d, self.op_xycb_4e, self.op_xycb_4f,
-            self.op_xycb_50, self.op_xycb_51, self.op_xycb_52, self.op_xycb_53,
-            self.op_xycb_54, self.op_xycb_55, self.op_xycb_56, self.op_xycb_57,
-            self.op_xycb_58, self.op_xycb_59, self.op_xycb_5a, self.op_xycb_5b,
-            self.op_xycb_5c, self.op_xycb_5d, self.op_xycb_5e, self.op_xycb_5f,
-            self.op_xycb_60, self.op_xycb_61, self.op_xycb_62, self.op_xycb_63,
-            self.op_xycb_64, self.op_xycb_65, self.op_xycb_66, self.op_xycb_67,
-            self.op_xycb_68, self.op_xycb_69, self.op_xycb_6a, self.op_xycb_6b,
-            self.op_xycb_6c, self.op_xycb_6d, self.op_xycb_6e, self.op_xycb_6f,
-            self.op_xycb_70, self.op_xycb_71, self.op_xycb_72, self.op_xycb_73,
-            self.op_xycb_74, self.op_xycb_75, self.op_xycb_76, self.op_xycb_77,
-            self.op_xycb_78, self.op_xycb_79, self.op_xycb_7a, self.op_xycb_7b,
-            self.op_xycb_7c, self.op_xycb_7d, self.op_xycb_7e, self.op_xycb_7f,
-            self.op_xycb_80, self.op_xycb_81, self.op_xycb_82, self.op_xycb_83,
-            self.op_xycb_84, self.op_xycb_85, self.op_xycb_86, self.op_xycb_87,
-            self.op_xycb_88, self.op_xycb_89, self.op_xycb_8a, self.op_xycb_8b,
-            self.op_xycb_8c, self.op_xycb_8d, self.op_xycb_8e, self.op_xycb_8f,
-            self.op_xycb_90, self.op_xycb_91, self.op_xycb_92, self.op_xycb_93,
-            self.op_xycb_94, self.op_xycb_95, self.op_xycb_96, self.op_xycb_97,
-            self.op_xycb_98, self.op_xycb_99, self.op_xycb_9a, self.op_xycb_9b,
-            self.op_xycb_9c, self.op_xycb_9d, self.op_xycb_9e, self.op_xycb_9f,
-            self.op_xycb_a0, self.op_xycb_a1, self.op_xycb_a2, self.op_xycb_a3,
-            self.op_xycb_a4, self.op_xycb_a5, self.op_xycb_a6, self.op_xycb_a7,
-            self.op_xycb_a8, self.op_xycb_a9, self.op_xycb_aa, self.op_xycb_ab,
-            self.op_xycb_ac, self.op_xycb_ad, self.op_xycb_ae, self.op_xycb_af,
-            self.op_xycb_b0, self.op_xycb_b1, self.op_xycb_b2, self.op_xycb_b3,
-            self.op_xycb_b4, self.op_xycb_b5, self.op_xycb_b6, self.op_xycb_b7,
-            self.op_xycb_b8, self.op_xycb_b9, self.op_xycb_ba, self.op_xycb_bb,
-            self.op_xycb_bc, self.op_xycb_bd, self.op_xycb_be, self.op_xycb_bf,
-            self.op_xycb_c0, self.op_xycb_c1, self.op_xycb_c2, self.op_xycb_c3,
-            self.op_xycb_c4, self.op_xycb_c5, self.op_xycb_c6, self.op_xycb_c7,
-            self.op_xycb_c8, self.op_xycb_c9, self.op_xycb_ca, self.op_xycb_cb,
-            self.op_xycb_cc, self.op_xycb_cd, self.op_xycb_ce, self.op_xycb_cf,
-            self.op_xycb_d0, self.op_xycb_d1, self.op_xycb_d2, self.op_xycb_d3,
-            self.op_xycb_d4, self.op_xycb_d5, self.op_xycb_d6, self.op_xycb_d7,
-            self.op_xycb_d8, self.op_xycb_d9, self.op_xycb_da, self.op_xycb_db,
-            self.op_xycb_dc, self.op_xycb_dd, self.op_xycb_de, self.op_xycb_df,
-            self.op_xycb_e0, self.op_xycb_e1, self.op_xycb_e2, self.op_xycb_e3,
-            self.op_xycb_e4, self.op_xycb_e5, self.op_xycb_e6, self.op_xycb_e7,
-            self.op_xycb_e8, self.op_xycb_e9, self.op_xycb_ea, self.op_xycb_eb,
-            self.op_xycb_ec, self.op_xycb_ed, self.op_xycb_ee, self.op_xycb_ef,
-            self.op_xycb_f0, self.op_xycb_f1, self.op_xycb_f2, self.op_xycb_f3,
-            self.op_xycb_f4, self.op_xycb_f5, self.op_xycb_f6, self.op_xycb_f7,
-            self.op_xycb_f8, self.op_xycb_f9, self.op_xycb_fa, self.op_xycb_fb,
-            self.op_xycb_fc, self.op_xycb_fd, self.op_xycb_fe, self.op_xycb_ff,
+        cls.op_xycb = [
+            cls.op_xycb_00, cls.op_xycb_01, cls.op_xycb_02, cls.op_xycb_03,
+            cls.op_xycb_04, cls.op_xycb_05, cls.op_xycb_06, cls.op_xycb_07,
+            cls.op_xycb_08, cls.op_xycb_09, cls.op_xycb_0a, cls.op_xycb_0b,
+            cls.op_xycb_0c, cls.op_xycb_0d, cls.op_xycb_0e, cls.op_xycb_0f,
+            cls.op_xycb_10, cls.op_xycb_11, cls.op_xycb_12, cls.op_xycb_13,
+            cls.op_xycb_14, cls.op_xycb_15, cls.op_xycb_16, cls.op_xycb_17,
+            cls.op_xycb_18, cls.op_xycb_19, cls.op_xycb_1a, cls.op_xycb_1b,
+            cls.op_xycb_1c, cls.op_xycb_1d, cls.op_xycb_1e, cls.op_xycb_1f,
+            cls.op_xycb_20, cls.op_xycb_21, cls.op_xycb_22, cls.op_xycb_23,
+            cls.op_xycb_24, cls.op_xycb_25, cls.op_xycb_26, cls.op_xycb_27,
+            cls.op_xycb_28, cls.op_xycb_29, cls.op_xycb_2a, cls.op_xycb_2b,
+            cls.op_xycb_2c, cls.op_xycb_2d, cls.op_xycb_2e, cls.op_xycb_2f,
+            cls.op_xycb_30, cls.op_xycb_31, cls.op_xycb_32, cls.op_xycb_33,
+            cls.op_xycb_34, cls.op_xycb_35, cls.op_xycb_36, cls.op_xycb_37,
+            cls.op_xycb_38, cls.op_xycb_39, cls.op_xycb_3a, cls.op_xycb_3b,
+            cls.op_xycb_3c, cls.op_xycb_3d, cls.op_xycb_3e, cls.op_xycb_3f,
+            cls.op_xycb_40, cls.op_xycb_41, cls.op_xycb_42, cls.op_xycb_43,
+            cls.op_xycb_44, cls.op_xycb_45, cls.op_xycb_46, cls.op_xycb_47,
+            cls.op_xycb_48, cls.op_xycb_49, cls.op_xycb_4a, cls.op_xycb_4b,
+            cls.op_xycb_4c, cls.op_xycb_4d, cls.op_xycb_4e, cls.op_xycb_4f,
+            cls.op_xycb_50, cls.op_xycb_51, cls.op_xycb_52, cls.op_xycb_53,
+            cls.op_xycb_54, cls.op_xycb_55, cls.op_xycb_56, cls.op_xycb_57,
+            cls.op_xycb_58, cls.op_xycb_59, cls.op_xycb_5a, cls.op_xycb_5b,
+            cls.op_xycb_5c, cls.op_xycb_5d, cls.op_xycb_5e, cls.op_xycb_5f,
+            cls.op_xycb_60, cls.op_xycb_61, cls.op_xycb_62, cls.op_xycb_63,
+            cls.op_xycb_64, cls.op_xycb_65, cls.op_xycb_66, cls.op_xycb_67,
+            cls.op_xycb_68, cls.op_xycb_69, cls.op_xycb_6a, cls.op_xycb_6b,
+            cls.op_xycb_6c, cls.op_xycb_6d, cls.op_xycb_6e, cls.op_xycb_6f,
+            cls.op_xycb_70, cls.op_xycb_71, cls.op_xycb_72, cls.op_xycb_73,
+            cls.op_xycb_74, cls.op_xycb_75, cls.op_xycb_76, cls.op_xycb_77,
+            cls.op_xycb_78, cls.op_xycb_79, cls.op_xycb_7a, cls.op_xycb_7b,
+            cls.op_xycb_7c, cls.op_xycb_7d, cls.op_xycb_7e, cls.op_xycb_7f,
+            cls.op_xycb_80, cls.op_xycb_81, cls.op_xycb_82, cls.op_xycb_83,
+            cls.op_xycb_84, cls.op_xycb_85, cls.op_xycb_86, cls.op_xycb_87,
+            cls.op_xycb_88, cls.op_xycb_89, cls.op_xycb_8a, cls.op_xycb_8b,
+            cls.op_xycb_8c, cls.op_xycb_8d, cls.op_xycb_8e, cls.op_xycb_8f,
+            cls.op_xycb_90, cls.op_xycb_91, cls.op_xycb_92, cls.op_xycb_93,
+            cls.op_xycb_94, cls.op_xycb_95, cls.op_xycb_96, cls.op_xycb_97,
+            cls.op_xycb_98, cls.op_xycb_99, cls.op_xycb_9a, cls.op_xycb_9b,
+            cls.op_xycb_9c, cls.op_xycb_9d, cls.op_xycb_9e, cls.op_xycb_9f,
+            cls.op_xycb_a0, cls.op_xycb_a1, cls.op_xycb_a2, cls.op_xycb_a3,
+            cls.op_xycb_a4, cls.op_xycb_a5, cls.op_xycb_a6, cls.op_xycb_a7,
+            cls.op_xycb_a8, cls.op_xycb_a9, cls.op_xycb_aa, cls.op_xycb_ab,
+            cls.op_xycb_ac, cls.op_xycb_ad, cls.op_xycb_ae, cls.op_xycb_af,
+            cls.op_xycb_b0, cls.op_xycb_b1, cls.op_xycb_b2, cls.op_xycb_b3,
+            cls.op_xycb_b4, cls.op_xycb_b5, cls.op_xycb_b6, cls.op_xycb_b7,
+            cls.op_xycb_b8, cls.op_xycb_b9, cls.op_xycb_ba, cls.op_xycb_bb,
+            cls.op_xycb_bc, cls.op_xycb_bd, cls.op_xycb_be, cls.op_xycb_bf,
+            cls.op_xycb_c0, cls.op_xycb_c1, cls.op_xycb_c2, cls.op_xycb_c3,
+            cls.op_xycb_c4, cls.op_xycb_c5, cls.op_xycb_c6, cls.op_xycb_c7,
+            cls.op_xycb_c8, cls.op_xycb_c9, cls.op_xycb_ca, cls.op_xycb_cb,
+            cls.op_xycb_cc, cls.op_xycb_cd, cls.op_xycb_ce, cls.op_xycb_cf,
+            cls.op_xycb_d0, cls.op_xycb_d1, cls.op_xycb_d2, cls.op_xycb_d3,
+            cls.op_xycb_d4, cls.op_xycb_d5, cls.op_xycb_d6, cls.op_xycb_d7,
+            cls.op_xycb_d8, cls.op_xycb_d9, cls.op_xycb_da, cls.op_xycb_db,
+            cls.op_xycb_dc, cls.op_xycb_dd, cls.op_xycb_de, cls.op_xycb_df,
+            cls.op_xycb_e0, cls.op_xycb_e1, cls.op_xycb_e2, cls.op_xycb_e3,
+            cls.op_xycb_e4, cls.op_xycb_e5, cls.op_xycb_e6, cls.op_xycb_e7,
+            cls.op_xycb_e8, cls.op_xycb_e9, cls.op_xycb_ea, cls.op_xycb_eb,
+            cls.op_xycb_ec, cls.op_xycb_ed, cls.op_xycb_ee, cls.op_xycb_ef,
+            cls.op_xycb_f0, cls.op_xycb_f1, cls.op_xycb_f2, cls.op_xycb_f3,
+            cls.op_xycb_f4, cls.op_xycb_f5, cls.op_xycb_f6, cls.op_xycb_f7,
+            cls.op_xycb_f8, cls.op_xycb_f9, cls.op_xycb_fa, cls.op_xycb_fb,
+            cls.op_xycb_fc, cls.op_xycb_fd, cls.op_xycb_fe, cls.op_xycb_ff,
         ]
-        self.op_dd = [
-            self.op_dd_00, self.op_dd_01, self.op_dd_02, self.op_dd_03,
-            self.op_dd_04, self.op_dd_05, self.op_dd_06, self.op_dd_07,
-            self.op_dd_08, self.op_dd_09, self.op_dd_0a, self.op_dd_0b,
-            self.op_dd_0c, self.op_dd_0d, self.op_dd_0e, self.op_dd_0f,
-            self.op_dd_10, self.op_dd_11, self.op_dd_12, self.op_dd_13,
-            self.op_dd_14, self.op_dd_15, self.op_dd_16, self.op_dd_17,
-            self.op_dd_18, self.op_dd_19, self.op_dd_1a, self.op_dd_1b,
-            self.op_dd_1c, self.op_dd_1d, self.op_dd_1e, self.op_dd_1f,
-            self.op_dd_20, self.op_dd_21, self.op_dd_22, self.op_dd_23,
-            self.op_dd_24, self.op_dd_25, self.op_dd_26, self.op_dd_27,
-            self.op_dd_28, self.op_dd_29, self.op_dd_2a, self.op_dd_2b,
-            self.op_dd_2c, self.op_dd_2d, self.op_dd_2e, self.op_dd_2f,
-            self.op_dd_30, self.op_dd_31, self.op_dd_32, self.op_dd_33,
-            self.op_dd_34, self.op_dd_35, self.op_dd_36, self.op_dd_37,
-            self.op_dd_38, self.op_dd_39, self.op_dd_3a, self.op_dd_3b,
-            self.op_dd_3c, self.op_dd_3d, self.op_dd_3e, self.op_dd_3f,
-            self.op_dd_40, self.op_dd_41, self.op_dd_42, self.op_dd_43,
-            self.op_dd_44, self.op_dd_45, self.op_dd_46, self.op_dd_47,
-            self.op_dd_48, self.op_dd_49, self.op_dd_4a, self.op_dd_4b,
-            self.op_dd_4c, self.op_dd_4d, self.op_dd_4e, self.op_dd_4f,
-            self.op_dd_50, self.op_dd_51, self.op_dd_52, self.op_dd_53,
-            self.op_dd_54, self.op_dd_55, self.op_dd_56, self.op_dd_57,
-            self.op_dd_58, self.op_dd_59, self.op_dd_5a, self.op_dd_5b,
-            self.op_dd_5c, self.op_dd_5d, self.op_dd_5e, self.op_dd_5f,
-            self.op_dd_60, self.op_dd_61, self.op_dd_62, self.op_dd_63,
-            self.op_dd_64, self.op_dd_65, self.op_dd_66, self.op_dd_67,
-            self.op_dd_68, self.op_dd_69, self.op_dd_6a, self.op_dd_6b,
-            self.op_dd_6c, self.op_dd_6d, self.op_dd_6e, self.op_dd_6f,
-            self.op_dd_70, self.op_dd_71, self.op_dd_72, self.op_dd_73,
-            self.op_dd_74, self.op_dd_75, self.op_dd_76, self.op_dd_77,
-            self.op_dd_78, self.op_dd_79, self.op_dd_7a, self.op_dd_7b,
-            self.op_dd_7c, self.op_dd_7d, self.op_dd_7e, self.op_dd_7f,
-            self.op_dd_80, self.op_dd_81, self.op_dd_82, self.op_dd_83,
-            self.op_dd_84, self.op_dd_85, self.op_dd_86, self.op_dd_87,
-            self.op_dd_88, self.op_dd_89, self.op_dd_8a, self.op_dd_8b,
-            self.op_dd_8c, self.op_dd_8d, self.op_dd_8e, self.op_dd_8f,
-            self.op_dd_90, self.op_dd_91, self.op_dd_92, self.op_dd_93,
-            self.op_dd_94, self.op_dd_95, self.op_dd_96, self.op_dd_97,
-            self.op_dd_98, self.op_dd_99, self.op_dd_9a, self.op_dd_9b,
-            self.op_dd_9c, self.op_dd_9d, self.op_dd_9e, self.op_dd_9f,
-            self.op_dd_a0, self.op_dd_a1, self.op_dd_a2, self.op_dd_a3,
-            self.op_dd_a4, self.op_dd_a5, self.op_dd_a6, self.op_dd_a7,
-            self.op_dd_a8, self.op_dd_a9, self.op_dd_aa, self.op_dd_ab,
-            self.op_dd_ac, self.op_dd_ad, self.op_dd_ae, self.op_dd_af,
-            self.op_dd_b0, self.op_dd_b1, self.op_dd_b2, self.op_dd_b3,
-            self.op_dd_b4, self.op_dd_b5, self.op_dd_b6, self.op_dd_b7,
-            self.op_dd_b8, self.op_dd_b9, self.op_dd_ba, self.op_dd_bb,
-            self.op_dd_bc, self.op_dd_bd, self.op_dd_be, self.op_dd_bf,
-            self.op_dd_c0, self.op_dd_c1, self.op_dd_c2, self.op_dd_c3,
-            self.op_dd_c4, self.op_dd_c5, self.op_dd_c6, self.op_dd_c7,
-            self.op_dd_c8, self.op_dd_c9, self.op_dd_ca, self.op_dd_cb,
-            self.op_dd_cc, self.op_dd_cd, self.op_dd_ce, self.op_dd_cf,
-            self.op_dd_d0, self.op_dd_d1, self.op_dd_d2, self.op_dd_d3,
-            self.op_dd_d4, self.op_dd_d5, self.op_dd_d6, self.op_dd_d7,
-            self.op_dd_d8, self.op_dd_d9, self.op_dd_da, self.op_dd_db,
-            self.op_dd_dc, self.op_dd_dd, self.op_dd_de, self.op_dd_df,
-            self.op_dd_e0, self.op_dd_e1, self.op_dd_e2, self.op_dd_e3,
-            self.op_dd_e4, self.op_dd_e5, self.op_dd_e6, self.op_dd_e7,
-            self.op_dd_e8, self.op_dd_e9, self.op_dd_ea, self.op_dd_eb,
-            self.op_dd_ec, self.op_dd_ed, self.op_dd_ee, self.op_dd_ef,
-            self.op_dd_f0, self.op_dd_f1, self.op_dd_f2, self.op_dd_f3,
-            self.op_dd_f4, self.op_dd_f5, self.op_dd_f6, self.op_dd_f7,
-            self.op_dd_f8, self.op_dd_f9, self.op_dd_fa, self.op_dd_fb,
-            self.op_dd_fc, self.op_dd_fd, self.op_dd_fe, self.op_dd_ff,
+        cls.op_dd = [
+            cls.op_dd_00, cls.op_dd_01, cls.op_dd_02, cls.op_dd_03,
+            cls.op_dd_04, cls.op_dd_05, cls.op_dd_06, cls.op_dd_07,
+            cls.op_dd_08, cls.op_dd_09, cls.op_dd_0a, cls.op_dd_0b,
+            cls.op_dd_0c, cls.op_dd_0d, cls.op_dd_0e, cls.op_dd_0f,
+            cls.op_dd_10, cls.op_dd_11, cls.op_dd_12, cls.op_dd_13,
+            cls.op_dd_14, cls.op_dd_15, cls.op_dd_16, cls.op_dd_17,
+            cls.op_dd_18, cls.op_dd_19, cls.op_dd_1a, cls.op_dd_1b,
+            cls.op_dd_1c, cls.op_dd_1d, cls.op_dd_1e, cls.op_dd_1f,
+            cls.op_dd_20, cls.op_dd_21, cls.op_dd_22, cls.op_dd_23,
+            cls.op_dd_24, cls.op_dd_25, cls.op_dd_26, cls.op_dd_27,
+            cls.op_dd_28, cls.op_dd_29, cls.op_dd_2a, cls.op_dd_2b,
+            cls.op_dd_2c, cls.op_dd_2d, cls.op_dd_2e, cls.op_dd_2f,
+            cls.op_dd_30, cls.op_dd_31, cls.op_dd_32, cls.op_dd_33,
+            cls.op_dd_34, cls.op_dd_35, cls.op_dd_36, cls.op_dd_37,
+            cls.op_dd_38, cls.op_dd_39, cls.op_dd_3a, cls.op_dd_3b,
+            cls.op_dd_3c, cls.op_dd_3d, cls.op_dd_3e, cls.op_dd_3f,
+            cls.op_dd_40, cls.op_dd_41, cls.op_dd_42, cls.op_dd_43,
+            cls.op_dd_44, cls.op_dd_45, cls.op_dd_46, cls.op_dd_47,
+            cls.op_dd_48, cls.op_dd_49, cls.op_dd_4a, cls.op_dd_4b,
+            cls.op_dd_4c, cls.op_dd_4d, cls.op_dd_4e, cls.op_dd_4f,
+            cls.op_dd_50, cls.op_dd_51, cls.op_dd_52, cls.op_dd_53,
+            cls.op_dd_54, cls.op_dd_55, cls.op_dd_56, cls.op_dd_57,
+            cls.op_dd_58, cls.op_dd_59, cls.op_dd_5a, cls.op_dd_5b,
+            cls.op_dd_5c, cls.op_dd_5d, cls.op_dd_5e, cls.op_dd_5f,
+            cls.op_dd_60, cls.op_dd_61, cls.op_dd_62, cls.op_dd_63,
+            cls.op_dd_64, cls.op_dd_65, cls.op_dd_66, cls.op_dd_67,
+            cls.op_dd_68, cls.op_dd_69, cls.op_dd_6a, cls.op_dd_6b,
+            cls.op_dd_6c, cls.op_dd_6d, cls.op_dd_6e, cls.op_dd_6f,
+            cls.op_dd_70, cls.op_dd_71, cls.op_dd_72, cls.op_dd_73,
+            cls.op_dd_74, cls.op_dd_75, cls.op_dd_76, cls.op_dd_77,
+            cls.op_dd_78, cls.op_dd_79, cls.op_dd_7a, cls.op_dd_7b,
+            cls.op_dd_7c, cls.op_dd_7d, cls.op_dd_7e, cls.op_dd_7f,
+            cls.op_dd_80, cls.op_dd_81, cls.op_dd_82, cls.op_dd_83,
+            cls.op_dd_84, cls.op_dd_85, cls.op_dd_86, cls.op_dd_87,
+            cls.op_dd_88, cls.op_dd_89, cls.op_dd_8a, cls.op_dd_8b,
+            cls.op_dd_8c, cls.op_dd_8d, cls.op_dd_8e, cls.op_dd_8f,
+            cls.op_dd_90, cls.op_dd_91, cls.op_dd_92, cls.op_dd_93,
+            cls.op_dd_94, cls.op_dd_95, cls.op_dd_96, cls.op_dd_97,
+            cls.op_dd_98, cls.op_dd_99, cls.op_dd_9a, cls.op_dd_9b,
+            cls.op_dd_9c, cls.op_dd_9d, cls.op_dd_9e, cls.op_dd_9f,
+            cls.op_dd_a0, cls.op_dd_a1, cls.op_dd_a2, cls.op_dd_a3,
+            cls.op_dd_a4, cls.op_dd_a5, cls.op_dd_a6, cls.op_dd_a7,
+            cls.op_dd_a8, cls.op_dd_a9, cls.op_dd_aa, cls.op_dd_ab,
+            cls.op_dd_ac, cls.op_dd_ad, cls.op_dd_ae, cls.op_dd_af,
+            cls.op_dd_b0, cls.op_dd_b1, cls.op_dd_b2, cls.op_dd_b3,
+            cls.op_dd_b4, cls.op_dd_b5, cls.op_dd_b6, cls.op_dd_b7,
+            cls.op_dd_b8, cls.op_dd_b9, cls.op_dd_ba, cls.op_dd_bb,
+            cls.op_dd_bc, cls.op_dd_bd, cls.op_dd_be, cls.op_dd_bf,
+            cls.op_dd_c0, cls.op_dd_c1, cls.op_dd_c2, cls.op_dd_c3,
+            cls.op_dd_c4, cls.op_dd_c5, cls.op_dd_c6, cls.op_dd_c7,
+            cls.op_dd_c8, cls.op_dd_c9, cls.op_dd_ca, cls.op_dd_cb,
+            cls.op_dd_cc, cls.op_dd_cd, cls.op_dd_ce, cls.op_dd_cf,
+            cls.op_dd_d0, cls.op_dd_d1, cls.op_dd_d2, cls.op_dd_d3,
+            cls.op_dd_d4, cls.op_dd_d5, cls.op_dd_d6, cls.op_dd_d7,
+            cls.op_dd_d8, cls.op_dd_d9, cls.op_dd_da, cls.op_dd_db,
+            cls.op_dd_dc, cls.op_dd_dd, cls.op_dd_de, cls.op_dd_df,
+            cls.op_dd_e0, cls.op_dd_e1, cls.op_dd_e2, cls.op_dd_e3,
+            cls.op_dd_e4, cls.op_dd_e5, cls.op_dd_e6, cls.op_dd_e7,
+            cls.op_dd_e8, cls.op_dd_e9, cls.op_dd_ea, cls.op_dd_eb,
+            cls.op_dd_ec, cls.op_dd_ed, cls.op_dd_ee, cls.op_dd_ef,
+            cls.op_dd_f0, cls.op_dd_f1, cls.op_dd_f2, cls.op_dd_f3,
+            cls.op_dd_f4, cls.op_dd_f5, cls.op_dd_f6, cls.op_dd_f7,
+            cls.op_dd_f8, cls.op_dd_f9, cls.op_dd_fa, cls.op_dd_fb,
+            cls.op_dd_fc, cls.op_dd_fd, cls.op_dd_fe, cls.op_dd_ff,
         ]
-        self.op_fd = [
-            self.op_fd_00, self.op_fd_01, self.op_fd_02, self.op_fd_03,
-            self.op_fd_04, self.op_fd_05, self.op_fd_06, self.op_fd_07,
-            self.op_fd_08, self.op_fd_09, self.op_fd_0a, self.op_fd_0b,
-            self.op_fd_0c, self.op_fd_0d, self.op_fd_0e, self.op_fd_0f,
-            self.op_fd_10, self.op_fd_11, self.op_fd_12, self.op_fd_13,
-            self.op_fd_14, self.op_fd_15, self.op_fd_16, self.op_fd_17,
-            self.op_fd_18, self.op_fd_19, self.op_fd_1a, self.op_fd_1b,
-            self.op_fd_1c, self.op_fd_1d, self.op_fd_1e, self.op_fd_1f,
-            self.op_fd_20, self.op_fd_21, self.op_fd_22, self.op_fd_23,
-            self.op_fd_24, self.op_fd_25, self.op_fd_26, self.op_fd_27,
-            self.op_fd_28, self.op_fd_29, self.op_fd_2a, self.op_fd_2b,
-            self.op_fd_2c, self.op_fd_2d, self.op_fd_2e, self.op_fd_2f,
-            self.op_fd_30, self.op_fd_31, self.op_fd_32, self.op_fd_33,
-            self.op_fd_34, self.op_fd_35, self.op_fd_36, self.op_fd_37,
-            self.op_fd_38, self.op_fd_39, self.op_fd_3a, self.op_fd_3b,
-            self.op_fd_3c, self.op_fd_3d, self.op_fd_3e, self.op_fd_3f,
-            self.op_fd_40, self.op_fd_41, self.op_fd_42, self.op_fd_43,
-            self.op_fd_44, self.op_fd_45, self.op_fd_46, self.op_fd_47,
-            self.op_fd_48, self.op_fd_49, self.op_fd_4a, self.op_fd_4b,
-            self.op_fd_4c, self.op_fd_4d, self.op_fd_4e, self.op_fd_4f,
-            self.op_fd_50, self.op_fd_51, self.op_fd_52, self.op_fd_53,
-            self.op_fd_54, self.op_fd_55, self.op_fd_56, self.op_fd_57,
-            self.op_fd_58, self.op_fd_59, self.op_fd_5a, self.op_fd_5b,
-            self.op_fd_5c, self.op_fd_5d, self.op_fd_5e, self.op_fd_5f,
-            self.op_fd_60, self.op_fd_61, self.op_fd_62, self.op_fd_63,
-            self.op_fd_64, self.op_fd_65, self.op_fd_66, self.op_fd_67,
-            self.op_fd_68, self.op_fd_69, self.op_fd_6a, self.op_fd_6b,
-            self.op_fd_6c, self.op_fd_6d, self.op_fd_6e, self.op_fd_6f,
-            self.op_fd_70, self.op_fd_71, self.op_fd_72, self.op_fd_73,
-            self.op_fd_74, self.op_fd_75, self.op_fd_76, self.op_fd_77,
-            self.op_fd_78, self.op_fd_79, self.op_fd_7a, self.op_fd_7b,
-            self.op_fd_7c, self.op_fd_7d, self.op_fd_7e, self.op_fd_7f,
-            self.op_fd_80, self.op_fd_81, self.op_fd_82, self.op_fd_83,
-            self.op_fd_84, self.op_fd_85, self.op_fd_86, self.op_fd_87,
-            self.op_fd_88, self.op_fd_89, self.op_fd_8a, self.op_fd_8b,
-            self.op_fd_8c, self.op_fd_8d, self.op_fd_8e, self.op_fd_8f,
-            self.op_fd_90, self.op_fd_91, self.op_fd_92, self.op_fd_93,
-            self.op_fd_94, self.op_fd_95, self.op_fd_96, self.op_fd_97,
-            self.op_fd_98, self.op_fd_99, self.op_fd_9a, self.op_fd_9b,
-            self.op_fd_9c, self.op_fd_9d, self.op_fd_9e, self.op_fd_9f,
-            self.op_fd_a0, self.op_fd_a1, self.op_fd_a2, self.op_fd_a3,
-            self.op_fd_a4, self.op_fd_a5, self.op_fd_a6, self.op_fd_a7,
-            self.op_fd_a8, self.op_fd_a9, self.op_fd_aa, self.op_fd_ab,
-            self.op_fd_ac, self.op_fd_ad, self.op_fd_ae, self.op_fd_af,
-            self.op_fd_b0, self.op_fd_b1, self.op_fd_b2, self.op_fd_b3,
-            self.op_fd_b4, self.op_fd_b5, self.op_fd_b6, self.op_fd_b7,
-            self.op_fd_b8, self.op_fd_b9, self.op_fd_ba, self.op_fd_bb,
-            self.op_fd_bc, self.op_fd_bd, self.op_fd_be, self.op_fd_bf,
-            self.op_fd_c0, self.op_fd_c1, self.op_fd_c2, self.op_fd_c3,
-            self.op_fd_c4, self.op_fd_c5, self.op_fd_c6, self.op_fd_c7,
-            self.op_fd_c8, self.op_fd_c9, self.op_fd_ca, self.op_fd_cb,
-            self.op_fd_cc, self.op_fd_cd, self.op_fd_ce, self.op_fd_cf,
-            self.op_fd_d0, self.op_fd_d1, self.op_fd_d2, self.op_fd_d3,
-            self.op_fd_d4, self.op_fd_d5, self.op_fd_d6, self.op_fd_d7,
-            self.op_fd_d8, self.op_fd_d9, self.op_fd_da, self.op_fd_db,
-            self.op_fd_dc, self.op_fd_dd, self.op_fd_de, self.op_fd_df,
-            self.op_fd_e0, self.op_fd_e1, self.op_fd_e2, self.op_fd_e3,
-            self.op_fd_e4, self.op_fd_e5, self.op_fd_e6, self.op_fd_e7,
-            self.op_fd_e8, self.op_fd_e9, self.op_fd_ea, self.op_fd_eb,
-            self.op_fd_ec, self.op_fd_ed, self.op_fd_ee, self.op_fd_ef,
-            self.op_fd_f0, self.op_fd_f1, self.op_fd_f2, self.op_fd_f3,
-            self.op_fd_f4, self.op_fd_f5, self.op_fd_f6, self.op_fd_f7,
-            self.op_fd_f8, self.op_fd_f9, self.op_fd_fa, self.op_fd_fb,
-            self.op_fd_fc, self.op_fd_fd, self.op_fd_fe, self.op_fd_ff,
+        cls.op_fd = [
+            cls.op_fd_00, cls.op_fd_01, cls.op_fd_02, cls.op_fd_03,
+            cls.op_fd_04, cls.op_fd_05, cls.op_fd_06, cls.op_fd_07,
+            cls.op_fd_08, cls.op_fd_09, cls.op_fd_0a, cls.op_fd_0b,
+            cls.op_fd_0c, cls.op_fd_0d, cls.op_fd_0e, cls.op_fd_0f,
+            cls.op_fd_10, cls.op_fd_11, cls.op_fd_12, cls.op_fd_13,
+            cls.op_fd_14, cls.op_fd_15, cls.op_fd_16, cls.op_fd_17,
+            cls.op_fd_18, cls.op_fd_19, cls.op_fd_1a, cls.op_fd_1b,
+            cls.op_fd_1c, cls.op_fd_1d, cls.op_fd_1e, cls.op_fd_1f,
+            cls.op_fd_20, cls.op_fd_21, cls.op_fd_22, cls.op_fd_23,
+            cls.op_fd_24, cls.op_fd_25, cls.op_fd_26, cls.op_fd_27,
+            cls.op_fd_28, cls.op_fd_29, cls.op_fd_2a, cls.op_fd_2b,
+            cls.op_fd_2c, cls.op_fd_2d, cls.op_fd_2e, cls.op_fd_2f,
+            cls.op_fd_30, cls.op_fd_31, cls.op_fd_32, cls.op_fd_33,
+            cls.op_fd_34, cls.op_fd_35, cls.op_fd_36, cls.op_fd_37,
+            cls.op_fd_38, cls.op_fd_39, cls.op_fd_3a, cls.op_fd_3b,
+            cls.op_fd_3c, cls.op_fd_3d, cls.op_fd_3e, cls.op_fd_3f,
+            cls.op_fd_40, cls.op_fd_41, cls.op_fd_42, cls.op_fd_43,
+            cls.op_fd_44, cls.op_fd_45, cls.op_fd_46, cls.op_fd_47,
+            cls.op_fd_48, cls.op_fd_49, cls.op_fd_4a, cls.op_fd_4b,
+            cls.op_fd_4c, cls.op_fd_4d, cls.op_fd_4e, cls.op_fd_4f,
+            cls.op_fd_50, cls.op_fd_51, cls.op_fd_52, cls.op_fd_53,
+            cls.op_fd_54, cls.op_fd_55, cls.op_fd_56, cls.op_fd_57,
+            cls.op_fd_58, cls.op_fd_59, cls.op_fd_5a, cls.op_fd_5b,
+            cls.op_fd_5c, cls.op_fd_5d, cls.op_fd_5e, cls.op_fd_5f,
+            cls.op_fd_60, cls.op_fd_61, cls.op_fd_62, cls.op_fd_63,
+            cls.op_fd_64, cls.op_fd_65, cls.op_fd_66, cls.op_fd_67,
+            cls.op_fd_68, cls.op_fd_69, cls.op_fd_6a, cls.op_fd_6b,
+            cls.op_fd_6c, cls.op_fd_6d, cls.op_fd_6e, cls.op_fd_6f,
+            cls.op_fd_70, cls.op_fd_71, cls.op_fd_72, cls.op_fd_73,
+            cls.op_fd_74, cls.op_fd_75, cls.op_fd_76, cls.op_fd_77,
+            cls.op_fd_78, cls.op_fd_79, cls.op_fd_7a, cls.op_fd_7b,
+            cls.op_fd_7c, cls.op_fd_7d, cls.op_fd_7e, cls.op_fd_7f,
+            cls.op_fd_80, cls.op_fd_81, cls.op_fd_82, cls.op_fd_83,
+            cls.op_fd_84, cls.op_fd_85, cls.op_fd_86, cls.op_fd_87,
+            cls.op_fd_88, cls.op_fd_89, cls.op_fd_8a, cls.op_fd_8b,
+            cls.op_fd_8c, cls.op_fd_8d, cls.op_fd_8e, cls.op_fd_8f,
+            cls.op_fd_90, cls.op_fd_91, cls.op_fd_92, cls.op_fd_93,
+            cls.op_fd_94, cls.op_fd_95, cls.op_fd_96, cls.op_fd_97,
+            cls.op_fd_98, cls.op_fd_99, cls.op_fd_9a, cls.op_fd_9b,
+            cls.op_fd_9c, cls.op_fd_9d, cls.op_fd_9e, cls.op_fd_9f,
+            cls.op_fd_a0, cls.op_fd_a1, cls.op_fd_a2, cls.op_fd_a3,
+            cls.op_fd_a4, cls.op_fd_a5, cls.op_fd_a6, cls.op_fd_a7,
+            cls.op_fd_a8, cls.op_fd_a9, cls.op_fd_aa, cls.op_fd_ab,
+            cls.op_fd_ac, cls.op_fd_ad, cls.op_fd_ae, cls.op_fd_af,
+            cls.op_fd_b0, cls.op_fd_b1, cls.op_fd_b2, cls.op_fd_b3,
+            cls.op_fd_b4, cls.op_fd_b5, cls.op_fd_b6, cls.op_fd_b7,
+            cls.op_fd_b8, cls.op_fd_b9, cls.op_fd_ba, cls.op_fd_bb,
+            cls.op_fd_bc, cls.op_fd_bd, cls.op_fd_be, cls.op_fd_bf,
+            cls.op_fd_c0, cls.op_fd_c1, cls.op_fd_c2, cls.op_fd_c3,
+            cls.op_fd_c4, cls.op_fd_c5, cls.op_fd_c6, cls.op_fd_c7,
+            cls.op_fd_c8, cls.op_fd_c9, cls.op_fd_ca, cls.op_fd_cb,
+            cls.op_fd_cc, cls.op_fd_cd, cls.op_fd_ce, cls.op_fd_cf,
+            cls.op_fd_d0, cls.op_fd_d1, cls.op_fd_d2, cls.op_fd_d3,
+            cls.op_fd_d4, cls.op_fd_d5, cls.op_fd_d6, cls.op_fd_d7,
+            cls.op_fd_d8, cls.op_fd_d9, cls.op_fd_da, cls.op_fd_db,
+            cls.op_fd_dc, cls.op_fd_dd, cls.op_fd_de, cls.op_fd_df,
+            cls.op_fd_e0, cls.op_fd_e1, cls.op_fd_e2, cls.op_fd_e3,
+            cls.op_fd_e4, cls.op_fd_e5, cls.op_fd_e6, cls.op_fd_e7,
+            cls.op_fd_e8, cls.op_fd_e9, cls.op_fd_ea, cls.op_fd_eb,
+            cls.op_fd_ec, cls.op_fd_ed, cls.op_fd_ee, cls.op_fd_ef,
+            cls.op_fd_f0, cls.op_fd_f1, cls.op_fd_f2, cls.op_fd_f3,
+            cls.op_fd_f4, cls.op_fd_f5, cls.op_fd_f6, cls.op_fd_f7,
+            cls.op_fd_f8, cls.op_fd_f9, cls.op_fd_fa, cls.op_fd_fb,
+            cls.op_fd_fc, cls.op_fd_fd, cls.op_fd_fe, cls.op_fd_ff,
         ]
-        self.op_ed = [
-            self.op_ed_00, self.op_ed_01, self.op_ed_02, self.op_ed_03,
-            self.op_ed_04, self.op_ed_05, self.op_ed_06, self.op_ed_07,
-            self.op_ed_08, self.op_ed_09, self.op_ed_0a, self.op_ed_0b,
-            self.op_ed_0c, self.op_ed_0d, self.op_ed_0e, self.op_ed_0f,
-            self.op_ed_10, self.op_ed_11, self.op_ed_12, self.op_ed_13,
-            self.op_ed_14, self.op_ed_15, self.op_ed_16, self.op_ed_17,
-            self.op_ed_18, self.op_ed_19, self.op_ed_1a, self.op_ed_1b,
-            self.op_ed_1c, self.op_ed_1d, self.op_ed_1e, self.op_ed_1f,
-            self.op_ed_20, self.op_ed_21, self.op_ed_22, self.op_ed_23,
-            self.op_ed_24, self.op_ed_25, self.op_ed_26, self.op_ed_27,
-            self.op_ed_28, self.op_ed_29, self.op_ed_2a, self.op_ed_2b,
-            self.op_ed_2c, self.op_ed_2d, self.op_ed_2e, self.op_ed_2f,
-            self.op_ed_30, self.op_ed_31, self.op_ed_32, self.op_ed_33,
-            self.op_ed_34, self.op_ed_35, self.op_ed_36, self.op_ed_37,
-            self.op_ed_38, self.op_ed_39, self.op_ed_3a, self.op_ed_3b,
-            self.op_ed_3c, self.op_ed_3d, self.op_ed_3e, self.op_ed_3f,
-            self.op_ed_40, self.op_ed_41, self.op_ed_42, self.op_ed_43,
-            self.op_ed_44, self.op_ed_45, self.op_ed_46, self.op_ed_47,
-            self.op_ed_48, self.op_ed_49, self.op_ed_4a, self.op_ed_4b,
-            self.op_ed_4c, self.op_ed_4d, self.op_ed_4e, self.op_ed_4f,
-            self.op_ed_50, self.op_ed_51, self.op_ed_52, self.op_ed_53,
-            self.op_ed_54, self.op_ed_55, self.op_ed_56, self.op_ed_57,
-            self.op_ed_58, self.op_ed_59, self.op_ed_5a, self.op_ed_5b,
-            self.op_ed_5c, self.op_ed_5d, self.op_ed_5e, self.op_ed_5f,
-            self.op_ed_60, self.op_ed_61, self.op_ed_62, self.op_ed_63,
-            self.op_ed_64, self.op_ed_65, self.op_ed_66, self.op_ed_67,
-            self.op_ed_68, self.op_ed_69, self.op_ed_6a, self.op_ed_6b,
-            self.op_ed_6c, self.op_ed_6d, self.op_ed_6e, self.op_ed_6f,
-            self.op_ed_70, self.op_ed_71, self.op_ed_72, self.op_ed_73,
-            self.op_ed_74, self.op_ed_75, self.op_ed_76, self.op_ed_77,
-            self.op_ed_78, self.op_ed_79, self.op_ed_7a, self.op_ed_7b,
-            self.op_ed_7c, self.op_ed_7d, self.op_ed_7e, self.op_ed_7f,
-            self.op_ed_80, self.op_ed_81, self.op_ed_82, self.op_ed_83,
-            self.op_ed_84, self.op_ed_85, self.op_ed_86, self.op_ed_87,
-            self.op_ed_88, self.op_ed_89, self.op_ed_8a, self.op_ed_8b,
-            self.op_ed_8c, self.op_ed_8d, self.op_ed_8e, self.op_ed_8f,
-            self.op_ed_90, self.op_ed_91, self.op_ed_92, self.op_ed_93,
-            self.op_ed_94, self.op_ed_95, self.op_ed_96, self.op_ed_97,
-            self.op_ed_98, self.op_ed_99, self.op_ed_9a, self.op_ed_9b,
-            self.op_ed_9c, self.op_ed_9d, self.op_ed_9e, self.op_ed_9f,
-            self.op_ed_a0, self.op_ed_a1, self.op_ed_a2, self.op_ed_a3,
-            self.op_ed_a4, self.op_ed_a5, self.op_ed_a6, self.op_ed_a7,
-            self.op_ed_a8, self.op_ed_a9, self.op_ed_aa, self.op_ed_ab,
-            self.op_ed_ac, self.op_ed_ad, self.op_ed_ae, self.op_ed_af,
-            self.op_ed_b0, self.op_ed_b1, self.op_ed_b2, self.op_ed_b3,
-            self.op_ed_b4, self.op_ed_b5, self.op_ed_b6, self.op_ed_b7,
-            self.op_ed_b8, self.op_ed_b9, self.op_ed_ba, self.op_ed_bb,
-            self.op_ed_bc, self.op_ed_bd, self.op_ed_be, self.op_ed_bf,
-            self.op_ed_c0, self.op_ed_c1, self.op_ed_c2, self.op_ed_c3,
-            self.op_ed_c4, self.op_ed_c5, self.op_ed_c6, self.op_ed_c7,
-            self.op_ed_c8, self.op_ed_c9, self.op_ed_ca, self.op_ed_cb,
-            self.op_ed_cc, self.op_ed_cd, self.op_ed_ce, self.op_ed_cf,
-            self.op_ed_d0, self.op_ed_d1, self.op_ed_d2, self.op_ed_d3,
-            self.op_ed_d4, self.op_ed_d5, self.op_ed_d6, self.op_ed_d7,
-            self.op_ed_d8, self.op_ed_d9, self.op_ed_da, self.op_ed_db,
-            self.op_ed_dc, self.op_ed_dd, self.op_ed_de, self.op_ed_df,
-            self.op_ed_e0, self.op_ed_e1, self.op_ed_e2, self.op_ed_e3,
-            self.op_ed_e4, self.op_ed_e5, self.op_ed_e6, self.op_ed_e7,
-            self.op_ed_e8, self.op_ed_e9, self.op_ed_ea, self.op_ed_eb,
-            self.op_ed_ec, self.op_ed_ed, self.op_ed_ee, self.op_ed_ef,
-            self.op_ed_f0, self.op_ed_f1, self.op_ed_f2, self.op_ed_f3,
-            self.op_ed_f4, self.op_ed_f5, self.op_ed_f6, self.op_ed_f7,
-            self.op_ed_f8, self.op_ed_f9, self.op_ed_fa, self.op_ed_fb,
-            self.op_ed_fc, self.op_ed_fd, self.op_ed_fe, self.op_ed_ff,
+        cls.op_ed = [
+            cls.op_ed_00, cls.op_ed_01, cls.op_ed_02, cls.op_ed_03,
+            cls.op_ed_04, cls.op_ed_05, cls.op_ed_06, cls.op_ed_07,
+            cls.op_ed_08, cls.op_ed_09, cls.op_ed_0a, cls.op_ed_0b,
+            cls.op_ed_0c, cls.op_ed_0d, cls.op_ed_0e, cls.op_ed_0f,
+            cls.op_ed_10, cls.op_ed_11, cls.op_ed_12, cls.op_ed_13,
+            cls.op_ed_14, cls.op_ed_15, cls.op_ed_16, cls.op_ed_17,
+            cls.op_ed_18, cls.op_ed_19, cls.op_ed_1a, cls.op_ed_1b,
+            cls.op_ed_1c, cls.op_ed_1d, cls.op_ed_1e, cls.op_ed_1f,
+            cls.op_ed_20, cls.op_ed_21, cls.op_ed_22, cls.op_ed_23,
+            cls.op_ed_24, cls.op_ed_25, cls.op_ed_26, cls.op_ed_27,
+            cls.op_ed_28, cls.op_ed_29, cls.op_ed_2a, cls.op_ed_2b,
+            cls.op_ed_2c, cls.op_ed_2d, cls.op_ed_2e, cls.op_ed_2f,
+            cls.op_ed_30, cls.op_ed_31, cls.op_ed_32, cls.op_ed_33,
+            cls.op_ed_34, cls.op_ed_35, cls.op_ed_36, cls.op_ed_37,
+            cls.op_ed_38, cls.op_ed_39, cls.op_ed_3a, cls.op_ed_3b,
+            cls.op_ed_3c, cls.op_ed_3d, cls.op_ed_3e, cls.op_ed_3f,
+            cls.op_ed_40, cls.op_ed_41, cls.op_ed_42, cls.op_ed_43,
+            cls.op_ed_44, cls.op_ed_45, cls.op_ed_46, cls.op_ed_47,
+            cls.op_ed_48, cls.op_ed_49, cls.op_ed_4a, cls.op_ed_4b,
+            cls.op_ed_4c, cls.op_ed_4d, cls.op_ed_4e, cls.op_ed_4f,
+            cls.op_ed_50, cls.op_ed_51, cls.op_ed_52, cls.op_ed_53,
+            cls.op_ed_54, cls.op_ed_55, cls.op_ed_56, cls.op_ed_57,
+            cls.op_ed_58, cls.op_ed_59, cls.op_ed_5a, cls.op_ed_5b,
+            cls.op_ed_5c, cls.op_ed_5d, cls.op_ed_5e, cls.op_ed_5f,
+            cls.op_ed_60, cls.op_ed_61, cls.op_ed_62, cls.op_ed_63,
+            cls.op_ed_64, cls.op_ed_65, cls.op_ed_66, cls.op_ed_67,
+            cls.op_ed_68, cls.op_ed_69, cls.op_ed_6a, cls.op_ed_6b,
+            cls.op_ed_6c, cls.op_ed_6d, cls.op_ed_6e, cls.op_ed_6f,
+            cls.op_ed_70, cls.op_ed_71, cls.op_ed_72, cls.op_ed_73,
+            cls.op_ed_74, cls.op_ed_75, cls.op_ed_76, cls.op_ed_77,
+            cls.op_ed_78, cls.op_ed_79, cls.op_ed_7a, cls.op_ed_7b,
+            cls.op_ed_7c, cls.op_ed_7d, cls.op_ed_7e, cls.op_ed_7f,
+            cls.op_ed_80, cls.op_ed_81, cls.op_ed_82, cls.op_ed_83,
+            cls.op_ed_84, cls.op_ed_85, cls.op_ed_86, cls.op_ed_87,
+            cls.op_ed_88, cls.op_ed_89, cls.op_ed_8a, cls.op_ed_8b,
+            cls.op_ed_8c, cls.op_ed_8d, cls.op_ed_8e, cls.op_ed_8f,
+            cls.op_ed_90, cls.op_ed_91, cls.op_ed_92, cls.op_ed_93,
+            cls.op_ed_94, cls.op_ed_95, cls.op_ed_96, cls.op_ed_97,
+            cls.op_ed_98, cls.op_ed_99, cls.op_ed_9a, cls.op_ed_9b,
+            cls.op_ed_9c, cls.op_ed_9d, cls.op_ed_9e, cls.op_ed_9f,
+            cls.op_ed_a0, cls.op_ed_a1, cls.op_ed_a2, cls.op_ed_a3,
+            cls.op_ed_a4, cls.op_ed_a5, cls.op_ed_a6, cls.op_ed_a7,
+            cls.op_ed_a8, cls.op_ed_a9, cls.op_ed_aa, cls.op_ed_ab,
+            cls.op_ed_ac, cls.op_ed_ad, cls.op_ed_ae, cls.op_ed_af,
+            cls.op_ed_b0, cls.op_ed_b1, cls.op_ed_b2, cls.op_ed_b3,
+            cls.op_ed_b4, cls.op_ed_b5, cls.op_ed_b6, cls.op_ed_b7,
+            cls.op_ed_b8, cls.op_ed_b9, cls.op_ed_ba, cls.op_ed_bb,
+            cls.op_ed_bc, cls.op_ed_bd, cls.op_ed_be, cls.op_ed_bf,
+            cls.op_ed_c0, cls.op_ed_c1, cls.op_ed_c2, cls.op_ed_c3,
+            cls.op_ed_c4, cls.op_ed_c5, cls.op_ed_c6, cls.op_ed_c7,
+            cls.op_ed_c8, cls.op_ed_c9, cls.op_ed_ca, cls.op_ed_cb,
+            cls.op_ed_cc, cls.op_ed_cd, cls.op_ed_ce, cls.op_ed_cf,
+            cls.op_ed_d0, cls.op_ed_d1, cls.op_ed_d2, cls.op_ed_d3,
+            cls.op_ed_d4, cls.op_ed_d5, cls.op_ed_d6, cls.op_ed_d7,
+            cls.op_ed_d8, cls.op_ed_d9, cls.op_ed_da, cls.op_ed_db,
+            cls.op_ed_dc, cls.op_ed_dd, cls.op_ed_de, cls.op_ed_df,
+            cls.op_ed_e0, cls.op_ed_e1, cls.op_ed_e2, cls.op_ed_e3,
+            cls.op_ed_e4, cls.op_ed_e5, cls.op_ed_e6, cls.op_ed_e7,
+            cls.op_ed_e8, cls.op_ed_e9, cls.op_ed_ea, cls.op_ed_eb,
+            cls.op_ed_ec, cls.op_ed_ed, cls.op_ed_ee, cls.op_ed_ef,
+            cls.op_ed_f0, cls.op_ed_f1, cls.op_ed_f2, cls.op_ed_f3,
+            cls.op_ed_f4, cls.op_ed_f5, cls.op_ed_f6, cls.op_ed_f7,
+            cls.op_ed_f8, cls.op_ed_f9, cls.op_ed_fa, cls.op_ed_fb,
+            cls.op_ed_fc, cls.op_ed_fd, cls.op_ed_fe, cls.op_ed_ff,
         ]
-        self.op_op = [
-            self.op_op_00, self.op_op_01, self.op_op_02, self.op_op_03,
-            self.op_op_04, self.op_op_05, self.op_op_06, self.op_op_07,
-            self.op_op_08, self.op_op_09, self.op_op_0a, self.op_op_0b,
-            self.op_op_0c, self.op_op_0d, self.op_op_0e, self.op_op_0f,
-            self.op_op_10, self.op_op_11, self.op_op_12, self.op_op_13,
-            self.op_op_14, self.op_op_15, self.op_op_16, self.op_op_17,
-            self.op_op_18, self.op_op_19, self.op_op_1a, self.op_op_1b,
-            self.op_op_1c, self.op_op_1d, self.op_op_1e, self.op_op_1f,
-            self.op_op_20, self.op_op_21, self.op_op_22, self.op_op_23,
-            self.op_op_24, self.op_op_25, self.op_op_26, self.op_op_27,
-            self.op_op_28, self.op_op_29, self.op_op_2a, self.op_op_2b,
-            self.op_op_2c, self.op_op_2d, self.op_op_2e, self.op_op_2f,
-            self.op_op_30, self.op_op_31, self.op_op_32, self.op_op_33,
-            self.op_op_34, self.op_op_35, self.op_op_36, self.op_op_37,
-            self.op_op_38, self.op_op_39, self.op_op_3a, self.op_op_3b,
-            self.op_op_3c, self.op_op_3d, self.op_op_3e, self.op_op_3f,
-            self.op_op_40, self.op_op_41, self.op_op_42, self.op_op_43,
-            self.op_op_44, self.op_op_45, self.op_op_46, self.op_op_47,
-            self.op_op_48, self.op_op_49, self.op_op_4a, self.op_op_4b,
-            self.op_op_4c, self.op_op_4d, self.op_op_4e, self.op_op_4f,
-            self.op_op_50, self.op_op_51, self.op_op_52, self.op_op_53,
-            self.op_op_54, self.op_op_55, self.op_op_56, self.op_op_57,
-            self.op_op_58, self.op_op_59, self.op_op_5a, self.op_op_5b,
-            self.op_op_5c, self.op_op_5d, self.op_op_5e, self.op_op_5f,
-            self.op_op_60, self.op_op_61, self.op_op_62, self.op_op_63,
-            self.op_op_64, self.op_op_65, self.op_op_66, self.op_op_67,
-            self.op_op_68, self.op_op_69, self.op_op_6a, self.op_op_6b,
-            self.op_op_6c, self.op_op_6d, self.op_op_6e, self.op_op_6f,
-            self.op_op_70, self.op_op_71, self.op_op_72, self.op_op_73,
-            self.op_op_74, self.op_op_75, self.op_op_76, self.op_op_77,
-            self.op_op_78, self.op_op_79, self.op_op_7a, self.op_op_7b,
-            self.op_op_7c, self.op_op_7d, self.op_op_7e, self.op_op_7f,
-            self.op_op_80, self.op_op_81, self.op_op_82, self.op_op_83,
-            self.op_op_84, self.op_op_85, self.op_op_86, self.op_op_87,
-            self.op_op_88, self.op_op_89, self.op_op_8a, self.op_op_8b,
-            self.op_op_8c, self.op_op_8d, self.op_op_8e, self.op_op_8f,
-            self.op_op_90, self.op_op_91, self.op_op_92, self.op_op_93,
-            self.op_op_94, self.op_op_95, self.op_op_96, self.op_op_97,
-            self.op_op_98, self.op_op_99, self.op_op_9a, self.op_op_9b,
-            self.op_op_9c, self.op_op_9d, self.op_op_9e, self.op_op_9f,
-            self.op_op_a0, self.op_op_a1, self.op_op_a2, self.op_op_a3,
-            self.op_op_a4, self.op_op_a5, self.op_op_a6, self.op_op_a7,
-            self.op_op_a8, self.op_op_a9, self.op_op_aa, self.op_op_ab,
-            self.op_op_ac, self.op_op_ad, self.op_op_ae, self.op_op_af,
-            self.op_op_b0, self.op_op_b1, self.op_op_b2, self.op_op_b3,
-            self.op_op_b4, self.op_op_b5, self.op_op_b6, self.op_op_b7,
-            self.op_op_b8, self.op_op_b9, self.op_op_ba, self.op_op_bb,
-            self.op_op_bc, self.op_op_bd, self.op_op_be, self.op_op_bf,
-            self.op_op_c0, self.op_op_c1, self.op_op_c2, self.op_op_c3,
-            self.op_op_c4, self.op_op_c5, self.op_op_c6, self.op_op_c7,
-            self.op_op_c8, self.op_op_c9, self.op_op_ca, self.op_op_cb,
-            self.op_op_cc, self.op_op_cd, self.op_op_ce, self.op_op_cf,
-            self.op_op_d0, self.op_op_d1, self.op_op_d2, self.op_op_d3,
-            self.op_op_d4, self.op_op_d5, self.op_op_d6, self.op_op_d7,
-            self.op_op_d8, self.op_op_d9, self.op_op_da, self.op_op_db,
-            self.op_op_dc, self.op_op_dd, self.op_op_de, self.op_op_df,
-            self.op_op_e0, self.op_op_e1, self.op_op_e2, self.op_op_e3,
-            self.op_op_e4, self.op_op_e5, self.op_op_e6, self.op_op_e7,
-            self.op_op_e8, self.op_op_e9, self.op_op_ea, self.op_op_eb,
-            self.op_op_ec, self.op_op_ed, self.op_op_ee, self.op_op_ef,
-            self.op_op_f0, self.op_op_f1, self.op_op_f2, self.op_op_f3,
-            self.op_op_f4, self.op_op_f5, self.op_op_f6, self.op_op_f7,
-            self.op_op_f8, self.op_op_f9, self.op_op_fa, self.op_op_fb,
-            self.op_op_fc, self.op_op_fd, self.op_op_fe, self.op_op_ff,
+        cls.op_op = [
+            cls.op_op_00, cls.op_op_01, cls.op_op_02, cls.op_op_03,
+            cls.op_op_04, cls.op_op_05, cls.op_op_06, cls.op_op_07,
+            cls.op_op_08, cls.op_op_09, cls.op_op_0a, cls.op_op_0b,
+            cls.op_op_0c, cls.op_op_0d, cls.op_op_0e, cls.op_op_0f,
+            cls.op_op_10, cls.op_op_11, cls.op_op_12, cls.op_op_13,
+            cls.op_op_14, cls.op_op_15, cls.op_op_16, cls.op_op_17,
+            cls.op_op_18, cls.op_op_19, cls.op_op_1a, cls.op_op_1b,
+            cls.op_op_1c, cls.op_op_1d, cls.op_op_1e, cls.op_op_1f,
+            cls.op_op_20, cls.op_op_21, cls.op_op_22, cls.op_op_23,
+            cls.op_op_24, cls.op_op_25, cls.op_op_26, cls.op_op_27,
+            cls.op_op_28, cls.op_op_29, cls.op_op_2a, cls.op_op_2b,
+            cls.op_op_2c, cls.op_op_2d, cls.op_op_2e, cls.op_op_2f,
+            cls.op_op_30, cls.op_op_31, cls.op_op_32, cls.op_op_33,
+            cls.op_op_34, cls.op_op_35, cls.op_op_36, cls.op_op_37,
+            cls.op_op_38, cls.op_op_39, cls.op_op_3a, cls.op_op_3b,
+            cls.op_op_3c, cls.op_op_3d, cls.op_op_3e, cls.op_op_3f,
+            cls.op_op_40, cls.op_op_41, cls.op_op_42, cls.op_op_43,
+            cls.op_op_44, cls.op_op_45, cls.op_op_46, cls.op_op_47,
+            cls.op_op_48, cls.op_op_49, cls.op_op_4a, cls.op_op_4b,
+            cls.op_op_4c, cls.op_op_4d, cls.op_op_4e, cls.op_op_4f,
+            cls.op_op_50, cls.op_op_51, cls.op_op_52, cls.op_op_53,
+            cls.op_op_54, cls.op_op_55, cls.op_op_56, cls.op_op_57,
+            cls.op_op_58, cls.op_op_59, cls.op_op_5a, cls.op_op_5b,
+            cls.op_op_5c, cls.op_op_5d, cls.op_op_5e, cls.op_op_5f,
+            cls.op_op_60, cls.op_op_61, cls.op_op_62, cls.op_op_63,
+            cls.op_op_64, cls.op_op_65, cls.op_op_66, cls.op_op_67,
+            cls.op_op_68, cls.op_op_69, cls.op_op_6a, cls.op_op_6b,
+            cls.op_op_6c, cls.op_op_6d, cls.op_op_6e, cls.op_op_6f,
+            cls.op_op_70, cls.op_op_71, cls.op_op_72, cls.op_op_73,
+            cls.op_op_74, cls.op_op_75, cls.op_op_76, cls.op_op_77,
+            cls.op_op_78, cls.op_op_79, cls.op_op_7a, cls.op_op_7b,
+            cls.op_op_7c, cls.op_op_7d, cls.op_op_7e, cls.op_op_7f,
+            cls.op_op_80, cls.op_op_81, cls.op_op_82, cls.op_op_83,
+            cls.op_op_84, cls.op_op_85, cls.op_op_86, cls.op_op_87,
+            cls.op_op_88, cls.op_op_89, cls.op_op_8a, cls.op_op_8b,
+            cls.op_op_8c, cls.op_op_8d, cls.op_op_8e, cls.op_op_8f,
+            cls.op_op_90, cls.op_op_91, cls.op_op_92, cls.op_op_93,
+            cls.op_op_94, cls.op_op_95, cls.op_op_96, cls.op_op_97,
+            cls.op_op_98, cls.op_op_99, cls.op_op_9a, cls.op_op_9b,
+            cls.op_op_9c, cls.op_op_9d, cls.op_op_9e, cls.op_op_9f,
+            cls.op_op_a0, cls.op_op_a1, cls.op_op_a2, cls.op_op_a3,
+            cls.op_op_a4, cls.op_op_a5, cls.op_op_a6, cls.op_op_a7,
+            cls.op_op_a8, cls.op_op_a9, cls.op_op_aa, cls.op_op_ab,
+            cls.op_op_ac, cls.op_op_ad, cls.op_op_ae, cls.op_op_af,
+            cls.op_op_b0, cls.op_op_b1, cls.op_op_b2, cls.op_op_b3,
+            cls.op_op_b4, cls.op_op_b5, cls.op_op_b6, cls.op_op_b7,
+            cls.op_op_b8, cls.op_op_b9, cls.op_op_ba, cls.op_op_bb,
+            cls.op_op_bc, cls.op_op_bd, cls.op_op_be, cls.op_op_bf,
+            cls.op_op_c0, cls.op_op_c1, cls.op_op_c2, cls.op_op_c3,
+            cls.op_op_c4, cls.op_op_c5, cls.op_op_c6, cls.op_op_c7,
+            cls.op_op_c8, cls.op_op_c9, cls.op_op_ca, cls.op_op_cb,
+            cls.op_op_cc, cls.op_op_cd, cls.op_op_ce, cls.op_op_cf,
+            cls.op_op_d0, cls.op_op_d1, cls.op_op_d2, cls.op_op_d3,
+            cls.op_op_d4, cls.op_op_d5, cls.op_op_d6, cls.op_op_d7,
+            cls.op_op_d8, cls.op_op_d9, cls.op_op_da, cls.op_op_db,
+            cls.op_op_dc, cls.op_op_dd, cls.op_op_de, cls.op_op_df,
+            cls.op_op_e0, cls.op_op_e1, cls.op_op_e2, cls.op_op_e3,
+            cls.op_op_e4, cls.op_op_e5, cls.op_op_e6, cls.op_op_e7,
+            cls.op_op_e8, cls.op_op_e9, cls.op_op_ea, cls.op_op_eb,
+            cls.op_op_ec, cls.op_op_ed, cls.op_op_ee, cls.op_op_ef,
+            cls.op_op_f0, cls.op_op_f1, cls.op_op_f2, cls.op_op_f3,
+            cls.op_op_f4, cls.op_op_f5, cls.op_op_f6, cls.op_op_f7,
+            cls.op_op_f8, cls.op_op_f9, cls.op_op_fa, cls.op_op_fb,
+            cls.op_op_fc, cls.op_op_fd, cls.op_op_fe, cls.op_op_ff,
         ]
 
     def take_nmi(self):
@@ -3436,8 +4099,8 @@ class Z80:
         self.m_icount_executing = 11
         self.T(self.m_icount_executing - self.MTM * 2)
         self.wm16_sp(self.m_pc)
-        self.PC = 0x0066
-        self.WZ = self.PC
+        self.m_pc = 0x0066
+        self.m_wz = self.m_pc
         self.m_nmi_pending = False
 
     def take_interrupt(self):
@@ -3472,7 +4135,7 @@ class Z80:
             self.wm16_sp(self.m_pc)
             self.m_icount_executing -= self.MTM * 2
             irq_vector = (irq_vector & 0xff) | (self.m_i << 8)
-            self.rm16(irq_vector, self.m_pc)
+            self.m_pc = self.rm16(irq_vector)
 
         # Interrupt mode 1. RST 38h
         elif self.m_im == 1:
@@ -3480,7 +4143,7 @@ class Z80:
             self.CC(Z80.cc_op, 0xff) # 11+2 = 13
             self.T(self.m_icount_executing - self.MTM * 4)
             self.wm16_sp(self.m_pc)
-            self.PC = 0x0038
+            self.m_pc = 0x0038
         else:
             # Interrupt mode 0. We check for CALL and JP instructions,
             # if neither of these were found we assume a 1 byte opcode
@@ -3494,20 +4157,20 @@ class Z80:
                     self.CC(Z80.cc_op, 0xcd)
                     self.T(self.m_icount_executing - self.MTM * 2)
                     self.wm16_sp(self.m_pc)
-                    self.PC = irq_vector & 0xffff
+                    self.m_pc = irq_vector & 0xffff
                 if v == 0xc30000: # jump
                     # JP $xxxx cycles
                     self.CC(Z80.cc_op, 0xc3)
                     self.T(self.m_icount_executing)
-                    self.PC = irq_vector & 0xffff
+                    self.m_pc = irq_vector & 0xffff
                 else: # rst (or other opcodes?)
                     # RST $xx cycles
                     self.CC(Z80.cc_op, 0xff)
                     self.T(self.m_icount_executing - self.MTM * 2)
                     self.wm16_sp(self.m_pc)
-                    self.PC = irq_vector & 0x0038
+                    self.m_pc = irq_vector & 0x0038
 
-        self.WZ = self.PC
+        self.m_wz = self.m_pc
 
 
     def irq_vector(self):
@@ -3549,10 +4212,12 @@ class Z80:
 
             # when in HALT state, the fetched opcode is not dispatched (aka a NOP)
             if self.m_halt:
-                self.PC -= 1
+                self.m_pc = (self.m_pc - 1) & 0xffff
                 opcode = 0
 
             self.EXEC(Z80.cc_op, self.op_op, opcode)
+            if self.m_halt:
+                self.skip_halt()
 
             #self.dump()
 
@@ -3588,7 +4253,7 @@ class Z80:
         print("--------------------------------")
         print("PC:{:04x} SP:{:04x}".format(self.PC, self.SP))
         print("AF:{:04x} BC:{:04x} DE:{:04x} HL:{:04x}".format(self.AF, self.BC, self.DE, self.HL))
-        print("   {:04x}    {:04x}    {:04x}    {:04x}".format(self.m_af2.w, self.m_bc2.w, self.m_de2.w, self.m_hl2.w))
+        print("   {:04x}    {:04x}    {:04x}    {:04x}".format(self.m_af2, self.m_bc2, self.m_de2, self.m_hl2))
         print("IX:{:04x} IY:{:04x}".format(self.IX, self.IY))
         print(" S:{:d}".format(1 if self.F & Z80.SF else 0), end='')
         print(" Z:{:d}".format(1 if self.F & Z80.ZF else 0), end='')
@@ -0,0 +1,196 @@
+"""Ahead-of-time translation of ROM images
+
+compile_rom() follows the control flow of a ROM image from its entry
+points, translates each basic block it reaches with the Translator of
+z80jit, and returns the source of a Python module holding the compiled
+blocks in BLOCKS:
+
+    python z80aot.py rom.bin rom_blocks.py --base 0x0000 --entry 0x0000 --entry 0x0038
+
+Z80AOT runs a CPU on them: whenever PC hits the start of a block whose
+bytes are in memory unchanged, the block runs instead of the
+interpreter.
+
+    import rom_blocks
+    cpu = Z80AOT(memory, io, rom_blocks.BLOCKS)
+
+Jumps through registers, such as JP (HL) and RET, cannot be followed;
+code reached only that way runs through the interpreter.
+"""
+import argparse
+
+from z80dasm import disassemble
+from z80jit import Block, Translator, Z80JIT
+
+
+def branches(read, pc):
+    """Length of the instruction at pc, the addresses it may jump to,
+    and whether it may go on to the next one
+    """
+    length = disassemble(read, pc)[1]
+    end = (pc + length) & 0xffff
+    op = read(pc)
+    if op in (0xdd, 0xfd, 0xed) and length > 1:
+        op = (op << 8) | read((pc + 1) & 0xffff)
+    nn = read((end - 2) & 0xffff) | (read((end - 1) & 0xffff) << 8)
+    d = read((end - 1) & 0xffff)
+    rel = (end + d - (0x100 if d & 0x80 else 0)) & 0xffff
+    if op == 0x18:
+        return length, [rel], False
+    if op in (0x10, 0x20, 0x28, 0x30, 0x38):
+        return length, [rel], True
+    if op == 0xc3:
+        return length, [nn], False
+    if op < 0x100 and (op & 0xc7) in (0xc2, 0xc4) or op == 0xcd:
+        # JP cc, CALL cc and CALL
+        return length, [nn], True
+    if op < 0x100 and (op & 0xc7) == 0xc7:
+        return length, [op & 0x38], True
+    if op in (0xc9, 0xe9, 0xdde9, 0xfde9) or (op >> 8 == 0xed and (op & 0xc7) == 0x45):
+        # RET, JP (HL), JP (IX), JP (IY), RETN and RETI
+        return length, [], False
+    return length, [], True
+
+
+def translate_rom(image, base=0, entries=None):
+    """Translate the blocks reachable from entries
+
+    Returns {start: (source, name, end, icount, code)}, with the bytes
+    of each block in code. Blocks must lie within the image.
+    """
+    memory = bytearray(0x10000)
+    memory[base:base + len(image)] = image
+    read = memory.__getitem__
+    translator = Translator(read)
+    last = base + len(image)
+
+    blocks = {}
+    seen = set()
+    todo = list(entries if entries is not None else [base])
+    while todo:
+        pc = todo.pop()
+        if pc in seen or not base <= pc < last:
+            continue
+        seen.add(pc)
+        res = translator.translate(pc, 'block_{:04x}'.format(pc))
+        if res is not None and pc < res[2] <= last:
+            source, name, end, icount = res
+            blocks[pc] = (source, name, end, icount, bytes(memory[pc:end]))
+        else:
+            end = None
+
+        # follow the instructions of the block, or just the one at pc
+        addr = pc
+        while True:
+            length, targets, falls = branches(read, addr)
+            todo.extend(targets)
+            addr = (addr + length) & 0xffff
+            if end is None or addr == end or not falls:
+                break
+        if falls:
+            todo.append(addr)
+    return blocks
+
+
+def compile_rom(image, base=0, entries=None, name='ROM'):
+    """Source of a module with the blocks reachable from entries
+    """
+    blocks = translate_rom(image, base, entries)
+    lines = [
+        '"""Blocks of {} compiled by z80aot'.format(name),
+        '',
+        'Load them with Z80AOT(mem_bus, io_bus, BLOCKS).',
+        '"""',
+        'from z80jit import Z80JIT',
+        '',
+    ]
+    lines.extend("{0} = Z80JIT.GLOBALS['{0}']".format(key) for key in Z80JIT.GLOBALS)
+    for start in sorted(blocks):
+        source, _, end, _, _ = blocks[start]
+        lines.append('')
+        lines.append('')
+        lines.append('# {:04x}-{:04x}'.format(start, (end - 1) & 0xffff))
+        lines.append(source.rstrip('\n'))
+    lines.append('')
+    lines.append('')
+    lines.append('# start: (block, end, icount, bytes)')
+    lines.append('BLOCKS = {')
+    for start in sorted(blocks):
+        _, block, end, icount, code = blocks[start]
+        lines.append('    0x{:04x}: ({}, 0x{:04x}, {}, bytes.fromhex({!r})),'.format(
+            start, block, end, icount, code.hex()))
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+class Z80AOT(Z80JIT):
+    """Z80JIT running blocks compiled ahead of time
+
+    Where PC hits the start of a compiled block, the block runs when
+    its bytes are in RAM or ROM pages unchanged; anything else runs
+    through the interpreter, nothing is translated at run time. Blocks
+    are dropped on writes and remapping as with Z80JIT, and taken up
+    again once their bytes are back, as after a bank switch.
+    """
+    __slots__ = ('m_compiled',)
+
+    def __init__(self, mem_bus, io_bus, blocks=None):
+        self.m_compiled = {}
+        super().__init__(mem_bus, io_bus)
+        if blocks is not None:
+            self.load_blocks(blocks)
+
+    def load_blocks(self, blocks):
+        """Add the BLOCKS of a module written by compile_rom()
+        """
+        self.m_compiled.update(blocks)
+        self.flush()
+
+    def holds(self, pc, code):
+        """Whether code is in RAM or ROM pages at pc
+        """
+        read_map = self.m_read_map
+        for offset, value in enumerate(code):
+            addr = (pc + offset) & 0xffff
+            page = read_map[addr >> 8]
+            if page is None or page[addr & 0xff] != value:
+                return False
+        return True
+
+    def translate(self, pc):
+        """Cache the compiled block at pc
+
+        Returns the Block, or None when the instruction at pc has to run
+        through the interpreter; both are cached.
+        """
+        block = None
+        end = (pc + 1) & 0xffff
+        compiled = self.m_compiled.get(pc)
+        if compiled is not None and self.m_opcodes is None and self.m_args is None:
+            run, block_end, icount, code = compiled
+            if self.holds(pc, code):
+                block = Block(run, pc, block_end, icount, None)
+                end = block_end
+        self.cache(pc, block, end)
+        return block
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile a ROM image into a module of Python functions')
+    parser.add_argument('image', help='ROM image')
+    parser.add_argument('output', help='module to write')
+    parser.add_argument('--base', type=lambda text: int(text, 0), default=0,
+                        help='address the image is mapped at (default: 0)')
+    parser.add_argument('--entry', type=lambda text: int(text, 0), action='append',
+                        help='entry point, may be repeated (default: the base address)')
+    args = parser.parse_args()
+
+    with open(args.image, 'rb') as fh:
+        image = fh.read()
+    source = compile_rom(image, args.base, args.entry, args.image)
+    with open(args.output, 'w') as fh:
+        fh.write(source)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,817 @@
+from operator import attrgetter
+
+import numpy as np
+
+from z80 import Z80, Bus
+
+
+def _families():
+    """The family of each opcode, and of each opcode after DD or FD
+
+    Family 0 is run by the fallback Z80 and family 1 is used for
+    halted instances; the opcode is fetched for all the others.
+    """
+    names = ['fallback', 'halted']
+    family = [0] * 0x100
+    xy_family = [0] * 0x100
+
+    def add(name, opcodes, table=family):
+        names.append(name)
+        for op in opcodes:
+            table[op] = len(names) - 1
+
+    add('nop', [0x00])
+    add('halt', [0x76])
+    add('di_ei', [0xf3, 0xfb])
+    add('ld_r_r', [op for op in range(0x40, 0x80) if op != 0x76])
+    add('ld_r_n', range(0x06, 0x40, 0x08))
+    add('alu_r', range(0x80, 0xc0))
+    add('alu_n', range(0xc6, 0x100, 0x08))
+    add('inc_dec_r', [op for op in range(0x04, 0x40) if op & 0x07 in (4, 5)])
+    add('inc_dec_rp', range(0x03, 0x40, 0x08))
+    add('ld_rp_nn', range(0x01, 0x40, 0x10))
+    add('add_hl_rp', range(0x09, 0x40, 0x10))
+    add('ld_ind', [0x02, 0x0a, 0x12, 0x1a, 0x22, 0x2a, 0x32, 0x3a])
+    add('rot_a', [0x07, 0x0f, 0x17, 0x1f])
+    add('cpl', [0x2f])
+    add('scf_ccf', [0x37, 0x3f])
+    add('ex_af', [0x08])
+    add('ex_de_hl', [0xeb])
+    add('exx', [0xd9])
+    add('jr', [0x10, 0x18, 0x20, 0x28, 0x30, 0x38])
+    add('jp', [0xc3] + list(range(0xc2, 0x100, 0x08)))
+    add('jp_hl', [0xe9])
+    add('ld_sp_hl', [0xf9])
+    add('call', [0xcd] + list(range(0xc4, 0x100, 0x08)))
+    add('ret', [0xc9] + list(range(0xc0, 0x100, 0x08)))
+    add('rst', range(0xc7, 0x100, 0x08))
+    add('push_rp', range(0xc5, 0x100, 0x10))
+    add('pop_rp', range(0xc1, 0x100, 0x10))
+    add('cb', [0xcb])
+    # DD and FD are looked up here by the opcode that follows
+    add('ld_r_xyd', [op for op in range(0x46, 0x80, 0x08) if op != 0x76], xy_family)
+    add('ld_xyd_r', [op for op in range(0x70, 0x78) if op != 0x76], xy_family)
+    add('ld_xyd_n', [0x36], xy_family)
+    add('alu_xyd', range(0x86, 0xc0, 0x08), xy_family)
+    add('inc_dec_xyd', [0x34, 0x35], xy_family)
+    add('ld_xy_nn', [0x21], xy_family)
+    add('inc_dec_xy', [0x23, 0x2b], xy_family)
+    add('push_pop_xy', [0xe1, 0xe5], xy_family)
+    return tuple(names), np.array(family), np.array(xy_family)
+
+
+class Z80Batch:
+    """N independent Z80s run in lockstep
+
+    The registers of instance n are element n of the m_* arrays. The
+    8-bit registers are row n of m_regs, in the order B, C, D, E, H, L,
+    F, A (the Z80's own register encoding, with F in the slot of (HL)),
+    and its 64K of RAM is row n of m_mem.
+
+    step() advances every instance by one instruction. Instances are
+    grouped by opcode, and the common instructions, including the CB
+    group and the IX/IY loads, stores and ALU operations, are run for a
+    whole group at once, with the flags looked up in the Z80 tables.
+    The others are run one instance at a time by a Z80 mapped onto the
+    memory of the instance, so the state after each step is the same
+    as with Z80, bit for bit.
+
+    There are no interrupts; I/O goes to io_read(n, port) and
+    io_write(n, port, value).
+    """
+    __slots__ = (
+        'm_pc', 'm_sp', 'm_regs', 'm_ix', 'm_iy', 'm_wz',
+        'm_af2', 'm_bc2', 'm_de2', 'm_hl2',
+        'm_r', 'm_r2', 'm_iff1', 'm_iff2', 'm_halt', 'm_im', 'm_i',
+        'm_cycles', 'm_mem', 'm_index',
+        'm_cpu', 'm_maps', 'm_current', 'm_io_read', 'm_io_write',
+    )
+
+    # columns of m_regs
+    B, C, D, E, H, L, F, A = range(8)
+
+    # flag tables of Z80 as arrays, see initialize_tables()
+    SZ = None
+    SZP = None
+    SZ_BIT = None
+    SZHV_inc = None
+    SZHV_dec = None
+    SZHVC_add = None
+    SZHVC_sub = None
+    S8 = None
+    cc_op = None
+    cc_cb = None
+    cc_xy = None
+    cc_ex = None
+
+    # condition codes of JP/CALL/RET cc: the flag tested, and whether
+    # it has to be set
+    COND_FLAG = np.array([Z80.ZF, Z80.ZF, Z80.CF, Z80.CF, Z80.PF, Z80.PF, Z80.SF, Z80.SF])
+    COND_SET = np.array([0, 1, 0, 1, 0, 1, 0, 1])
+    # columns holding BC, DE, HL and AF; SP and AF are dealt with apart
+    PAIR_HI = np.array([B, D, H, A])
+    PAIR_LO = np.array([C, E, L, F])
+
+    # registers kept in arrays of the same name, apart from m_regs, in
+    # the order fallback() copies them
+    REGISTERS = (
+        'm_pc', 'm_sp', 'm_ix', 'm_iy', 'm_wz', 'm_af2', 'm_bc2', 'm_de2', 'm_hl2',
+        'm_r', 'm_r2', 'm_iff1', 'm_iff2', 'm_halt', 'm_im', 'm_i',
+    )
+
+    FAMILIES, FAMILY, XY_FAMILY = _families()
+    HALTED = 1
+
+    def __init__(self, count, io_read=None, io_write=None):
+        self.m_mem = np.zeros((count, 0x10000), np.uint8)
+        self.m_index = np.arange(count)
+
+        # Reset registers to their initial values, as Z80 does
+        self.m_regs = np.zeros((count, 8), np.int64)
+        self.m_regs[:, Z80Batch.F] = Z80.ZF
+        self.m_pc = np.zeros(count, np.int64)
+        self.m_sp = np.zeros(count, np.int64)
+        self.m_ix = np.full(count, 0xffff, np.int64)
+        self.m_iy = np.full(count, 0xffff, np.int64)
+        self.m_wz = np.zeros(count, np.int64)
+        self.m_af2 = np.zeros(count, np.int64)
+        self.m_bc2 = np.zeros(count, np.int64)
+        self.m_de2 = np.zeros(count, np.int64)
+        self.m_hl2 = np.zeros(count, np.int64)
+        self.m_r = np.zeros(count, np.int64)
+        self.m_r2 = np.zeros(count, np.int64)
+        self.m_iff1 = np.zeros(count, np.int64)
+        self.m_iff2 = np.zeros(count, np.int64)
+        self.m_halt = np.zeros(count, np.int64)
+        self.m_im = np.zeros(count, np.int64)
+        self.m_i = np.zeros(count, np.int64)
+        # T-states run so far
+        self.m_cycles = np.zeros(count, np.int64)
+
+        self.m_io_read = io_read if io_read is not None else lambda n, port: 0xff
+        self.m_io_write = io_write if io_write is not None else lambda n, port, value: None
+        # the Z80 that runs the other instructions, on the memory of
+        # instance m_current; the memory map of each instance is set up
+        # the first time it is needed and kept in m_maps
+        self.m_current = 0
+        self.m_maps = [None] * count
+        io_bus = Bus(lambda port: self.m_io_read(self.m_current, port),
+                     lambda port, value: self.m_io_write(self.m_current, port, value))
+        self.m_cpu = Z80(self.m_mem[0], io_bus)
+        self.initialize_tables()
+
+    def initialize_tables(self):
+        if Z80Batch.SZHVC_add is None:
+            Z80Batch.SZ = np.frombuffer(Z80.SZ, np.uint8).astype(np.int64)
+            Z80Batch.SZP = np.frombuffer(Z80.SZP, np.uint8).astype(np.int64)
+            Z80Batch.SZ_BIT = np.frombuffer(Z80.SZ_BIT, np.uint8).astype(np.int64)
+            Z80Batch.SZHV_inc = np.frombuffer(Z80.SZHV_inc, np.uint8).astype(np.int64)
+            Z80Batch.SZHV_dec = np.frombuffer(Z80.SZHV_dec, np.uint8).astype(np.int64)
+            Z80Batch.SZHVC_sub = np.frombuffer(Z80.SZHVC_sub, np.uint8).astype(np.int64)
+            Z80Batch.S8 = np.array(Z80.S8, np.int64)
+            Z80Batch.cc_op = np.array(Z80.cc_op, np.int64)
+            Z80Batch.cc_cb = np.array(Z80.cc_cb, np.int64)
+            Z80Batch.cc_xy = np.array(Z80.cc_xy, np.int64)
+            Z80Batch.cc_ex = np.array(Z80.cc_ex, np.int64)
+            Z80Batch.SZHVC_add = np.frombuffer(Z80.SZHVC_add, np.uint8).astype(np.int64)
+
+    def load(self, n, cpu):
+        """Copy the registers of cpu to instance n
+        """
+        self.m_pc[n] = cpu.m_pc
+        self.m_sp[n] = cpu.m_sp
+        self.m_regs[n] = (cpu.m_bc >> 8, cpu.m_bc & 0xff, cpu.m_de >> 8, cpu.m_de & 0xff,
+                          cpu.m_hl >> 8, cpu.m_hl & 0xff, cpu.m_f, cpu.m_a)
+        self.m_ix[n] = cpu.m_ix
+        self.m_iy[n] = cpu.m_iy
+        self.m_wz[n] = cpu.m_wz
+        self.m_af2[n] = cpu.m_af2
+        self.m_bc2[n] = cpu.m_bc2
+        self.m_de2[n] = cpu.m_de2
+        self.m_hl2[n] = cpu.m_hl2
+        self.m_r[n] = cpu.m_r
+        self.m_r2[n] = cpu.m_r2
+        self.m_iff1[n] = cpu.m_iff1
+        self.m_iff2[n] = cpu.m_iff2
+        self.m_halt[n] = cpu.m_halt
+        self.m_im[n] = cpu.m_im
+        self.m_i[n] = cpu.m_i
+
+    def store(self, n, cpu):
+        """Copy the registers of instance n to cpu
+        """
+        b, c, d, e, h, l, f, a = self.m_regs[n].tolist()
+        cpu.m_pc = int(self.m_pc[n])
+        cpu.m_sp = int(self.m_sp[n])
+        cpu.m_a = a
+        cpu.m_f = f
+        cpu.m_bc = (b << 8) | c
+        cpu.m_de = (d << 8) | e
+        cpu.m_hl = (h << 8) | l
+        cpu.m_ix = int(self.m_ix[n])
+        cpu.m_iy = int(self.m_iy[n])
+        cpu.m_wz = int(self.m_wz[n])
+        cpu.m_af2 = int(self.m_af2[n])
+        cpu.m_bc2 = int(self.m_bc2[n])
+        cpu.m_de2 = int(self.m_de2[n])
+        cpu.m_hl2 = int(self.m_hl2[n])
+        cpu.m_r = int(self.m_r[n])
+        cpu.m_r2 = int(self.m_r2[n])
+        cpu.m_iff1 = int(self.m_iff1[n])
+        cpu.m_iff2 = int(self.m_iff2[n])
+        cpu.m_halt = int(self.m_halt[n])
+        cpu.m_im = int(self.m_im[n])
+        cpu.m_i = int(self.m_i[n])
+
+    def run(self, steps):
+        """Advance every instance by steps instructions
+        """
+        for _ in range(steps):
+            self.step()
+
+    def step(self):
+        """Advance every instance by one instruction
+        """
+        index = self.m_index
+        pc = self.m_pc
+        op = self.m_mem[index, pc].astype(np.int64)
+        family = Z80Batch.FAMILY[op]
+        xy = (op == 0xdd) | (op == 0xfd)
+        if xy.any():
+            family[xy] = Z80Batch.XY_FAMILY[self.m_mem[index[xy], (pc[xy] + 1) & 0xffff]]
+        family[self.m_halt != 0] = Z80Batch.HALTED
+
+        # the opcode fetch, for the instructions run here
+        fetched = family > Z80Batch.HALTED
+        self.m_pc[fetched] = (pc[fetched] + 1) & 0xffff
+        self.m_r[family >= Z80Batch.HALTED] += 1
+        self.m_cycles[fetched] += Z80Batch.cc_op[op[fetched]]
+
+        for f in np.unique(family).tolist():
+            sel = index[family == f]
+            getattr(self, Z80Batch.FAMILIES[f])(sel, op[sel])
+
+    # memory and register access for the instances in sel
+
+    def rm(self, sel, addr):
+        """Read a byte from given memory location
+        """
+        return self.m_mem[sel, addr].astype(np.int64)
+
+    def wm(self, sel, addr, value):
+        """Write a byte to given memory location
+        """
+        self.m_mem[sel, addr] = value
+
+    def fetch(self, sel, cc):
+        """Fetch the opcode following a prefix, taking its cycles from cc
+        """
+        pc = self.m_pc[sel]
+        op = self.m_mem[sel, pc].astype(np.int64)
+        self.m_pc[sel] = (pc + 1) & 0xffff
+        self.m_r[sel] += 1
+        self.m_cycles[sel] += cc[op]
+        return op
+
+    def arg(self, sel):
+        """Read an opcode argument from (PC)
+        """
+        pc = self.m_pc[sel]
+        self.m_pc[sel] = (pc + 1) & 0xffff
+        return self.m_mem[sel, pc].astype(np.int64)
+
+    def arg16(self, sel):
+        """Read a word argument from (PC)
+        """
+        res = self.arg(sel)
+        return res | (self.arg(sel) << 8)
+
+    def push(self, sel, value):
+        """PUSH
+        """
+        sp = (self.m_sp[sel] - 1) & 0xffff
+        self.wm(sel, sp, value >> 8)
+        sp = (sp - 1) & 0xffff
+        self.wm(sel, sp, value & 0xff)
+        self.m_sp[sel] = sp
+
+    def pop(self, sel):
+        """POP
+        """
+        sp = self.m_sp[sel]
+        res = self.rm(sel, sp) | (self.rm(sel, (sp + 1) & 0xffff) << 8)
+        self.m_sp[sel] = (sp + 2) & 0xffff
+        return res
+
+    def hl(self, sel):
+        """HL
+        """
+        return (self.m_regs[sel, Z80Batch.H] << 8) | self.m_regs[sel, Z80Batch.L]
+
+    def get_rp(self, sel, p):
+        """BC, DE, HL or SP by register pair code p
+        """
+        res = (self.m_regs[sel, Z80Batch.PAIR_HI[p]] << 8) | self.m_regs[sel, Z80Batch.PAIR_LO[p]]
+        sp = p == 3
+        res[sp] = self.m_sp[sel[sp]]
+        return res
+
+    def set_rp(self, sel, p, value):
+        """Set BC, DE, HL or SP by register pair code p
+        """
+        sp = p == 3
+        self.m_sp[sel[sp]] = value[sp]
+        pair = ~sp
+        sel = sel[pair]
+        p = p[pair]
+        value = value[pair]
+        self.m_regs[sel, Z80Batch.PAIR_HI[p]] = value >> 8
+        self.m_regs[sel, Z80Batch.PAIR_LO[p]] = value & 0xff
+
+    def get_r(self, sel, r):
+        """8-bit register or (HL) by register code r
+        """
+        res = self.m_regs[sel, r]
+        mem = r == 6
+        if mem.any():
+            res[mem] = self.rm(sel[mem], self.hl(sel[mem]))
+        return res
+
+    def set_r(self, sel, r, value):
+        """Set 8-bit register or (HL) by register code r
+        """
+        mem = r == 6
+        if mem.any():
+            self.wm(sel[mem], self.hl(sel[mem]), value[mem])
+            reg = ~mem
+            sel = sel[reg]
+            r = r[reg]
+            value = value[reg]
+        self.m_regs[sel, r] = value
+
+    def xy(self, sel, iy):
+        """IX, or IY where iy
+        """
+        return np.where(iy, self.m_iy[sel], self.m_ix[sel])
+
+    def set_xy(self, sel, iy, value):
+        """Set IX, or IY where iy
+        """
+        self.m_ix[sel[~iy]] = value[~iy]
+        self.m_iy[sel[iy]] = value[iy]
+
+    def ea_xy(self, sel, iy):
+        """Fetch the displacement d and calculate IX+d or IY+d, which is
+        also put in WZ
+        """
+        ea = (self.xy(sel, iy) + Z80Batch.S8[self.arg(sel)]) & 0xffff
+        self.m_wz[sel] = ea
+        return ea
+
+    def condition(self, sel, cc):
+        """Whether condition code cc holds
+        """
+        f = self.m_regs[sel, Z80Batch.F]
+        return ((f & Z80Batch.COND_FLAG[cc]) != 0) == (Z80Batch.COND_SET[cc] != 0)
+
+    # instruction families; op holds the opcodes of the instances in sel
+
+    def fallback(self, sel, op):
+        """Anything else, one instance at a time
+
+        The registers of the instances in sel are taken out of the
+        arrays at once, and put back at once, as store() and load()
+        would do them one by one.
+        """
+        cpu = self.m_cpu
+        columns = [getattr(self, name) for name in Z80Batch.REGISTERS]
+        before = np.stack([column[sel] for column in columns], 1).tolist()
+        registers = attrgetter(*Z80Batch.REGISTERS, 'm_bc', 'm_de', 'm_hl', 'm_f', 'm_a', 'm_icount')
+        after = []
+        for n, values, (b, c, d, e, h, l, f, a) in zip(sel.tolist(), before, self.m_regs[sel].tolist()):
+            self.m_current = n
+            self.map(n)
+            (cpu.m_pc, cpu.m_sp, cpu.m_ix, cpu.m_iy, cpu.m_wz, cpu.m_af2, cpu.m_bc2, cpu.m_de2, cpu.m_hl2,
+             cpu.m_r, cpu.m_r2, cpu.m_iff1, cpu.m_iff2, cpu.m_halt, cpu.m_im, cpu.m_i) = values
+            cpu.m_a = a
+            cpu.m_f = f
+            cpu.m_bc = (b << 8) | c
+            cpu.m_de = (d << 8) | e
+            cpu.m_hl = (h << 8) | l
+            cpu.m_icount = 0
+            cpu.execute_run()
+            after.append(registers(cpu))
+
+        after = np.array(after, np.int64)
+        for k, column in enumerate(columns):
+            column[sel] = after[:, k]
+        bc, de, hl, f, a, icount = after[:, len(columns):].T
+        self.m_regs[sel] = np.stack([bc >> 8, bc & 0xff, de >> 8, de & 0xff, hl >> 8, hl & 0xff, f, a], 1)
+        self.m_cycles[sel] -= icount
+
+    def map(self, n):
+        """Map the memory of instance n into the fallback Z80
+
+        The pages are set up as map_ram() does, once per instance, and
+        swapped in as a whole; the fallback Z80 never remaps them.
+        """
+        maps = self.m_maps[n]
+        if maps is None:
+            row = self.m_mem[n]
+            view = memoryview(row)
+            offsets = range(0, 0x10000, 0x100)
+            pages = [view[offset:offset + 0x100] for offset in offsets]
+            maps = self.m_maps[n] = (pages, list(pages), [(row, offset) for offset in offsets])
+        cpu = self.m_cpu
+        cpu.m_read_map, cpu.m_write_map, cpu.m_page_origins = maps
+
+    def halted(self, sel, op):
+        """NOPs executed in HALT state
+        """
+        self.m_cycles[sel] += Z80Batch.cc_op[0]
+
+    def nop(self, sel, op):
+        """NOP
+        """
+
+    def halt(self, sel, op):
+        """HALT
+        """
+        self.m_halt[sel] = 1
+
+    def di_ei(self, sel, op):
+        """DI, EI
+        """
+        value = (op == 0xfb).astype(np.int64)
+        self.m_iff1[sel] = value
+        self.m_iff2[sel] = value
+
+    def ld_r_r(self, sel, op):
+        """LD   r,r
+        """
+        self.set_r(sel, (op >> 3) & 7, self.get_r(sel, op & 7))
+
+    def ld_r_n(self, sel, op):
+        """LD   r,n
+        """
+        self.set_r(sel, (op >> 3) & 7, self.arg(sel))
+
+    def alu_r(self, sel, op):
+        """ADD/ADC/SUB/SBC/AND/XOR/OR/CP  r
+        """
+        self.alu(sel, (op >> 3) & 7, self.get_r(sel, op & 7))
+
+    def alu_n(self, sel, op):
+        """ADD/ADC/SUB/SBC/AND/XOR/OR/CP  n
+        """
+        self.alu(sel, (op >> 3) & 7, self.arg(sel))
+
+    def alu(self, sel, y, value):
+        """ALU operation y on A and value
+        """
+        regs = self.m_regs
+        a = regs[sel, Z80Batch.A]
+        c = regs[sel, Z80Batch.F] & Z80.CF
+        res = a.copy()
+        f = np.empty_like(a)
+        for k in np.unique(y).tolist():
+            m = y == k
+            am = a[m]
+            vm = value[m]
+            if k == 0:
+                r = (am + vm) & 0xff
+                f[m] = Z80Batch.SZHVC_add[(am << 8) | r]
+            elif k == 1:
+                cm = c[m]
+                r = (am + vm + cm) & 0xff
+                f[m] = Z80Batch.SZHVC_add[(cm << 16) | (am << 8) | r]
+            elif k == 2:
+                r = (am - vm) & 0xff
+                f[m] = Z80Batch.SZHVC_sub[(am << 8) | r]
+            elif k == 3:
+                cm = c[m]
+                r = (am - vm - cm) & 0xff
+                f[m] = Z80Batch.SZHVC_sub[(cm << 16) | (am << 8) | r]
+            elif k == 4:
+                r = am & vm
+                f[m] = Z80Batch.SZP[r] | Z80.HF
+            elif k == 5:
+                r = am ^ vm
+                f[m] = Z80Batch.SZP[r]
+            elif k == 6:
+                r = am | vm
+                f[m] = Z80Batch.SZP[r]
+            else:
+                r = am
+                f[m] = Z80Batch.SZHVC_sub[(am << 8) | ((am - vm) & 0xff)] & ~(Z80.YF | Z80.XF) \
+                    | (vm & (Z80.YF | Z80.XF))
+            res[m] = r
+        regs[sel, Z80Batch.A] = res
+        regs[sel, Z80Batch.F] = f
+
+    def inc_dec_r(self, sel, op):
+        """INC  r, DEC  r
+        """
+        y = (op >> 3) & 7
+        value = self.get_r(sel, y)
+        dec = (op & 1) != 0
+        res = np.where(dec, value - 1, value + 1) & 0xff
+        flags = np.where(dec, Z80Batch.SZHV_dec[res], Z80Batch.SZHV_inc[res])
+        self.m_regs[sel, Z80Batch.F] = (self.m_regs[sel, Z80Batch.F] & Z80.CF) | flags
+        self.set_r(sel, y, res)
+
+    def inc_dec_rp(self, sel, op):
+        """INC  rr, DEC  rr
+        """
+        p = (op >> 4) & 3
+        step = np.where(op & 0x08, -1, 1)
+        self.set_rp(sel, p, (self.get_rp(sel, p) + step) & 0xffff)
+
+    def ld_rp_nn(self, sel, op):
+        """LD   rr,nn
+        """
+        self.set_rp(sel, (op >> 4) & 3, self.arg16(sel))
+
+    def add_hl_rp(self, sel, op):
+        """ADD  HL,rr
+        """
+        regs = self.m_regs
+        dr = self.hl(sel)
+        sr = self.get_rp(sel, (op >> 4) & 3)
+        res = dr + sr
+        self.m_wz[sel] = (dr + 1) & 0xffff
+        regs[sel, Z80Batch.F] = (regs[sel, Z80Batch.F] & (Z80.SF | Z80.ZF | Z80.VF)) \
+            | (((dr ^ res ^ sr) >> 8) & Z80.HF) \
+            | ((res >> 16) & Z80.CF) \
+            | ((res >> 8) & (Z80.YF | Z80.XF))
+        regs[sel, Z80Batch.H] = (res >> 8) & 0xff
+        regs[sel, Z80Batch.L] = res & 0xff
+
+    def ld_ind(self, sel, op):
+        """LD   (BC)/(DE)/(nn),A, LD   A,(BC)/(DE)/(nn), LD   (nn),HL, LD   HL,(nn)
+        """
+        regs = self.m_regs
+        for k in np.unique(op).tolist():
+            s = sel[op == k]
+            if k in (0x02, 0x12):
+                addr = self.get_rp(s, np.full(len(s), k >> 4))
+                a = regs[s, Z80Batch.A]
+                self.wm(s, addr, a)
+                self.m_wz[s] = (a << 8) | ((addr + 1) & 0xff)
+            elif k in (0x0a, 0x1a):
+                addr = self.get_rp(s, np.full(len(s), k >> 4))
+                regs[s, Z80Batch.A] = self.rm(s, addr)
+                self.m_wz[s] = (addr + 1) & 0xffff
+            elif k == 0x22:
+                ea = self.arg16(s)
+                self.wm(s, ea, regs[s, Z80Batch.L])
+                self.wm(s, (ea + 1) & 0xffff, regs[s, Z80Batch.H])
+                self.m_wz[s] = (ea + 1) & 0xffff
+            elif k == 0x2a:
+                ea = self.arg16(s)
+                regs[s, Z80Batch.L] = self.rm(s, ea)
+                regs[s, Z80Batch.H] = self.rm(s, (ea + 1) & 0xffff)
+                self.m_wz[s] = (ea + 1) & 0xffff
+            elif k == 0x32:
+                ea = self.arg16(s)
+                a = regs[s, Z80Batch.A]
+                self.wm(s, ea, a)
+                self.m_wz[s] = (a << 8) | ((ea + 1) & 0xff)
+            else:
+                ea = self.arg16(s)
+                regs[s, Z80Batch.A] = self.rm(s, ea)
+                self.m_wz[s] = (ea + 1) & 0xffff
+
+    def rot_a(self, sel, op):
+        """RLCA, RRCA, RLA, RRA
+        """
+        regs = self.m_regs
+        a = regs[sel, Z80Batch.A]
+        f = regs[sel, Z80Batch.F]
+        y = (op >> 3) & 7
+        res = np.select(
+            [y == 0, y == 1, y == 2],
+            [((a << 1) | (a >> 7)) & 0xff, ((a >> 1) | (a << 7)) & 0xff, ((a << 1) | (f & Z80.CF)) & 0xff],
+            ((a >> 1) | (f << 7)) & 0xff)
+        c = np.where(y & 1, a & Z80.CF, a >> 7)
+        regs[sel, Z80Batch.A] = res
+        regs[sel, Z80Batch.F] = (f & (Z80.SF | Z80.ZF | Z80.PF)) | c | (res & (Z80.YF | Z80.XF))
+
+    def cpl(self, sel, op):
+        """CPL
+        """
+        regs = self.m_regs
+        a = regs[sel, Z80Batch.A] ^ 0xff
+        regs[sel, Z80Batch.A] = a
+        regs[sel, Z80Batch.F] = (regs[sel, Z80Batch.F] & (Z80.SF | Z80.ZF | Z80.PF | Z80.CF)) \
+            | Z80.HF | Z80.NF | (a & (Z80.YF | Z80.XF))
+
+    def scf_ccf(self, sel, op):
+        """SCF, CCF
+        """
+        regs = self.m_regs
+        f = regs[sel, Z80Batch.F]
+        yx = regs[sel, Z80Batch.A] & (Z80.YF | Z80.XF)
+        scf = (f & (Z80.SF | Z80.ZF | Z80.YF | Z80.XF | Z80.PF)) | Z80.CF | yx
+        ccf = ((f & (Z80.SF | Z80.ZF | Z80.YF | Z80.XF | Z80.PF | Z80.CF)) | ((f & Z80.CF) << 4) | yx) ^ Z80.CF
+        regs[sel, Z80Batch.F] = np.where(op == 0x37, scf, ccf)
+
+    def ex_af(self, sel, op):
+        """EX   AF,AF'
+        """
+        regs = self.m_regs
+        af2 = self.m_af2[sel]
+        self.m_af2[sel] = (regs[sel, Z80Batch.A] << 8) | regs[sel, Z80Batch.F]
+        regs[sel, Z80Batch.A] = af2 >> 8
+        regs[sel, Z80Batch.F] = af2 & 0xff
+
+    def ex_de_hl(self, sel, op):
+        """EX   DE,HL
+        """
+        regs = self.m_regs
+        de = regs[sel, Z80Batch.D:Z80Batch.E + 1]
+        regs[sel, Z80Batch.D:Z80Batch.E + 1] = regs[sel, Z80Batch.H:Z80Batch.L + 1]
+        regs[sel, Z80Batch.H:Z80Batch.L + 1] = de
+
+    def exx(self, sel, op):
+        """EXX
+        """
+        regs = self.m_regs
+        for hi, other in ((Z80Batch.B, self.m_bc2), (Z80Batch.D, self.m_de2), (Z80Batch.H, self.m_hl2)):
+            value = (regs[sel, hi] << 8) | regs[sel, hi + 1]
+            regs[sel, hi] = other[sel] >> 8
+            regs[sel, hi + 1] = other[sel] & 0xff
+            other[sel] = value
+
+    def jr(self, sel, op):
+        """JR   e, JR   cc,e, DJNZ e
+        """
+        regs = self.m_regs
+        djnz = op == 0x10
+        if djnz.any():
+            b = sel[djnz]
+            regs[b, Z80Batch.B] = (regs[b, Z80Batch.B] - 1) & 0xff
+        taken = np.where(op & 0x20, self.condition(sel, ((op >> 3) & 7) - 4), True)
+        taken[djnz] = regs[sel[djnz], Z80Batch.B] != 0
+        disp = self.arg(sel)
+        pc = (self.m_pc[sel] + Z80Batch.S8[disp]) & 0xffff
+        self.m_pc[sel] = np.where(taken, pc, self.m_pc[sel])
+        self.m_wz[sel] = np.where(taken, pc, disp)
+        self.m_cycles[sel[taken]] += Z80Batch.cc_ex[op[taken]]
+
+    def jp(self, sel, op):
+        """JP   nn, JP   cc,nn
+        """
+        taken = (op == 0xc3) | self.condition(sel, (op >> 3) & 7)
+        nn = self.arg16(sel)
+        self.m_pc[sel] = np.where(taken, nn, self.m_pc[sel])
+        self.m_wz[sel] = nn
+
+    def jp_hl(self, sel, op):
+        """JP   (HL)
+        """
+        self.m_pc[sel] = self.hl(sel)
+
+    def ld_sp_hl(self, sel, op):
+        """LD   SP,HL
+        """
+        self.m_sp[sel] = self.hl(sel)
+
+    def call(self, sel, op):
+        """CALL nn, CALL cc,nn
+        """
+        taken = (op == 0xcd) | self.condition(sel, (op >> 3) & 7)
+        nn = self.arg16(sel)
+        self.m_wz[sel] = nn
+        sel = sel[taken]
+        self.push(sel, self.m_pc[sel])
+        self.m_pc[sel] = nn[taken]
+        self.m_cycles[sel] += Z80Batch.cc_ex[op[taken]]
+
+    def ret(self, sel, op):
+        """RET, RET  cc
+        """
+        taken = (op == 0xc9) | self.condition(sel, (op >> 3) & 7)
+        sel = sel[taken]
+        pc = self.pop(sel)
+        self.m_pc[sel] = pc
+        self.m_wz[sel] = pc
+        self.m_cycles[sel] += Z80Batch.cc_ex[op[taken]]
+
+    def rst(self, sel, op):
+        """RST  n
+        """
+        self.push(sel, self.m_pc[sel])
+        self.m_pc[sel] = op & 0x38
+        self.m_wz[sel] = op & 0x38
+
+    def push_rp(self, sel, op):
+        """PUSH rr
+        """
+        regs = self.m_regs
+        p = (op >> 4) & 3
+        self.push(sel, (regs[sel, Z80Batch.PAIR_HI[p]] << 8) | regs[sel, Z80Batch.PAIR_LO[p]])
+
+    def pop_rp(self, sel, op):
+        """POP  rr
+        """
+        regs = self.m_regs
+        p = (op >> 4) & 3
+        value = self.pop(sel)
+        regs[sel, Z80Batch.PAIR_HI[p]] = value >> 8
+        regs[sel, Z80Batch.PAIR_LO[p]] = value & 0xff
+
+    def cb(self, sel, op):
+        """RLC/RRC/RL/RR/SLA/SRA/SLL/SRL, BIT, RES and SET  r
+        """
+        regs = self.m_regs
+        op = self.fetch(sel, Z80Batch.cc_cb)
+        x, y, z = op >> 6, (op >> 3) & 7, op & 7
+        value = self.get_r(sel, z)
+        f = regs[sel, Z80Batch.F]
+        rotated = np.select(
+            [y == 0, y == 1, y == 2, y == 3, y == 4, y == 5, y == 6],
+            [(value << 1) | (value >> 7), (value >> 1) | (value << 7),
+             (value << 1) | (f & Z80.CF), (value >> 1) | (f << 7),
+             value << 1, (value >> 1) | (value & 0x80), (value << 1) | 0x01],
+            value >> 1) & 0xff
+        c = np.where(y & 1, value & Z80.CF, value >> 7)
+        bit = 1 << y
+        # BIT n,(HL) takes X and Y from WZ
+        yx = np.where(z == 6, self.m_wz[sel] >> 8, value) & (Z80.YF | Z80.XF)
+        tested = (f & Z80.CF) | Z80.HF | (Z80Batch.SZ_BIT[value & bit] & ~(Z80.YF | Z80.XF)) | yx
+        regs[sel, Z80Batch.F] = np.select([x == 0, x == 1], [Z80Batch.SZP[rotated] | c, tested], f)
+        res = np.select([x == 0, x == 2], [rotated, value & ~bit], value | bit)
+        write = x != 1
+        self.set_r(sel[write], z[write], res[write])
+
+    # IX and IY instructions; op holds the prefix, DD or FD
+
+    def ld_r_xyd(self, sel, op):
+        """LD   r,(IX+d), LD   r,(IY+d)
+        """
+        iy = op == 0xfd
+        op = self.fetch(sel, Z80Batch.cc_xy)
+        self.m_regs[sel, (op >> 3) & 7] = self.rm(sel, self.ea_xy(sel, iy))
+
+    def ld_xyd_r(self, sel, op):
+        """LD   (IX+d),r, LD   (IY+d),r
+        """
+        iy = op == 0xfd
+        op = self.fetch(sel, Z80Batch.cc_xy)
+        self.wm(sel, self.ea_xy(sel, iy), self.m_regs[sel, op & 7])
+
+    def ld_xyd_n(self, sel, op):
+        """LD   (IX+d),n, LD   (IY+d),n
+        """
+        iy = op == 0xfd
+        self.fetch(sel, Z80Batch.cc_xy)
+        ea = self.ea_xy(sel, iy)
+        self.wm(sel, ea, self.arg(sel))
+
+    def alu_xyd(self, sel, op):
+        """ADD/ADC/SUB/SBC/AND/XOR/OR/CP  (IX+d), (IY+d)
+        """
+        iy = op == 0xfd
+        op = self.fetch(sel, Z80Batch.cc_xy)
+        self.alu(sel, (op >> 3) & 7, self.rm(sel, self.ea_xy(sel, iy)))
+
+    def inc_dec_xyd(self, sel, op):
+        """INC  (IX+d), DEC  (IX+d), INC  (IY+d), DEC  (IY+d)
+        """
+        iy = op == 0xfd
+        op = self.fetch(sel, Z80Batch.cc_xy)
+        ea = self.ea_xy(sel, iy)
+        value = self.rm(sel, ea)
+        dec = (op & 1) != 0
+        res = np.where(dec, value - 1, value + 1) & 0xff
+        flags = np.where(dec, Z80Batch.SZHV_dec[res], Z80Batch.SZHV_inc[res])
+        self.m_regs[sel, Z80Batch.F] = (self.m_regs[sel, Z80Batch.F] & Z80.CF) | flags
+        self.wm(sel, ea, res)
+
+    def ld_xy_nn(self, sel, op):
+        """LD   IX,nn, LD   IY,nn
+        """
+        iy = op == 0xfd
+        self.fetch(sel, Z80Batch.cc_xy)
+        self.set_xy(sel, iy, self.arg16(sel))
+
+    def inc_dec_xy(self, sel, op):
+        """INC  IX, DEC  IX, INC  IY, DEC  IY
+        """
+        iy = op == 0xfd
+        op = self.fetch(sel, Z80Batch.cc_xy)
+        step = np.where(op & 0x08, -1, 1)
+        self.set_xy(sel, iy, (self.xy(sel, iy) + step) & 0xffff)
+
+    def push_pop_xy(self, sel, op):
+        """PUSH IX, POP  IX, PUSH IY, POP  IY
+        """
+        iy = op == 0xfd
+        op = self.fetch(sel, Z80Batch.cc_xy)
+        push = op == 0xe5
+        s = sel[push]
+        self.push(s, self.xy(s, iy[push]))
+        pop = ~push
+        s = sel[pop]
+        self.set_xy(s, iy[pop], self.pop(s))
@@ -0,0 +1,112 @@
+from z80 import Z80
+
+
+class Z80Coarse(Z80):
+    """Z80 with instruction-granular timing
+
+    Z80 spreads the cycles of an instruction over its memory and I/O
+    accesses, so that bus handlers see m_icount as it was at the
+    access, as needed for contended memory. Z80Coarse charges the
+    total of each instruction from the cc_* tables up front instead
+    and leaves m_icount_executing alone. The cycles taken per
+    instruction and interrupt, and thus where execute_run() stops, are
+    the same as with Z80.
+    """
+
+    def CC(self, table, opcode):
+        self.m_icount -= table[opcode]
+
+    def T(self, icount):
+        pass
+
+    def EXEC(self, cc_table, op_table, opcode):
+        self.m_icount -= cc_table[opcode]
+        op_table[opcode](self)
+
+    def inp(self, port):
+        """Input a byte from given I/O port
+        """
+        return self.m_io.read(port)
+
+    def out(self, port, value):
+        """Output a byte to given I/O port
+        """
+        self.m_io.write(port, value)
+
+    def rm(self, addr):
+        """Read a byte from given memory location
+        """
+        page = self.m_read_map[addr >> 8]
+        if page is None:
+            return self.m_read_handlers[addr >> 8](addr)
+        return page[addr & 0xff]
+
+    def rm_reg(self, addr):
+        """Read a byte from given memory location
+        """
+        return self.rm(addr)
+
+    def wm(self, addr, data):
+        """Write a byte to given memory location
+        """
+        page = self.m_write_map[addr >> 8]
+        if page is None:
+            self.m_write_handlers[addr >> 8](addr, data)
+        else:
+            page[addr & 0xff] = data
+
+    def wm16(self, addr, value):
+        """Write a word to given memory location
+        """
+        self.wm(addr, value & 0xff)
+        self.wm((addr + 1) & 0xffff, value >> 8)
+
+    def wm16_sp(self, value):
+        """Write a word to (SP)
+        """
+        sp = (self.m_sp - 1) & 0xffff
+        self.wm(sp, value >> 8)
+        sp = (sp - 1) & 0xffff
+        self.wm(sp, value & 0xff)
+        self.m_sp = sp
+
+    def rop(self):
+        """Read an opcode from (PC)
+        """
+        pc = self.m_pc
+        if self.m_opcodes is None:
+            page = self.m_read_map[pc >> 8]
+            if page is None:
+                res = self.m_read_handlers[pc >> 8](pc)
+            else:
+                res = page[pc & 0xff]
+        else:
+            res = self.m_opcodes.read(pc)
+        self.m_pc = (pc + 1) & 0xffff
+        self.m_r += 1
+        return res
+
+    def arg(self):
+        """Read an opcode argument from (PC)
+        """
+        pc = self.m_pc
+        if self.m_args is None:
+            page = self.m_read_map[pc >> 8]
+            if page is None:
+                res = self.m_read_handlers[pc >> 8](pc)
+            else:
+                res = page[pc & 0xff]
+        else:
+            res = self.m_args.read(pc)
+        self.m_pc = (pc + 1) & 0xffff
+        return res
+
+    def nomreq_ir(self, cycles):
+        pass
+
+    def nomreq_addr(self, addr, cycles):
+        pass
+
+    def take_nmi(self):
+        super().take_nmi()
+        self.m_icount -= 11
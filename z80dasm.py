@@ -0,0 +1,211 @@
+"""Z80 disassembler
+
+disassemble(read, pc) decodes the instruction at pc, reading bytes
+with read(addr), and returns its text and length. Undocumented
+instructions are included; prefixes that do nothing show as NOP*.
+"""
+
+R = ('B', 'C', 'D', 'E', 'H', 'L', '(HL)', 'A')
+RP = ('BC', 'DE', 'HL', 'SP')
+RP2 = ('BC', 'DE', 'HL', 'AF')
+CC = ('NZ', 'Z', 'NC', 'C', 'PO', 'PE', 'P', 'M')
+ALU = ('ADD A,', 'ADC A,', 'SUB ', 'SBC A,', 'AND ', 'XOR ', 'OR ', 'CP ')
+ROT = ('RLC', 'RRC', 'RL', 'RR', 'SLA', 'SRA', 'SLL', 'SRL')
+ACC = ('RLCA', 'RRCA', 'RLA', 'RRA', 'DAA', 'CPL', 'SCF', 'CCF')
+IM = ('0', '0/1', '1', '2', '0', '0/1', '1', '2')
+BLOCK = (
+    ('LDI', 'CPI', 'INI', 'OUTI'),
+    ('LDD', 'CPD', 'IND', 'OUTD'),
+    ('LDIR', 'CPIR', 'INIR', 'OTIR'),
+    ('LDDR', 'CPDR', 'INDR', 'OTDR'),
+)
+ED_MISC = ('LD I,A', 'LD R,A', 'LD A,I', 'LD A,R', 'RRD', 'RLD', 'NOP*', 'NOP*')
+
+
+class Decoder:
+    """Decoding state of one instruction
+    """
+
+    def __init__(self, read, pc):
+        self.read = read
+        self.pc = pc
+        self.length = 0
+        # HL, IX or IY, and the displacement text for (IX+d)
+        self.xy = 'HL'
+        self.disp = None
+
+    def byte(self):
+        value = self.read((self.pc + self.length) & 0xffff)
+        self.length += 1
+        return value
+
+    def n(self):
+        return '${:02X}'.format(self.byte())
+
+    def nn(self):
+        low = self.byte()
+        return '${:04X}'.format((self.byte() << 8) | low)
+
+    def rel(self):
+        d = self.byte()
+        d = d - 0x100 if d & 0x80 else d
+        return '${:04X}'.format((self.pc + self.length + d) & 0xffff)
+
+    def index(self):
+        """(HL), or (IX+d)/(IY+d) reading d when not read yet
+        """
+        if self.xy == 'HL':
+            return '(HL)'
+        if self.disp is None:
+            d = self.byte()
+            self.disp = '{}${:02X}'.format('-' if d & 0x80 else '+', (-d) & 0xff if d & 0x80 else d)
+        return '({}{})'.format(self.xy, self.disp)
+
+    def r(self, i, memory=False):
+        """Register i; H and L stay themselves next to (IX+d)
+        """
+        if i == 6:
+            return self.index()
+        if i in (4, 5) and self.xy != 'HL' and not memory:
+            return self.xy + 'HL'[i - 4]
+        return R[i]
+
+    def rp(self, p, table=RP):
+        return self.xy if p == 2 else table[p]
+
+    def op(self):
+        opcode = self.byte()
+        x, y, z = opcode >> 6, (opcode >> 3) & 7, opcode & 7
+        p, q = y >> 1, y & 1
+        if x == 0:
+            if z == 0:
+                if y == 0:
+                    return 'NOP'
+                if y == 1:
+                    return "EX AF,AF'"
+                if y == 2:
+                    return 'DJNZ ' + self.rel()
+                if y == 3:
+                    return 'JR ' + self.rel()
+                return 'JR {},{}'.format(CC[y - 4], self.rel())
+            if z == 1:
+                if q == 0:
+                    return 'LD {},{}'.format(self.rp(p), self.nn())
+                return 'ADD {},{}'.format(self.xy, self.rp(p))
+            if z == 2:
+                if p == 0:
+                    return ('LD (BC),A', 'LD A,(BC)')[q]
+                if p == 1:
+                    return ('LD (DE),A', 'LD A,(DE)')[q]
+                if p == 2:
+                    return ('LD ({1}),{0}', 'LD {0},({1})')[q].format(self.xy, self.nn())
+                return ('LD ({}),A', 'LD A,({})')[q].format(self.nn())
+            if z == 3:
+                return '{} {}'.format(('INC', 'DEC')[q], self.rp(p))
+            if z == 4:
+                return 'INC ' + self.r(y)
+            if z == 5:
+                return 'DEC ' + self.r(y)
+            if z == 6:
+                dst = self.r(y)
+                return 'LD {},{}'.format(dst, self.n())
+            return ACC[y]
+        if x == 1:
+            if y == 6 and z == 6:
+                return 'HALT'
+            memory = y == 6 or z == 6
+            dst = self.r(y, memory)
+            return 'LD {},{}'.format(dst, self.r(z, memory))
+        if x == 2:
+            return ALU[y] + self.r(z)
+        if z == 0:
+            return 'RET ' + CC[y]
+        if z == 1:
+            if q == 0:
+                return 'POP ' + self.rp(p, RP2)
+            return ('RET', 'EXX', 'JP ({})'.format(self.xy), 'LD SP,' + self.xy)[p]
+        if z == 2:
+            return 'JP {},{}'.format(CC[y], self.nn())
+        if z == 3:
+            if y == 0:
+                return 'JP ' + self.nn()
+            if y == 1:
+                return self.cb()
+            if y == 2:
+                return 'OUT ({}),A'.format(self.n())
+            if y == 3:
+                return 'IN A,({})'.format(self.n())
+            if y == 4:
+                return 'EX (SP),' + self.xy
+            return ('EX DE,HL', 'DI', 'EI')[y - 5]
+        if z == 4:
+            return 'CALL {},{}'.format(CC[y], self.nn())
+        if z == 5:
+            if q == 0:
+                return 'PUSH ' + self.rp(p, RP2)
+            if p == 0:
+                return 'CALL ' + self.nn()
+            if p == 2:
+                if self.xy != 'HL':
+                    self.length -= 1
+                    return 'NOP*'
+                return self.ed()
+            if self.xy != 'HL':
+                self.length -= 1
+                return 'NOP*'
+            self.xy = ('IX', 'IY')[p == 3]
+            return self.op()
+        if z == 6:
+            return ALU[y] + self.n()
+        return 'RST ${:02X}'.format(y * 8)
+
+    def cb(self):
+        if self.xy != 'HL':
+            # DD CB d op
+            operand = self.index()
+        opcode = self.byte()
+        x, y, z = opcode >> 6, (opcode >> 3) & 7, opcode & 7
+        if self.xy == 'HL':
+            operand = R[z]
+        if x == 0:
+            text = '{} {}'.format(ROT[y], operand)
+        else:
+            text = '{} {},{}'.format(('BIT', 'RES', 'SET')[x - 1], y, operand)
+        if self.xy != 'HL' and z != 6 and x != 1:
+            # the result is copied to a register as well
+            text += ',' + R[z]
+        return text
+
+    def ed(self):
+        opcode = self.byte()
+        x, y, z = opcode >> 6, (opcode >> 3) & 7, opcode & 7
+        p, q = y >> 1, y & 1
+        if x == 1:
+            if z == 0:
+                return 'IN (C)' if y == 6 else 'IN {},(C)'.format(R[y])
+            if z == 1:
+                return 'OUT (C),0' if y == 6 else 'OUT (C),{}'.format(R[y])
+            if z == 2:
+                return '{} HL,{}'.format(('SBC', 'ADC')[q], RP[p])
+            if z == 3:
+                if q == 0:
+                    return 'LD ({}),{}'.format(self.nn(), RP[p])
+                return 'LD {},({})'.format(RP[p], self.nn())
+            if z == 4:
+                return 'NEG'
+            if z == 5:
+                return 'RETI' if y == 1 else 'RETN'
+            if z == 6:
+                return 'IM ' + IM[y]
+            return ED_MISC[y]
+        if x == 2 and z <= 3 and y >= 4:
+            return BLOCK[y - 4][z]
+        return 'NOP*'
+
+
+def disassemble(read, pc):
+    """Text and length of the instruction at pc
+    """
+    decoder = Decoder(read, pc)
+    text = decoder.op()
+    return text, decoder.length
@@ -0,0 +1,88 @@
+from z80 import Z80
+
+
+class Z80Fuse(Z80):
+    """Z80 running common instruction pairs in one dispatch
+
+    The handler of the first instruction of a pair checks the byte
+    after it, and when that is the opcode of the second one and
+    execute_run() would go on to it at once, fetches and runs it too,
+    without going through the loop of execute_run() again. The pairs
+    are
+
+        LD A,(HL)   INC HL          LD (HL),A   INC HL
+        LD A,(DE)   INC DE          LD (DE),A   INC DE
+        DEC B       JR NZ,e         DEC C       JR NZ,e
+        OR A        JR Z,e          AND A       JR Z,e
+
+    Registers, flags, WZ, R and the cycles taken, also as seen by the
+    memory and I/O handlers, are the same as with Z80. Nothing is
+    fused when an interrupt is to be taken between the two, the time
+    slice ends after the first, the CPU is stalled, or the opcodes are
+    not read from a RAM or ROM page.
+    """
+
+    def fuse(self, opcode):
+        """Fetch opcode as the next instruction, if it is the next one
+
+        Does what execute_run() does between two instructions, and
+        returns False where it would not run the next one right away.
+        """
+        # the end of EXEC() for the first instruction
+        if self.m_icount_executing > 0:
+            self.m_icount -= self.m_icount_executing
+        self.m_icount_executing = 0
+        if self.m_icount < 0 or self.m_wait_state or self.m_nmi_pending or \
+                (self.m_irq_state != Z80.CLEAR_LINE and self.m_iff1) or self.m_opcodes is not None:
+            return False
+        pc = self.m_pc
+        page = self.m_read_map[pc >> 8]
+        if page is None or page[pc & 0xff] != opcode:
+            return False
+        self.m_after_ldair = False
+        # rop() and CC() for it
+        self.m_pc = (pc + 1) & 0xffff
+        self.m_r += 1
+        self.m_icount -= 4
+        self.m_icount_executing = Z80.cc_op[opcode] - 4
+        return True
+
+    def op_op_05(self):
+        self.m_bc = (self.dec((self.m_bc >> 8)) << 8) | (self.m_bc & 0xff)
+        if self.fuse(0x20):
+            self.jr_cond(not self.m_f & Z80.ZF, 0x20)
+
+    def op_op_0d(self):
+        self.m_bc = (self.m_bc & 0xff00) | self.dec((self.m_bc & 0xff))
+        if self.fuse(0x20):
+            self.jr_cond(not self.m_f & Z80.ZF, 0x20)
+
+    def op_op_12(self):
+        self.wm(self.m_de, self.m_a); self.m_wz = (self.m_a << 8) | ((self.m_de + 1) & 0xff)
+        if self.fuse(0x13):
+            self.nomreq_ir(2); self.m_de = (self.m_de + 1) & 0xffff
+
+    def op_op_1a(self):
+        self.m_a = self.rm(self.m_de); self.m_wz = (self.m_de + 1) & 0xffff
+        if self.fuse(0x13):
+            self.nomreq_ir(2); self.m_de = (self.m_de + 1) & 0xffff
+
+    def op_op_77(self):
+        self.wm(self.m_hl, self.m_a)
+        if self.fuse(0x23):
+            self.nomreq_ir(2); self.m_hl = (self.m_hl + 1) & 0xffff
+
+    def op_op_7e(self):
+        self.m_a = self.rm(self.m_hl)
+        if self.fuse(0x23):
+            self.nomreq_ir(2); self.m_hl = (self.m_hl + 1) & 0xffff
+
+    def op_op_a7(self):
+        self.and_a(self.m_a)
+        if self.fuse(0x28):
+            self.jr_cond(self.m_f & Z80.ZF, 0x28)
+
+    def op_op_b7(self):
+        self.or_a(self.m_a)
+        if self.fuse(0x28):
+            self.jr_cond(self.m_f & Z80.ZF, 0x28)
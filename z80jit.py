@@ -0,0 +1,921 @@
+import re
+
+from z80 import Z80
+
+
+class Block:
+    """A translated basic block
+
+    run is the compiled function, called with the CPU. icount is the
+    number of T-states the instructions before the last one take: the
+    block may only be entered with at least that much left, so that it
+    stops exactly where the interpreter would have stopped.
+    """
+    __slots__ = ('run', 'start', 'end', 'icount', 'source')
+
+    def __init__(self, run, start, end, icount, source):
+        self.run = run
+        self.start = start
+        self.end = end
+        self.icount = icount
+        self.source = source
+
+
+class Translator:
+    """Translate straight-line Z80 code into Python source
+
+    A block starts at a given PC and runs up to the first instruction
+    that changes the control flow, touches the interrupt state or I/O,
+    or cannot be translated. Registers are loaded into locals at entry
+    and written back at every exit; the cycles of the whole block are
+    summed from the cc_* tables at translation time and charged once.
+
+    Opcode and argument bytes are read through the read_op/read_arg
+    callables given to the constructor, so that the same translator can
+    be used on a live CPU or on a ROM image. When readable is given, a
+    block ends before the first instruction with any of its possible
+    bytes at an address readable() refuses.
+    """
+
+    # registers that may be loaded into locals of a block
+    REGS = ('a', 'f', 'bc', 'de', 'hl', 'ix', 'iy', 'sp', 'wz', 'ea')
+
+    MAX_INSNS = 64
+
+    CF = Z80.CF
+    NF = Z80.NF
+    PF = Z80.PF
+    VF = Z80.VF
+    XF = Z80.XF
+    HF = Z80.HF
+    YF = Z80.YF
+    ZF = Z80.ZF
+    SF = Z80.SF
+
+    # condition codes for JR/JP/CALL/RET cc: NZ Z NC C PO PE P M
+    COND = (
+        'not (f & 0x40)', '(f & 0x40)', 'not (f & 0x01)', '(f & 0x01)',
+        'not (f & 0x04)', '(f & 0x04)', 'not (f & 0x80)', '(f & 0x80)',
+    )
+
+    def __init__(self, read_op, read_arg=None, readable=None):
+        self.read_op = read_op
+        self.read_arg = read_arg if read_arg is not None else read_op
+        self.readable = readable
+
+    # --- source helpers ---------------------------------------------------
+
+    def get8(self, r, xy='hl'):
+        """Source for reading register r (0-7, 6 is not allowed)
+        """
+        return (
+            '(bc >> 8)', '(bc & 0xff)', '(de >> 8)', '(de & 0xff)',
+            '({} >> 8)'.format(xy), '({} & 0xff)'.format(xy), None, 'a',
+        )[r]
+
+    def set8(self, r, value, xy='hl'):
+        """Source for writing the simple expression value to register r
+        """
+        pair = ('bc', 'bc', 'de', 'de', xy, xy, None, 'a')[r]
+        if r == 7:
+            return 'a = {}'.format(value)
+        if r & 1:
+            return '{0} = ({0} & 0xff00) | {1}'.format(pair, value)
+        return '{0} = ({1} << 8) | ({0} & 0xff)'.format(pair, value)
+
+    def rd(self, addr):
+        """Source for a memory read; addr is an int, a name or an
+        expression in parentheses
+        """
+        page = addr >> 8 if isinstance(addr, int) else '{} >> 8'.format(addr)
+        return '(pg[{0} & 0xff] if (pg := rmap[{1}]) is not None else rh[{1}]({0}))'.format(addr, page)
+
+    def write(self, addr, value):
+        """Source for a memory write
+
+        Writes into pages holding translated code invalidate them; the
+        block is left after the current instruction in that case. So it
+        is after writes to handler pages, which may remap memory.
+        """
+        self.smc = True
+        if isinstance(addr, int):
+            page = addr >> 8
+        else:
+            if not addr.isidentifier():
+                return ['adr = {}'.format(addr)] + self.write('adr', value)
+            page = '{} >> 8'.format(addr)
+        return [
+            'pg = wmap[{}]'.format(page),
+            'if pg is None:',
+            '    wh[{}]({}, {})'.format(page, addr, value),
+            '    smc = True',
+            'else:',
+            '    pg[{} & 0xff] = {}'.format(addr, value),
+            'if pages[{}]:'.format(page),
+            '    cpu.invalidate({})'.format(addr),
+            '    smc = True',
+        ]
+
+    def alu(self, op, value):
+        """Source for the 8-bit ALU operation op (0-7) on A and value
+        """
+        if op == 0:     # ADD
+            return ['n = {}'.format(value),
+                    't = (a + n) & 0xff',
+                    'f = SZHVC_add[(a << 8) | t]',
+                    'a = t']
+        if op == 1:     # ADC
+            return ['n = {}'.format(value),
+                    'cy = f & 1',
+                    't = (a + n + cy) & 0xff',
+                    'f = SZHVC_add[(cy << 16) | (a << 8) | t]',
+                    'a = t']
+        if op == 2:     # SUB
+            return ['n = {}'.format(value),
+                    't = (a - n) & 0xff',
+                    'f = SZHVC_sub[(a << 8) | t]',
+                    'a = t']
+        if op == 3:     # SBC
+            return ['n = {}'.format(value),
+                    'cy = f & 1',
+                    't = (a - n - cy) & 0xff',
+                    'f = SZHVC_sub[(cy << 16) | (a << 8) | t]',
+                    'a = t']
+        if op == 4:     # AND
+            return ['a &= {}'.format(value),
+                    'f = SZP[a] | {}'.format(self.HF)]
+        if op == 5:     # XOR
+            return ['a ^= {}'.format(value),
+                    'f = SZP[a]']
+        if op == 6:     # OR
+            return ['a |= {}'.format(value),
+                    'f = SZP[a]']
+        # CP
+        return ['n = {}'.format(value),
+                'f = (SZHVC_sub[(a << 8) | ((a - n) & 0xff)] & {}) | (n & {})'.format(
+                    0xff & ~(self.YF | self.XF), self.YF | self.XF)]
+
+    def rot(self, op, value):
+        """Source for the CB rotate/shift op (0-7) of value into t
+        """
+        if op == 0:     # RLC
+            expr = '((n << 1) | (n >> 7)) & 0xff', '(n >> 7)'
+        elif op == 1:   # RRC
+            expr = '((n >> 1) | (n << 7)) & 0xff', '(n & 0x01)'
+        elif op == 2:   # RL
+            expr = '((n << 1) | (f & 0x01)) & 0xff', '(n >> 7)'
+        elif op == 3:   # RR
+            expr = '((n >> 1) | (f << 7)) & 0xff', '(n & 0x01)'
+        elif op == 4:   # SLA
+            expr = '(n << 1) & 0xff', '(n >> 7)'
+        elif op == 5:   # SRA
+            expr = '(n >> 1) | (n & 0x80)', '(n & 0x01)'
+        elif op == 6:   # SLL
+            expr = '((n << 1) | 0x01) & 0xff', '(n >> 7)'
+        else:           # SRL
+            expr = 'n >> 1', '(n & 0x01)'
+        return ['n = {}'.format(value),
+                't = {}'.format(expr[0]),
+                'f = SZP[t] | {}'.format(expr[1])]
+
+    def bit(self, b, value, xy):
+        """Source for BIT b,value; xy is the source of the X/Y flags
+        """
+        return ['f = (f & 0x01) | {} | (SZ_BIT[{} & {}] & {}) | ({} & {})'.format(
+            self.HF, value, 1 << b, 0xff & ~(self.YF | self.XF), xy, self.YF | self.XF)]
+
+    def push(self, value):
+        """Source for pushing the simple expression value
+        """
+        return (['sp = (sp - 1) & 0xffff']
+            + self.write('sp', '{} >> 8'.format(value))
+            + ['sp = (sp - 1) & 0xffff']
+            + self.write('sp', '{} & 0xff'.format(value)))
+
+    def pop(self, target):
+        """Source for popping a word into target
+        """
+        return ['{} = {} | ({} << 8)'.format(target, self.rd('sp'), self.rd('((sp + 1) & 0xffff)')),
+                'sp = (sp + 2) & 0xffff']
+
+    # --- decoder ----------------------------------------------------------
+
+    def decode(self, pc):
+        """Translate the instruction at pc
+
+        Returns (lines, length, cycles, refresh, kind) or None if the
+        instruction is not translated. kind is None for plain
+        instructions, 'end' for instructions that end the block with a
+        known next PC, and 'jump' when the lines set the local pc.
+        """
+        op = self.read_op(pc)
+        if op == 0xcb:
+            return self.decode_cb(pc)
+        if op == 0xed:
+            return self.decode_ed(pc)
+        if op == 0xdd:
+            return self.decode_xy(pc, 'ix')
+        if op == 0xfd:
+            return self.decode_xy(pc, 'iy')
+        res = self.decode_op(pc, op, 'hl')
+        if res is None:
+            return None
+        lines, length, kind = res
+        return lines, length, Z80.cc_op[op], 1, kind
+
+    def arg(self, pc, n):
+        return self.read_arg((pc + n) & 0xffff)
+
+    def fits(self, pc):
+        """Whether the 4 bytes from pc, the longest instruction, may be read
+        """
+        readable = self.readable
+        return readable is None or all(readable((pc + n) & 0xffff) for n in range(4))
+
+    def arg16(self, pc, n):
+        return self.arg(pc, n) | (self.arg(pc, n + 1) << 8)
+
+    def decode_op(self, pc, op, xy, disp=None):
+        """Translate an unprefixed opcode, or its DD/FD form when xy is
+        'ix' or 'iy'; pc is the address of the opcode byte itself
+        """
+        x, y, z = op >> 6, (op >> 3) & 7, op & 7
+        p, q = y >> 1, y & 1
+        rp = ('bc', 'de', xy, 'sp')
+        hf, nf, cf = self.HF, self.NF, self.CF
+        sf, zf, pf, yf, xf = self.SF, self.ZF, self.PF, self.YF, self.XF
+        # (HL) or (IX+d): the prefixed forms fetch the displacement first
+        if xy == 'hl':
+            mem, pre, mlen = 'hl', [], 1
+        else:
+            mem, mlen = 'ea', 2
+            pre = ['ea = (({} + {}) & 0xffff)'.format(xy, disp if disp is not None else 0),
+                   'wz = ea']
+
+        if x == 0:
+            if z == 0:
+                if y == 0:      # NOP
+                    return [], 1, None
+                if y == 1:      # EX AF,AF'
+                    return ['t = cpu.m_af2',
+                            'cpu.m_af2 = (a << 8) | f',
+                            'a = t >> 8',
+                            'f = t & 0xff'], 1, None
+                d = self.arg(pc, 1)
+                target = (pc + 2 + (d - 0x100 if d & 0x80 else d)) & 0xffff
+                if y == 2:      # DJNZ
+                    return ['bc = (bc - 0x100) & 0xffff',
+                            'if bc & 0xff00:',
+                            '    pc = wz = {}'.format(target),
+                            '    cycles += {}'.format(Z80.cc_ex[op]),
+                            'else:',
+                            '    pc = {}'.format((pc + 2) & 0xffff),
+                            '    wz = {}'.format(d)], 2, 'jump'
+                if y == 3:      # JR
+                    return ['pc = wz = {}'.format(target)], 2, 'jump'
+                return ['if {}:'.format(self.COND[y - 4]),
+                        '    pc = wz = {}'.format(target),
+                        '    cycles += {}'.format(Z80.cc_ex[op]),
+                        'else:',
+                        '    pc = {}'.format((pc + 2) & 0xffff),
+                        '    wz = {}'.format(d)], 2, 'jump'
+            if z == 1:
+                if q == 0:      # LD rp,nn
+                    return ['{} = {}'.format(rp[p], self.arg16(pc, 1))], 3, None
+                # ADD HL,rp
+                return ['t = {} + {}'.format(rp[2], rp[p]),
+                        'wz = ({} + 1) & 0xffff'.format(rp[2]),
+                        'f = (f & {}) | ((({} ^ t ^ {}) >> 8) & {}) | ((t >> 16) & {}) | ((t >> 8) & {})'.format(
+                            sf | zf | pf, rp[2], rp[p], hf, cf, yf | xf),
+                        '{} = t & 0xffff'.format(rp[2])], 1, None
+            if z == 2:
+                if p == 0 or p == 1:
+                    r16 = rp[p]
+                    if q == 0:  # LD (BC),A / LD (DE),A
+                        return (self.write(r16, 'a')
+                            + ['wz = (a << 8) | (({} + 1) & 0xff)'.format(r16)]), 1, None
+                    # LD A,(BC) / LD A,(DE)
+                    return ['a = {}'.format(self.rd(r16)),
+                            'wz = ({} + 1) & 0xffff'.format(r16)], 1, None
+                nn = self.arg16(pc, 1)
+                if p == 2:
+                    if q == 0:  # LD (nn),HL
+                        return (['ea = {}'.format(nn)] + self.write(nn, '{} & 0xff'.format(xy))
+                            + self.write((nn + 1) & 0xffff, '{} >> 8'.format(xy))
+                            + ['wz = {}'.format((nn + 1) & 0xffff)]), 3, None
+                    # LD HL,(nn)
+                    return ['ea = {}'.format(nn),
+                            '{} = {} | ({} << 8)'.format(xy, self.rd(nn), self.rd((nn + 1) & 0xffff)),
+                            'wz = {}'.format((nn + 1) & 0xffff)], 3, None
+                if q == 0:      # LD (nn),A
+                    return (['ea = {}'.format(nn)] + self.write(nn, 'a')
+                        + ['wz = (a << 8) | {}'.format((nn + 1) & 0xff)]), 3, None
+                # LD A,(nn)
+                return ['ea = {}'.format(nn),
+                        'a = {}'.format(self.rd(nn)),
+                        'wz = {}'.format((nn + 1) & 0xffff)], 3, None
+            if z == 3:          # INC rp / DEC rp
+                return ['{0} = ({0} {1} 1) & 0xffff'.format(rp[p], '-' if q else '+')], 1, None
+            if z == 4 or z == 5:
+                table = 'SZHV_dec' if z == 5 else 'SZHV_inc'
+                delta = '- 1' if z == 5 else '+ 1'
+                if y == 6:      # INC (HL) / DEC (HL)
+                    return (pre
+                        + ['t = ({} {}) & 0xff'.format(self.rd(mem), delta),
+                           'f = (f & 0x01) | {}[t]'.format(table)]
+                        + self.write(mem, 't')), mlen, None
+                return ['t = ({} {}) & 0xff'.format(self.get8(y, xy), delta),
+                        'f = (f & 0x01) | {}[t]'.format(table),
+                        self.set8(y, 't', xy)], 1, None
+            if z == 6:
+                if y == 6:      # LD (HL),n
+                    if xy == 'hl':
+                        return self.write('hl', self.arg(pc, 1)), 2, None
+                    return pre + self.write(mem, self.arg(pc, 2)), 3, None
+                return [self.set8(y, self.arg(pc, 1), xy)], 2, None
+            # z == 7
+            if y == 0:          # RLCA
+                return ['a = ((a << 1) | (a >> 7)) & 0xff',
+                        'f = (f & {}) | (a & {})'.format(sf | zf | pf, yf | xf | cf)], 1, None
+            if y == 1:          # RRCA
+                return ['f = (f & {}) | (a & {})'.format(sf | zf | pf, cf),
+                        'a = ((a >> 1) | (a << 7)) & 0xff',
+                        'f |= a & {}'.format(yf | xf)], 1, None
+            if y == 2:          # RLA
+                return ['t = ((a << 1) | (f & 0x01)) & 0xff',
+                        'f = (f & {}) | (a >> 7) | (t & {})'.format(sf | zf | pf, yf | xf),
+                        'a = t'], 1, None
+            if y == 3:          # RRA
+                return ['t = ((a >> 1) | (f << 7)) & 0xff',
+                        'f = (f & {}) | (a & 0x01) | (t & {})'.format(sf | zf | pf, yf | xf),
+                        'a = t'], 1, None
+            if y == 4:          # DAA
+                return ['t = a',
+                        'if f & {}:'.format(nf),
+                        '    if (f & {}) or (a & 0x0f) > 9:'.format(hf),
+                        '        t = (t - 6) & 0xff',
+                        '    if (f & {}) or a > 0x99:'.format(cf),
+                        '        t = (t - 0x60) & 0xff',
+                        'else:',
+                        '    if (f & {}) or (a & 0x0f) > 9:'.format(hf),
+                        '        t = (t + 6) & 0xff',
+                        '    if (f & {}) or a > 0x99:'.format(cf),
+                        '        t = (t + 0x60) & 0xff',
+                        'f = (f & {}) | (a > 0x99) | ((a ^ t) & {}) | SZP[t]'.format(cf | nf, hf),
+                        'a = t'], 1, None
+            if y == 5:          # CPL
+                return ['a ^= 0xff',
+                        'f = (f & {}) | {} | (a & {})'.format(sf | zf | pf | cf, hf | nf, yf | xf)], 1, None
+            if y == 6:          # SCF
+                return ['f = (f & {}) | {} | (a & {})'.format(sf | zf | yf | xf | pf, cf, yf | xf)], 1, None
+            # CCF
+            return ['f = ((f & {}) | ((f & 0x01) << 4) | (a & {})) ^ 0x01'.format(
+                sf | zf | yf | xf | pf | cf, yf | xf)], 1, None
+
+        if x == 1:
+            if op == 0x76:      # HALT
+                return None
+            if y == 6:          # LD (HL),r
+                return pre + self.write(mem, self.get8(z)), mlen, None
+            if z == 6:          # LD r,(HL)
+                return pre + [self.set8(y, self.rd(mem))], mlen, None
+            if y == z:
+                return [], 1, None
+            return [self.set8(y, self.get8(z, xy), xy)], 1, None
+
+        if x == 2:
+            if z == 6:
+                return pre + self.alu(y, self.rd(mem)), mlen, None
+            return self.alu(y, self.get8(z, xy)), 1, None
+
+        # x == 3
+        if z == 0:              # RET cc
+            return ['if {}:'.format(self.COND[y])] \
+                + ['    ' + l for l in self.pop('pc')] + [
+                    '    wz = pc',
+                    '    cycles += {}'.format(Z80.cc_ex[op]),
+                    'else:',
+                    '    pc = {}'.format((pc + 1) & 0xffff)], 1, 'jump'
+        if z == 1:
+            if q == 0:          # POP rp2
+                if p == 3:
+                    return self.pop('t') + ['a = t >> 8', 'f = t & 0xff'], 1, None
+                return self.pop(rp[p]), 1, None
+            if p == 0:          # RET
+                return self.pop('pc') + ['wz = pc'], 1, 'jump'
+            if p == 1:          # EXX
+                return ['bc, cpu.m_bc2 = cpu.m_bc2, bc',
+                        'de, cpu.m_de2 = cpu.m_de2, de',
+                        'hl, cpu.m_hl2 = cpu.m_hl2, hl'], 1, None
+            if p == 2:          # JP (HL)
+                return ['pc = {}'.format(xy)], 1, 'jump'
+            # LD SP,HL
+            return ['sp = {}'.format(xy)], 1, None
+        if z == 2:              # JP cc,nn
+            nn = self.arg16(pc, 1)
+            return ['wz = {}'.format(nn),
+                    'pc = {} if {} else {}'.format(nn, self.COND[y], (pc + 3) & 0xffff)], 3, 'jump'
+        if z == 3:
+            if y == 0:          # JP nn
+                return ['pc = wz = {}'.format(self.arg16(pc, 1))], 3, 'jump'
+            if y == 2:          # OUT (n),A
+                d = self.arg(pc, 1)
+                return ['cpu.m_icount -= cycles',
+                        'cycles = 0',
+                        'out({} | (a << 8), a)'.format(d),
+                        'wz = (a << 8) | {}'.format((d + 1) & 0xff)], 2, 'end'
+            if y == 3:          # IN A,(n)
+                d = self.arg(pc, 1)
+                return ['cpu.m_icount -= cycles',
+                        'cycles = 0',
+                        't = {} | (a << 8)'.format(d),
+                        'a = inp(t)',
+                        'wz = (t + 1) & 0xffff'], 2, 'end'
+            if y == 4:          # EX (SP),HL
+                return ['t = {} | ({} << 8)'.format(self.rd('sp'), self.rd('((sp + 1) & 0xffff)'))]\
+                    + self.write('(sp + 1) & 0xffff', '{} >> 8'.format(xy))\
+                    + self.write('sp', '{} & 0xff'.format(xy))\
+                    + ['{} = wz = t'.format(xy)], 1, None
+            if y == 5:          # EX DE,HL
+                return ['de, hl = hl, de'], 1, None
+            if y == 6:          # DI
+                return ['cpu.m_iff1 = cpu.m_iff2 = 0'], 1, None
+            # EI
+            return ['cpu.m_iff1 = cpu.m_iff2 = 1',
+                    'cpu.m_after_ei = True'], 1, 'end'
+        if z == 4:              # CALL cc,nn
+            nn = self.arg16(pc, 1)
+            return ['wz = {}'.format(nn),
+                    'if {}:'.format(self.COND[y]),
+                    '    ea = {}'.format(nn)] \
+                + ['    ' + l for l in self.push((pc + 3) & 0xffff)] + [
+                    '    pc = {}'.format(nn),
+                    '    cycles += {}'.format(Z80.cc_ex[op]),
+                    'else:',
+                    '    pc = {}'.format((pc + 3) & 0xffff)], 3, 'jump'
+        if z == 5:
+            if q == 0:          # PUSH rp2
+                if p == 3:
+                    return self.push('((a << 8) | f)'), 1, None
+                return self.push(rp[p]), 1, None
+            if p == 0:          # CALL nn
+                nn = self.arg16(pc, 1)
+                return ['ea = wz = {}'.format(nn)] + self.push((pc + 3) & 0xffff) \
+                    + ['pc = {}'.format(nn)], 3, 'jump'
+            return None
+        if z == 6:              # alu n
+            return self.alu(y, self.arg(pc, 1)), 2, None
+        # RST
+        return self.push((pc + 1) & 0xffff) + ['pc = wz = {}'.format(y * 8)], 1, 'jump'
+
+    def decode_cb(self, pc):
+        op = self.read_op((pc + 1) & 0xffff)
+        x, y, z = op >> 6, (op >> 3) & 7, op & 7
+        cycles = Z80.cc_op[0xcb] + Z80.cc_cb[op]
+        if z == 6:
+            value = self.rd('hl')
+        else:
+            value = self.get8(z)
+        if x == 0:
+            lines = self.rot(y, value)
+        elif x == 1:
+            if z == 6:
+                return ['n = ' + self.rd('hl')] + self.bit(y, 'n', '(wz >> 8)'), 2, cycles, 2, None
+            return ['n = {}'.format(value)] + self.bit(y, 'n', 'n'), 2, cycles, 2, None
+        elif x == 2:
+            lines = ['t = {} & {}'.format(value, 0xff & ~(1 << y))]
+        else:
+            lines = ['t = {} | {}'.format(value, 1 << y)]
+        if z == 6:
+            return lines + self.write('hl', 't'), 2, cycles, 2, None
+        return lines + [self.set8(z, 't')], 2, cycles, 2, None
+
+    def decode_xycb(self, pc, xy):
+        """DD CB d op / FD CB d op
+        """
+        d = self.arg(pc, 2)
+        op = self.arg(pc, 3)
+        x, y, z = op >> 6, (op >> 3) & 7, op & 7
+        cycles = Z80.cc_op[0xdd] + Z80.cc_xy[0xcb] + Z80.cc_xycb[op]
+        lines = ['ea = ({} + {}) & 0xffff'.format(xy, d - 0x100 if d & 0x80 else d),
+                 'wz = ea']
+        if x == 1:
+            return lines + ['n = ' + self.rd('ea')] + self.bit(y, 'n', '(ea >> 8)'), 4, cycles, 2, None
+        if x == 0:
+            lines += self.rot(y, self.rd('ea'))
+        elif x == 2:
+            lines += ['t = {} & {}'.format(self.rd('ea'), 0xff & ~(1 << y))]
+        else:
+            lines += ['t = {} | {}'.format(self.rd('ea'), 1 << y)]
+        if z != 6:
+            lines.append(self.set8(z, 't'))
+        return lines + self.write('ea', 't'), 4, cycles, 2, None
+
+    # DD/FD opcodes that have their own handler; all others behave
+    # like the unprefixed opcode and are left to the interpreter
+    XY_OPS = frozenset([
+        0x09, 0x19, 0x21, 0x22, 0x23, 0x24, 0x25, 0x26, 0x29, 0x2a, 0x2b, 0x2c,
+        0x2d, 0x2e, 0x34, 0x35, 0x36, 0x39, 0x44, 0x45, 0x46, 0x4c, 0x4d, 0x4e,
+        0x54, 0x55, 0x56, 0x5c, 0x5d, 0x5e, 0x60, 0x61, 0x62, 0x63, 0x64, 0x65,
+        0x66, 0x67, 0x68, 0x69, 0x6a, 0x6b, 0x6c, 0x6d, 0x6e, 0x6f, 0x70, 0x71,
+        0x72, 0x73, 0x74, 0x75, 0x77, 0x7c, 0x7d, 0x7e, 0x84, 0x85, 0x86, 0x8c,
+        0x8d, 0x8e, 0x94, 0x95, 0x96, 0x9c, 0x9d, 0x9e, 0xa4, 0xa5, 0xa6, 0xac,
+        0xad, 0xae, 0xb4, 0xb5, 0xb6, 0xbc, 0xbd, 0xbe, 0xe1, 0xe3, 0xe5, 0xe9,
+        0xf9,
+    ])
+
+    def decode_xy(self, pc, xy):
+        op = self.read_op((pc + 1) & 0xffff)
+        if op == 0xcb:
+            return self.decode_xycb(pc, xy)
+        if op not in Translator.XY_OPS:
+            return None
+        cycles = Z80.cc_op[0xdd] + Z80.cc_xy[op]
+        x, y, z = op >> 6, (op >> 3) & 7, op & 7
+        uses_mem = (x == 1 and (y == 6 or z == 6)) or (x == 2 and z == 6) or op in (0x34, 0x35, 0x36)
+        if uses_mem:
+            d = self.arg(pc, 2)
+            disp = d - 0x100 if d & 0x80 else d
+            if x == 1:
+                # LD r,(IX+d) and LD (IX+d),r use the real H and L
+                if y == 6:
+                    lines = ['ea = ({} + {}) & 0xffff'.format(xy, disp), 'wz = ea'] \
+                        + self.write('ea', self.get8(z))
+                else:
+                    lines = ['ea = ({} + {}) & 0xffff'.format(xy, disp), 'wz = ea',
+                             self.set8(y, self.rd('ea'))]
+                return lines, 3, cycles, 2, None
+            res = self.decode_op(pc + 1, op, xy, disp)
+        else:
+            res = self.decode_op(pc + 1, op, xy)
+        if res is None:
+            return None
+        lines, length, kind = res
+        return lines, length + 1, cycles, 2, kind
+
+    def decode_ed(self, pc):
+        op = self.read_op((pc + 1) & 0xffff)
+        cycles = Z80.cc_op[0xed] + Z80.cc_ed[op]
+        x, y, z = op >> 6, (op >> 3) & 7, op & 7
+        p, q = y >> 1, y & 1
+        rp = ('bc', 'de', 'hl', 'sp')
+        hf, nf, cf = self.HF, self.NF, self.CF
+        sf, yf, xf = self.SF, self.YF, self.XF
+        if x == 1:
+            if z == 2:
+                if q == 0:      # SBC HL,rp
+                    return ['n = {}'.format(rp[p]),
+                            't = hl - n - (f & 0x01)',
+                            'wz = (hl + 1) & 0xffff',
+                            'f = (((hl ^ t ^ n) >> 8) & {}) | {} | ((t >> 16) & 0x01) | ((t >> 8) & {}) '
+                            '| (0 if (t & 0xffff) else 0x40) | (((n ^ hl) & (hl ^ t) & 0x8000) >> 13)'.format(
+                                hf, nf, sf | yf | xf),
+                            'hl = t & 0xffff'], 2, cycles, 2, None
+                # ADC HL,rp
+                return ['n = {}'.format(rp[p]),
+                        't = hl + n + (f & 0x01)',
+                        'wz = (hl + 1) & 0xffff',
+                        'f = (((hl ^ t ^ n) >> 8) & {}) | ((t >> 16) & 0x01) | ((t >> 8) & {}) '
+                        '| (0 if (t & 0xffff) else 0x40) | (((n ^ hl ^ 0x8000) & (n ^ t) & 0x8000) >> 13)'.format(
+                            hf, sf | yf | xf),
+                        'hl = t & 0xffff'], 2, cycles, 2, None
+            if z == 3:
+                nn = self.arg16(pc, 2)
+                if q == 0:      # LD (nn),rp
+                    return (['ea = {}'.format(nn)] + self.write(nn, '{} & 0xff'.format(rp[p]))
+                        + self.write((nn + 1) & 0xffff, '{} >> 8'.format(rp[p]))
+                        + ['wz = {}'.format((nn + 1) & 0xffff)]), 4, cycles, 2, None
+                # LD rp,(nn)
+                return ['ea = {}'.format(nn),
+                        '{} = {} | ({} << 8)'.format(rp[p], self.rd(nn), self.rd((nn + 1) & 0xffff)),
+                        'wz = {}'.format((nn + 1) & 0xffff)], 4, cycles, 2, None
+            if z == 4:          # NEG
+                return ['t = (-a) & 0xff',
+                        'f = SZHVC_sub[t]',
+                        'a = t'], 2, cycles, 2, None
+            if z == 6:          # IM
+                return ['cpu.m_im = {}'.format((0, 0, 1, 2)[y & 3])], 2, cycles, 2, None
+            if z == 7 and y in (4, 5):
+                if y == 4:      # RRD
+                    expr = ['n = ' + self.rd('hl'),
+                            'wz = (hl + 1) & 0xffff'] \
+                        + self.write('hl', '((n >> 4) | (a << 4)) & 0xff') \
+                        + ['a = (a & 0xf0) | (n & 0x0f)']
+                else:           # RLD
+                    expr = ['n = ' + self.rd('hl'),
+                            'wz = (hl + 1) & 0xffff'] \
+                        + self.write('hl', '((n << 4) | (a & 0x0f)) & 0xff') \
+                        + ['a = (a & 0xf0) | (n >> 4)']
+                return expr + ['f = (f & 0x01) | SZP[a]'], 2, cycles, 2, None
+            return None
+        if x == 2 and y in (4, 5) and z <= 1:
+            inc = '+' if y == 4 else '-'
+            if z == 0:          # LDI / LDD
+                return ['n = ' + self.rd('hl')] + self.write('de', 'n') + [
+                        't = a + n',
+                        'hl = (hl {} 1) & 0xffff'.format(inc),
+                        'de = (de {} 1) & 0xffff'.format(inc),
+                        'bc = (bc - 1) & 0xffff',
+                        'f = (f & {}) | ((t << 4) & {}) | (t & {}) | ({} if bc else 0)'.format(
+                            self.SF | self.ZF | cf, yf, xf, self.VF)], 2, cycles, 2, None
+            # CPI / CPD
+            return ['n = ' + self.rd('hl'),
+                    't = (a - n) & 0xff',
+                    'wz = (wz {} 1) & 0xffff'.format(inc),
+                    'hl = (hl {} 1) & 0xffff'.format(inc),
+                    'bc = (bc - 1) & 0xffff',
+                    'f = (f & 0x01) | (SZ[t] & {}) | ((a ^ n ^ t) & {}) | {}'.format(
+                        0xff & ~(yf | xf), hf, nf),
+                    'if f & {}:'.format(hf),
+                    '    t -= 1',
+                    'f |= ((t << 4) & {}) | (t & {}) | ({} if bc else 0)'.format(
+                        yf, xf, self.VF)], 2, cycles, 2, None
+        return None
+
+    # --- blocks -------------------------------------------------------------
+
+    def translate(self, start, name=None):
+        """Translate the block at start
+
+        Returns (source, name, end, icount) or None when the very first
+        instruction cannot be translated, or is a jump onto itself that
+        the interpreter runs as an idle loop. end is the address
+        following the last translated instruction.
+        """
+        if not self.fits(start) or self.jumps_to_itself(start):
+            return None
+        name = name or 'block_{:04x}'.format(start)
+        body = []
+        pc = start
+        cycles = 0
+        refresh = 0
+        icount = 0
+        count = 0
+        kind = None
+        while count < Translator.MAX_INSNS:
+            if not self.fits(pc):
+                break
+            self.smc = False
+            res = self.decode(pc)
+            if res is None:
+                break
+            lines, length, insn_cycles, insn_refresh, kind = res
+            icount = cycles
+            cycles += insn_cycles
+            refresh += insn_refresh
+            count += 1
+            body.append('# {:04x}: {}'.format(pc, ' '.join(
+                '{:02x}'.format(self.read_op((pc + i) & 0xffff)) for i in range(length))))
+            body.extend(lines)
+            pc = (pc + length) & 0xffff
+            if kind is not None:
+                break
+            if self.smc:
+                body.append('if smc:')
+                body.append('    @EXIT {} {} {}'.format(pc, cycles, refresh))
+        if count == 0:
+            return None
+
+        # collect the registers the block touches
+        text = '\n'.join(l.split('#')[0] for l in body)
+        regs = [r for r in Translator.REGS if self._uses(text, r)]
+
+        src = ['def {}(cpu):'.format(name)]
+        if 'rmap[' in text:
+            src.append('    rmap = cpu.m_read_map')
+            src.append('    rh = cpu.m_read_handlers')
+        if 'wmap[' in text:
+            src.append('    wmap = cpu.m_write_map')
+            src.append('    wh = cpu.m_write_handlers')
+            src.append('    pages = cpu.m_code_pages')
+            src.append('    smc = False')
+        if 'inp(' in text:
+            src.append('    inp = cpu.m_io.read')
+        if 'out(' in text:
+            src.append('    out = cpu.m_io.write')
+        for r in regs:
+            src.append('    {0} = cpu.m_{0}'.format(r))
+        src.append('    cycles = {}'.format(cycles))
+        for l in body:
+            if l.lstrip().startswith('@EXIT'):
+                indent = ' ' * (4 + len(l) - len(l.lstrip()))
+                _, epc, ecycles, erefresh = l.split()
+                src.extend(indent + s for s in self._exit(regs, epc, ecycles, erefresh))
+            else:
+                src.append('    ' + l)
+        if kind == 'jump':
+            src.extend('    ' + s for s in self._exit(regs, 'pc', 'cycles', refresh))
+        else:
+            src.extend('    ' + s for s in self._exit(regs, pc, 'cycles', refresh))
+        return '\n'.join(src) + '\n', name, pc, icount
+
+    def jumps_to_itself(self, pc):
+        """Whether the instruction at pc is a JR, DJNZ or JP onto itself
+        """
+        op = self.read_op(pc)
+        if op in (0x10, 0x18, 0x20, 0x28, 0x30, 0x38):
+            return self.read_arg((pc + 1) & 0xffff) == 0xfe
+        if op == 0xc3 or (op & 0xc7) == 0xc2:
+            return self.read_arg((pc + 1) & 0xffff) | (self.read_arg((pc + 2) & 0xffff) << 8) == pc
+        return False
+
+    @staticmethod
+    def _uses(text, reg):
+        return re.search(r'(?<![\w.]){}\b'.format(reg), text) is not None
+
+    @staticmethod
+    def _exit(regs, pc, cycles, refresh):
+        lines = ['cpu.m_{0} = {0}'.format(r) for r in regs]
+        lines.append('cpu.m_pc = {}'.format(pc))
+        lines.append('cpu.m_icount -= {}'.format(cycles))
+        lines.append('cpu.m_r += {}'.format(refresh))
+        lines.append('return')
+        return lines
+
+
+class Z80JIT(Z80):
+    """Z80 with a basic-block translation cache
+
+    Straight-line code is translated into Python functions by
+    Translator, compiled once and cached by start address. Instructions
+    the translator does not handle, and blocks that do not fit into the
+    remaining cycles, run through the interpreter, so the state after
+    execute_run() is the same as with Z80.
+
+    Timing is instruction-granular inside a block: memory callbacks see
+    m_icount as it was when the block was entered. Code in memory
+    handler pages, or fetched through m_opcodes or m_args, is never
+    translated, so that devices see every fetch as it happens. Writes through wm()
+    or from translated code into a page that holds translated code drop
+    all blocks of that page, and so does remapping the page. Hosts that
+    modify memory behind the CPU's back must call invalidate() or
+    flush() themselves.
+    """
+    __slots__ = ('m_blocks', 'm_code_pages', 'm_page_blocks', 'm_translator')
+
+    # globals of the generated code
+    GLOBALS = {
+        'SZ': Z80.SZ,
+        'SZ_BIT': Z80.SZ_BIT,
+        'SZP': Z80.SZP,
+        'SZHV_inc': Z80.SZHV_inc,
+        'SZHV_dec': Z80.SZHV_dec,
+        'SZHVC_add': Z80.SZHVC_add,
+        'SZHVC_sub': Z80.SZHVC_sub,
+    }
+
+    def __init__(self, mem_bus, io_bus):
+        # the memory map is set up by Z80.__init__ through set_page()
+        self.m_blocks = {}
+        self.m_code_pages = bytearray(0x100)
+        self.m_page_blocks = [[] for _ in range(0x100)]
+        super().__init__(mem_bus, io_bus)
+        self.m_translator = Translator(
+            lambda addr: self.m_read_map[addr >> 8][addr & 0xff],
+            readable=lambda addr: self.m_read_map[addr >> 8] is not None)
+
+    def set_page(self, page, read_page, write_page, read=None, write=None, origin=None):
+        """Set one page of the memory map
+        """
+        super().set_page(page, read_page, write_page, read, write, origin)
+        if self.m_code_pages[page]:
+            self.invalidate(page << 8)
+
+    def wm(self, addr, data):
+        """Write a byte to given memory location
+        """
+        super().wm(addr, data)
+        if self.m_code_pages[addr >> 8]:
+            self.invalidate(addr)
+
+    def block_copy(self, opcode, step):
+        """Run further iterations of LDIR/LDDR in one go
+        """
+        dst = self.m_de
+        super().block_copy(opcode, step)
+        self.invalidate_block(dst, ((self.m_de - dst) * step) & 0xffff, step)
+
+    def block_io(self, opcode, step):
+        """Run the remaining iterations of INIR/OTIR/INDR/OTDR in one go
+        """
+        hl = self.m_hl
+        super().block_io(opcode, step)
+        if not opcode & 1:
+            self.invalidate_block(hl, ((self.m_hl - hl) * step) & 0xffff, step)
+
+    def invalidate_block(self, addr, count, step):
+        """Drop translated blocks in the pages of count bytes written from addr
+        """
+        if count:
+            first = addr if step > 0 else (addr - count + 1) & 0xffff
+            for n in range(((first & 0xff) + count + 0xff) >> 8):
+                page = ((first >> 8) + n) & 0xff
+                if self.m_code_pages[page]:
+                    self.invalidate(page << 8)
+
+    def invalidate(self, addr):
+        """Drop all translated blocks in the page of addr
+        """
+        page = addr >> 8
+        blocks = self.m_blocks
+        for start in self.m_page_blocks[page]:
+            blocks.pop(start, None)
+        self.m_page_blocks[page] = []
+        self.m_code_pages[page] = 0
+
+    def flush(self):
+        """Drop all translated blocks
+        """
+        self.m_blocks.clear()
+        self.m_code_pages[:] = bytes(0x100)
+        self.m_page_blocks = [[] for _ in range(0x100)]
+
+    def load_state(self, state):
+        """Restore a state packed by save_state()
+        """
+        super().load_state(state)
+        if len(state) > Z80.STATE.size:
+            self.flush()
+
+    def restore(self, snapshot):
+        """Go back to a checkpoint taken by snapshot()
+        """
+        super().restore(snapshot)
+        self.flush()
+
+    def translate(self, pc):
+        """Translate and cache the block at pc
+
+        Returns the Block, or None when the instruction at pc has to run
+        through the interpreter; both are cached, except while m_opcodes
+        or m_args is set.
+        """
+        if self.m_opcodes is not None or self.m_args is not None:
+            return None
+        res = self.m_translator.translate(pc)
+        block = None
+        end = (pc + 1) & 0xffff
+        if res is not None:
+            source, name, end, icount = res
+            code = {}
+            exec(compile(source, '<{}>'.format(name), 'exec'), Z80JIT.GLOBALS, code)
+            block = Block(code[name], pc, end, icount, source)
+        self.cache(pc, block, end)
+        return block
+
+    def cache(self, pc, block, end):
+        """Cache block, or None, at pc and register it with its pages
+        """
+        self.m_blocks[pc] = block
+        # register the block with every page it covers
+        last = (end - 1) & 0xffff
+        page = pc >> 8
+        while True:
+            self.m_page_blocks[page].append(pc)
+            self.m_code_pages[page] = 1
+            if page == last >> 8:
+                break
+            page = (page + 1) & 0xff
+
+    def execute_run(self):
+        """Execute 'cycles' T-states.
+        """
+        blocks = self.m_blocks
+        while True:
+            if self.m_wait_state:
+                # stalled
+                self.m_icount = 0
+                return
+
+            # check for interrupts before each instruction
+            self.check_interrupts()
+            self.m_icount_executing = 0
+
+            # the instruction after EI must run alone: interrupts are
+            # checked again right after it
+            after_ei = self.m_after_ei
+            self.m_after_ei = False
+            self.m_after_ldair = False
+
+            pc = self.m_pc
+            if pc in blocks:
+                block = blocks[pc]
+            else:
+                block = self.translate(pc)
+
+            if block is not None and self.m_icount >= block.icount and not (self.m_halt or after_ei):
+                block.run(self)
+            else:
+                opcode = self.rop()
+
+                # when in HALT state, the fetched opcode is not dispatched (aka a NOP)
+                if self.m_halt:
+                    self.m_pc = (self.m_pc - 1) & 0xffff
+                    opcode = 0
+
+                self.EXEC(Z80.cc_op, self.op_op, opcode)
+                if self.m_halt:
+                    self.skip_halt()
+
+            if self.m_icount < 0:
+                break
@@ -0,0 +1,375 @@
+import inspect
+import re
+import textwrap
+
+from z80 import Z80
+
+
+class Z80Predecode(Z80):
+    """Z80 with a per-address cache of decoded instructions
+
+    The first time an instruction in a RAM or ROM page is executed, its
+    prefixes and operands are decoded into an entry of m_entries: the
+    handler, the length, the immediate operand, the displacement and
+    the cycles taken by the fetches. Later runs of that address set PC,
+    R and m_icount from the entry and call the handler with the
+    operands, without going through rop(), arg() and the prefix tables.
+
+    The handlers taking operands are generated from the source of the
+    op_* handlers, with arg(), arg16(), eax() and eay() replaced by the
+    operands. The cycles of the fetches are charged before the handler
+    runs, which is where Z80 charges them, too, as operands are fetched
+    before anything else is accessed. State and timing, also as seen by
+    memory and I/O handlers, are the same as with Z80. Prefix chains
+    such as DD DD, and opcodes in handler pages, run through the
+    interpreter.
+
+    Writes through wm() or write_mem(), block transfers and remapping
+    drop the entries of the instructions they overwrite. Hosts that
+    modify memory behind the CPU's back must call invalidate() or
+    flush() themselves.
+    """
+    __slots__ = ('m_entries', 'm_code_pages')
+
+    # operand bytes read by each of these calls
+    OPERANDS = {
+        'arg': 1, 'arg16': 2, 'eax': 1, 'eay': 1,
+        'jp': 2, 'jp_cond': 2, 'call': 2, 'call_cond': 2, 'jr': 1, 'jr_cond': 1,
+    }
+    READS = re.compile(r'self\.(arg16|arg|eax|eay|jp_cond|jp|jr_cond|jr|call_cond|call)\(')
+    SUBSTITUTIONS = (
+        (re.compile(r'self\.eax\(\)'), 'self.m_ea = (self.m_ix + d) & 0xffff; self.m_wz = self.m_ea'),
+        (re.compile(r'self\.eay\(\)'), 'self.m_ea = (self.m_iy + d) & 0xffff; self.m_wz = self.m_ea'),
+        (re.compile(r'self\.arg(16)?\(\)'), 'n'),
+        (re.compile(r'self\.(jp|jr|call)\(\)'), r'self.\1_n(n)'),
+        (re.compile(r'self\.(jp_cond|jr_cond|call_cond)\('), r'self.\1_n(n, '),
+    )
+    # handlers that cannot be decoded ahead: prefixes and prefix chains
+    UNDECODED = re.compile(r'self\.(rop|EXEC|op_illegal_1)\(')
+
+    def __init__(self, mem_bus, io_bus):
+        # the memory map is set up by Z80.__init__ through set_page()
+        self.m_entries = [None] * 0x10000
+        self.m_code_pages = bytearray(0x100)
+        super().__init__(mem_bus, io_bus)
+
+    @classmethod
+    def initialize_dispatch(cls):
+        """Build the opcode dispatch tables and the predecoded handlers
+
+        pre_op, pre_cb, pre_ed, pre_dd and pre_fd hold a (handler,
+        operand bytes, displacement) tuple or None for each opcode;
+        pre_xycb_ix and pre_xycb_iy hold the handlers of DD CB d op
+        and FD CB d op.
+        """
+        super().initialize_dispatch()
+        sources = {}
+        tables = {}
+        for group in ('op', 'cb', 'ed', 'dd', 'fd'):
+            table = []
+            for opcode in range(0x100):
+                name = 'op_{}_{:02x}'.format(group, opcode)
+                func = getattr(cls, name)
+                src = textwrap.dedent(inspect.getsource(func))
+                reads = cls.READS.findall(src)
+                if cls.UNDECODED.search(src) or len(reads) - ('eax' in reads or 'eay' in reads) > 1:
+                    table.append(None)
+                    continue
+                for pattern, repl in cls.SUBSTITUTIONS:
+                    src = pattern.sub(repl, src)
+                cls.check_rewritten(name, src)
+                sources.setdefault(id(func.__globals__), (func.__globals__, []))[1].append(
+                    cls.predecoded(src, 'pre_' + name))
+                table.append(('pre_' + name, sum(cls.OPERANDS[read] for read in reads),
+                              'eax' in reads or 'eay' in reads))
+            tables[group] = table
+        for xy in ('ix', 'iy'):
+            for opcode in range(0x100):
+                name = 'op_xycb_{:02x}'.format(opcode)
+                func = getattr(cls, name)
+                src = textwrap.dedent(inspect.getsource(func))
+                cls.check_rewritten(name, src)
+                sources.setdefault(id(func.__globals__), (func.__globals__, []))[1].append(
+                    cls.predecoded(src, 'pre_xycb_{}_{:02x}'.format(xy, opcode),
+                                   'self.m_ea = (self.m_{} + d) & 0xffff'.format(xy), 'self.m_wz = self.m_ea'))
+
+        funcs = {}
+        for module_globals, defs in sources.values():
+            exec(compile('\n'.join(defs), '<predecoded>', 'exec'), module_globals, funcs)
+        for group, table in tables.items():
+            setattr(cls, 'pre_' + group, [None if entry is None else (funcs[entry[0]],) + entry[1:]
+                                          for entry in table])
+        for xy in ('ix', 'iy'):
+            setattr(cls, 'pre_xycb_' + xy, [funcs['pre_xycb_{}_{:02x}'.format(xy, opcode)]
+                                            for opcode in range(0x100)])
+
+    @classmethod
+    def check_rewritten(cls, name, src):
+        """Raise RuntimeError if the rewritten source of handler name
+        still fetches operands itself
+        """
+        left = cls.READS.search(src)
+        if left is not None:
+            raise RuntimeError('{}: {} left after rewriting'.format(name, left.group(0)))
+
+    @staticmethod
+    def predecoded(src, name, *prologue):
+        """Source of handler src renamed to name, taking the operands n and d
+        """
+        header, _, body = src.partition(':')
+        if body.startswith('\n'):
+            body = body.strip('\n')
+        else:
+            # a one-liner
+            body = '    ' + body.strip()
+        lines = ['def {}(self, n, d):'.format(name)]
+        lines.extend('    ' + line for line in prologue)
+        lines.append(body)
+        return '\n'.join(lines) + '\n'
+
+    def jp_n(self, nn):
+        """JP with the address decoded
+        """
+        pc = self.m_pc
+        self.m_pc = nn
+        self.m_wz = nn
+        if nn == (pc - 3) & 0xffff:
+            self.skip_idle()
+
+    def jp_cond_n(self, nn, cond):
+        """JP_COND with the address decoded
+        """
+        if cond:
+            self.jp_n(nn)
+        else:
+            self.m_wz = nn
+
+    def jr_n(self, n):
+        """JR with the displacement decoded
+        """
+        disp = Z80.S8[n]
+        self.m_pc = (self.m_pc + disp) & 0xffff
+        self.nomreq_addr(self.m_pc - 1, 5)
+        self.m_wz = self.m_pc
+        if disp == -2:
+            self.skip_idle()
+
+    def jr_cond_n(self, n, cond, opcode):
+        """JR_COND with the displacement decoded
+        """
+        if cond:
+            self.CC(Z80.cc_ex, opcode)
+            self.jr_n(n)
+        else:
+            self.m_wz = n
+
+    def call_n(self, nn):
+        """CALL with the address decoded
+        """
+        self.m_ea = nn
+        self.nomreq_addr(self.m_pc - 1, 1)
+        self.m_wz = nn
+        self.wm16_sp(self.m_pc)
+        self.m_pc = nn
+
+    def call_cond_n(self, nn, cond, opcode):
+        """CALL_COND with the address decoded
+        """
+        if cond:
+            self.CC(Z80.cc_ex, opcode)
+            self.call_n(nn)
+        else:
+            self.m_wz = nn
+
+    def decode(self, pc):
+        """Decode and cache the instruction at pc
+
+        Returns the entry, a (handler, length, refresh, cycles,
+        executing, n, d) tuple, or False when the instruction has to
+        run through the interpreter; both are cached. cycles is what
+        the fetches take from m_icount, executing what is left in
+        m_icount_executing for the handler.
+        """
+        read_map = self.m_read_map
+        code = []
+        for offset in range(4):
+            page = read_map[((pc + offset) & 0xffff) >> 8]
+            code.append(None if page is None else page[(pc + offset) & 0xff])
+
+        # pages holding the instruction, for invalidation
+        self.m_code_pages[pc >> 8] = 1
+        self.m_code_pages[((pc + 3) & 0xffff) >> 8] = 1
+
+        fetch = 2 * self.execute_min_cycles()
+        mtm = self.MTM
+        entry = False
+        opcode = code[0]
+        if opcode is None:
+            pass
+        elif opcode in (0xdd, 0xfd) and code[1] == 0xcb:
+            if None not in code:
+                handler = (self.pre_xycb_ix if opcode == 0xdd else self.pre_xycb_iy)[code[3]]
+                cc = Z80.cc_dd if opcode == 0xdd else Z80.cc_fd
+                cycles = Z80.cc_op[opcode] + fetch + 2 * mtm + 2
+                executing = cc[0xcb] - fetch - 2 * mtm - 2 + Z80.cc_xycb[code[3]]
+                entry = (handler, 4, 2, cycles, executing, 0, Z80.S8[code[2]])
+        else:
+            if opcode in (0xcb, 0xed, 0xdd, 0xfd):
+                group, cc = {
+                    0xcb: (self.pre_cb, Z80.cc_cb),
+                    0xed: (self.pre_ed, Z80.cc_ed),
+                    0xdd: (self.pre_dd, Z80.cc_dd),
+                    0xfd: (self.pre_fd, Z80.cc_fd),
+                }[opcode]
+                prefix = 1
+                cycles = Z80.cc_op[opcode] + fetch
+                opcode = code[1]
+            else:
+                group, cc = self.pre_op, Z80.cc_op
+                prefix = 0
+                cycles = fetch
+            decoded = group[opcode] if opcode is not None else None
+            if decoded is not None:
+                handler, count, disp = decoded
+                length = prefix + 1 + count
+                operands = code[prefix + 1:length]
+                if None not in operands:
+                    d = 0
+                    if disp:
+                        d = Z80.S8[operands.pop(0)]
+                    n = operands[0] | (operands[1] << 8) if len(operands) == 2 else \
+                        operands[0] if operands else 0
+                    entry = (handler, length, prefix + 1, cycles + count * mtm,
+                             cc[opcode] - fetch - count * mtm, n, d)
+        self.m_entries[pc] = entry
+        return entry
+
+    def set_page(self, page, read_page, write_page, read=None, write=None, origin=None):
+        """Set one page of the memory map
+        """
+        super().set_page(page, read_page, write_page, read, write, origin)
+        if self.m_code_pages[page]:
+            self.invalidate_range(page << 8, 0x100)
+
+    def wm(self, addr, data):
+        """Write a byte to given memory location
+        """
+        super().wm(addr, data)
+        if self.m_code_pages[addr >> 8]:
+            self.invalidate(addr)
+
+    def write_mem(self, addr, data):
+        """Write a byte through the memory map without taking any cycles
+        """
+        super().write_mem(addr, data)
+        if self.m_code_pages[addr >> 8]:
+            self.invalidate(addr)
+
+    def block_copy(self, opcode, step):
+        """Run further iterations of LDIR/LDDR in one go
+        """
+        dst = self.m_de
+        super().block_copy(opcode, step)
+        count = ((self.m_de - dst) * step) & 0xffff
+        self.invalidate_range(dst if step > 0 else (dst - count + 1) & 0xffff, count)
+
+    def block_io(self, opcode, step):
+        """Run the remaining iterations of INIR/OTIR/INDR/OTDR in one go
+        """
+        hl = self.m_hl
+        super().block_io(opcode, step)
+        if not opcode & 1:
+            count = ((self.m_hl - hl) * step) & 0xffff
+            self.invalidate_range(hl if step > 0 else (hl - count + 1) & 0xffff, count)
+
+    def invalidate(self, addr):
+        """Drop the entries of the instructions holding the byte at addr
+        """
+        entries = self.m_entries
+        for offset in range(4):
+            entries[(addr - offset) & 0xffff] = None
+
+    def invalidate_range(self, addr, count):
+        """Drop the entries of the instructions holding count bytes from addr
+        """
+        if not count:
+            return
+        entries = self.m_entries
+        first = (addr - 3) & 0xffff
+        count += 3
+        if first + count <= 0x10000:
+            entries[first:first + count] = [None] * count
+        else:
+            entries[first:] = [None] * (0x10000 - first)
+            entries[:first + count - 0x10000] = [None] * (first + count - 0x10000)
+
+    def flush(self):
+        """Drop all entries
+        """
+        self.m_entries = [None] * 0x10000
+        self.m_code_pages[:] = bytes(0x100)
+
+    def load_state(self, state):
+        """Restore a state packed by save_state()
+        """
+        super().load_state(state)
+        if len(state) > Z80.STATE.size:
+            self.flush()
+
+    def restore(self, snapshot):
+        """Go back to a checkpoint taken by snapshot()
+        """
+        super().restore(snapshot)
+        self.flush()
+
+    def execute_run(self):
+        """Execute 'cycles' T-states.
+        """
+        if self.m_opcodes is not None or self.m_args is not None:
+            # opcodes and arguments are read through callbacks
+            super().execute_run()
+            return
+
+        while True:
+            if self.m_wait_state:
+                # stalled
+                self.m_icount = 0
+                return
+
+            # check for interrupts before each instruction
+            self.check_interrupts()
+            self.m_icount_executing = 0
+
+            self.m_after_ei = False
+            self.m_after_ldair = False
+
+            pc = self.m_pc
+            entry = self.m_entries[pc]
+            if entry is None:
+                entry = self.decode(pc)
+
+            if entry and not self.m_halt:
+                handler, length, refresh, cycles, executing, n, d = entry
+                self.m_pc = (pc + length) & 0xffff
+                self.m_r += refresh
+                self.m_icount -= cycles
+                self.m_icount_executing = executing
+                handler(self, n, d)
+                if self.m_icount_executing > 0:
+                    self.T(self.m_icount_executing)
+                else:
+                    self.m_icount_executing = 0
+            else:
+                opcode = self.rop()
+
+                # when in HALT state, the fetched opcode is not dispatched (aka a NOP)
+                if self.m_halt:
+                    self.m_pc = (self.m_pc - 1) & 0xffff
+                    opcode = 0
+
+                self.EXEC(Z80.cc_op, self.op_op, opcode)
+            if self.m_halt:
+                self.skip_halt()
+
+            if self.m_icount < 0:
+                break
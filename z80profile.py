@@ -0,0 +1,115 @@
+"""Per-PC execution profile
+
+Profile.run() runs a Z80 like execute_run() does, from a loop of its
+own, and counts per PC the instructions executed there and the
+T-states they took. execute_run() itself is not touched, so a CPU
+that is not profiled runs at full speed.
+
+report() lists the hot spots with their disassembly, and dump() writes
+the counters as a .npy file of shape (2, 65536): numpy.load() gives
+the instruction counts in row 0 and the T-states in row 1.
+"""
+import struct
+import sys
+from array import array
+
+from z80 import Z80
+from z80dasm import disassemble
+
+
+class Profile:
+    """Instruction and T-state counters for each of the 64K PCs
+
+    T-states spent taking interrupts are counted apart, in
+    interrupt_cycles. Time skipped in HALT or an idle loop counts for
+    the HALT or jump.
+    """
+
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * 0x10000))
+        self.cycles = array('Q', bytes(8 * 0x10000))
+        self.interrupt_cycles = 0
+
+    def run(self, cpu, cycles):
+        """Run cpu for cycles T-states, profiling every instruction
+
+        The same as adding cycles to m_icount and calling execute_run().
+        """
+        cpu.m_icount += cycles
+        counts = self.counts
+        spent = self.cycles
+        while True:
+            if cpu.m_wait_state:
+                # stalled
+                cpu.m_icount = 0
+                break
+
+            # check for interrupts before each instruction
+            icount = cpu.m_icount
+            cpu.check_interrupts()
+            cpu.m_icount_executing = 0
+            if cpu.m_icount != icount:
+                self.interrupt_cycles += icount - cpu.m_icount
+                icount = cpu.m_icount
+
+            cpu.m_after_ei = False
+            cpu.m_after_ldair = False
+
+            pc = cpu.m_pc
+            opcode = cpu.rop()
+
+            # when in HALT state, the fetched opcode is not dispatched (aka a NOP)
+            if cpu.m_halt:
+                cpu.m_pc = (cpu.m_pc - 1) & 0xffff
+                opcode = 0
+
+            cpu.EXEC(Z80.cc_op, cpu.op_op, opcode)
+            if cpu.m_halt:
+                cpu.skip_halt()
+
+            counts[pc] += 1
+            spent[pc] += icount - cpu.m_icount
+
+            if cpu.m_icount < 0:
+                break
+
+    def hot_spots(self, count=20):
+        """The count PCs with the most T-states, most first
+        """
+        spent = self.cycles
+        pcs = sorted((pc for pc in range(0x10000) if spent[pc]), key=lambda pc: -spent[pc])
+        return pcs[:count]
+
+    def report(self, cpu, count=20):
+        """Text listing of the hot spots
+
+        The disassembly is read from the RAM and ROM pages of cpu.
+        """
+        read_map = cpu.m_read_map
+
+        def read(addr):
+            page = read_map[addr >> 8]
+            return page[addr & 0xff] if page is not None else 0
+
+        total = sum(self.cycles) + self.interrupt_cycles
+        lines = ['{:>12} {:>14} {:>6}  {:<4}  {}'.format('count', 'T-states', '%', 'PC', 'instruction')]
+        for pc in self.hot_spots(count):
+            text = disassemble(read, pc)[0] if read_map[pc >> 8] is not None else '?'
+            lines.append('{:12d} {:14d} {:6.2f}  {:04X}  {}'.format(
+                self.counts[pc], self.cycles[pc], 100.0 * self.cycles[pc] / total, pc, text))
+        if self.interrupt_cycles:
+            lines.append('{:>12} {:14d} {:6.2f}  interrupts'.format(
+                '', self.interrupt_cycles, 100.0 * self.interrupt_cycles / total))
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        """Write the counters as a .npy file of uint64, shape (2, 65536)
+        """
+        descr = '<u8' if sys.byteorder == 'little' else '>u8'
+        header = "{'descr': '%s', 'fortran_order': False, 'shape': (2, 65536), }" % descr
+        # magic, version 1.0 and a header padded to 64 bytes with a newline
+        header += ' ' * (63 - (10 + len(header)) % 64) + '\n'
+        with open(path, 'wb') as fh:
+            fh.write(b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin-1'))
+            fh.write(self.counts.tobytes())
+            fh.write(self.cycles.tobytes())
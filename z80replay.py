@@ -0,0 +1,176 @@
+import struct
+
+from z80 import Bus
+
+
+# Log layout: a header, the save_state() of the CPU, then records
+# starting with their kind. Timestamps count T-states from the start
+# of the recording.
+MAGIC = b'Z80R'
+VERSION = 1
+HEADER = struct.Struct('<4sBBI')     # magic, version, flags, state size
+HAS_READ_BLOCK = 0x01
+
+RUN = 0         # cycles given to execute_run()
+IN = 1          # timestamp, port, value
+IN_BLOCK = 2    # timestamp, port, count, then the values
+INPUT = 3       # timestamp, input line, state
+VECTOR = 4      # timestamp, IRQ vector
+
+RECORDS = {
+    RUN: struct.Struct('<Bq'),
+    IN: struct.Struct('<BqHB'),
+    IN_BLOCK: struct.Struct('<BqHH'),
+    INPUT: struct.Struct('<BqBB'),
+    VECTOR: struct.Struct('<BqI'),
+}
+
+
+class Recorder:
+    """Record everything that comes into a Z80 from outside
+
+    Wraps the I/O bus and IRQ vector callback of cpu, and logs each
+    value read from them to stream with a timestamp in T-states. Input
+    lines must be set and time slices run through the Recorder, which
+    logs those, too. Replayer feeds the log back into a CPU without any
+    devices; I/O writes are not logged.
+
+    The log starts with cpu.save_state(memory).
+    """
+
+    def __init__(self, cpu, stream, memory=False):
+        self.cpu = cpu
+        self.stream = stream
+        self.io = cpu.m_io
+        self.vector = cpu.m_irq_vector
+        # origin - m_icount counts the cycles run since the start
+        self.origin = cpu.m_icount
+
+        state = cpu.save_state(memory)
+        flags = HAS_READ_BLOCK if self.io.read_block is not None else 0
+        stream.write(HEADER.pack(MAGIC, VERSION, flags, len(state)) + state)
+
+        read_block = self.read_block if self.io.read_block is not None else None
+        cpu.m_io = Bus(self.read, self.io.write, read_block, self.io.write_block)
+        cpu.m_irq_vector = self.irq_vector
+
+    def clock(self):
+        """T-states run since the start of the recording
+        """
+        return self.origin - self.cpu.m_icount
+
+    def run(self, cycles):
+        """Run cpu for cycles T-states
+        """
+        self.stream.write(RECORDS[RUN].pack(RUN, cycles))
+        self.origin += cycles
+        self.cpu.m_icount += cycles
+        self.cpu.execute_run()
+
+    def execute_set_input(self, inputnum, state):
+        """Set an input line of cpu
+        """
+        self.stream.write(RECORDS[INPUT].pack(INPUT, self.clock(), inputnum, state))
+        self.cpu.execute_set_input(inputnum, state)
+
+    def read(self, port):
+        value = self.io.read(port)
+        self.stream.write(RECORDS[IN].pack(IN, self.clock(), port, value))
+        return value
+
+    def read_block(self, port, count):
+        data = bytes(self.io.read_block(port, count))
+        self.stream.write(RECORDS[IN_BLOCK].pack(IN_BLOCK, self.clock(), port, count) + data)
+        return data
+
+    def irq_vector(self):
+        vector = self.vector() if self.vector is not None else 0
+        self.stream.write(RECORDS[VECTOR].pack(VECTOR, self.clock(), vector & 0xffffffff))
+        return vector
+
+
+class Replayer:
+    """Run a CPU on a log written by Recorder
+
+    Restores the state the log starts with and serves I/O reads and IRQ
+    vectors from it, at the same points of the same time slices, so cpu
+    takes the very path of the recorded run. A read that does not match
+    the next logged one raises ValueError. I/O writes go to write, if
+    given.
+    """
+
+    def __init__(self, cpu, stream, write=None):
+        self.cpu = cpu
+        self.data = stream.read()
+        magic, version, flags, size = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not a Z80 log of version {}'.format(VERSION))
+        start = HEADER.size
+        cpu.load_state(self.data[start:start + size])
+        self.pos = start + size
+        self.origin = cpu.m_icount
+
+        read_block = self.read_block if flags & HAS_READ_BLOCK else None
+        cpu.m_io = Bus(self.read, write if write is not None else lambda port, value: None, read_block)
+        cpu.m_irq_vector = self.irq_vector
+
+    def clock(self):
+        """T-states run since the start of the recording
+        """
+        return self.origin - self.cpu.m_icount
+
+    def next(self, kind):
+        """The fields of the next record, which must be of kind
+        """
+        data = self.data
+        pos = self.pos
+        if pos >= len(data) or data[pos] != kind:
+            raise ValueError('replay diverged at cycle {}'.format(self.clock()))
+        record = RECORDS[kind]
+        values = record.unpack_from(data, pos)
+        self.pos = pos + record.size
+        if kind != RUN and values[1] != self.clock():
+            raise ValueError('replay diverged at cycle {}'.format(self.clock()))
+        return values
+
+    def step(self):
+        """Replay the next time slice or input line change
+
+        Returns False at the end of the log.
+        """
+        data = self.data
+        if self.pos >= len(data):
+            return False
+        cpu = self.cpu
+        if data[self.pos] == INPUT:
+            _, _, inputnum, state = self.next(INPUT)
+            cpu.execute_set_input(inputnum, state)
+        else:
+            _, cycles = self.next(RUN)
+            self.origin += cycles
+            cpu.m_icount += cycles
+            cpu.execute_run()
+        return True
+
+    def run(self):
+        """Replay the whole log
+        """
+        while self.step():
+            pass
+
+    def read(self, port):
+        _, _, logged, value = self.next(IN)
+        if logged != port:
+            raise ValueError('replay diverged at cycle {}'.format(self.clock()))
+        return value
+
+    def read_block(self, port, count):
+        _, _, logged, n = self.next(IN_BLOCK)
+        if logged != port or n != count:
+            raise ValueError('replay diverged at cycle {}'.format(self.clock()))
+        pos = self.pos
+        self.pos = pos + n
+        return self.data[pos:pos + n]
+
+    def irq_vector(self):
+        return self.next(VECTOR)[2]
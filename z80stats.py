@@ -0,0 +1,85 @@
+from array import array
+
+from z80 import Z80
+from z80dasm import disassemble
+
+
+def counted(group, opcode, handler):
+    """A dispatch table entry counting its calls before running handler
+    """
+    def op(cpu):
+        cpu.m_opcode_counts[group][opcode] += 1
+        handler(cpu)
+    return op
+
+
+class Z80Stats(Z80):
+    """Z80 counting the opcodes it executes
+
+    Every entry of the dispatch tables of this class is wrapped to count
+    its calls, per opcode and table, in m_opcode_counts. The tables of
+    Z80 itself are left alone. A prefix that is followed by another one
+    counts in the table of the first: DD DD in op_dd[0xdd], and DD CB
+    in op_dd[0xcb] followed by the op_xycb entry of the last byte.
+    """
+    __slots__ = ('m_opcode_counts',)
+
+    GROUPS = ('op', 'cb', 'ed', 'dd', 'fd', 'xycb')
+    # opcode bytes before those of each group, for the disassembly
+    PREFIXES = {'op': b'', 'cb': b'\xcb', 'ed': b'\xed', 'dd': b'\xdd', 'fd': b'\xfd', 'xycb': b'\xdd\xcb\x00'}
+
+    def __init__(self, *args, **kwargs):
+        self.m_opcode_counts = [array('Q', bytes(8 * 0x100)) for _ in Z80Stats.GROUPS]
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def initialize_dispatch(cls):
+        super().initialize_dispatch()
+        for group, name in enumerate(Z80Stats.GROUPS):
+            table = getattr(cls, 'op_' + name)
+            setattr(cls, 'op_' + name, [counted(group, opcode, handler) for opcode, handler in enumerate(table)])
+
+    def reset_counts(self):
+        for counts in self.m_opcode_counts:
+            counts[:] = array('Q', bytes(8 * 0x100))
+
+    def rows(self):
+        """(group, opcode, count) of every opcode executed, most first
+        """
+        rows = []
+        for group, counts in zip(Z80Stats.GROUPS, self.m_opcode_counts):
+            rows.extend((group, opcode, count) for opcode, count in enumerate(counts) if count)
+        rows.sort(key=lambda row: -row[2])
+        return rows
+
+    def chains(self):
+        """Counts of the prefix chains
+        """
+        dd = Z80Stats.GROUPS.index('dd')
+        fd = Z80Stats.GROUPS.index('fd')
+        res = {}
+        for name, group in (('DD', dd), ('FD', fd)):
+            counts = self.m_opcode_counts[group]
+            res[name + ' DD'] = counts[0xdd]
+            res[name + ' FD'] = counts[0xfd]
+            res[name + ' ED'] = counts[0xed]
+            res[name + ' CB d op'] = counts[0xcb]
+        return res
+
+    def report(self, count=None):
+        """Text table of the opcode counts, most first
+        """
+        rows = self.rows()
+        total = sum(self.m_opcode_counts[0])
+        lines = ['{:<5} {:<6} {:>12} {:>6}  {}'.format('group', 'opcode', 'count', '%', 'instruction')]
+        for group, opcode, n in rows[:count]:
+            code = Z80Stats.PREFIXES[group] + bytes([opcode]) + bytes(3)
+            if group in ('op', 'dd', 'fd') and opcode in (0xcb, 0xdd, 0xed, 0xfd):
+                text = '(prefix)'
+            else:
+                text = disassemble(lambda addr: code[addr] if addr < len(code) else 0, 0)[0]
+            lines.append('{:<5} {:02x}     {:12d} {:6.2f}  {}'.format(group, opcode, n, 100.0 * n / total, text))
+        lines.append('')
+        for chain, n in self.chains().items():
+            lines.append('{:<13} {:12d}'.format(chain, n))
+        return '\n'.join(lines)
@@ -0,0 +1,143 @@
+"""Binary instruction traces
+
+Trace.run() runs a Z80 like execute_run() does, and writes a fixed-size
+record for each instruction into a ring buffer: the cycle it starts at,
+PC, SP, AF, BC, DE, HL and the four bytes at PC. The ring buffer is a
+bytearray, or a file mapped into memory. execute_run() itself has no
+tracing in it, so a CPU that is not traced runs at full speed.
+
+    python z80trace.py trace.bin
+
+prints a trace file, oldest record first.
+"""
+import mmap
+import struct
+import sys
+
+from z80 import Z80
+
+
+class Trace:
+    """A ring buffer of the last capacity instruction records
+
+    With path, the buffer is that file, mapped into memory; its header
+    is brought up to date at the end of each run().
+    """
+    MAGIC = b'Z80T'
+    VERSION = 1
+    # magic, version, record size, capacity, records written
+    HEADER = struct.Struct('<4sBxHIQ')
+    # cycle, PC, SP, AF, BC, DE, HL, bytes at PC
+    RECORD = struct.Struct('<qHHHHHH4s')
+
+    def __init__(self, capacity, path=None):
+        self.capacity = capacity
+        self.count = 0
+        # cycles run since the start of the trace are origin - m_icount
+        self.origin = None
+        size = Trace.HEADER.size + capacity * Trace.RECORD.size
+        if path is None:
+            self.file = None
+            self.buffer = bytearray(size)
+        else:
+            self.file = open(path, 'w+b')
+            self.file.truncate(size)
+            self.buffer = mmap.mmap(self.file.fileno(), size)
+        self.write_header()
+
+    def write_header(self):
+        Trace.HEADER.pack_into(self.buffer, 0, Trace.MAGIC, Trace.VERSION,
+                               Trace.RECORD.size, self.capacity, self.count)
+
+    def close(self):
+        self.write_header()
+        if self.file is not None:
+            self.buffer.close()
+            self.file.close()
+
+    def run(self, cpu, cycles):
+        """Run cpu for cycles T-states, tracing every instruction
+
+        The same as adding cycles to m_icount and calling execute_run().
+        """
+        if self.origin is None:
+            self.origin = cpu.m_icount
+        self.origin += cycles
+        cpu.m_icount += cycles
+
+        buffer = self.buffer
+        pack_into = Trace.RECORD.pack_into
+        size = Trace.RECORD.size
+        capacity = self.capacity
+        read_map = cpu.m_read_map
+        count = self.count
+        while True:
+            if cpu.m_wait_state:
+                # stalled
+                cpu.m_icount = 0
+                break
+
+            # check for interrupts before each instruction
+            cpu.check_interrupts()
+            cpu.m_icount_executing = 0
+
+            cpu.m_after_ei = False
+            cpu.m_after_ldair = False
+
+            pc = cpu.m_pc
+            page = read_map[pc >> 8]
+            if page is not None and (pc & 0xff) <= 0xfc:
+                code = page[pc & 0xff:(pc & 0xff) + 4]
+            else:
+                code = bytes(cpu.read_mem((pc + n) & 0xffff) if read_map[((pc + n) & 0xffff) >> 8] is not None else 0
+                             for n in range(4))
+            pack_into(buffer, Trace.HEADER.size + (count % capacity) * size,
+                      self.origin - cpu.m_icount, pc, cpu.m_sp, (cpu.m_a << 8) | cpu.m_f,
+                      cpu.m_bc, cpu.m_de, cpu.m_hl, bytes(code))
+            count += 1
+
+            opcode = cpu.rop()
+
+            # when in HALT state, the fetched opcode is not dispatched (aka a NOP)
+            if cpu.m_halt:
+                cpu.m_pc = (cpu.m_pc - 1) & 0xffff
+                opcode = 0
+
+            cpu.EXEC(Z80.cc_op, cpu.op_op, opcode)
+            if cpu.m_halt:
+                cpu.skip_halt()
+
+            if cpu.m_icount < 0:
+                break
+        self.count = count
+        self.write_header()
+
+    def records(self):
+        """The records in the buffer, oldest first
+        """
+        return read_trace(self.buffer)
+
+
+def read_trace(buffer):
+    """Decode a trace buffer or file contents, oldest record first
+
+    Yields (cycle, pc, sp, af, bc, de, hl, code) tuples.
+    """
+    magic, version, size, capacity, count = Trace.HEADER.unpack_from(buffer)
+    if magic != Trace.MAGIC or version != Trace.VERSION or size != Trace.RECORD.size:
+        raise ValueError('not a Z80 trace of version {}'.format(Trace.VERSION))
+    unpack_from = Trace.RECORD.unpack_from
+    for n in range(max(count - capacity, 0), count):
+        yield unpack_from(buffer, Trace.HEADER.size + (n % capacity) * size)
+
+
+def main():
+    with open(sys.argv[1], 'rb') as fh:
+        data = fh.read()
+    for cycle, pc, sp, af, bc, de, hl, code in read_trace(data):
+        print("{:12d} PC:{:04x} SP:{:04x} AF:{:04x} BC:{:04x} DE:{:04x} HL:{:04x}  {}".format(
+            cycle, pc, sp, af, bc, de, hl, code.hex(' ')))
+
+
+if __name__ == '__main__':
+    main()